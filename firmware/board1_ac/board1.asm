@@ -43,8 +43,53 @@
         AMBIENT_TEMP_INT
         FAN_SPEED
         UART_TEMP
+
+        ; Protokol v2 (cerceve) registerlari
+        FR_CRC
+        FR_BITS
+        FR_TX
+        FR_LEN
+        FR_TYPE
+        FR_P0, FR_P1        ; Yuk (FSR ile yazilir, ardisik olmali)
+        FR_FLAGS            ; bit0: alma zaman asimi
+        FR_CNT
+        TO_LO, TO_HI
+        BAUD_OLD            ; Hiz degisiminde eski SPBRG (geri donus icin)
+        BAUD_EXP            ; Yanki testinde beklenen byte
+
+        ; Push (abonelik) modu
+        PUSH_ON             ; bit0: abonelik acik (T_SUBSCRIBE)
+        PUSH_PERIOD         ; Heartbeat periyodu (100 ms birimi, 0 = sadece degisimde)
+        PUSH_CNT            ; Heartbeat'e kalan tick
+        PUSH_FLAGS          ; bit0: EVENT gonderilecek
+        LAST_DES_I, LAST_DES_F, LAST_AMB, LAST_FAN  ; Son gonderilen degerler
     ENDC
 
+;----------------------------- PROTOKOL v2 ----------------------------------
+; Cerceve: SOF | LEN | TYPE | PAYLOAD | CRC-8 (poly 0x07, init 0, LEN..PAYLOAD)
+; constants.py ile ayni degerler. SOF/HELLO eski (v1) firmware'de yok sayilir.
+SOF_BYTE        EQU 0x7E
+HELLO_BYTE      EQU 0x7F
+PROTO_VERSION   EQU 0x02
+BOARD_ID        EQU 0x01
+MAX_PAYLOAD     EQU 0x02
+T_READ_ALL      EQU 0x01
+T_SET           EQU 0x02
+T_BAUD          EQU 0x03
+T_SUBSCRIBE     EQU 0x04
+T_HELLO_ACK     EQU 0x80
+T_VALUES        EQU 0x81
+T_SET_ACK       EQU 0x82
+T_EVENT         EQU 0x83
+T_NAK           EQU 0xC0
+NAK_CRC         EQU 0x01
+NAK_TYPE        EQU 0x02
+NAK_LEN         EQU 0x03
+BAUD_COMMIT     EQU 0xA5
+; TMR1: 1 MHz / 8 = 125 kHz -> 12500 sayim = 100 ms (65536 - 12500 = 0xCF2C)
+TMR1_RELOAD_H   EQU 0xCF
+TMR1_RELOAD_L   EQU 0x2C
+
     ORG 0x00
     GOTO START
 
@@ -124,6 +169,11 @@ START:
     BSF     RCSTA, SPEN
     BSF     RCSTA, CREN
 
+    ; TMR1: push heartbeat tick'i (dahili saat, 1:8 on bolucu, kesme yok)
+    BANKSEL T1CON
+    MOVLW   B'00110001'
+    MOVWF   T1CON
+
     ; Degiskenleri Sifirla
     BANKSEL PORTC
     CLRF    PORTC
@@ -139,6 +189,8 @@ START:
     CLRF    AMBIENT_TEMP_INT
     CLRF    AMBIENT_TEMP_FRAC
     CLRF    FAN_SPEED
+    CLRF    PUSH_ON
+    CLRF    PUSH_FLAGS
 
     ; Varsayilan Kullanici Hedefi (25.0)
     MOVLW   D'2'
@@ -638,11 +690,17 @@ WAIT_TX:
 ;   SET Protokolü (automation_api.py ile aynı) :contentReference[oaicite:3]{index=3}
 ;     10xxxxxx (0x80|data): set desired frac (0-63)
 ;     11xxxxxx (0xC0|data): set desired int  (0-63)
+;
+;   Protokol v2:
+;     0x7F: HELLO -> HELLO_ACK [versiyon, kart no]
+;     0x7E: SOF   -> cercevenin kalani bloklayarak okunur (UART_HANDLE_FRAME)
+;
+;   Byte yoksa PUSH_TASK calisir (abonelikte EVENT cercevesi).
 ; ---------------------------------------------------------------------------
 UART_Check:
     BANKSEL PIR1
     BTFSS   PIR1, RCIF
-    RETURN
+    GOTO    PUSH_TASK
 
     ; Byte oku
     BANKSEL RCREG
@@ -665,7 +723,18 @@ UART_Check:
     BTFSC   STATUS, Z
     GOTO    UART_SET_FRAC
 
-    ; --- 2) GET komutlarını işle (0x01..0x05) ---
+    ; --- 2) Protokol v2: HELLO / cerceve baslangici ---
+    MOVF    UART_TEMP, W
+    XORLW   HELLO_BYTE
+    BTFSC   STATUS, Z
+    GOTO    UART_HELLO
+
+    MOVF    UART_TEMP, W
+    XORLW   SOF_BYTE
+    BTFSC   STATUS, Z
+    GOTO    UART_HANDLE_FRAME
+
+    ; --- 3) GET komutlarını işle (0x01..0x05) ---
     MOVF    UART_TEMP, W
     XORLW   0x01
     BTFSC   STATUS, Z
@@ -798,5 +867,445 @@ UART_TENS_DONE:
     MOVWF   USER_D4
     RETURN
 
+; ===========================================================================
+; PROTOKOL v2 - CERCEVE ISLEME
+;   Stack: UART_Check (en derin 2. seviye) + 3 seviye = 5 (< 8)
+;   FR_FLAGS: bit0 = alma zaman asimi, bit1 = yanki testi hatasi
+; ===========================================================================
+
+; ---------------------------------------------------------------------------
+; UART_HELLO
+;   HELLO_ACK [PROTO_VERSION, BOARD_ID] cevabi gonderir.
+; ---------------------------------------------------------------------------
+UART_HELLO:
+    MOVLW   D'2'
+    MOVWF   FR_LEN
+    MOVLW   T_HELLO_ACK
+    CALL    FRAME_Start
+    MOVLW   PROTO_VERSION
+    CALL    FRAME_SendByte
+    MOVLW   BOARD_ID
+    CALL    FRAME_SendByte
+    GOTO    FRAME_End
+
+; ---------------------------------------------------------------------------
+; UART_HANDLE_FRAME
+;   SOF alindiktan sonra LEN, TYPE, PAYLOAD ve CRC'yi bloklayarak okur.
+;   Bu sirada ekran/tus taramasi beklemez; byte'lar geldigi anda alinir,
+;   boylece 2 byte'lik RX FIFO tasmaz. Byte arasi ~20 ms zaman asimi.
+; ---------------------------------------------------------------------------
+UART_HANDLE_FRAME:
+    BANKSEL FR_CRC
+    CLRF    FR_CRC
+    CLRF    FR_P0
+    CLRF    FR_P1
+
+    ; LEN
+    CALL    UART_RecvByte_Timeout
+    BTFSC   FR_FLAGS, 0
+    RETURN                      ; Zaman asimi: cerceve cevapsiz birakilir
+    MOVWF   FR_LEN
+    CALL    CRC8_Update
+    MOVLW   MAX_PAYLOAD + 1
+    SUBWF   FR_LEN, W           ; C=1 -> LEN > MAX_PAYLOAD
+    BTFSC   STATUS, C
+    GOTO    UART_NAK_LEN
+
+    ; TYPE
+    CALL    UART_RecvByte_Timeout
+    BTFSC   FR_FLAGS, 0
+    RETURN
+    MOVWF   FR_TYPE
+    CALL    CRC8_Update
+
+    ; PAYLOAD -> FR_P0, FR_P1
+    MOVLW   FR_P0
+    MOVWF   FSR
+    MOVF    FR_LEN, W
+    MOVWF   FR_CNT
+FRAME_PAYLOAD_LOOP:
+    MOVF    FR_CNT, F
+    BTFSC   STATUS, Z
+    GOTO    FRAME_CHECK_CRC
+    CALL    UART_RecvByte_Timeout
+    BTFSC   FR_FLAGS, 0
+    RETURN
+    MOVWF   INDF
+    CALL    CRC8_Update
+    INCF    FSR, F
+    DECF    FR_CNT, F
+    GOTO    FRAME_PAYLOAD_LOOP
+
+FRAME_CHECK_CRC:
+    CALL    UART_RecvByte_Timeout
+    BTFSC   FR_FLAGS, 0
+    RETURN
+    XORWF   FR_CRC, W
+    BTFSS   STATUS, Z
+    GOTO    UART_NAK_CRC
+
+    ; Tip dagitimi
+    MOVF    FR_TYPE, W
+    XORLW   T_READ_ALL
+    BTFSC   STATUS, Z
+    GOTO    UART_FRAME_VALUES
+
+    MOVF    FR_TYPE, W
+    XORLW   T_SET
+    BTFSC   STATUS, Z
+    GOTO    UART_FRAME_SET
+
+    MOVF    FR_TYPE, W
+    XORLW   T_BAUD
+    BTFSC   STATUS, Z
+    GOTO    UART_FRAME_BAUD
+
+    MOVF    FR_TYPE, W
+    XORLW   T_SUBSCRIBE
+    BTFSC   STATUS, Z
+    GOTO    UART_FRAME_SUBSCRIBE
+
+    MOVLW   NAK_TYPE
+    GOTO    UART_SEND_NAK
+
+; ---------------------------------------------------------------------------
+; UART_FRAME_VALUES
+;   READ_ALL cevabi: tum degerler tek cercevede (UPDATE_COMMANDS sirasi)
+;   [desired int, desired frac, ambient int, ambient frac, fan speed]
+; UART_SEND_VALUES
+;   Ayni yuk, W = TYPE (T_VALUES / T_EVENT).
+; ---------------------------------------------------------------------------
+UART_FRAME_VALUES:
+    MOVLW   T_VALUES
+UART_SEND_VALUES:
+    MOVWF   FR_TYPE
+    MOVLW   D'5'
+    MOVWF   FR_LEN
+    MOVF    FR_TYPE, W
+    CALL    FRAME_Start
+    MOVF    DESIRED_TEMP_INT, W
+    CALL    FRAME_SendByte
+    MOVF    DESIRED_TEMP_FRAC, W
+    CALL    FRAME_SendByte
+    MOVF    AMBIENT_TEMP_INT, W
+    CALL    FRAME_SendByte
+    MOVF    AMBIENT_TEMP_FRAC, W
+    CALL    FRAME_SendByte
+    MOVF    FAN_SPEED, W
+    CALL    FRAME_SendByte
+    GOTO    FRAME_End
+
+; ---------------------------------------------------------------------------
+; UART_FRAME_SET
+;   Yuk: [desired int, desired frac] -> SET_ACK [0]
+; ---------------------------------------------------------------------------
+UART_FRAME_SET:
+    MOVF    FR_LEN, W
+    XORLW   D'2'
+    BTFSS   STATUS, Z
+    GOTO    UART_NAK_LEN
+
+    MOVF    FR_P0, W
+    ANDLW   0x3F
+    MOVWF   DESIRED_TEMP_INT
+    MOVF    FR_P1, W
+    ANDLW   0x3F
+    MOVWF   DESIRED_TEMP_FRAC
+    CALL    UART_UpdateUserDigitsFromDesired
+
+    BANKSEL FR_LEN
+    MOVLW   D'1'
+    MOVWF   FR_LEN
+    MOVLW   T_SET_ACK
+    CALL    FRAME_Start
+    MOVLW   0x00
+    CALL    FRAME_SendByte
+    GOTO    FRAME_End
+
+; ---------------------------------------------------------------------------
+; UART_FRAME_SUBSCRIBE
+;   Yuk: [acik (bit0), heartbeat (100 ms birimi, 0 = sadece degisimde)]
+;   -> SET_ACK [0]. Acilista ilk EVENT hemen gonderilir (tam goruntu).
+; ---------------------------------------------------------------------------
+UART_FRAME_SUBSCRIBE:
+    MOVF    FR_LEN, W
+    XORLW   D'2'
+    BTFSS   STATUS, Z
+    GOTO    UART_NAK_LEN
+
+    MOVF    FR_P0, W
+    ANDLW   0x01
+    MOVWF   PUSH_ON
+    MOVF    FR_P1, W
+    MOVWF   PUSH_PERIOD
+    MOVWF   PUSH_CNT
+    BSF     PUSH_FLAGS, 0
+
+    MOVLW   D'1'
+    MOVWF   FR_LEN
+    MOVLW   T_SET_ACK
+    CALL    FRAME_Start
+    MOVLW   0x00
+    CALL    FRAME_SendByte
+    GOTO    FRAME_End
+
+; ---------------------------------------------------------------------------
+; PUSH_TASK
+;   UART_Check'te byte yokken calisir: komutlar arasinda, hicbir cevabin
+;   ortasinda degil. Abonelik aciksa hedef/ortam sicakligi veya fan hizi
+;   degisince ya da heartbeat suresi dolunca T_EVENT gonderir (yuk = READ_ALL).
+;   TMR1 her 100 ms'de tasar; PUSH_CNT heartbeat'e kalan tick sayisidir.
+; ---------------------------------------------------------------------------
+PUSH_TASK:
+    BANKSEL PUSH_ON
+    BTFSS   PUSH_ON, 0
+    RETURN
+
+    ; Degisim algilama (son gonderilen degerlerle karsilastir)
+    MOVF    DESIRED_TEMP_INT, W
+    XORWF   LAST_DES_I, W
+    BTFSS   STATUS, Z
+    BSF     PUSH_FLAGS, 0
+    MOVF    DESIRED_TEMP_FRAC, W
+    XORWF   LAST_DES_F, W
+    BTFSS   STATUS, Z
+    BSF     PUSH_FLAGS, 0
+    MOVF    AMBIENT_TEMP_INT, W
+    XORWF   LAST_AMB, W
+    BTFSS   STATUS, Z
+    BSF     PUSH_FLAGS, 0
+    MOVF    FAN_SPEED, W
+    XORWF   LAST_FAN, W
+    BTFSS   STATUS, Z
+    BSF     PUSH_FLAGS, 0
+
+    ; 100 ms tick
+    BTFSS   PIR1, TMR1IF
+    GOTO    PUSH_CHECK
+    BCF     T1CON, TMR1ON
+    MOVLW   TMR1_RELOAD_H
+    MOVWF   TMR1H
+    MOVLW   TMR1_RELOAD_L
+    MOVWF   TMR1L
+    BSF     T1CON, TMR1ON
+    BCF     PIR1, TMR1IF
+    MOVF    PUSH_PERIOD, F
+    BTFSC   STATUS, Z
+    GOTO    PUSH_CHECK          ; Heartbeat kapali
+    DECFSZ  PUSH_CNT, F
+    GOTO    PUSH_CHECK
+    MOVF    PUSH_PERIOD, W
+    MOVWF   PUSH_CNT
+    BSF     PUSH_FLAGS, 0
+
+PUSH_CHECK:
+    BTFSS   PUSH_FLAGS, 0
+    RETURN
+    BCF     PUSH_FLAGS, 0
+    MOVF    DESIRED_TEMP_INT, W
+    MOVWF   LAST_DES_I
+    MOVF    DESIRED_TEMP_FRAC, W
+    MOVWF   LAST_DES_F
+    MOVF    AMBIENT_TEMP_INT, W
+    MOVWF   LAST_AMB
+    MOVF    FAN_SPEED, W
+    MOVWF   LAST_FAN
+    MOVLW   T_EVENT
+    GOTO    UART_SEND_VALUES
+
+; ---------------------------------------------------------------------------
+; UART_FRAME_BAUD
+;   Yuk: [SPBRG]. ACK eski hizda gonderilir, TSR bosalinca yeni SPBRG yuklenir.
+;   Yeni hizda 4 byte'lik desen (0x55 0xAA 0x0F 0xF0) okunup aynen geri
+;   gonderilir, ardindan BAUD_COMMIT beklenir. Byte ~100 ms icinde gelmezse,
+;   desen yanlissa veya onay gelmezse eski SPBRG'ye donulur.
+; ---------------------------------------------------------------------------
+UART_FRAME_BAUD:
+    MOVF    FR_LEN, W
+    XORLW   D'1'
+    BTFSS   STATUS, Z
+    GOTO    UART_NAK_LEN
+
+    MOVLW   D'1'
+    MOVWF   FR_LEN
+    MOVLW   T_SET_ACK
+    CALL    FRAME_Start
+    MOVLW   0x00
+    CALL    FRAME_SendByte
+    CALL    FRAME_End
+
+    ; ACK'in son biti hatta cikana kadar bekle
+    BANKSEL TXSTA
+BAUD_WAIT_TRMT:
+    BTFSS   TXSTA, TRMT
+    GOTO    BAUD_WAIT_TRMT
+
+    BANKSEL SPBRG
+    MOVF    SPBRG, W
+    BANKSEL BAUD_OLD
+    MOVWF   BAUD_OLD
+    MOVF    FR_P0, W
+    BANKSEL SPBRG
+    MOVWF   SPBRG
+    BANKSEL FR_FLAGS
+    BCF     FR_FLAGS, 1         ; Desen hatasi bayragi
+
+    MOVLW   0x55
+    CALL    BAUD_EchoExpect
+    BTFSC   FR_FLAGS, 0
+    GOTO    BAUD_REVERT
+    MOVLW   0xAA
+    CALL    BAUD_EchoExpect
+    BTFSC   FR_FLAGS, 0
+    GOTO    BAUD_REVERT
+    MOVLW   0x0F
+    CALL    BAUD_EchoExpect
+    BTFSC   FR_FLAGS, 0
+    GOTO    BAUD_REVERT
+    MOVLW   0xF0
+    CALL    BAUD_EchoExpect
+    BTFSC   FR_FLAGS, 0
+    GOTO    BAUD_REVERT
+    BTFSC   FR_FLAGS, 1
+    GOTO    BAUD_REVERT         ; PC yanlis yanki gordu, onay gondermeyecek
+
+    MOVLW   D'100'
+    CALL    UART_RecvByte_Wait
+    BTFSC   FR_FLAGS, 0
+    GOTO    BAUD_REVERT
+    XORLW   BAUD_COMMIT
+    BTFSS   STATUS, Z
+    GOTO    BAUD_REVERT
+    RETURN                      ; Yeni hiz kalici (reset'e kadar)
+
+BAUD_REVERT:
+    BANKSEL BAUD_OLD
+    MOVF    BAUD_OLD, W
+    BANKSEL SPBRG
+    MOVWF   SPBRG
+    BANKSEL FR_FLAGS
+    RETURN
+
+; ---------------------------------------------------------------------------
+; BAUD_EchoExpect
+;   W = beklenen byte. Gelen byte'i geri gonderir; farkliysa FR_FLAGS.1 = 1,
+;   zaman asiminda FR_FLAGS.0 = 1.
+; ---------------------------------------------------------------------------
+BAUD_EchoExpect:
+    MOVWF   BAUD_EXP
+    MOVLW   D'100'
+    CALL    UART_RecvByte_Wait
+    BTFSC   FR_FLAGS, 0
+    RETURN
+    MOVWF   UART_TEMP
+    CALL    UART_SendByte
+    MOVF    UART_TEMP, W
+    XORWF   BAUD_EXP, W
+    BTFSS   STATUS, Z
+    BSF     FR_FLAGS, 1
+    RETURN
+
+; ---------------- NAK cevaplari ----------------
+UART_NAK_LEN:
+    MOVLW   NAK_LEN
+    GOTO    UART_SEND_NAK
+
+UART_NAK_CRC:
+    MOVLW   NAK_CRC
+
+UART_SEND_NAK:
+    ; W = hata kodu
+    MOVWF   FR_P0
+    MOVLW   D'1'
+    MOVWF   FR_LEN
+    MOVLW   T_NAK
+    CALL    FRAME_Start
+    MOVF    FR_P0, W
+    CALL    FRAME_SendByte
+    GOTO    FRAME_End
+
+; ---------------------------------------------------------------------------
+; FRAME_Start
+;   W = TYPE, FR_LEN = yuk uzunlugu. SOF, LEN ve TYPE'i gonderir, CRC'yi baslatir.
+; FRAME_End
+;   Biriken CRC'yi gonderir (cagirana doner).
+; ---------------------------------------------------------------------------
+FRAME_Start:
+    MOVWF   FR_TYPE
+    CLRF    FR_CRC
+    MOVLW   SOF_BYTE
+    CALL    UART_SendByte
+    MOVF    FR_LEN, W
+    CALL    FRAME_SendByte
+    MOVF    FR_TYPE, W
+    GOTO    FRAME_SendByte
+
+FRAME_End:
+    MOVF    FR_CRC, W
+    GOTO    UART_SendByte
+
+; ---------------------------------------------------------------------------
+; FRAME_SendByte
+;   W'deki byte'i CRC'ye katar ve gonderir.
+; ---------------------------------------------------------------------------
+FRAME_SendByte:
+    MOVWF   FR_TX
+    CALL    CRC8_Update
+    MOVF    FR_TX, W
+    GOTO    UART_SendByte
+
+; ---------------------------------------------------------------------------
+; CRC8_Update
+;   FR_CRC = CRC-8(FR_CRC ^ W), polinom 0x07, MSB once. W bozulur.
+; ---------------------------------------------------------------------------
+CRC8_Update:
+    XORWF   FR_CRC, F
+    MOVLW   D'8'
+    MOVWF   FR_BITS
+CRC8_BIT:
+    BCF     STATUS, C
+    RLF     FR_CRC, F           ; En ust bit -> C
+    MOVLW   0x07
+    BTFSC   STATUS, C
+    XORWF   FR_CRC, F
+    DECFSZ  FR_BITS, F
+    GOTO    CRC8_BIT
+    RETURN
+
+; ---------------------------------------------------------------------------
+; UART_RecvByte_Timeout / UART_RecvByte_Wait (W = bekleme, ~1 ms birimi)
+;   Bir byte bekler (~20 ms: 20 x 256 x 4 dongu @ 1 MIPS). Gelirse W'de doner.
+;   Zaman asiminda veya tasmada (OERR) FR_FLAGS.0 = 1 olur. UART_Check'ten farkli
+;   olarak OERR burada temizlenir; aksi halde alici kilitli kalirdi.
+; ---------------------------------------------------------------------------
+UART_RecvByte_Timeout:
+    MOVLW   D'20'
+UART_RecvByte_Wait:
+    BANKSEL FR_FLAGS
+    BCF     FR_FLAGS, 0
+    MOVWF   TO_HI
+    CLRF    TO_LO
+RX_TO_WAIT:
+    BTFSC   PIR1, RCIF
+    GOTO    RX_TO_READ
+    DECFSZ  TO_LO, F
+    GOTO    RX_TO_WAIT
+    DECFSZ  TO_HI, F
+    GOTO    RX_TO_WAIT
+    BSF     FR_FLAGS, 0         ; Zaman asimi
+    RETLW   0x00
+
+RX_TO_READ:
+    BTFSS   RCSTA, OERR
+    GOTO    RX_TO_GET
+    BCF     RCSTA, CREN         ; Tasma: aliciyi sifirla
+    BSF     RCSTA, CREN
+    BSF     FR_FLAGS, 0
+    RETLW   0x00
+
+RX_TO_GET:
+    MOVF    RCREG, W
+    RETURN
+
 
     END
\ No newline at end of file
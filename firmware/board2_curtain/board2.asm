@@ -25,6 +25,31 @@ MASK_SET_FRAC_HEADER          EQU b'10000000'
 MASK_SET_INT_HEADER           EQU b'11000000'
 MASK_DATA_6BIT                EQU 0x3F
 
+; --- PROTOKOL v2 (constants.py ile ayni) ---
+; Cerceve: SOF | LEN | TYPE | PAYLOAD | CRC-8 (poly 0x07, init 0, LEN..PAYLOAD)
+; SOF/HELLO ust 2 biti 01 oldugu icin eski firmware'de HANDLE_GET'te eslesmez.
+FRAME_SOF                     EQU 0x7E
+CMD_PROTO_HELLO               EQU 0x7F
+PROTO_VERSION                 EQU 0x02
+BOARD_ID                      EQU 0x02
+FRAME_MAX_PAYLOAD             EQU 0x02
+FRAME_READ_ALL                EQU 0x01
+FRAME_SET                     EQU 0x02
+FRAME_BAUD                    EQU 0x03
+FRAME_SUBSCRIBE               EQU 0x04
+FRAME_HELLO_ACK               EQU 0x80
+FRAME_VALUES                  EQU 0x81
+FRAME_SET_ACK                 EQU 0x82
+FRAME_EVENT                   EQU 0x83
+FRAME_NAK                     EQU 0xC0
+NAK_CRC                       EQU 0x01
+NAK_TYPE                      EQU 0x02
+NAK_LEN                       EQU 0x03
+BAUD_COMMIT                   EQU 0xA5
+; TMR1: 1 MHz / 8 = 125 kHz -> 12500 sayım = 100 ms (65536 - 12500 = 0xCF2C)
+TMR1_RELOAD_H                 EQU 0xCF
+TMR1_RELOAD_L                 EQU 0x2C
+
 SPBRG_VAL EQU .25
 
 ; ---------------------------
@@ -56,6 +81,29 @@ SPBRG_VAL EQU .25
     mot_phase     
     d1, d2        
     lux_int       ; LDR hesaplama icin
+
+    ; --- PROTOKOL v2 ---
+    crc           ; CRC-8 birikimi
+    bit_cnt
+    tx_tmp
+    frame_len
+    frame_type
+    frame_p0      ; Yuk (FSR ile yazilir, ardisik olmali)
+    frame_p1
+    frame_flags   ; bit0: alma zaman asimi
+    frame_cnt
+    to_lo
+    to_hi
+    baud_old      ; Hız değişiminde eski SPBRG (geri dönüş için)
+    baud_exp      ; Yankı testinde beklenen byte
+
+    ; --- PUSH (ABONELİK) ---
+    push_on       ; bit0: abonelik açık (FRAME_SUBSCRIBE)
+    push_period   ; Heartbeat periyodu (100 ms birimi, 0 = sadece değişimde)
+    push_cnt      ; Heartbeat'e kalan tick
+    push_flags    ; bit0: FRAME_EVENT gönderilecek
+    last_pct      ; Son gönderilen perde hedefi
+    last_night    ; Son gönderilen gece modu
         ENDC
 
 ; =============================================================================
@@ -99,6 +147,13 @@ INIT:
         CLRF    is_night_mode
         CLRF    saved_usr_pos
 
+        ; Push kapalı; TMR1 heartbeat tick'i (dahili saat, 1:8, kesme yok)
+        CLRF    push_on
+        CLRF    push_flags
+        BANKSEL T1CON
+        MOVLW   b'00110001'
+        MOVWF   T1CON
+
         CALL    UART_Init
 
 ; =============================================================================
@@ -111,7 +166,10 @@ MAIN_LOOP:
         ; 2. MOTOR GÖREVİ
         CALL MOTOR_TASK
 
-        ; 3. UART KONTROLÜ
+        ; 3. ABONELİK (PUSH) GÖREVİ - komutlar arasında, cevap ortasında değil
+        CALL PUSH_TASK
+
+        ; 4. UART KONTROLÜ
         BANKSEL PIR1
         BTFSS   PIR1, RCIF
         GOTO    MAIN_LOOP
@@ -119,6 +177,17 @@ MAIN_LOOP:
         CALL    UART_Read_Byte_Safe
         MOVWF   cmd_byte
 
+        ; --- PROTOKOL v2 ---
+        MOVF    cmd_byte, W
+        XORLW   CMD_PROTO_HELLO
+        BTFSC   STATUS, Z
+        GOTO    HANDLE_HELLO
+
+        MOVF    cmd_byte, W
+        XORLW   FRAME_SOF
+        BTFSC   STATUS, Z
+        GOTO    HANDLE_FRAME
+
         ; --- HEADER KONTROLÜ ---
         MOVF    cmd_byte, W
         ANDLW   b'11000000'
@@ -390,13 +459,7 @@ SEND_ZERO:
 
 ; --- SENSÖRLER ---
 UPDATE_TEMP_AND_SEND_INT:
-        CALL ReadADC_AN1
-        MOVF adc_val, W
-        MOVWF rx_tmp
-        BCF STATUS, C
-        RRF rx_tmp, F
-        RRF rx_tmp, F
-        MOVF rx_tmp, W
+        CALL CALC_TEMP_INT
         CALL UART_SendByte
         GOTO MAIN_LOOP
 
@@ -406,12 +469,7 @@ UPDATE_TEMP_AND_SEND_FRAC:
         GOTO MAIN_LOOP
 
 UPDATE_PRESS_AND_SEND_INT:
-        CALL ReadADC_AN2
-        MOVF adc_val, W
-        MOVWF rx_tmp
-        BCF STATUS, C
-        RRF rx_tmp, F
-        MOVF rx_tmp, W
+        CALL CALC_PRESS_INT
         CALL UART_SendByte
         GOTO MAIN_LOOP
 
@@ -421,6 +479,36 @@ UPDATE_PRESS_AND_SEND_FRAC:
         GOTO MAIN_LOOP
 
 UPDATE_LIGHT_AND_SEND_INT:
+        CALL CALC_LIGHT_INT
+        CALL UART_SendByte
+        GOTO MAIN_LOOP
+
+UPDATE_LIGHT_AND_SEND_FRAC:
+        MOVLW .0
+        CALL UART_SendByte
+        GOTO MAIN_LOOP
+
+; --- SENSÖR HESAPLARI (HANDLE_GET ve FRAME_VALUES ortak, sonuç W'de) ---
+CALC_TEMP_INT:
+        CALL ReadADC_AN1
+        MOVF adc_val, W
+        MOVWF rx_tmp
+        BCF STATUS, C
+        RRF rx_tmp, F
+        RRF rx_tmp, F
+        MOVF rx_tmp, W
+        RETURN
+
+CALC_PRESS_INT:
+        CALL ReadADC_AN2
+        MOVF adc_val, W
+        MOVWF rx_tmp
+        BCF STATUS, C
+        RRF rx_tmp, F
+        MOVF rx_tmp, W
+        RETURN
+
+CALC_LIGHT_INT:
         CALL ReadADC_AN0
         MOVF adc_val, W
         MOVWF rx_tmp
@@ -434,13 +522,398 @@ DIV3_L:
         GOTO DIV3_L
 DIV3_L_DONE:
         MOVF lux_int, W
-        CALL UART_SendByte
-        GOTO MAIN_LOOP
+        RETURN
 
-UPDATE_LIGHT_AND_SEND_FRAC:
-        MOVLW .0
-        CALL UART_SendByte
-        GOTO MAIN_LOOP
+; =============================================================================
+; PROTOKOL v2 - ÇERÇEVE İŞLEME
+; SOF alınınca çerçevenin kalanı bloklayarak okunur; bu sırada otomasyon ve
+; motor adımı çalışmaz, byte'lar geldiği anda alındığı için FIFO taşmaz.
+; =============================================================================
+HANDLE_HELLO:
+        MOVLW   .2
+        MOVWF   frame_len
+        MOVLW   FRAME_HELLO_ACK
+        CALL    FRAME_Start
+        MOVLW   PROTO_VERSION
+        CALL    FRAME_SendByte
+        MOVLW   BOARD_ID
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+        GOTO    MAIN_LOOP
+
+HANDLE_FRAME:
+        BANKSEL crc
+        CLRF    crc
+        CLRF    frame_p0
+        CLRF    frame_p1
+
+        ; LEN
+        CALL    UART_RecvByte_Timeout
+        BTFSC   frame_flags, 0
+        GOTO    MAIN_LOOP               ; Zaman aşımı: cevapsız bırak
+        MOVWF   frame_len
+        CALL    CRC8_Update
+        MOVLW   FRAME_MAX_PAYLOAD + 1
+        SUBWF   frame_len, W            ; C=1 -> LEN > FRAME_MAX_PAYLOAD
+        BTFSC   STATUS, C
+        GOTO    FRAME_NAK_LEN
+
+        ; TYPE
+        CALL    UART_RecvByte_Timeout
+        BTFSC   frame_flags, 0
+        GOTO    MAIN_LOOP
+        MOVWF   frame_type
+        CALL    CRC8_Update
+
+        ; PAYLOAD -> frame_p0, frame_p1
+        MOVLW   frame_p0
+        MOVWF   FSR
+        MOVF    frame_len, W
+        MOVWF   frame_cnt
+FRAME_PAYLOAD_LOOP:
+        MOVF    frame_cnt, F
+        BTFSC   STATUS, Z
+        GOTO    FRAME_CHECK_CRC
+        CALL    UART_RecvByte_Timeout
+        BTFSC   frame_flags, 0
+        GOTO    MAIN_LOOP
+        MOVWF   INDF
+        CALL    CRC8_Update
+        INCF    FSR, F
+        DECF    frame_cnt, F
+        GOTO    FRAME_PAYLOAD_LOOP
+
+FRAME_CHECK_CRC:
+        CALL    UART_RecvByte_Timeout
+        BTFSC   frame_flags, 0
+        GOTO    MAIN_LOOP
+        XORWF   crc, W
+        BTFSS   STATUS, Z
+        GOTO    FRAME_NAK_CRC
+
+        MOVF    frame_type, W
+        XORLW   FRAME_READ_ALL
+        BTFSC   STATUS, Z
+        GOTO    SEND_FRAME_VALUES
+
+        MOVF    frame_type, W
+        XORLW   FRAME_SET
+        BTFSC   STATUS, Z
+        GOTO    HANDLE_FRAME_SET
+
+        MOVF    frame_type, W
+        XORLW   FRAME_BAUD
+        BTFSC   STATUS, Z
+        GOTO    HANDLE_FRAME_BAUD
+
+        MOVF    frame_type, W
+        XORLW   FRAME_SUBSCRIBE
+        BTFSC   STATUS, Z
+        GOTO    HANDLE_FRAME_SUBSCRIBE
+
+        MOVLW   NAK_TYPE
+        GOTO    FRAME_SEND_NAK
+
+; READ_ALL cevabı (UPDATE_COMMANDS sırası):
+; [perde int, perde frac, sıcaklık int, sıcaklık frac, basınç int, basınç frac, ışık int, ışık frac]
+SEND_FRAME_VALUES:
+        MOVLW   FRAME_VALUES
+        CALL    SEND_VALUES_FRAME
+        GOTO    MAIN_LOOP
+
+; W = TYPE (FRAME_VALUES / FRAME_EVENT). Tüm değerleri tek çerçevede gönderir.
+SEND_VALUES_FRAME:
+        MOVWF   frame_type
+        MOVLW   .8
+        MOVWF   frame_len
+        MOVF    frame_type, W
+        CALL    FRAME_Start
+        MOVF    cur_percentage, W
+        CALL    FRAME_SendByte
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        CALL    CALC_TEMP_INT
+        CALL    FRAME_SendByte
+        MOVLW   .5
+        CALL    FRAME_SendByte
+        CALL    CALC_PRESS_INT
+        CALL    FRAME_SendByte
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        CALL    CALC_LIGHT_INT
+        CALL    FRAME_SendByte
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        GOTO    FRAME_End
+
+; SET: [perde int, perde frac]. Gece kilidinde ACK [1], aksi halde ACK [0] + hareket.
+HANDLE_FRAME_SET:
+        MOVF    frame_len, W
+        XORLW   .2
+        BTFSS   STATUS, Z
+        GOTO    FRAME_NAK_LEN
+
+        MOVLW   .1
+        MOVWF   frame_len
+        MOVLW   FRAME_SET_ACK
+        CALL    FRAME_Start
+        BTFSS   is_night_mode, 0
+        GOTO    FRAME_SET_APPLY
+        MOVLW   .1                      ; Gece kilidi: komut uygulanmaz
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+        GOTO    MAIN_LOOP
+
+FRAME_SET_APPLY:
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+
+        MOVF    frame_p0, W
+        SUBLW   .50                     ; C=0 -> frame_p0 > 50
+        MOVF    frame_p0, W
+        BTFSS   STATUS, C
+        MOVLW   .50
+        MOVWF   set_int_6
+        MOVWF   cur_percentage
+        GOTO    CALCULATE_STEPS
+
+; SUBSCRIBE: [açık (bit0), heartbeat (100 ms birimi, 0 = sadece değişimde)] -> ACK [0].
+; Açılışta ilk FRAME_EVENT hemen gönderilir (tam görüntü).
+HANDLE_FRAME_SUBSCRIBE:
+        MOVF    frame_len, W
+        XORLW   .2
+        BTFSS   STATUS, Z
+        GOTO    FRAME_NAK_LEN
+
+        MOVF    frame_p0, W
+        ANDLW   .1
+        MOVWF   push_on
+        MOVF    frame_p1, W
+        MOVWF   push_period
+        MOVWF   push_cnt
+        BSF     push_flags, 0
+
+        MOVLW   .1
+        MOVWF   frame_len
+        MOVLW   FRAME_SET_ACK
+        CALL    FRAME_Start
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+        GOTO    MAIN_LOOP
+
+; Abonelik açıksa perde hedefi / gece modu değişince (LDR otomasyonu, SET) ya da
+; heartbeat süresi dolunca FRAME_EVENT gönderir (yük = READ_ALL cevabı). Sensörler
+; gürültülü olduğu için değişim sayılmaz, heartbeat ile taşınır.
+; TMR1 her 100 ms'de taşar; push_cnt heartbeat'e kalan tick sayısıdır.
+PUSH_TASK:
+        BANKSEL push_on
+        BTFSS   push_on, 0
+        RETURN
+
+        MOVF    cur_percentage, W
+        XORWF   last_pct, W
+        BTFSS   STATUS, Z
+        BSF     push_flags, 0
+        MOVF    is_night_mode, W
+        XORWF   last_night, W
+        BTFSS   STATUS, Z
+        BSF     push_flags, 0
+
+        ; 100 ms tick
+        BTFSS   PIR1, TMR1IF
+        GOTO    PUSH_CHECK
+        BCF     T1CON, TMR1ON
+        MOVLW   TMR1_RELOAD_H
+        MOVWF   TMR1H
+        MOVLW   TMR1_RELOAD_L
+        MOVWF   TMR1L
+        BSF     T1CON, TMR1ON
+        BCF     PIR1, TMR1IF
+        MOVF    push_period, F
+        BTFSC   STATUS, Z
+        GOTO    PUSH_CHECK              ; Heartbeat kapalı
+        DECFSZ  push_cnt, F
+        GOTO    PUSH_CHECK
+        MOVF    push_period, W
+        MOVWF   push_cnt
+        BSF     push_flags, 0
+
+PUSH_CHECK:
+        BTFSS   push_flags, 0
+        RETURN
+        BCF     push_flags, 0
+        MOVF    cur_percentage, W
+        MOVWF   last_pct
+        MOVF    is_night_mode, W
+        MOVWF   last_night
+        MOVLW   FRAME_EVENT
+        GOTO    SEND_VALUES_FRAME
+
+; BAUD: [SPBRG]. ACK eski hızda, TSR boşalınca yeni SPBRG; yeni hızda 4 byte'lık
+; desen okunup yankılanır ve BAUD_COMMIT beklenir. Byte ~100 ms içinde gelmezse,
+; desen yanlışsa veya onay gelmezse eski SPBRG'ye dönülür.
+HANDLE_FRAME_BAUD:
+        MOVF    frame_len, W
+        XORLW   .1
+        BTFSS   STATUS, Z
+        GOTO    FRAME_NAK_LEN
+
+        MOVLW   .1
+        MOVWF   frame_len
+        MOVLW   FRAME_SET_ACK
+        CALL    FRAME_Start
+        MOVLW   .0
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+
+        BANKSEL TXSTA
+BAUD_WAIT_TRMT:
+        BTFSS   TXSTA, TRMT
+        GOTO    BAUD_WAIT_TRMT
+
+        BANKSEL SPBRG
+        MOVF    SPBRG, W
+        BANKSEL baud_old
+        MOVWF   baud_old
+        MOVF    frame_p0, W
+        BANKSEL SPBRG
+        MOVWF   SPBRG
+        BANKSEL frame_flags
+        BCF     frame_flags, 1          ; Desen hatası bayrağı
+
+        MOVLW   0x55
+        CALL    BAUD_ECHO_EXPECT
+        BTFSC   frame_flags, 0
+        GOTO    BAUD_REVERT
+        MOVLW   0xAA
+        CALL    BAUD_ECHO_EXPECT
+        BTFSC   frame_flags, 0
+        GOTO    BAUD_REVERT
+        MOVLW   0x0F
+        CALL    BAUD_ECHO_EXPECT
+        BTFSC   frame_flags, 0
+        GOTO    BAUD_REVERT
+        MOVLW   0xF0
+        CALL    BAUD_ECHO_EXPECT
+        BTFSC   frame_flags, 0
+        GOTO    BAUD_REVERT
+        BTFSC   frame_flags, 1
+        GOTO    BAUD_REVERT             ; PC yanlış yankı gördü, onay göndermeyecek
+
+        MOVLW   .100
+        CALL    UART_RecvByte_Wait
+        BTFSC   frame_flags, 0
+        GOTO    BAUD_REVERT
+        XORLW   BAUD_COMMIT
+        BTFSC   STATUS, Z
+        GOTO    MAIN_LOOP               ; Yeni hız kalıcı (reset'e kadar)
+
+BAUD_REVERT:
+        BANKSEL baud_old
+        MOVF    baud_old, W
+        BANKSEL SPBRG
+        MOVWF   SPBRG
+        BANKSEL frame_flags
+        GOTO    MAIN_LOOP
+
+; W = beklenen byte. Gelen byte geri gönderilir; farklıysa frame_flags.1 = 1,
+; zaman aşımında frame_flags.0 = 1.
+BAUD_ECHO_EXPECT:
+        MOVWF   baud_exp
+        MOVLW   .100
+        CALL    UART_RecvByte_Wait
+        BTFSC   frame_flags, 0
+        RETURN
+        MOVWF   rx_tmp
+        CALL    UART_SendByte
+        BANKSEL rx_tmp
+        MOVF    rx_tmp, W
+        XORWF   baud_exp, W
+        BTFSS   STATUS, Z
+        BSF     frame_flags, 1
+        RETURN
+
+FRAME_NAK_LEN:
+        MOVLW   NAK_LEN
+        GOTO    FRAME_SEND_NAK
+
+FRAME_NAK_CRC:
+        MOVLW   NAK_CRC
+
+FRAME_SEND_NAK:
+        ; W = hata kodu
+        MOVWF   frame_p0
+        MOVLW   .1
+        MOVWF   frame_len
+        MOVLW   FRAME_NAK
+        CALL    FRAME_Start
+        MOVF    frame_p0, W
+        CALL    FRAME_SendByte
+        CALL    FRAME_End
+        GOTO    MAIN_LOOP
+
+; W = TYPE, frame_len = yük uzunluğu. SOF, LEN, TYPE gönderilir, CRC başlatılır.
+FRAME_Start:
+        MOVWF   frame_type
+        CLRF    crc
+        MOVLW   FRAME_SOF
+        CALL    UART_SendByte
+        BANKSEL frame_len
+        MOVF    frame_len, W
+        CALL    FRAME_SendByte
+        MOVF    frame_type, W
+        GOTO    FRAME_SendByte
+
+; Biriken CRC'yi gönderir.
+FRAME_End:
+        MOVF    crc, W
+        GOTO    UART_SendByte
+
+; W'deki byte'ı CRC'ye katar ve gönderir (bank 0'a döner).
+FRAME_SendByte:
+        MOVWF   tx_tmp
+        CALL    CRC8_Update
+        MOVF    tx_tmp, W
+        CALL    UART_SendByte
+        BANKSEL crc
+        RETURN
+
+; crc = CRC-8(crc ^ W), polinom 0x07, MSB önce. W bozulur.
+CRC8_Update:
+        XORWF   crc, F
+        MOVLW   .8
+        MOVWF   bit_cnt
+CRC8_BIT:
+        BCF     STATUS, C
+        RLF     crc, F                  ; En üst bit -> C
+        MOVLW   0x07
+        BTFSC   STATUS, C
+        XORWF   crc, F
+        DECFSZ  bit_cnt, F
+        GOTO    CRC8_BIT
+        RETURN
+
+; Bir byte bekler (~20 ms: 20 x 256 x 4 döngü @ 1 MIPS). Gelirse W'de döner,
+; zaman aşımında frame_flags.0 = 1. OERR, UART_Read_Byte_Safe'te temizlenir.
+; UART_RecvByte_Wait: W = bekleme süresi (~1 ms birimi).
+UART_RecvByte_Timeout:
+        MOVLW   .20
+UART_RecvByte_Wait:
+        BANKSEL frame_flags
+        BCF     frame_flags, 0
+        MOVWF   to_hi
+        CLRF    to_lo
+RX_TO_WAIT:
+        BTFSC   PIR1, RCIF
+        GOTO    UART_Read_Byte_Safe
+        DECFSZ  to_lo, F
+        GOTO    RX_TO_WAIT
+        DECFSZ  to_hi, F
+        GOTO    RX_TO_WAIT
+        BSF     frame_flags, 0
+        RETLW   0x00
 
 ; =============================================================================
 ; UART & ADC HELPERS
@@ -0,0 +1,372 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PERFORMANS ÖLÇÜMLERİ (BENCHMARK)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Protokol gecikmesi, update() döngü süresi, komut hızı, kodlama
+#           hızı ve GUI kare süresini emüle (pty) veya gerçek portlar üzerinde
+#           ölçen ve sonuçları JSON olarak kaydeden/karşılaştıran betiktir.
+# ==============================================================================
+
+"""
+Benchmark Suite
+---------------
+Ölçüm:
+    python run_benchmarks.py -o sonuc.json                  # Emüle kartlar (pty)
+    python run_benchmarks.py --ac-port /dev/ttyUSB0 ...     # Gerçek / loopback portlar
+    python run_benchmarks.py --quick                        # Az örnekli hızlı koşu
+
+Karşılaştırma (regresyon varsa çıkış kodu 1):
+    python run_benchmarks.py --compare eski.json yeni.json --threshold 0.2
+
+Her sonuç: isim, birim, örnek sayısı, ortalama / medyan / p95 / p99 / min / max
+ve 'higher_is_better' bilgisi. Karşılaştırmada medyan kullanılır.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# --- PATH AYARI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import codec
+import config as cfg
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+
+SCHEMA_VERSION = 1
+
+
+# ------------------------------------------------------------------------------
+# Sonuç yardımcıları
+# ------------------------------------------------------------------------------
+
+def summarize(name: str, samples: List[float], unit: str, higher_is_better: bool = False,
+              **extra) -> Dict:
+    """Ham örneklerden istatistik özeti üretir."""
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    result = {
+        "name": name,
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+        "samples": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "p95": pct(95),
+        "p99": pct(99),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+    result.update(extra)
+    return result
+
+
+def skipped(name: str, reason: str) -> Dict:
+    return {"name": name, "skipped": reason}
+
+
+def timed(fn: Callable[[], object], repeat: int, scale: float = 1000.0) -> List[float]:
+    """fn'i repeat kez çalıştırır, her çağrının süresini (varsayılan ms) döner."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * scale)
+    return samples
+
+
+# ------------------------------------------------------------------------------
+# Ölçümler
+# ------------------------------------------------------------------------------
+
+class BoardSource:
+    """
+    Ölçülecek kartları sağlar: verilen portlar veya her ölçüm için yeni bir emüle kart.
+    Emüle kart her seferinde sıfırdan açılır; bir ölçümdeki taşma diğerini etkilemez.
+    """
+
+    def __init__(self, ac_port: Optional[str], curtain_port: Optional[str]):
+        self.ports = {"ac": ac_port, "curtain": curtain_port}
+        self.hub = None
+        if not (ac_port and curtain_port):
+            from board_emulator import EmulatorHub
+            self.hub = EmulatorHub(seed=0)
+            self.hub.start()
+
+    def connect(self, board_type: str):
+        """Açık bir bağlantı ve (emüle ise) VirtualBoard döner."""
+        from board_emulator import BOARD_MODELS
+
+        board = None
+        port = self.ports[board_type]
+        if not port:
+            board = self.hub.add(BOARD_MODELS[board_type]())
+            port = board.port
+
+        cls = AirConditionerSystemConnection if board_type == "ac" else CurtainControlSystemConnection
+        conn = cls(port)
+        if not conn.open():
+            raise RuntimeError(f"{port} açılamadı")
+        return conn, board
+
+    def close(self) -> None:
+        if self.hub:
+            self.hub.stop()
+
+
+def bench_command_rtt(source: BoardSource, repeat: int) -> List[Dict]:
+    """Her GET komutu için tek byte gönder -> tek byte al gidiş-dönüş süresi."""
+    results = []
+    for board_type, cls in (("ac", AirConditionerSystemConnection), ("curtain", CurtainControlSystemConnection)):
+        conn, board = source.connect(board_type)
+        try:
+            ser = conn.serial_conn
+            for cmd in cls.UPDATE_COMMANDS:
+                timeouts = 0
+
+                def rtt():
+                    nonlocal timeouts
+                    ser.reset_input_buffer()
+                    ser.write(bytes([cmd]))
+                    if len(ser.read(1)) != 1:
+                        timeouts += 1
+
+                samples = timed(rtt, repeat)
+                results.append(summarize(f"rtt.{board_type}.0x{cmd:02X}", samples, "ms", timeouts=timeouts))
+        finally:
+            conn.close()
+    return results
+
+
+def bench_update_cycle(source: BoardSource, repeat: int) -> List[Dict]:
+    """update() çağrısının toplam süresi (tüm GET komutları + cevaplar)."""
+    results = []
+    for board_type in ("ac", "curtain"):
+        conn, board = source.connect(board_type)
+        try:
+            samples = timed(conn.update, repeat)
+            results.append(summarize(f"update.{board_type}", samples, "ms",
+                                     pacing_ms=conn.inter_byte_pacing * 1000,
+                                     overruns=board.overruns if board else None))
+        finally:
+            conn.close()
+    return results
+
+
+def bench_set_rate(source: BoardSource, repeat: int) -> List[Dict]:
+    """setDesiredTemp / setCurtainStatus çağrı hızı (komut / saniye)."""
+    results = []
+    cases = (("ac", "setDesiredTemp", lambda c, i: c.setDesiredTemp(18 + (i % 10) * 0.5)),
+             ("curtain", "setCurtainStatus", lambda c, i: c.setCurtainStatus((i * 7) % 100)))
+    for board_type, name, call in cases:
+        conn, board = source.connect(board_type)
+        try:
+            counter = iter(range(repeat))
+            samples = timed(lambda: call(conn, next(counter)), repeat, scale=1.0)
+            rates = [1.0 / s for s in samples if s > 0]
+            results.append(summarize(f"set_rate.{name}", rates, "cmd/s", higher_is_better=True,
+                                     overruns=board.overruns if board else None))
+        finally:
+            conn.close()
+    return results
+
+
+def bench_float_to_parts(repeat: int) -> List[Dict]:
+    """_float_to_parts kodlama hızı (saf CPU, port gerekmez)."""
+    conn = AirConditionerSystemConnection(0)
+    values = [i / 10.0 for i in range(640)]
+    batch = len(values)
+
+    def run():
+        for v in values:
+            conn._float_to_parts(v)
+
+    samples = timed(run, repeat, scale=1.0)
+    rates = [batch / s for s in samples if s > 0]
+    return [summarize("encode.float_to_parts", rates, "ops/s", higher_is_better=True)]
+
+
+def bench_codec(repeat: int) -> List[Dict]:
+    """Tablolu kodek: toplu hedef kodlama ve cevap çifti çözme hızı (saf CPU)."""
+    values = [i / 10.0 for i in range(640)]
+    replies = bytes(b for k in range(codec.CODES) for b in divmod(k, codec.FRAC_STEPS))
+    codec.decode_pairs(replies)  # 16 bit tablo ölçüm dışında kurulsun
+
+    encode = timed(lambda: codec.encode_setpoints(values), repeat, scale=1.0)
+    decode = timed(lambda: codec.decode_pairs(replies), repeat, scale=1.0)
+    return [
+        summarize("encode.codec_batch", [len(values) / s for s in encode if s > 0], "ops/s", higher_is_better=True),
+        summarize("decode.codec_batch", [codec.CODES / s for s in decode if s > 0], "ops/s", higher_is_better=True),
+    ]
+
+
+def bench_gui_frame(repeat: int) -> List[Dict]:
+    """
+    update_gui_loop kare süresi. Gizli bir pencerede, her karede tüm alanlar
+    değişmiş gibi kuyruğa değer konur ve Tk'nin bekleyen çizimleri de ölçülür.
+    """
+    name = "gui.frame"
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return [skipped(name, "DISPLAY yok (örn: xvfb-run ile çalıştırın)")]
+    try:
+        import customtkinter as ctk
+        from gui_app import ModernHomeAutomationGUI
+    except ImportError as e:
+        return [skipped(name, f"GUI bağımlılığı eksik: {e}")]
+
+    root = ctk.CTk()
+    root.withdraw()
+    gui = ModernHomeAutomationGUI(root)
+    try:
+        gui.ac_connected = gui.curtain_connected = False  # Arka plan thread'i porta dokunmasın
+        gui.ensure_dashboard()  # Paneller ilk bağlantıda kurulur; kurulum süresi kareye katılmasın
+        counter = iter(range(repeat))
+
+        def frame():
+            i = next(counter)
+            gui.ui_queue.put({
+                "ac.ambient": 20 + (i % 50) / 10.0, "ac.fan": i % 255, "ac.desired": 22.5,
+                "ac.trend": (i % 3) - 1, "cur.temp": 10 + i % 20, "cur.press": 100 + i % 5,
+                "cur.light": 40 + i % 30, "cur.status": i % 100, "cur.night": False,
+            })
+            gui.update_gui_loop()
+            root.update_idletasks()
+
+        samples = timed(frame, repeat)
+        return [summarize(name, samples, "ms")]
+    finally:
+        gui.running = False
+        root.destroy()
+
+
+# ------------------------------------------------------------------------------
+# Çalıştırma ve karşılaştırma
+# ------------------------------------------------------------------------------
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=software_dir,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_all(ac_port: Optional[str] = None, curtain_port: Optional[str] = None,
+            quick: bool = False) -> Dict:
+    """Tüm ölçümleri çalıştırır ve JSON'a yazılabilir sonuç sözlüğü döner."""
+    io_repeat = 10 if quick else 100
+    cpu_repeat = 20 if quick else 500
+
+    results = bench_float_to_parts(cpu_repeat)
+    results += bench_codec(cpu_repeat)
+    try:
+        source = BoardSource(ac_port, curtain_port)
+    except OSError as e:
+        source = None
+        results.append(skipped("serial", f"Emülatör açılamadı: {e}"))
+
+    if source:
+        try:
+            results += bench_command_rtt(source, io_repeat)
+            results += bench_update_cycle(source, io_repeat)
+            results += bench_set_rate(source, io_repeat)
+        finally:
+            source.close()
+
+    results += bench_gui_frame(io_repeat)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": "hardware" if ac_port and curtain_port else "emulator",
+        "baud": cfg.DEFAULT_BAUDRATE,
+        "results": results,
+    }
+
+
+def compare_results(old: Dict, new: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    İki koşunun medyanlarını karşılaştırır.
+
+    :param threshold: Göreli kötüleşme sınırı (0.2 = %20).
+    :return: Ortak her ölçüm için {name, old, new, change, regression} listesi.
+             change > 0 daima "daha kötü" anlamına gelir.
+    """
+    old_by_name = {r["name"]: r for r in old.get("results", []) if "median" in r}
+    rows = []
+    for r in new.get("results", []):
+        base = old_by_name.get(r["name"])
+        if "median" not in r or not base or base["median"] == 0:
+            continue
+        change = (r["median"] - base["median"]) / base["median"]
+        if r.get("higher_is_better"):
+            change = -change
+        rows.append({
+            "name": r["name"], "unit": r["unit"],
+            "old": base["median"], "new": r["median"],
+            "change": change, "regression": change > threshold,
+        })
+    return rows
+
+
+def print_results(data: Dict) -> None:
+    print(f"# {data['target']} @ {data['baud']} baud, rev {data['revision'] or '?'}")
+    for r in data["results"]:
+        if "skipped" in r:
+            print(f"{r['name']:<32} ATLANDI: {r['skipped']}")
+        else:
+            print(f"{r['name']:<32} medyan {r['median']:>12.3f} {r['unit']:<6} "
+                  f"p95 {r['p95']:>12.3f}  (n={r['samples']})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Nexus Control Hub performans ölçümleri")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--ac-port", help="Board #1 portu (verilmezse emülatör kullanılır)")
+    parser.add_argument("--curtain-port", help="Board #2 portu (verilmezse emülatör kullanılır)")
+    parser.add_argument("--quick", action="store_true", help="Az örnekle hızlı koşu")
+    parser.add_argument("--compare", nargs=2, metavar=("ESKI", "YENI"), help="İki sonuç dosyasını karşılaştır")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresyon eşiği (varsayılan 0.2 = %%20)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        rows = compare_results(old, new, args.threshold)
+        for row in rows:
+            mark = "REGRESYON" if row["regression"] else ""
+            print(f"{row['name']:<32} {row['old']:>12.3f} -> {row['new']:>12.3f} {row['unit']:<6} "
+                  f"{row['change'] * 100:+7.1f}%  {mark}")
+        return 1 if any(r["regression"] for r in rows) else 0
+
+    logging.basicConfig(level=logging.WARNING)
+    data = run_all(args.ac_port, args.curtain_port, args.quick)
+    print_results(data)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
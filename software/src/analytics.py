@@ -0,0 +1,208 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SENSÖR ANALİTİĞİ (NUMPY)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Telemetri deposundaki sensör geçmişi üzerinde hareketli ortalama,
+#           standart sapma, EWMA yumuşatma, değişim hızı ve z-skor anomali
+#           tespitini NumPy ile vektörel (döngüsüz) olarak hesaplayan modüldür.
+# ==============================================================================
+
+"""
+Sensor Analytics
+----------------
+Tüm fonksiyonlar tampondaki serinin tamamını tek seferde işler; örnek başına
+Python döngüsü yoktur. Girdi olarak list, array('d') veya numpy dizisi kabul edilir
+(array('d') tampon protokolü sayesinde kopyalanmadan okunur).
+
+Çıktı uzunluğu girdi ile aynıdır; pencere dolmadan hesaplanamayan baştaki
+elemanlar NaN olur.
+"""
+
+import math
+
+import numpy as np
+
+import config as cfg
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """
+    Hareketli ortalama (kümülatif toplam farkı ile O(n)).
+
+    :param values: Sensör değerleri.
+    :param window: Pencere uzunluğu (örnek sayısı).
+    :return: Aynı uzunlukta dizi; ilk window-1 eleman NaN.
+    """
+    x = _as_float_array(values)
+    out = np.full(x.shape, np.nan)
+    if window <= 0 or len(x) < window:
+        return out
+
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def rolling_std(values, window: int) -> np.ndarray:
+    """
+    Hareketli (popülasyon) standart sapma.
+
+    :return: Aynı uzunlukta dizi; ilk window-1 eleman NaN.
+    """
+    x = _as_float_array(values)
+    out = np.full(x.shape, np.nan)
+    if window <= 0 or len(x) < window:
+        return out
+
+    windows = np.lib.stride_tricks.sliding_window_view(x, window)
+    out[window - 1:] = windows.std(axis=1)
+    return out
+
+
+def ewma(values, alpha: float = cfg.ANALYTICS_EWMA_ALPHA) -> np.ndarray:
+    """
+    Üstel ağırlıklı hareketli ortalama: y[t] = alpha * x[t] + (1 - alpha) * y[t-1], y[0] = x[0].
+
+    Kapalı form (1-alpha)^-k ile ölçeklenmiş kümülatif toplam kullanılır. Uzun
+    serilerde taşmayı önlemek için dizi, ölçek katsayısı sınırlı kalacak
+    büyüklükte bloklara bölünür (blok sayısı kadar döngü, örnek sayısı kadar değil).
+
+    :param alpha: Yumuşatma katsayısı (0 < alpha <= 1). Büyük değer = daha az yumuşatma.
+    """
+    x = _as_float_array(values)
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    if alpha >= 1.0:
+        out[:] = x
+        return out
+
+    decay = 1.0 - alpha
+    # decay^-block en fazla ~1e150 olacak şekilde blok boyu
+    block = max(1, int(150 * math.log(10) / -math.log(decay)))
+
+    prev = x[0]
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        k = np.arange(len(chunk))
+        powers = decay ** k
+        # y[k] = decay^(k+1) * prev + alpha * decay^k * sum_{j<=k} x[j] / decay^j
+        acc = np.cumsum(chunk / powers)
+        out[start:start + len(chunk)] = decay * powers * prev + alpha * powers * acc
+        prev = out[start + len(chunk) - 1]
+    return out
+
+
+def rate_of_change(times, values) -> np.ndarray:
+    """
+    Değişim hızı (birim / saniye), zaman damgalarına göre merkezi fark ile.
+
+    :return: Aynı uzunlukta dizi. İkiden az örnekte sıfırlar döner.
+    """
+    t = _as_float_array(times)
+    x = _as_float_array(values)
+    if len(x) < 2:
+        return np.zeros(x.shape)
+    return np.gradient(x, t)
+
+
+def zscore(values, window: int) -> np.ndarray:
+    """
+    Her örneğin, KENDİSİNDEN ÖNCEKİ 'window' örneğe göre z-skoru.
+    Standart sapması sıfır olan (tamamen sabit) pencerelerde z = 0 kabul edilir.
+
+    :return: Aynı uzunlukta dizi; ilk 'window' eleman NaN.
+    """
+    x = _as_float_array(values)
+    out = np.full(x.shape, np.nan)
+    if window <= 0 or len(x) <= window:
+        return out
+
+    windows = np.lib.stride_tricks.sliding_window_view(x[:-1], window)
+    mean = windows.mean(axis=1)
+    std = windows.std(axis=1)
+    dev = x[window:] - mean
+    out[window:] = np.divide(dev, std, out=np.zeros_like(dev), where=std > 0)
+    return out
+
+
+def anomaly_flags(values, window: int = cfg.ANALYTICS_WINDOW,
+                  threshold: float = cfg.ANALYTICS_ZSCORE_THRESHOLD) -> np.ndarray:
+    """
+    |z| > threshold olan örnekleri işaretler (tek bayt sıçramaları, sensör hataları).
+
+    :return: bool dizisi; pencere dolmadan False.
+    """
+    z = zscore(values, window)
+    return np.abs(np.nan_to_num(z)) > threshold
+
+
+def smoothed_latest(values, alpha: float = cfg.ANALYTICS_EWMA_ALPHA) -> float:
+    """Serinin EWMA ile yumuşatılmış son değeri (boş seride NaN)."""
+    if len(values) == 0:
+        return float("nan")
+    return float(ewma(values, alpha)[-1])
+
+
+def trend(times, values, alpha: float = cfg.ANALYTICS_EWMA_ALPHA,
+          deadband: float = cfg.TREND_DEADBAND_PER_MIN) -> int:
+    """
+    Yumuşatılmış serinin yönü.
+
+    :param deadband: Bu değerin (birim / dakika) altındaki eğimler "sabit" sayılır.
+    :return: 1 (artıyor), -1 (azalıyor) veya 0 (sabit / yetersiz veri).
+    """
+    t = _as_float_array(times)
+    if len(t) < 2 or t[-1] <= t[0]:
+        return 0
+
+    smooth = ewma(values, alpha)
+    slope_per_min = (smooth[-1] - smooth[0]) / (t[-1] - t[0]) * 60.0
+    if slope_per_min > deadband:
+        return 1
+    if slope_per_min < -deadband:
+        return -1
+    return 0
+
+
+def decimate_minmax(times, values, buckets: int):
+    """
+    Uzun seriyi çizim için min/max korumalı olarak seyreltir (piksel başına min + max).
+
+    Seri eşit örnek sayılı 'buckets' parçaya bölünür; her parçadan en küçük ve en
+    büyük örnek, zaman sırası korunarak alınır. Böylece kısa sıçramalar grafikte
+    kaybolmaz ama çizilen nokta sayısı en fazla 2 * buckets olur.
+
+    :param buckets: Hedef parça sayısı (genelde grafiğin piksel genişliği).
+    :return: (zamanlar, değerler) numpy dizileri.
+    """
+    t = _as_float_array(times)
+    x = _as_float_array(values)
+    n = len(x)
+    if buckets <= 0 or n <= 2 * buckets:
+        return t, x
+
+    per = n // buckets
+    usable = per * buckets
+    # Kalan (bölünemeyen) en eski örnekler atlanır; en yeni veri daima çizilir
+    tb = t[n - usable:].reshape(buckets, per)
+    xb = x[n - usable:].reshape(buckets, per)
+
+    rows = np.arange(buckets)
+    i_min = xb.argmin(axis=1)
+    i_max = xb.argmax(axis=1)
+    first = np.minimum(i_min, i_max)
+    second = np.maximum(i_min, i_max)
+
+    out_t = np.empty(2 * buckets)
+    out_x = np.empty(2 * buckets)
+    out_t[0::2] = tb[rows, first]
+    out_t[1::2] = tb[rows, second]
+    out_x[0::2] = xb[rows, first]
+    out_x[1::2] = xb[rows, second]
+    return out_t, out_x
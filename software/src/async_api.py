@@ -0,0 +1,589 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ASENKRON OTOMASYON API KATMANI
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Birden fazla kartın tek bir asyncio event loop içinde, birbirini
+#           beklemeden eşzamanlı sorgulanmasını sağlayan asenkron taşıma katmanı.
+# ==============================================================================
+
+"""
+Async Home Automation API Module
+--------------------------------
+Senkron sınıfların (automation_api) protokol adımlarını (_*_exchange üreteçleri)
+aynen yürütür; sadece seri port G/Ç'si asyncio üzerinden bloklamadan yapılır
+(bkz. _run). Böylece bir kartın TIMEOUT_READ beklemesi diğer kartların sorgusunu
+geciktirmez.
+
+Kullanım:
+    ac = AsyncAirConditionerSystemConnection(10)
+    cur = AsyncCurtainControlSystemConnection(12)
+    await ac.open(); await cur.open()
+    await poll_all([ac, cur])
+
+Push modu (v2 kartlar): sorgu yerine kart değerleri kendisi gönderir.
+    await cur.subscribe(heartbeat=1.0)
+    while ...:
+        await cur.listen(timeout=1.0)     # gelen FRAME_EVENT'ler snapshot'a işlenir
+    await cur.unsubscribe()
+
+@author: Kenan Kandilli
+@date: 2025-11-16
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import serial
+
+import config as cfg
+import constants as const
+from command_queue import CommandQueue
+from automation_api import (
+    IO_BAUD,
+    IO_DISCARD,
+    IO_READ,
+    IO_SLEEP,
+    IO_WRITE,
+    AirConditionerSystemConnection,
+    CurtainControlSystemConnection,
+    Exchange,
+    HomeAutomationSystemConnection,
+    QueryResult,
+    FrameParser,
+    RxBuffer,
+    encode_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSerialTransport:
+    """
+    Açık bir pyserial bağlantısı üzerinde bloklamayan okuma/yazma sağlar.
+
+    POSIX sistemlerde port dosya tanımlayıcısı event loop'a (add_reader) kaydedilir;
+    Windows COM portlarında ise in_waiting, bir karakter süresi aralıklarla yoklanır.
+    Okuma sadece tamponda hazır olan kadar yapılır, yani hiçbir zaman bloklamaz.
+    Byte'lar önceden ayrılmış bir RxBuffer'a okunur; her parça için yeni nesne oluşmaz.
+    """
+
+    def __init__(self, serial_conn: serial.Serial, baud_rate: int = cfg.DEFAULT_BAUDRATE):
+        self.serial_conn = serial_conn
+        self.poll_interval = 10.0 / baud_rate  # Bir UART karakterinin süresi
+        self._fd: Optional[int] = None
+        self.rx = RxBuffer()  # read() için alım tamponu
+
+        try:
+            fd = serial_conn.fileno()
+            if isinstance(fd, int):
+                self._fd = fd
+        except (AttributeError, NotImplementedError, serial.SerialException):
+            pass
+
+    def reset_input_buffer(self) -> int:
+        """
+        Girişte bekleyen artık byte'ları temizler.
+
+        :return: Atılan byte sayısı (bilinmiyorsa 0).
+        """
+        waiting = self.serial_conn.in_waiting
+        self.serial_conn.reset_input_buffer()
+        self.rx.clear()
+        return waiting if isinstance(waiting, int) else 0
+
+    async def write(self, data: bytes, pacing: float = 0.0, sent: Optional[List[float]] = None) -> None:
+        """
+        Veriyi gönderir. pacing > 0 ise byte'lar arasında event loop'u bloklamadan bekler.
+
+        :param data: Gönderilecek byte'lar.
+        :param pacing: Byte'lar arası bekleme (saniye).
+        :param sent: Verilirse her byte'ın yazıldığı an (perf_counter) eklenir.
+        """
+        if pacing <= 0:
+            if sent is not None:
+                sent.extend([time.perf_counter()] * len(data))
+            self.serial_conn.write(data)
+            return
+
+        for i in range(len(data)):
+            if sent is not None:
+                sent.append(time.perf_counter())
+            self.serial_conn.write(data[i:i + 1])
+            if i < len(data) - 1:
+                await asyncio.sleep(pacing)
+
+    async def read(self, size: int, timeout: float = cfg.TIMEOUT_READ,
+                   arrivals: Optional[List[float]] = None) -> bytes:
+        """
+        En fazla 'size' byte okur.
+
+        :param size: Beklenen byte sayısı.
+        :param timeout: Toplam bekleme süresi (saniye).
+        :param arrivals: Verilirse her byte'ın okunduğu an (perf_counter) eklenir.
+        :return: Okunan byte'lar. Süre dolarsa eksik dönebilir.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        rx = self.rx
+        rx.clear()
+
+        while len(rx) < size:
+            # Beklenenden fazlası okunmaz: sonraki byte'lar portta kalır (senkron API ile ortak port)
+            count = rx.fill(self.serial_conn, size - len(rx))
+            if count:
+                if arrivals is not None:
+                    arrivals.extend([time.perf_counter()] * count)
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await self._wait_readable(loop, remaining)
+
+        data = bytes(rx.view())
+        rx.clear()
+        return data
+
+    async def read_available(self, timeout: float) -> bytes:
+        """
+        Tamponda ne varsa okur; boşsa ilk byte gelene veya süre dolana kadar bekler.
+
+        :return: Okunan byte'lar (süre dolduysa boş).
+        """
+        rx = self.rx
+        rx.clear()
+        await self.fill(rx, timeout)
+        data = bytes(rx.view())
+        rx.clear()
+        return data
+
+    async def fill(self, rx: RxBuffer, timeout: float) -> int:
+        """
+        Portta hazır olan tüm byte'ları doğrudan verilen tampona okur (kopyasız akış okuması);
+        hazır byte yoksa ilk byte gelene veya süre dolana kadar bekler.
+
+        :return: Okunan byte sayısı (süre dolduysa 0).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            count = rx.fill(self.serial_conn)
+            if count:
+                return count
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return 0
+            await self._wait_readable(loop, remaining)
+
+    async def _wait_readable(self, loop: asyncio.AbstractEventLoop, remaining: float) -> None:
+        """Port okunabilir olana ya da süre dolana kadar bekler."""
+        if self._fd is None:
+            await asyncio.sleep(min(self.poll_interval, remaining))
+            return
+
+        ready = loop.create_future()
+        try:
+            loop.add_reader(self._fd, lambda: ready.done() or ready.set_result(None))
+        except (NotImplementedError, ValueError, OSError):
+            # Event loop bu tanımlayıcıyı izleyemiyor (örn. Windows Proactor) -> yoklamaya geç
+            self._fd = None
+            await asyncio.sleep(min(self.poll_interval, remaining))
+            return
+
+        try:
+            await asyncio.wait_for(ready, remaining)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self._fd)
+
+
+class AsyncHomeAutomationSystemConnection:
+    """
+    Asenkron bağlantılar için temel sınıf.
+
+    Bağlantı durumu ve okunan değerler sarmalanan senkron nesnede (device) tutulur;
+    bu sınıf cihazın protokol adımlarını (_*_exchange) yürütür ve sadece G/Ç'yi
+    asyncio ile yapar. Böylece iki API aynı protokol kodunu ve aynı seri port
+    tanıtıcısını paylaşır.
+    """
+
+    # Komut kuyruğu anahtarı -> cihazdaki kodlayıcı (değer gönderim anında kodlanır)
+    ENCODERS: Dict[str, str] = {}
+
+    def __init__(self, device: HomeAutomationSystemConnection):
+        self.device = device
+        self.transport: Optional[AsyncSerialTransport] = None
+        # Diğer thread'lerden gelen SET komutları (sorgulardan önce gönderilir)
+        self.commands = CommandQueue()  # Anahtar -> hedef değer (ENCODERS ile kodlanır)
+
+        # Push modu: abonelik açıkken port sadece listen() ile okunur
+        self.streaming = False
+        self.last_frame = 0.0  # Son çerçevenin geldiği an (time.monotonic)
+        self._parser = FrameParser()
+        self._ack: Optional[bool] = None  # Akışta gelen son SET_ACK sonucu
+
+    @property
+    def port_name(self) -> str:
+        return self.device.port_name
+
+    @property
+    def is_open(self) -> bool:
+        return self.device.is_open
+
+    async def open(self) -> bool:
+        """
+        UART bağlantısını başlatır (port açma işlemi kısa sürdüğü için doğrudan yapılır),
+        config.PROTOCOL_MODE "auto" ise protokol sürümünü, v2 kartta ve
+        config.BAUD_NEGOTIATE açıksa en yüksek çalışan hızı kartla pazarlık eder.
+
+        :return: Bağlantı başarılıysa True.
+        """
+        if not self.device.open():
+            return False
+        self.transport = AsyncSerialTransport(self.device.serial_conn, self.device.baud_rate)
+        self.streaming = False
+        self._parser.reset()
+        if await self.negotiateProtocol() == const.PROTOCOL_V2 and cfg.BAUD_NEGOTIATE:
+            await self.negotiateBaudRate()
+        return True
+
+    async def negotiateProtocol(self) -> int:
+        """Senkron negotiateProtocol'ün asenkron karşılığı."""
+        return await self._run(self.device._hello_exchange())
+
+    async def negotiateBaudRate(self, candidates: Optional[Sequence[int]] = None) -> int:
+        """Senkron negotiateBaudRate'in asenkron karşılığı."""
+        for rate in sorted(candidates or cfg.BAUD_CANDIDATES, reverse=True):
+            if rate <= self.device.baud_rate or await self.setBaudRate(rate):
+                break
+        return self.device.baud_rate
+
+    async def setBaudRate(self, rate: int) -> bool:
+        """
+        Senkron setBaudRate'in asenkron karşılığı (aynı FRAME_BAUD el sıkışması).
+
+        :return: Yeni hız kullanılıyorsa True.
+        """
+        if not self.is_open:
+            return self.device.setBaudRate(rate)
+        return await self._run(self.device._baud_exchange(rate))
+
+    async def calibratePacing(self, samples: int = 5) -> float:
+        """Senkron calibratePacing'in asenkron karşılığı (aynı PROBE_COMMAND ölçümü)."""
+        return await self._run(self.device._calibrate_exchange(samples))
+
+    def _switch_baud(self, rate: int) -> None:
+        self.device._switch_baud(rate)
+        self._transport().poll_interval = 10.0 / rate
+
+    async def subscribe(self, heartbeat: float = cfg.PUSH_HEARTBEAT) -> bool:
+        """
+        Push moduna geçer: kart değerler değişince ve heartbeat periyodunda FRAME_EVENT
+        gönderir. Kart onaydan hemen sonra ilk olayı (tam görüntü) yollar.
+
+        :param heartbeat: Değişim olmasa da olay periyodu (saniye, 0 -> sadece değişimde).
+        :return: Kart aboneliği onayladıysa True (v1 kartlar push desteklemez).
+        """
+        device = self.device
+        if not self.is_open or device.protocol != const.PROTOCOL_V2:
+            logger.warning(f"{self.port_name}: Push modu sadece protokol v2 kartlarda kullanılabilir.")
+            return False
+
+        ticks = min(max(round(heartbeat / const.PUSH_TICK), 1 if heartbeat > 0 else 0), const.PUSH_MAX_TICKS)
+        transport = self._transport()
+        ok = False
+        try:
+            transport.reset_input_buffer()
+            self._parser.reset()
+            await self._run(device._frame_ops(encode_frame(const.FRAME_SUBSCRIBE, bytes([1, ticks]))))
+            # Sadece ACK kadar okunur; hemen ardından gelen ilk olay tamponda kalır
+            ok = device._check_set_ack(await transport.read(const.FRAME_OVERHEAD + 1, device.health.read_timeout()))
+        except serial.SerialException as e:
+            device.metrics.incr("errors")
+            logger.error(f"Abonelik Hatası ({self.port_name}): {e}")
+
+        self.streaming = ok
+        self.last_frame = time.monotonic()
+        if ok:
+            logger.info(f"{self.port_name}: Push modu açık (heartbeat {ticks * const.PUSH_TICK:.1f} sn).")
+        return ok
+
+    async def unsubscribe(self) -> bool:
+        """
+        Push modunu kapatır. Onaydan önce gelen olaylar yine snapshot'a işlenir.
+
+        :return: Kart onayladıysa True.
+        """
+        if not self.streaming:
+            return True
+        self._ack = None
+        try:
+            await self._run(self.device._frame_ops(encode_frame(const.FRAME_SUBSCRIBE, bytes([0, 0]))))
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.device.health.read_timeout()
+            while self._ack is None and loop.time() < deadline:
+                await self.listen(deadline - loop.time())
+        except serial.SerialException as e:
+            self.device.metrics.incr("errors")
+            logger.error(f"Abonelik Kapatma Hatası ({self.port_name}): {e}")
+        self.streaming = False
+        return bool(self._ack)
+
+    async def listen(self, timeout: float) -> int:
+        """
+        Push akışından gelen byte'ları okur ve tamamlanan çerçeveleri işler. En az bir
+        çerçeve tamamlanana veya süre dolana kadar bekler (portu sorgulamaz).
+
+        :param timeout: En uzun bekleme (saniye).
+        :return: Yayınlanan snapshot sayısı.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        frames = self._parser.frames
+        published = 0
+        while self.is_open:
+            try:
+                # Port doğrudan ayrıştırıcının tamponuna okunur
+                count = await self._transport().fill(self._parser.rx, max(deadline - loop.time(), 0.0))
+            except serial.SerialException as e:
+                self.device.metrics.incr("errors")
+                logger.error(f"Push Okuma Hatası ({self.port_name}): {e}")
+                self.streaming = False
+                self.device._close_port()  # Kopan portta el sıkışması denenmez
+                break
+            published += self._consume(count)
+            if not count or self._parser.frames != frames:
+                break
+        return published
+
+    def _consume(self, count: int) -> int:
+        """
+        Ayrıştırıcı tamponuna yeni okunan count byte'ı çözer; olaylar snapshot'a,
+        ACK'ler _ack'e işlenir. Yükler tampon üzerinde memoryview'dır, kopyalanmaz.
+        """
+        if not count:
+            return 0
+        device = self.device
+        metrics = device.metrics
+        parser = self._parser
+        crc_errors = parser.crc_errors
+        published = 0
+        metrics.incr("bytes_received", count)
+
+        for frame_type, payload in parser.parse():
+            self.last_frame = time.monotonic()
+            if frame_type in (const.FRAME_EVENT, const.FRAME_VALUES) and len(payload) == len(device.UPDATE_COMMANDS):
+                device._apply_update(payload)
+                published += 1
+            elif frame_type in (const.FRAME_SET_ACK, const.FRAME_NAK):
+                self._ack = device._set_ack_result(frame_type, payload)
+            else:
+                metrics.incr("frame_errors")
+                logger.warning(f"{self.port_name}: Akışta beklenmeyen çerçeve (tip 0x{frame_type:02X}).")
+
+        if parser.crc_errors > crc_errors:
+            metrics.incr("frame_errors", parser.crc_errors - crc_errors)
+        if published:
+            metrics.incr("push_events", published)
+            device.health.record_success()
+        return published
+
+    async def close(self) -> bool:
+        """
+        Aktif bağlantıyı kapatır (push aboneliği kapatılır, canlı değiştirilen hız
+        önce taban hıza geri alınır).
+        """
+        device = self.device
+        if self.is_open and self.streaming:
+            await self.unsubscribe()
+        self.streaming = False
+        if self.is_open and device.baud_rate != device._base_baud and device.protocol == const.PROTOCOL_V2:
+            await self.setBaudRate(device._base_baud)
+        self.transport = None
+        return device._close_port()
+
+    async def update(self, channels: Optional[Sequence[str]] = None) -> bool:
+        """
+        Cihazdan sensör verilerini tek toplu sorgu ile okur ve
+        sarmalanan nesnenin özelliklerini günceller.
+
+        :param channels: Sadece bu kanallar okunur (None -> tüm kanallar, bkz. ChannelScheduler).
+        :return: Yeni snapshot yayınlandıysa True.
+        """
+        if not self.is_open:
+            return False
+
+        try:
+            # Bekleyen SET komutları okumalardan önce gider
+            await self.flush_commands()
+            if self.streaming:
+                # Push modunda sorgu yapılmaz; tamponda biriken olaylar işlenir
+                return await self.listen(0.0) > 0
+            if channels is None:
+                result = await self._poll(self.device.UPDATE_COMMANDS)
+                if result.ok:
+                    self.device._apply_update(result.data)
+            else:
+                result = await self._poll(self.device._channel_commands(channels))
+                if result.ok:
+                    self.device._apply_channels(channels, result.data)
+            return result.ok
+        except Exception as e:
+            logger.error(f"Async Update Hatası ({self.port_name}): {e}")
+            return False
+
+    async def flush_commands(self) -> int:
+        """
+        Kuyrukta bekleyen SET komutlarını sırayla gönderir. Değerler burada, o anki
+        protokolle kodlanır: kuyruğa v2 bağlantısında eklenip yeniden bağlanınca v1'e
+        düşen kartın eline çerçeve byte'ları (v1'de GET/SET olarak yorumlanır) gitmez.
+
+        :return: Gönderilen komut sayısı.
+        """
+        items = self.commands.take()
+        for key, value in items:
+            payload = value if isinstance(value, bytes) else getattr(self.device, self.ENCODERS[key])(value)
+            await self._send(payload)
+        return len(items)
+
+    async def _poll(self, commands: Sequence[int]) -> QueryResult:
+        """Senkron _poll'un asenkron karşılığı (sağlık durumu sarmalanan nesnede tutulur)."""
+        return await self._run(self.device._poll_exchange(commands))
+
+    async def _probe(self) -> bool:
+        """Çevrimdışı karta PROBE_COMMAND gönderir; tek byte cevap gelirse True."""
+        return await self._run(self.device._probe_exchange())
+
+    async def _query(self, commands: Sequence[int], timeout: float = cfg.TIMEOUT_READ) -> QueryResult:
+        """
+        Senkron _query'nin asenkron karşılığı.
+
+        :param commands: Gönderilecek komut byte'ları.
+        :param timeout: Cevaplar için toplam bekleme süresi.
+        :return: QueryResult. data komut sırasıyla cevaplardır; eksikler 0 ile doldurulur.
+        """
+        return await self._run(self.device._query_exchange(commands, timeout))
+
+    async def _send(self, payload: bytes) -> bool:
+        """
+        SET komut byte'larını ölçülmüş pacing ile gönderir.
+
+        :return: v2'de kart onay verdiyse, v1'de yazma başarılıysa True. Push modunda
+                 onay akışla birlikte gelir (listen); yazma başarılıysa True döner.
+        """
+        return await self._run(self.device._set_exchange(payload, streaming=self.streaming))
+
+    async def _run(self, exchange: Exchange) -> Any:
+        """
+        Cihazın protokol adımını event loop'u bloklamadan yürütür (senkron _run'ın karşılığı).
+
+        :param exchange: G/Ç işlemleri yield eden üreteç (bkz. automation_api.IO_*).
+        :return: Üretecin dönüş değeri.
+        """
+        try:
+            op = next(exchange)
+            while True:
+                try:
+                    result = await self._do_io(op)
+                except serial.SerialException as e:
+                    op = exchange.throw(e)
+                else:
+                    op = exchange.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _do_io(self, op: tuple) -> Any:
+        """Tek bir G/Ç işlemini AsyncSerialTransport ile yapar."""
+        kind = op[0]
+        if kind == IO_READ:
+            _, size, timeout, arrivals = op
+            return await self._transport().read(size, cfg.TIMEOUT_READ if timeout is None else timeout, arrivals)
+        if kind == IO_WRITE:
+            _, data, pacing, sent = op
+            return await self._transport().write(data, pacing, sent)
+        if kind == IO_DISCARD:
+            return self._transport().reset_input_buffer()
+        if kind == IO_SLEEP:
+            return await asyncio.sleep(op[1])
+        if kind == IO_BAUD:
+            return self._switch_baud(op[1])
+        raise ValueError(f"Bilinmeyen G/Ç işlemi: {kind}")
+
+    def _transport(self) -> AsyncSerialTransport:
+        if self.transport is None or self.transport.serial_conn is not self.device.serial_conn:
+            self.transport = AsyncSerialTransport(self.device.serial_conn, self.device.baud_rate)
+        return self.transport
+
+
+class AsyncAirConditionerSystemConnection(AsyncHomeAutomationSystemConnection):
+    """Klima kontrol sistemi (Board #1) için asenkron API sınıfı."""
+
+    ENCODERS = {"desired_temp": "_encode_desired_temp"}
+
+    def __init__(self, com_port: int = 0, device: Optional[AirConditionerSystemConnection] = None):
+        super().__init__(device or AirConditionerSystemConnection(com_port))
+
+    async def setDesiredTemp(self, temp: float) -> bool:
+        """
+        Yeni hedef sıcaklığı cihaza gönderir.
+
+        :param temp: İstenen sıcaklık değeri (Float).
+        :return: İşlem başarılıysa True.
+        """
+        return await self._send(self.device._encode_desired_temp(temp))
+
+    def queueDesiredTemp(self, temp: float) -> None:
+        """
+        Hedef sıcaklığı kuyruğa ekler (bloklamaz, herhangi bir thread'den çağrılabilir).
+        Gönderilmeden önce yeni bir hedef gelirse sadece son hedef gönderilir.
+        """
+        self.commands.submit("desired_temp", float(temp))
+
+    # --- GETTER METHODS (UML Requirement) ---
+    def getSnapshot(self): return self.device.getSnapshot()
+    def getAmbientTemp(self) -> float: return self.device.getAmbientTemp()
+    def getFanSpeed(self) -> int: return self.device.getFanSpeed()
+    def getDesiredTemp(self) -> float: return self.device.getDesiredTemp()
+
+
+class AsyncCurtainControlSystemConnection(AsyncHomeAutomationSystemConnection):
+    """Perde kontrol sistemi (Board #2) için asenkron API sınıfı."""
+
+    ENCODERS = {"curtain_status": "_encode_curtain_status"}
+
+    def __init__(self, com_port: int = 0, device: Optional[CurtainControlSystemConnection] = None):
+        super().__init__(device or CurtainControlSystemConnection(com_port))
+
+    async def setCurtainStatus(self, status: float) -> bool:
+        """
+        Perde açıklık oranını (%0-%100) cihaza gönderir.
+
+        :param status: İstenen perde açıklığı.
+        :return: İşlem başarılıysa True.
+        """
+        return await self._send(self.device._encode_curtain_status(status))
+
+    def queueCurtainStatus(self, status: float) -> None:
+        """
+        Perde hedefini kuyruğa ekler (bloklamaz, herhangi bir thread'den çağrılabilir).
+        Slider hızla sürüklenirse sadece son konum gönderilir.
+        """
+        self.commands.submit("curtain_status", float(status))
+
+    # --- GETTER METHODS (UML Requirement) ---
+    def getSnapshot(self): return self.device.getSnapshot()
+    def getCurtainStatus(self) -> float: return self.device.curtainStatus
+    def getOutdoorTemp(self) -> float: return self.device.getOutdoorTemp()
+    def getOutdoorPress(self) -> float: return self.device.getOutdoorPress()
+    def getLightIntensity(self) -> float: return self.device.getLightIntensity()
+
+
+async def poll_all(connections: Iterable[AsyncHomeAutomationSystemConnection]) -> None:
+    """
+    Verilen tüm kartları aynı anda sorgular.
+    Toplam süre en yavaş kartın süresi kadardır (kartların toplamı değil).
+    """
+    await asyncio.gather(*(conn.update() for conn in connections))
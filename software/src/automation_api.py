@@ -20,33 +20,460 @@ Proje: Introduction to Microcomputers Term Project
 """
 
 import serial
+import os
+import select
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Tuple, Union
 
+import codec
 import constants as const
 import config as cfg
+from metrics import ConnectionMetrics, command_names
+from health import BoardHealth
 
 logger = logging.getLogger(__name__)
 
+
+def port_name_for(port: Union[int, str]) -> str:
+    """
+    Port numarasını seri port adına çevirir.
+
+    :param port: COM numarası (3 -> "COM3") veya doğrudan cihaz yolu ("/dev/pts/4").
+    """
+    if isinstance(port, str) and not port.isdigit():
+        return port
+    return f"COM{int(port)}"
+
+
+# --- PROTOKOL v2: ÇERÇEVE KODEĞİ ---
+
+def _crc8_table(poly: int = 0x07) -> Tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def crc8(data: bytes, crc: int = 0) -> int:
+    """CRC-8 (polinom 0x07, başlangıç 0, MSB önce) - firmware'deki CRC8_Update ile aynı."""
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+class FrameError(ValueError):
+    """Çerçeve bozuk: SOF / uzunluk / CRC uyuşmazlığı veya eksik çerçeve."""
+
+
+def encode_frame(frame_type: int, payload: bytes = b"") -> bytes:
+    """
+    v2 çerçevesi oluşturur: SOF | LEN | TYPE | PAYLOAD | CRC.
+
+    :param frame_type: İstek/cevap tipi (constants.FRAME_*).
+    :param payload: Yük byte'ları (en fazla 255).
+    """
+    body = bytes([len(payload), frame_type]) + bytes(payload)
+    return bytes([const.FRAME_SOF]) + body + bytes([crc8(body)])
+
+
+def decode_frame(data: bytes) -> Tuple[int, bytes]:
+    """
+    Tek bir v2 çerçevesini çözer.
+
+    :param data: SOF ile başlayan tam çerçeve.
+    :return: (tip, yük)
+    :raises FrameError: Çerçeve eksik veya bozuksa.
+    """
+    if len(data) < const.FRAME_OVERHEAD or data[0] != const.FRAME_SOF:
+        raise FrameError(f"Geçersiz çerçeve başlangıcı: {bytes(data[:3]).hex()}")
+    length = data[1]
+    if len(data) != length + const.FRAME_OVERHEAD:
+        raise FrameError(f"Çerçeve uzunluğu {len(data)}, beklenen {length + const.FRAME_OVERHEAD}")
+    if crc8(data[1:-1]) != data[-1]:
+        raise FrameError("CRC hatası")
+    return data[2], bytes(data[3:-1])
+
+
+class RxBuffer:
+    """
+    Seri porttan okunan byte'lar için önceden ayrılmış alım tamponu.
+
+    Okunmamış veri _buf[_start:_end] aralığında durur. fill() porttaki hazır byte'ları
+    doğrudan boş alana okur (POSIX'te os.readv; ara bytes nesnesi oluşmaz), ayrıştırıcılar
+    view() ile kopyasız okur ve consume() ile ilerler. Yazma ucu sona dayanınca okunmamış
+    kısım (genelde yarım bir çerçeve) başa taşınır; yine sığmazsa tampon büyütülür.
+    """
+
+    def __init__(self, capacity: int = cfg.RX_BUFFER_SIZE):
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def view(self) -> memoryview:
+        """Okunmamış byte'lar (kopyasız). Bir sonraki write() / fill()'e kadar geçerlidir."""
+        return self._view[self._start:self._end]
+
+    def find(self, value: int, start: int = 0) -> int:
+        """Okunmamış kısımda byte arar; göreli indeks veya -1 döner."""
+        index = self._buf.find(value, self._start + start, self._end)
+        return index - self._start if index >= 0 else -1
+
+    def consume(self, count: int) -> None:
+        """Baştaki count byte'ı okunmuş sayar."""
+        self._start = min(self._start + count, self._end)
+        if self._start == self._end:
+            self._start = self._end = 0  # Boşaldı: taşıma gerekmeden başa dön
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def write(self, data: bytes) -> None:
+        """Hazır byte'ları sona ekler (feed() ve port dışı kaynaklar için)."""
+        size = len(data)
+        self._reserve(size)[:size] = data
+        self._end += size
+
+    def fill(self, serial_conn, limit: Optional[int] = None) -> int:
+        """
+        Portta bekleyen byte'ları (en fazla limit kadar) tampona okur; hiç beklemez.
+
+        :return: Okunan byte sayısı.
+        :raises serial.SerialException: Port okunabilir görünüp veri vermezse (kopmuş cihaz).
+        """
+        waiting = serial_conn.in_waiting
+        if not isinstance(waiting, int) or waiting <= 0:
+            return 0
+        if limit is not None:
+            waiting = min(waiting, limit)
+        target = self._reserve(waiting)[:waiting]
+
+        if os.name == "posix" and type(serial_conn) is serial.Serial:
+            # pyserial'in read()'i her çağrıda yeni bytes ayırır; doğrudan tampona okunur
+            try:
+                count = os.readv(serial_conn.fileno(), [target])
+            except BlockingIOError:
+                return 0
+            except OSError as e:
+                raise serial.SerialException(f"Okuma hatası: {e}")
+            if count == 0:
+                raise serial.SerialException("Cihaz okunabilir görünüyor ama veri yok (bağlantı koptu mu?)")
+        else:
+            # Kayıt/tekrar oynatma sarmalayıcıları ve diğer port tipleri: read() + tek kopya
+            data = serial_conn.read(waiting)
+            count = len(data)
+            target[:count] = data
+        self._end += count
+        return count
+
+    def _reserve(self, size: int) -> memoryview:
+        """Sonda en az size byte boş yer açar ve o alanı döner."""
+        if self._end + size > len(self._buf):
+            pending = self._end - self._start
+            if pending + size > len(self._buf):
+                grown = bytearray(max(len(self._buf) * 2, pending + size))
+                grown[:pending] = self._view[self._start:self._end]
+                self._buf, self._view = grown, memoryview(grown)
+            else:
+                self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+        return self._view[self._end:]
+
+
+class FrameParser:
+    """
+    Sürekli gelen byte akışından v2 çerçevelerini artımlı çözer (push modu).
+
+    Veri parça parça gelebilir; yarım çerçeve RxBuffer'da bir sonraki okumaya kadar
+    bekler. SOF'a kadar olan byte'lar atlanır. CRC tutmazsa sadece SOF atılır ve
+    bir sonraki SOF'tan yeniden senkron olunur (yük içindeki 0x7E sahte başlangıç
+    olabileceği için çerçevenin tamamı atılmaz).
+
+    Port doğrudan parser.rx'e okunabilir (AsyncSerialTransport.fill); parse() yükleri
+    tampon üzerinde memoryview olarak döner, hiçbir byte kopyalanmaz.
+    """
+
+    def __init__(self, max_payload: int = 32, capacity: int = cfg.RX_BUFFER_SIZE):
+        self.rx = RxBuffer(capacity)
+        self.max_payload = max_payload  # Daha uzun LEN -> sahte SOF
+        self.frames = 0
+        self.crc_errors = 0
+        self.skipped = 0  # Senkron için atlanan byte'lar
+
+    def feed(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """
+        Yeni gelen byte'ları ekler.
+
+        :param data: Porttan okunan byte'lar (herhangi bir uzunlukta).
+        :return: Tamamlanan çerçeveler, geliş sırasıyla [(tip, yük), ...]. Yükler kopyadır.
+        """
+        self.rx.write(data)
+        return [(frame_type, bytes(payload)) for frame_type, payload in self.parse()]
+
+    def parse(self) -> List[Tuple[int, memoryview]]:
+        """
+        rx'teki tamamlanmış çerçeveleri çözer.
+
+        :return: [(tip, yük), ...]; yükler rx üzerinde memoryview'dır ve bir sonraki
+                 write() / fill()'e kadar geçerlidir (saklanacaksa bytes() ile kopyalanmalı).
+        """
+        rx = self.rx
+        frames = []
+        while len(rx):
+            start = rx.find(const.FRAME_SOF)
+            if start < 0:
+                self.skipped += len(rx)
+                rx.clear()
+                break
+            if start:
+                self.skipped += start
+                rx.consume(start)
+            buf = rx.view()
+            if len(buf) < 2:
+                break
+
+            end = buf[1] + const.FRAME_OVERHEAD
+            if buf[1] > self.max_payload:
+                self.skipped += 1
+                rx.consume(1)
+                continue
+            if len(buf) < end:
+                break
+            if crc8(buf[1:end - 1]) != buf[end - 1]:
+                self.crc_errors += 1
+                rx.consume(1)
+                continue
+
+            frames.append((buf[2], buf[3:end - 1]))
+            self.frames += 1
+            rx.consume(end)
+        return frames
+
+    def reset(self) -> None:
+        """Tampondaki yarım çerçeveyi atar (örn. yeniden abone olurken)."""
+        self.rx.clear()
+
+    def __len__(self) -> int:
+        return len(self.rx)
+
+
+def baud_divisor(baud: int, osc: int = cfg.BOARD_OSC_HZ) -> Tuple[int, float]:
+    """
+    PIC UART'ı için SPBRG değerini hesaplar (BRGH=1: baud = OSC / (16 x (SPBRG + 1))).
+
+    :param baud: İstenen hız.
+    :param osc: Kart kristal frekansı (Hz).
+    :return: (SPBRG, oransal hata). Örn. 4 MHz'de 9600 -> (25, 0.0016).
+    """
+    spbrg = min(max(round(osc / (16 * baud)) - 1, 0), 255)
+    actual = osc / (16 * (spbrg + 1))
+    return spbrg, abs(actual - baud) / baud
+
+
+class DeviceSnapshot:
+    """
+    Bir update() döngüsünde okunan tüm değerlerin DEĞİŞTİRİLEMEZ kopyası.
+
+    Poller thread'i her update() sonunda yeni bir snapshot oluşturur ve cihazdaki
+    tek bir referansı (self.snapshot) değiştirir. Python'da referans ataması atomik
+    olduğu için okuyucular kilit kullanmadan her zaman tutarlı bir kare görür
+    (örn. yeni tam kısım + eski ondalık kısım gibi yarım güncellemeler oluşmaz).
+
+    seq: Cihaz başına artan sıra numarası (0 = henüz okunmadı)
+    timestamp: Okumanın tamamlandığı an (unix saniye)
+    """
+
+    __slots__ = ("seq", "timestamp")
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, seq: int = 0, timestamp: float = 0.0, **values):
+        object.__setattr__(self, "seq", seq)
+        object.__setattr__(self, "timestamp", timestamp)
+        for name in self.FIELDS:
+            object.__setattr__(self, name, values.get(name, 0.0))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} değiştirilemez.")
+
+    def evolve(self, seq: int, timestamp: float, **changes) -> "DeviceSnapshot":
+        """Verilen alanları değiştirilmiş, diğerleri aynı kalan YENİ bir snapshot döner."""
+        values = self.as_dict()
+        values.update(changes)
+        return type(self)(seq, timestamp, **values)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Ölçüm alanlarını (seq/timestamp hariç) telemetri kanal isimleriyle döner."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)}" for name in self.FIELDS)
+        return f"{type(self).__name__}(seq={self.seq}, {values})"
+
+
+class AcSnapshot(DeviceSnapshot):
+    """Board #1 (Klima) anlık görüntüsü."""
+    __slots__ = ("desired_temp", "ambient_temp", "fan_speed")
+    FIELDS = __slots__
+
+
+class CurtainSnapshot(DeviceSnapshot):
+    """Board #2 (Perde & Sensörler) anlık görüntüsü."""
+    __slots__ = ("curtain_status", "outdoor_temp", "outdoor_pressure", "light_intensity")
+    FIELDS = __slots__
+
+
+class ReadStatus:
+    """Okuma sonucunun türü (zaman aşımı, gerçek bir 0 değerinden ayırt edilebilsin diye)."""
+    OK = "ok"
+    PARTIAL = "partial"    # Cevapların bir kısmı geldi
+    TIMEOUT = "timeout"    # Hiç cevap gelmedi
+    ERROR = "error"        # Port hatası
+    SKIPPED = "skipped"    # Kart çevrimdışı, sorgu gönderilmedi
+
+
+class ReadResult:
+    """_read_byte() sonucu: değer + durum. Değer sadece status == OK ise anlamlıdır."""
+
+    __slots__ = ("value", "status")
+
+    def __init__(self, value: int, status: str):
+        self.value = value
+        self.status = status
+
+    @property
+    def ok(self) -> bool:
+        return self.status == ReadStatus.OK
+
+    def __repr__(self) -> str:
+        return f"ReadResult({self.value}, {self.status})"
+
+
+class QueryResult:
+    """
+    _query() sonucu.
+
+    data: Komut sırasıyla cevaplar (eksikler 0 ile doldurulmuş, sadece ok ise güvenilir).
+    received: Gerçekten gelen cevap byte sayısı.
+    rtt: Son komut yazıldıktan cevapların okunmasının bitişine kadar geçen süre.
+    """
+
+    __slots__ = ("data", "received", "status", "rtt")
+
+    def __init__(self, data: bytes, received: int, status: str, rtt: Optional[float] = None):
+        self.data = data
+        self.received = received
+        self.status = status
+        self.rtt = rtt
+
+    @property
+    def ok(self) -> bool:
+        return self.status == ReadStatus.OK
+
+    def __repr__(self) -> str:
+        return f"QueryResult({self.data.hex()}, {self.received}/{len(self.data)}, {self.status})"
+
+
+# --- G/Ç İŞLEMLERİ (sans-IO) ---
+# Protokol adımları (_*_exchange) porta dokunmayan üreteçler olarak bir kez yazılır:
+# yapmak istedikleri G/Ç'yi aşağıdaki işlemlerle yield eder, sonucunu send() ile alır.
+# Senkron sınıf bunları bloklayan pyserial çağrılarıyla (_run), asenkron sınıf event
+# loop üzerinden (AsyncHomeAutomationSystemConnection._run) yürütür. Port hatası
+# (serial.SerialException) üretecin içine throw() ile atılır.
+
+IO_WRITE = "write"      # (veri, pacing, sent) -> None. pacing > 0: byte'lar arası bekleme
+IO_READ = "read"        # (boyut, zaman aşımı, arrivals) -> bytes. Zaman aşımı None: portun ayarı
+IO_DISCARD = "discard"  # () -> Giriş tamponundan atılan byte sayısı
+IO_SLEEP = "sleep"      # (saniye,) -> None
+IO_BAUD = "baud"        # (hız,) -> None. Portun hızı değiştirilir
+
+# Protokol adımı: G/Ç işlemleri yield eden, sonucunu return ile döndüren üreteç
+Exchange = Generator[tuple, Any, Any]
+
+
+def io_write(data: bytes, pacing: float = 0.0, sent: Optional[List[float]] = None) -> tuple:
+    """:param sent: Verilirse her byte'ın yazıldığı an (perf_counter) eklenir."""
+    return IO_WRITE, data, pacing, sent
+
+
+def io_read(size: int, timeout: Optional[float] = None, arrivals: Optional[List[float]] = None) -> tuple:
+    """:param arrivals: Verilirse her byte'ın çağırana ulaştığı an (perf_counter) eklenir."""
+    return IO_READ, size, timeout, arrivals
+
+
+def io_discard() -> tuple:
+    return (IO_DISCARD,)
+
+
+def io_sleep(seconds: float) -> tuple:
+    return IO_SLEEP, seconds
+
+
+def io_baud(rate: int) -> tuple:
+    return IO_BAUD, rate
+
+
 class HomeAutomationSystemConnection(ABC):
     """
     Ev otomasyon sistemi bağlantıları için soyut temel sınıf (Abstract Base Class).
     Tüm UART iletişim mantığını kapsüller.
     """
 
-    def __init__(self, com_port: int, baud_rate: int = cfg.DEFAULT_BAUDRATE):
+    # Pacing kalibrasyonunda kullanılan, yan etkisiz GET komutu (alt sınıflar belirler)
+    PROBE_COMMAND: int = 0
+    # HELLO cevabında beklenen kart kimliği (constants.BOARD_ID_*)
+    BOARD_ID: int = 0
+    # Kanal (snapshot alanı) -> o kanalı okuyan GET komutları (cevaplar bu sırayla gelir)
+    CHANNELS: Dict[str, Tuple[int, ...]] = {}
+    # Metrik etiketleri: kart tipi ve constants.py'deki komut isim öneki
+    BOARD_KIND: str = "board"
+    COMMAND_PREFIX: str = ""
+
+    def __init__(self, com_port: Union[int, str], baud_rate: int = cfg.DEFAULT_BAUDRATE):
         """
         Bağlantı nesnesini başlatır.
 
-        :param com_port: Bağlanılacak COM port numarası (örn: 3).
+        :param com_port: Bağlanılacak COM port numarası (örn: 3) veya cihaz yolu (örn: "/dev/pts/4").
         :param baud_rate: İletişim hızı (varsayılan: 9600 - config.py'den gelir).
         """
         self.com_port = com_port
         self.baud_rate = baud_rate
+        # open() ile kullanılan hız; canlı değiştirilen hız close()'da buna geri alınır
+        self._base_baud = baud_rate
         self.serial_conn: Optional[serial.Serial] = None
-        self.port_name = f"COM{self.com_port}"
+        self.port_name = port_name_for(self.com_port)
+        self.inter_byte_pacing: float = cfg.INTER_BYTE_PACING
+        # Seri port nesnesini üreten fonksiyon (None -> serial.Serial).
+        # Kayıt/tekrar oynatma (serial_capture) veya emülatörler için değiştirilebilir.
+        self.serial_factory: Optional[Callable[..., serial.Serial]] = None
+        # Senkron okumaların alım tamponu (bkz. _read_into_rx)
+        self._rx = RxBuffer()
+        # Komut başına gecikme histogramları ve hata sayaçları
+        names = command_names(self.COMMAND_PREFIX) if self.COMMAND_PREFIX else {}
+        self.metrics = ConnectionMetrics(self.BOARD_KIND, self.port_name, names)
+        # Sağlıklı / bozulmuş / çevrimdışı durumu ve uyarlamalı zaman aşımı
+        self.health = BoardHealth(self.port_name)
+        # Aktif protokol: negotiateProtocol() karta göre v2'ye yükseltir
+        self.protocol = const.PROTOCOL_V1
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.serial_conn and self.serial_conn.is_open)
 
     def open(self) -> bool:
         """
@@ -59,7 +486,8 @@ class HomeAutomationSystemConnection(ABC):
             return True
 
         try:
-            self.serial_conn = serial.Serial(
+            factory = self.serial_factory or serial.Serial
+            self.serial_conn = factory(
                 port=self.port_name,
                 baudrate=self.baud_rate,
                 timeout=cfg.TIMEOUT_READ,
@@ -71,17 +499,84 @@ class HomeAutomationSystemConnection(ABC):
             logger.error(f"Bağlantı Hatası ({self.port_name}): {e}")
             return False
 
+    def negotiateProtocol(self) -> int:
+        """
+        Karta tek byte'lık CMD_PROTO_HELLO gönderir; FRAME_HELLO_ACK gelirse v2'ye geçer.
+
+        v1 firmware HELLO byte'ını yok sayar, kısa bekleme sonunda v1 ile devam edilir.
+        open() bunu kendiliğinden çağırmaz (ham port API'si değişmesin diye); bağlantıyı
+        kuran katman (arayüz, havuz, asenkron open) çağırır.
+
+        :return: Seçilen protokol sürümü.
+        """
+        with self._keep_read_timeout():
+            return self._run(self._hello_exchange())
+
+    def _hello_exchange(self) -> Exchange:
+        """HELLO pazarlığı (bkz. negotiateProtocol)."""
+        self.protocol = const.PROTOCOL_V1
+        if cfg.PROTOCOL_MODE != "auto" or not self.is_open:
+            return self.protocol
+
+        raw = b""
+        try:
+            yield from self._discard_ops()
+            yield io_write(bytes([const.CMD_PROTO_HELLO]))
+            raw = yield io_read(const.FRAME_OVERHEAD + 2, cfg.PROTOCOL_HELLO_TIMEOUT)
+        except serial.SerialException as e:
+            logger.error(f"Protokol Pazarlığı Hatası ({self.port_name}): {e}")
+
+        if self._is_hello_ack(raw):
+            self.protocol = const.PROTOCOL_V2
+        elif raw:
+            logger.warning(f"{self.port_name}: Beklenmeyen HELLO cevabı ({bytes(raw).hex()}), v1 kullanılıyor.")
+            yield io_discard()
+        logger.info(f"{self.port_name}: Protokol v{self.protocol}")
+        return self.protocol
+
+    def _is_hello_ack(self, raw: bytes) -> bool:
+        try:
+            frame_type, payload = decode_frame(bytes(raw))
+        except FrameError:
+            return False
+        return (frame_type == const.FRAME_HELLO_ACK and len(payload) == 2
+                and payload[0] >= const.PROTOCOL_V2 and payload[1] == self.BOARD_ID)
+
+    def negotiateBaudRate(self, candidates: Optional[Sequence[int]] = None) -> int:
+        """
+        Adayları büyükten küçüğe dener ve el sıkışması başarılı olan ilk hızda kalır.
+
+        :param candidates: Denenecek hızlar (None -> config.BAUD_CANDIDATES).
+        :return: Kullanılan hız.
+        """
+        for rate in sorted(candidates or cfg.BAUD_CANDIDATES, reverse=True):
+            if rate <= self.baud_rate or self.setBaudRate(rate):
+                break
+        return self.baud_rate
+
     def close(self) -> bool:
         """
         Aktif bağlantıyı güvenli bir şekilde kapatır.
 
         :return: Kapatma başarılıysa True.
         """
-        if self.serial_conn and self.serial_conn.is_open:
+        if self.is_open:
+            # Kart canlı değiştirilen hızda kalmasın (bir sonraki open() taban hızla açar)
+            if self.baud_rate != self._base_baud and self.protocol == const.PROTOCOL_V2:
+                self.setBaudRate(self._base_baud)
+        return self._close_port()
+
+    def _close_port(self) -> bool:
+        """Portu el sıkışması yapmadan kapatır; hız bir sonraki open() için tabana döner."""
+        if not self.is_open:
+            return False
+        try:
             self.serial_conn.close()
-            logger.info(f"Bağlantı Kapatıldı: {self.port_name}")
-            return True
-        return False
+        except (serial.SerialException, OSError) as e:
+            logger.error(f"Kapatma Hatası ({self.port_name}): {e}")
+        logger.info(f"Bağlantı Kapatıldı: {self.port_name}")
+        self.baud_rate = self._base_baud
+        return True
 
     @abstractmethod
     def update(self) -> None:
@@ -91,53 +586,572 @@ class HomeAutomationSystemConnection(ABC):
         """
         pass
 
-    def setComPort(self, port: int) -> None:
+    def setComPort(self, port: Union[int, str]) -> None:
         """
         İletişim portunu günceller. Bağlantı kapalıyken yapılmalıdır.
-        :param port: Yeni port numarası.
+        :param port: Yeni port numarası veya cihaz yolu.
         """
         self.com_port = port
-        self.port_name = f"COM{port}"
+        self.port_name = port_name_for(port)
+        self.metrics.port = self.port_name
+        self.health.name = self.port_name
 
-    def setBaudRate(self, rate: int) -> None:
+    def setBaudRate(self, rate: int) -> bool:
         """
         İletişim hızını günceller.
+
+        Port kapalıysa hız bir sonraki open() için kaydedilir. Port açıksa (protokol v2)
+        kartla FRAME_BAUD el sıkışması yapılır ve hız canlı değiştirilir: ACK eski
+        hızda gelir, yeni hızda BAUD_TEST_PATTERN yankılanır, BAUD_COMMIT ve HELLO ile
+        doğrulanır. Herhangi bir adım başarısızsa iki taraf da eski hıza döner.
+
         :param rate: Yeni baud rate değeri.
+        :return: Yeni hız kullanılıyorsa True.
         """
+        if not self.is_open:
+            self.baud_rate = self._base_baud = rate
+            return True
+        with self._keep_read_timeout():
+            return self._run(self._baud_exchange(rate))
+
+    def _baud_exchange(self, rate: int) -> Exchange:
+        """FRAME_BAUD el sıkışması (bkz. setBaudRate). :return: Yeni hız kullanılıyorsa True."""
+        if rate == self.baud_rate:
+            return True
+        request = self._baud_request(rate)
+        if request is None:
+            return False
+
+        old = self.baud_rate
+        pattern = const.BAUD_TEST_PATTERN
+        timeout = cfg.PROTOCOL_HELLO_TIMEOUT
+        switched = ok = False
+        try:
+            yield from self._discard_ops()
+            yield from self._frame_ops(request)
+            if self._check_set_ack((yield io_read(const.FRAME_OVERHEAD + 1, timeout))):
+                yield io_baud(rate)
+                switched = True
+                yield io_sleep(cfg.BAUD_SWITCH_DELAY)
+                yield io_write(pattern)
+                if (yield io_read(len(pattern), timeout)) == pattern:
+                    yield io_write(bytes([const.BAUD_COMMIT, const.CMD_PROTO_HELLO]))
+                    ok = self._is_hello_ack((yield io_read(const.FRAME_OVERHEAD + 2, timeout)))
+        except serial.SerialException as e:
+            self.metrics.incr("errors")
+            logger.error(f"Baud Değiştirme Hatası ({self.port_name}): {e}")
+
+        if switched and not ok:
+            # Kart da desen/onay gelmeyince kendi zaman aşımıyla eski hıza döner
+            yield io_baud(old)
+            yield io_sleep(cfg.BAUD_REVERT_DELAY)
+            yield io_discard()
+        self._log_baud_result(rate, ok)
+        return ok
+
+    def _baud_request(self, rate: int) -> Optional[bytes]:
+        """FRAME_BAUD isteğini hazırlar; hız desteklenmiyorsa None."""
+        if self.protocol != const.PROTOCOL_V2:
+            logger.warning(f"{self.port_name}: v1 firmware hız değiştiremez ({self.baud_rate} baud).")
+            return None
+        spbrg, error = baud_divisor(rate)
+        if error > cfg.BAUD_MAX_ERROR:
+            logger.warning(f"{self.port_name}: {rate} baud kristalle üretilemiyor (hata %{error * 100:.1f}).")
+            return None
+        return encode_frame(const.FRAME_BAUD, bytes([spbrg]))
+
+    def _switch_baud(self, rate: int) -> None:
+        self.serial_conn.baudrate = rate
         self.baud_rate = rate
 
+    def _log_baud_result(self, rate: int, ok: bool) -> None:
+        if ok:
+            logger.info(f"{self.port_name}: Hız {rate} baud olarak değiştirildi.")
+        else:
+            logger.warning(f"{self.port_name}: {rate} baud doğrulanamadı, {self.baud_rate} baud ile devam.")
+
+    def getHealth(self) -> str:
+        """Kartın sağlık durumu: "healthy", "degraded" veya "offline"."""
+        return self.health.state
+
+    def getMetrics(self) -> Dict:
+        """Sayaçların ve komut başına gecikme özetlerinin anlık görüntüsünü döner."""
+        return self.metrics.snapshot()
+
+    def calibratePacing(self, samples: int = 5) -> float:
+        """
+        Komut baytları arasındaki bekleme süresini (pacing) ölçerek belirler.
+
+        PROBE_COMMAND tek başına gönderilir ve cevabın gelme süresi ölçülür.
+        Hat üzerindeki iki byte'lık süre (istek + cevap) çıkarıldığında kalan kısım,
+        PIC'in UART_Check döngüsünde bir komuta cevap verme süresidir.
+
+        :param samples: Ölçüm sayısı (medyan alınır).
+        :return: Yeni pacing değeri (saniye). Cevap gelmezse mevcut değer korunur.
+        """
+        return self._run(self._calibrate_exchange(samples))
+
+    def _calibrate_exchange(self, samples: int) -> Exchange:
+        """Pacing ölçüm adımı (bkz. calibratePacing)."""
+        if not self.is_open:
+            return self.inter_byte_pacing
+
+        rtts = []
+        try:
+            for _ in range(samples):
+                yield io_discard()
+                t0 = time.perf_counter()
+                yield io_write(bytes([self.PROBE_COMMAND]))
+                if not (yield io_read(1)):
+                    break
+                rtts.append(time.perf_counter() - t0)
+        except serial.SerialException as e:
+            logger.error(f"Pacing Ölçüm Hatası ({self.port_name}): {e}")
+
+        if len(rtts) < samples:
+            logger.warning(f"{self.port_name}: Pacing ölçülemedi, {self.inter_byte_pacing * 1000:.1f} ms korunuyor.")
+            return self.inter_byte_pacing
+
+        import statistics  # Sadece kalibrasyonda gerekir (fractions/decimal zinciri açılışa eklenmez)
+
+        service_time = statistics.median(rtts) - 2 * self._byte_time()
+        # Bir byte süresi kadar güvenlik payı bırak
+        self.inter_byte_pacing = max(service_time, 0.0) + self._byte_time()
+        logger.info(f"{self.port_name}: Pacing {self.inter_byte_pacing * 1000:.2f} ms olarak ölçüldü.")
+        return self.inter_byte_pacing
+
     # --- PROTECTED HELPER METHODS ---
 
-    def _send_byte(self, byte_val: int) -> None:
+    def _send_payload(self, payload: bytes) -> bool:
         """
-        Seri port üzerinden tek bir byte gönderir.
+        SET komut byte'larını gönderir. v2 çerçevesi ise kartın onayını (SET_ACK) da okur.
 
-        :param byte_val: Gönderilecek 0-255 arası tamsayı.
+        :return: v1'de yazma başarılıysa, v2'de komut kart tarafından uygulandıysa True.
         """
-        if self.serial_conn and self.serial_conn.is_open:
-            try:
-                self.serial_conn.write(bytes([byte_val]))
-                # PIC işlem süresi için minimal bekleme
-                time.sleep(0.05)
-            except serial.SerialTimeoutException:
-                logger.warning(f"Timeout: Veri yazılamadı -> {byte_val}")
-            except Exception as e:
-                logger.error(f"Yazma Hatası: {e}")
+        return self._run(self._set_exchange(payload))
+
+    def _set_exchange(self, payload: bytes, streaming: bool = False) -> Exchange:
+        """
+        SET gönderimi. v1 byte'ları ölçülmüş pacing ile gider; v2 çerçevesinden sonra
+        SET_ACK okunur. Push akışında (streaming) olaylar ACK'ten önce gelebilir: tampon
+        temizlenmez, ACK akışla birlikte işlenir (AsyncHomeAutomationSystemConnection.listen).
+
+        :return: v1'de / akışta yazma başarılıysa, v2'de kart onay verdiyse True.
+        """
+        if not self.is_open:
+            return False
+        framed = self._is_frame(payload)
+        raw = b""
+        try:
+            if not framed:
+                yield io_write(payload, self.inter_byte_pacing)
+            elif streaming:
+                yield from self._frame_ops(payload)
+            else:
+                yield from self._discard_ops()
+                yield from self._frame_ops(payload)
+                raw = yield io_read(const.FRAME_OVERHEAD + 1, self.health.read_timeout())
+                self.metrics.incr("bytes_received", len(raw))
+            self.metrics.incr("bytes_sent", len(payload))
+        except serial.SerialTimeoutException:
+            self.metrics.incr("write_timeouts")
+            logger.warning(f"Timeout: Veri yazılamadı -> {payload.hex()}")
+            return False
+        except serial.SerialException as e:
+            self.metrics.incr("errors")
+            logger.error(f"Yazma Hatası: {e}")
+            return False
+        return self._check_set_ack(raw) if framed and not streaming else True
+
+    def _is_frame(self, payload: bytes) -> bool:
+        return self.protocol == const.PROTOCOL_V2 and payload[:1] == bytes([const.FRAME_SOF])
+
+    def _frame_ops(self, frame: bytes) -> Exchange:
+        """
+        Çerçeveyi yazar: SOF'tan sonra bir pacing beklenir, kalan byte'lar tek yazma ile gider.
+        Kart SOF'u gördükten sonra çerçevenin geri kalanını bloklayarak okur; FIFO taşmaz.
+        """
+        yield io_write(frame[:1])
+        if self.inter_byte_pacing > 0:
+            yield io_sleep(self.inter_byte_pacing)
+        yield io_write(frame[1:])
 
-    def _read_byte(self) -> int:
+    def _check_set_ack(self, raw: bytes) -> bool:
+        """SET_ACK / NAK cevabını değerlendirir."""
+        try:
+            frame_type, payload = decode_frame(bytes(raw))
+        except FrameError as e:
+            self.metrics.incr("timeouts" if not raw else "frame_errors")
+            logger.warning(f"{self.port_name}: SET onayı alınamadı ({e}).")
+            return False
+        return self._set_ack_result(frame_type, payload)
+
+    def _set_ack_result(self, frame_type: int, payload: bytes) -> bool:
+        """Çözülmüş SET_ACK / NAK çerçevesini değerlendirir (push akışında da kullanılır)."""
+        if frame_type == const.FRAME_SET_ACK and payload == b"\x00":
+            return True
+        if frame_type == const.FRAME_SET_ACK:
+            logger.info(f"{self.port_name}: SET komutu kart tarafından kilitli (durum {payload.hex()}).")
+        else:
+            self.metrics.incr("frame_errors")
+            logger.warning(f"{self.port_name}: SET reddedildi (tip 0x{frame_type:02X}, {payload.hex()}).")
+        return False
+
+    def _read_byte(self) -> ReadResult:
         """
         Seri porttan tek bir byte okur.
 
-        :return: Okunan byte değeri (int). Veri okunamazsa 0 döner.
+        :return: ReadResult. Zaman aşımında status TIMEOUT olur (değer 0 ama geçersizdir).
         """
         if self.serial_conn and self.serial_conn.is_open:
             try:
                 data = self.serial_conn.read(1)
                 if data:
-                    return int.from_bytes(data, byteorder='big')
+                    self.metrics.incr("bytes_received")
+                    return ReadResult(data[0], ReadStatus.OK)
+                self.metrics.incr("timeouts")
+                return ReadResult(0, ReadStatus.TIMEOUT)
             except serial.SerialException as e:
+                self.metrics.incr("errors")
                 logger.error(f"Okuma Hatası: {e}")
-        return 0
+        return ReadResult(0, ReadStatus.ERROR)
+
+    def _poll(self, commands: Sequence[int]) -> QueryResult:
+        """Sağlık durumuna göre toplu sorgu yapar (bkz. _poll_exchange)."""
+        return self._run(self._poll_exchange(commands))
+
+    def _poll_exchange(self, commands: Sequence[int]) -> Exchange:
+        """
+        Sağlık durumuna göre toplu sorgu yapar.
+
+        Çevrimdışı kart, yoklama zamanı gelmediyse hiç sorgulanmaz (SKIPPED); zamanı
+        geldiyse önce tek byte'lık yoklama gönderilir. Okuma zaman aşımı kartın
+        gözlenen gecikmesine göre ayarlanır; böylece ölü bir kart döngüyü
+        TIMEOUT_READ kadar bekletmez.
+        """
+        skipped = QueryResult(bytes(len(commands)), 0, ReadStatus.SKIPPED)
+        if not self.health.should_poll():
+            return skipped
+        if self.health.needs_probe() and not (yield from self._probe_exchange()):
+            return skipped
+
+        result = yield from self._query_exchange(commands, timeout=self.health.read_timeout())
+        if result.ok:
+            self.health.record_success(result.rtt)
+        else:
+            self.health.record_failure()
+        return result
+
+    def _probe(self) -> bool:
+        """Çevrimdışı karta PROBE_COMMAND gönderir; tek byte cevap gelirse True."""
+        return self._run(self._probe_exchange())
+
+    def _probe_exchange(self) -> Exchange:
+        """Yoklama adımı (bkz. _probe)."""
+        answered = False
+        try:
+            yield from self._discard_ops()
+            yield io_write(bytes([self.PROBE_COMMAND]))
+            answered = len((yield io_read(1, self.health.probe_timeout()))) == 1
+        except serial.SerialException as e:
+            self.metrics.incr("errors")
+            logger.error(f"Yoklama Hatası ({self.port_name}): {e}")
+        self.health.record_probe(answered)
+        return answered
+
+    def _set_read_timeout(self, timeout: float) -> None:
+        """Port okuma zaman aşımını sadece belirgin şekilde değiştiyse günceller (ayar çağrısı ucuz değil)."""
+        current = self.serial_conn.timeout
+        if not isinstance(current, (int, float)) or abs(current - timeout) > 0.1 * timeout:
+            self.serial_conn.timeout = timeout
+
+    def _query(self, commands: Sequence[int], timeout: Optional[float] = None) -> QueryResult:
+        """
+        Toplu sorgu: Tüm GET komutlarını art arda gönderir, cevapları tek seferde okur.
+
+        :param commands: Gönderilecek komut byte'ları.
+        :param timeout: Cevaplar için okuma zaman aşımı (None -> portun mevcut ayarı).
+        :return: QueryResult. data komut sırasıyla cevaplardır; eksikler 0 ile doldurulur.
+        """
+        return self._run(self._query_exchange(commands, timeout))
+
+    def _query_exchange(self, commands: Sequence[int], timeout: Optional[float] = None) -> Exchange:
+        """
+        Toplu sorgu adımı. v2'de tek çerçeve (_frame_query_exchange) kullanılır.
+
+        Pacing 0 ise komutların hepsi tek yazma ile gider. Aksi halde komutlar
+        arasında sadece ölçülmüş pacing kadar beklenir (PIC'in 2 byte'lık RX FIFO'su
+        taşmasın diye); cevap beklemek için ayrıca durulmaz.
+        """
+        count = len(commands)
+        if not self.is_open:
+            return QueryResult(bytes(count), 0, ReadStatus.ERROR)
+        if self.protocol == const.PROTOCOL_V2:
+            return (yield from self._frame_query_exchange(commands, timeout))
+
+        data = b""
+        sent, arrivals = [], []
+        status = ReadStatus.OK
+        try:
+            # Önceki döngüden kalan artık byte'lar cevap sırasını kaydırmasın
+            yield from self._discard_ops()
+            yield io_write(bytes(commands), self.inter_byte_pacing, sent)
+            data = yield io_read(count, timeout, arrivals)
+        except serial.SerialTimeoutException:
+            status = ReadStatus.ERROR
+            self.metrics.incr("write_timeouts")
+            logger.warning(f"Timeout: Toplu sorgu yazılamadı -> {self.port_name}")
+        except serial.SerialException as e:
+            status = ReadStatus.ERROR
+            self.metrics.incr("errors")
+            logger.error(f"Toplu Sorgu Hatası ({self.port_name}): {e}")
+            self._close_port()  # Port koptu: üst katman (DevicePool) yeniden bağlansın
+
+        self.metrics.record_query(commands, sent, arrivals, len(data))
+        rtt = arrivals[-1] - sent[-1] if sent and arrivals else None
+        return self._query_result(bytes(data), count, status, rtt)
+
+    def _query_frame(self, commands: Sequence[int], timeout: Optional[float] = None) -> QueryResult:
+        """v2 toplu sorgu (bkz. _frame_query_exchange)."""
+        return self._run(self._frame_query_exchange(commands, timeout))
+
+    def _frame_query_exchange(self, commands: Sequence[int], timeout: Optional[float] = None) -> Exchange:
+        """
+        v2 toplu sorgu: tek FRAME_READ_ALL isteği, tüm değerler tek FRAME_VALUES cevabında.
+        İstenen komutların değerleri cevaptan seçilir; QueryResult biçimi v1 ile aynıdır.
+        """
+        request = encode_frame(const.FRAME_READ_ALL)
+        raw = b""
+        status = ReadStatus.OK
+        sent = time.perf_counter()
+        try:
+            yield from self._discard_ops()
+            sent = time.perf_counter()
+            yield from self._frame_ops(request)
+            # Önce SOF + LEN: NAK gibi kısa cevaplar tam zaman aşımı beklemeden okunur
+            deadline = None if timeout is None else time.monotonic() + timeout
+            raw = yield io_read(2, timeout)
+            rest = self._frame_remaining(raw)
+            if rest:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                raw = bytes(raw) + (yield io_read(rest, remaining))
+        except serial.SerialTimeoutException:
+            status = ReadStatus.ERROR
+            self.metrics.incr("write_timeouts")
+            logger.warning(f"Timeout: Çerçeve yazılamadı -> {self.port_name}")
+        except serial.SerialException as e:
+            status = ReadStatus.ERROR
+            self.metrics.incr("errors")
+            logger.error(f"Çerçeve Sorgu Hatası ({self.port_name}): {e}")
+            self._close_port()  # Port koptu: üst katman (DevicePool) yeniden bağlansın
+
+        done = time.perf_counter()
+        return self._frame_result(commands, bytes(raw), status, sent, done, len(request))
+
+    def _frame_remaining(self, header: bytes) -> int:
+        """
+        Çerçeve başlığından (SOF + LEN) sonra okunacak byte sayısı.
+        Başlık geçersizse FRAME_VALUES uzunluğu beklenir; bozuk cevap sonuna kadar okunup hata sayılır.
+        """
+        if len(header) < 2:
+            return 0  # Cevap gelmedi: zaman aşımı
+        if header[0] == const.FRAME_SOF:
+            return header[1] + const.FRAME_OVERHEAD - 2
+        return const.FRAME_OVERHEAD + len(self.UPDATE_COMMANDS) - 2
+
+    def _frame_result(self, commands: Sequence[int], raw: bytes, status: str,
+                      sent: float, done: float, request_size: int) -> QueryResult:
+        """FRAME_VALUES cevabını QueryResult'a çevirir."""
+        values = b""
+        answered = 0  # Zaman aşımı sayılmayacak komut sayısı
+        if status == ReadStatus.OK and raw:
+            try:
+                frame_type, payload = decode_frame(raw)
+                if frame_type == const.FRAME_NAK:
+                    raise FrameError(f"Kart isteği reddetti (NAK {payload.hex()})")
+                if frame_type != const.FRAME_VALUES or len(payload) != len(self.UPDATE_COMMANDS):
+                    raise FrameError(f"Beklenmeyen cevap (tip 0x{frame_type:02X}, {len(payload)} byte)")
+                index = {cmd: i for i, cmd in enumerate(self.UPDATE_COMMANDS)}
+                values = bytes(payload[index[cmd]] for cmd in commands)
+                answered = len(values)
+            except FrameError as e:
+                # Eksik çerçeve zaman aşımıdır; tam geldiyse ama bozuk (CRC) ya da
+                # beklenmeyen tipteyse (örn. NAK) hata
+                if len(raw) >= 2 and len(raw) - 2 >= self._frame_remaining(raw[:2]):
+                    status = ReadStatus.ERROR
+                    self.metrics.incr("frame_errors")
+                    answered = len(commands)  # Cevap geldi; zaman aşımı değil, çerçeve hatası
+                logger.warning(f"{self.port_name}: Çerçeve hatası ({e}).")
+
+        # Tüm değerler tek çerçevede gelir: komut başına gecikme = çerçeve gidiş-dönüşü
+        self.metrics.record_query(commands, [sent] * len(commands), [done] * len(values), answered,
+                                  bytes_sent=request_size, bytes_received=len(raw))
+        return self._query_result(values, len(commands), status, done - sent)
+
+    def _query_result(self, data: bytes, count: int, status: str, rtt: Optional[float]) -> QueryResult:
+        """Okunan ham cevaplardan QueryResult oluşturur (senkron ve asenkron yol ortak)."""
+        received = len(data)
+        if status == ReadStatus.OK and received < count:
+            status = ReadStatus.TIMEOUT if received == 0 else ReadStatus.PARTIAL
+
+        if received < count:
+            logger.warning(f"{self.port_name}: Eksik cevap ({received}/{count} byte).")
+            data = data + bytes(count - received)
+        return QueryResult(data, received, status, rtt)
+
+    def _discard_ops(self) -> Exchange:
+        """Giriş tamponunu temizler; içinde beklenmeyen byte varsa 'overruns' sayacına ekler."""
+        stale = yield io_discard()
+        if stale:
+            self.metrics.incr("overruns", stale)
+
+    # --- SENKRON G/Ç SÜRÜCÜSÜ ---
+
+    def _run(self, exchange: Exchange) -> Any:
+        """
+        Protokol adımını bloklayan pyserial çağrılarıyla yürütür.
+
+        :param exchange: G/Ç işlemleri yield eden üreteç (bkz. IO_*).
+        :return: Üretecin dönüş değeri.
+        """
+        self._rx.clear()  # Önceki adımın okuma görünümleri burada geçersizleşir
+        try:
+            op = next(exchange)
+            while True:
+                try:
+                    result = self._do_io(op)
+                except serial.SerialException as e:
+                    op = exchange.throw(e)  # Adım kendi try/except'i ile ele alır
+                else:
+                    op = exchange.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def _do_io(self, op: tuple) -> Any:
+        """Tek bir G/Ç işlemini bloklayarak yapar."""
+        kind = op[0]
+        if kind == IO_READ:
+            _, size, timeout, arrivals = op
+            if os.name == "posix" and type(self.serial_conn) is serial.Serial:
+                return self._read_into_rx(size, self.serial_conn.timeout if timeout is None else timeout, arrivals)
+            # Kayıt/tekrar oynatma sarmalayıcıları ve diğer port tipleri: pyserial read()
+            if timeout is not None:
+                self._set_read_timeout(timeout)
+            data = self.serial_conn.read(size)
+            if arrivals is not None:
+                arrivals.extend([time.perf_counter()] * len(data))
+            return data
+        if kind == IO_WRITE:
+            _, data, pacing, sent = op
+            if pacing <= 0 or len(data) == 1:
+                if sent is not None:
+                    sent.extend([time.perf_counter()] * len(data))
+                self.serial_conn.write(data)
+                return None
+            for i in range(len(data)):
+                if sent is not None:
+                    sent.append(time.perf_counter())
+                self.serial_conn.write(data[i:i + 1])
+                if i < len(data) - 1:
+                    time.sleep(pacing)
+            return None
+        if kind == IO_DISCARD:
+            waiting = self.serial_conn.in_waiting
+            self.serial_conn.reset_input_buffer()
+            return waiting if isinstance(waiting, int) else 0
+        if kind == IO_SLEEP:
+            time.sleep(op[1])
+            return None
+        if kind == IO_BAUD:
+            self._switch_baud(op[1])
+            return None
+        raise ValueError(f"Bilinmeyen G/Ç işlemi: {kind}")
+
+    def _read_into_rx(self, size: int, timeout: Optional[float],
+                      arrivals: Optional[List[float]] = None) -> memoryview:
+        """
+        En fazla size byte'ı önceden ayrılmış alım tamponuna okur (POSIX pyserial portu).
+
+        pyserial'in read()'i her çağrıda yeni bytes ayırır ve zaman aşımı değişince portu
+        yeniden yapılandırır; burada port select() ile beklenir ve byte'lar doğrudan
+        tampona okunur (RxBuffer.fill). Port ayarı değiştirilmez.
+
+        :param timeout: Toplam bekleme süresi (None -> byte'lar gelene kadar).
+        :return: Okunan byte'lar (tampon üzerinde memoryview; bir sonraki _run'a kadar geçerli).
+        """
+        rx = self._rx
+        start = len(rx)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        received = 0
+        while received < size:
+            count = rx.fill(self.serial_conn, size - received)
+            if not count:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                if not select.select([self.serial_conn.fileno()], [], [], remaining)[0]:
+                    continue  # Süre doldu
+                count = rx.fill(self.serial_conn, size - received)
+                if not count:
+                    # pyserial read() ile aynı: okunabilir görünen ama boş port kopmuştur
+                    raise serial.SerialException("Cihaz okunabilir görünüyor ama veri yok (bağlantı koptu mu?)")
+            received += count
+            if arrivals is not None:
+                arrivals.extend([time.perf_counter()] * count)
+        return rx.view()[start:]
+
+    @contextmanager
+    def _keep_read_timeout(self):
+        """Pazarlık adımlarının değiştirdiği okuma zaman aşımını sonunda eski haline getirir."""
+        previous = self.serial_conn.timeout if self.is_open else None
+        try:
+            yield
+        finally:
+            if self.is_open and self.serial_conn.timeout != previous:
+                self.serial_conn.timeout = previous
+
+    def _byte_time(self) -> float:
+        """Bir UART karakterinin (start + 8 data + stop = 10 bit) hat üzerindeki süresi."""
+        return 10.0 / self.baud_rate
+
+    def _channel_commands(self, names: Sequence[str]) -> Tuple[int, ...]:
+        """Verilen kanalları okuyan GET komutlarını kanal sırasıyla birleştirir."""
+        return tuple(cmd for name in names for cmd in self.CHANNELS[name])
+
+    def _decode_channel(self, name: str, raw: bytes) -> float:
+        """Tek bir kanalın cevap byte'larını değere çevirir (Tam + Ondalık/10 veya tek byte)."""
+        if len(raw) == 2:
+            return codec.decode_pair(raw[0], raw[1])
+        return raw[0]
+
+    def _apply_channels(self, names: Sequence[str], data: bytes) -> None:
+        """
+        Sadece verilen kanalların cevaplarını işler; diğer alanlar önceki snapshot'tan aynen taşınır.
+
+        :param names: Sorgulanan kanallar (data bu sırayla dizilmiştir).
+        :param data: _channel_commands(names) sorgusunun cevapları.
+        """
+        changes = {}
+        pos = 0
+        for name in names:
+            size = len(self.CHANNELS[name])
+            changes[name] = self._decode_channel(name, data[pos:pos + size])
+            pos += size
+
+        # Tüm değerler yeni snapshot'ta toplanır ve tek atama ile yayınlanır
+        self.snapshot = self.snapshot.evolve(self.snapshot.seq + 1, time.time(), **changes)
+
+    def _encode_set(self, int_part: int, frac_part: int) -> bytes:
+        """
+        (Tam, Ondalık) hedefini bağlantının protokolüne göre SET komutuna çevirir.
+        v1 byte'ları 6 bit maskeler; v2 çerçevesinde parçalar 0-63 / 0-9'a sınırlanır
+        (negatif hedef bytes() ile patlamaz, kart da aralık dışı değer görmez).
+        """
+        if self.protocol == const.PROTOCOL_V2:
+            int_part = min(max(int_part, 0), codec.MAX_INT)
+            frac_part = min(max(frac_part, 0), 9)
+            return encode_frame(const.FRAME_SET, bytes([int_part, frac_part]))
+        return codec.set_command(int_part, frac_part)
 
     def _float_to_parts(self, value: float) -> Tuple[int, int]:
         """
@@ -148,16 +1162,7 @@ class HomeAutomationSystemConnection(ABC):
         :param value: İşlenecek ondalıklı sayı.
         :return: (tam_kısım, ondalık_kısım) tuple'ı.
         """
-        int_part = int(value)
-        # Ondalık kısmı al, 10 ile çarp ve yuvarla (Örn: 0.56 -> 5.6 -> 6)
-        frac_part = int(round((value - int_part) * 10))
-
-        # Yuvarlama taşması kontrolü (Örn: 25.95 -> 26.0)
-        if frac_part == 10:
-            int_part += 1
-            frac_part = 0
-
-        return int_part, frac_part
+        return codec.float_to_parts(value)
 
 
 class AirConditionerSystemConnection(HomeAutomationSystemConnection):
@@ -166,11 +1171,22 @@ class AirConditionerSystemConnection(HomeAutomationSystemConnection):
     Sıcaklık ve fan hızı kontrolünü yönetir.
     """
 
+    PROBE_COMMAND = const.CMD_AC_GET_FAN_SPEED
+    BOARD_ID = const.BOARD_ID_AC
+    BOARD_KIND = "ac"
+    COMMAND_PREFIX = "CMD_AC_"
+
+    CHANNELS = {
+        "desired_temp": (const.CMD_AC_GET_DESIRED_TEMP_INT, const.CMD_AC_GET_DESIRED_TEMP_FRAC),  # 1. Hedef Sıcaklık
+        "ambient_temp": (const.CMD_AC_GET_AMBIENT_TEMP_INT, const.CMD_AC_GET_AMBIENT_TEMP_FRAC),  # 2. Ortam Sıcaklığı
+        "fan_speed": (const.CMD_AC_GET_FAN_SPEED,),                                               # 3. Fan Hızı
+    }
+    # update() sırasında gönderilen GET komutları (cevaplar bu sırayla gelir)
+    UPDATE_COMMANDS = tuple(cmd for cmds in CHANNELS.values() for cmd in cmds)
+
     def __init__(self, com_port: int):
         super().__init__(com_port)
-        self.desiredTemperature: float = 0.0
-        self.ambientTemperature: float = 0.0
-        self.fanSpeed: int = 0
+        self.snapshot: AcSnapshot = AcSnapshot(fan_speed=0)
 
     def update(self) -> None:
         """
@@ -181,28 +1197,11 @@ class AirConditionerSystemConnection(HomeAutomationSystemConnection):
             return
 
         try:
-            # 1. Hedef Sıcaklık (Desired Temp)
-            self._send_byte(const.CMD_AC_GET_DESIRED_TEMP_INT)
-            d_int = self._read_byte()
-
-            self._send_byte(const.CMD_AC_GET_DESIRED_TEMP_FRAC)
-            d_frac = self._read_byte()
-
-            self.desiredTemperature = d_int + (d_frac / 10.0)
-
-            # 2. Ortam Sıcaklığı (Ambient Temp)
-            self._send_byte(const.CMD_AC_GET_AMBIENT_TEMP_INT)
-            a_int = self._read_byte()
-
-            self._send_byte(const.CMD_AC_GET_AMBIENT_TEMP_FRAC)
-            a_frac = self._read_byte()
-
-            self.ambientTemperature = a_int + (a_frac / 10.0)
-
-            # 3. Fan Hızı (Fan Speed)
-            self._send_byte(const.CMD_AC_GET_FAN_SPEED)
-            self.fanSpeed = self._read_byte()
-
+            # Tüm istekler tek seferde gönderilir, cevaplar aynı sırayla okunur.
+            # Eksik/cevapsız sorguda önceki snapshot korunur (sahte 0 değerleri yayınlanmaz).
+            result = self._poll(self.UPDATE_COMMANDS)
+            if result.ok:
+                self._apply_update(result.data)
         except Exception as e:
             logger.error(f"AC Update Hatası: {e}")
 
@@ -217,26 +1216,40 @@ class AirConditionerSystemConnection(HomeAutomationSystemConnection):
         :param temp: İstenen sıcaklık değeri (Float).
         :return: İşlem başarılıysa True.
         """
-        int_part, frac_part = self._float_to_parts(temp)
+        return self._send_payload(self._encode_desired_temp(temp))
 
-        # 6-bit veri sınırı kontrolü (0-63)
-        if int_part > 63:
-            int_part = 63
-            logger.warning("Sıcaklık değeri 63'e (max) çekildi.")
+    # --- PROTOKOL (Senkron ve Asenkron API tarafından ortak kullanılır) ---
+
+    def _apply_update(self, data: bytes) -> None:
+        """UPDATE_COMMANDS sırasıyla gelen cevap byte'larını özelliklere işler."""
+        self._apply_channels(tuple(self.CHANNELS), data)
+
+    def _encode_desired_temp(self, temp: float) -> bytes:
+        """
+        Hedef sıcaklığı gönderim sırasına göre (Önce Ondalık, sonra Tam) iki byte'a paketler.
 
-        if frac_part > 9: frac_part = 9
+        :param temp: İstenen sıcaklık değeri (Float).
+        :return: Gönderilecek komut byte'ları.
+        """
+        # 6-bit veri sınırı (0-63) ve ondalık sınırı (0-9) codec.quantize içinde uygulanır
+        int_part, frac_part, clamped = codec.quantize(temp, codec.MAX_INT)
+        if clamped:
+            logger.warning("Sıcaklık değeri 63'e (max) çekildi.")
 
-        # Bitwise Paketleme - Constant kullanımı düzeltildi
-        cmd_frac = const.MASK_SET_FRAC_HEADER | (frac_part & const.MASK_DATA_6BIT)
-        self._send_byte(cmd_frac)
+        logger.info(f"SET TEMP -> {temp} (Int: {int_part}, Frac: {frac_part})", extra={"audit": True})
+        return self._encode_set(int_part, frac_part)
 
-        cmd_int = const.MASK_SET_INT_HEADER | (int_part & const.MASK_DATA_6BIT)
-        self._send_byte(cmd_int)
+    def readings(self) -> Dict[str, float]:
+        """Son okunan değerleri telemetri kanal isimleriyle döner."""
+        return self.snapshot.as_dict()
 
-        logger.info(f"SET TEMP -> {temp} (Int: {int_part}, Frac: {frac_part})")
-        return True
+    # Eski öznitelik isimleri: son snapshot'tan okunur (salt okunur)
+    desiredTemperature = property(lambda self: self.snapshot.desired_temp)
+    ambientTemperature = property(lambda self: self.snapshot.ambient_temp)
+    fanSpeed = property(lambda self: self.snapshot.fan_speed)
 
     # --- GETTER METHODS (UML Requirement) ---
+    def getSnapshot(self) -> AcSnapshot: return self.snapshot
     def getAmbientTemp(self) -> float: return self.ambientTemperature
     def getFanSpeed(self) -> int: return self.fanSpeed
     def getDesiredTemp(self) -> float: return self.desiredTemperature
@@ -248,12 +1261,23 @@ class CurtainControlSystemConnection(HomeAutomationSystemConnection):
     Perde pozisyonu, ışık, basınç ve dış sıcaklık verilerini yönetir.
     """
 
+    PROBE_COMMAND = const.CMD_CUR_GET_DESIRED_FRAC
+    BOARD_ID = const.BOARD_ID_CURTAIN
+    BOARD_KIND = "curtain"
+    COMMAND_PREFIX = "CMD_CUR_"
+
+    CHANNELS = {
+        "curtain_status": (const.CMD_CUR_GET_DESIRED_INT, const.CMD_CUR_GET_DESIRED_FRAC),           # 1. Perde Durumu
+        "outdoor_temp": (const.CMD_CUR_GET_OUTDOOR_TEMP_INT, const.CMD_CUR_GET_OUTDOOR_TEMP_FRAC),   # 2. Dış Sıcaklık
+        "outdoor_pressure": (const.CMD_CUR_GET_PRESSURE_INT, const.CMD_CUR_GET_PRESSURE_FRAC),       # 3. Basınç
+        "light_intensity": (const.CMD_CUR_GET_LIGHT_INT, const.CMD_CUR_GET_LIGHT_FRAC),              # 4. Işık Şiddeti
+    }
+    # update() sırasında gönderilen GET komutları (cevaplar bu sırayla gelir)
+    UPDATE_COMMANDS = tuple(cmd for cmds in CHANNELS.values() for cmd in cmds)
+
     def __init__(self, com_port: int):
         super().__init__(com_port)
-        self.curtainStatus: float = 0.0
-        self.outdoorTemperature: float = 0.0
-        self.outdoorPressure: float = 0.0
-        self.lightIntensity: float = 0.0
+        self.snapshot: CurtainSnapshot = CurtainSnapshot()
 
     def update(self) -> None:
         """
@@ -263,54 +1287,14 @@ class CurtainControlSystemConnection(HomeAutomationSystemConnection):
         if not self.serial_conn or not self.serial_conn.is_open:
             return
 
-        # PIC'in önceki işlemlerden kurtulması için minik bekleme
-        time.sleep(0.02)
-
-        # --- 1. Perde Durumu ---
         try:
-            self._send_byte(const.CMD_CUR_GET_DESIRED_INT)
-            c_int = self._read_byte()
-            self._send_byte(const.CMD_CUR_GET_DESIRED_FRAC)
-            c_frac = self._read_byte()
-            raw_val = c_int + (c_frac / 10.0)
-            self.curtainStatus = raw_val * 2.0
-
-        except Exception:
-            pass
-
-            # --- 2. Dış Sıcaklık ---
-        try:
-            self._send_byte(const.CMD_CUR_GET_OUTDOOR_TEMP_INT)
-            t_int = self._read_byte()
-            self._send_byte(const.CMD_CUR_GET_OUTDOOR_TEMP_FRAC)
-            t_frac = self._read_byte()
-            self.outdoorTemperature = t_int + (t_frac / 10.0)
-        except Exception:
-            pass
-
-        # --- 3. Basınç ---
-        try:
-            self._send_byte(const.CMD_CUR_GET_PRESSURE_INT)
-            p_int = self._read_byte()
-            self._send_byte(const.CMD_CUR_GET_PRESSURE_FRAC)
-            p_frac = self._read_byte()
-            self.outdoorPressure = p_int + (p_frac / 10.0)
-        except Exception:
-            pass
-
-        # --- 4. Işık Şiddeti ---
-        try:
-            self._send_byte(const.CMD_CUR_GET_LIGHT_INT)
-            l_int = self._read_byte()
-            time.sleep(0.01)
-            self._send_byte(const.CMD_CUR_GET_LIGHT_FRAC)
-            l_frac = self._read_byte()
-
-            self.lightIntensity = l_int + (l_frac / 10.0)
-            print(f"DEBUG: Işık Okundu -> {self.lightIntensity}")
-
+            # Tüm istekler tek seferde gönderilir, cevaplar aynı sırayla okunur.
+            # Eksik/cevapsız sorguda önceki snapshot korunur (sahte 0 değerleri yayınlanmaz).
+            result = self._poll(self.UPDATE_COMMANDS)
+            if result.ok:
+                self._apply_update(result.data)
         except Exception as e:
-            logger.error(f"Light Error: {e}")
+            logger.error(f"Curtain Update Hatası: {e}")
 
     def setCurtainStatus(self, status: float) -> bool:
         """
@@ -319,28 +1303,51 @@ class CurtainControlSystemConnection(HomeAutomationSystemConnection):
         ÖNEMLİ: 6 bit sınırına (0-63) takılmamak için değeri 2'ye bölüp gönderiyoruz.
         Örnek: %100 -> 50 olarak gider. PIC bunu 20 ile çarpıp 1000 adıma çevirir.
         """
+        return self._send_payload(self._encode_curtain_status(status))
+
+    # --- PROTOKOL (Senkron ve Asenkron API tarafından ortak kullanılır) ---
+
+    def _apply_update(self, data: bytes) -> None:
+        """UPDATE_COMMANDS sırasıyla gelen cevap byte'larını özelliklere işler."""
+        self._apply_channels(tuple(self.CHANNELS), data)
+
+    def _decode_channel(self, name: str, raw: bytes) -> float:
+        """Perde verisi 0-50 skalasında gelir; 2 ile çarpılıp %0-%100 yapılır."""
+        if name == "curtain_status":
+            return codec.decode_pair(raw[0], raw[1], scale=2)
+        return super()._decode_channel(name, raw)
+
+    def _encode_curtain_status(self, status: float) -> bytes:
+        """
+        Perde yüzdesini 0-50 skalasına indirip iki byte'a (Ondalık, Tam) paketler.
+
+        :param status: İstenen perde açıklığı (%0-%100).
+        :return: Gönderilecek komut byte'ları.
+        """
         # Gelen % değerini (örn: 100) yarıya indir (örn: 50)
         status_scaled = status / 2.0
 
-        int_part, frac_part = self._float_to_parts(status_scaled)
-
         # Maksimum değer 50 olmalı (Orijinal 100'ün yarısı)
         # Çünkü protokolde 6 bit yer var (max 63). 100 gönderirsek taşar.
-        if int_part > 50:
-            int_part = 50
+        int_part, frac_part, clamped = codec.quantize(status_scaled, 50)
+        if clamped:
             logger.warning("Perde değeri ölçekli sınır (50) ile sınırlandırıldı.")
 
-        # Protokol gereği paketleme
-        cmd_frac = const.MASK_SET_FRAC_HEADER | (frac_part & const.MASK_DATA_6BIT)
-        self._send_byte(cmd_frac)
+        logger.info(f"SET CURTAIN -> %{status} (Giden Ham Veri: {int_part})", extra={"audit": True})
+        return self._encode_set(int_part, frac_part)
 
-        cmd_int = const.MASK_SET_INT_HEADER | (int_part & const.MASK_DATA_6BIT)
-        self._send_byte(cmd_int)
+    def readings(self) -> Dict[str, float]:
+        """Son okunan değerleri telemetri kanal isimleriyle döner."""
+        return self.snapshot.as_dict()
 
-        logger.info(f"SET CURTAIN -> %{status} (Giden Ham Veri: {int_part})")
-        return True
+    # Eski öznitelik isimleri: son snapshot'tan okunur (salt okunur)
+    curtainStatus = property(lambda self: self.snapshot.curtain_status)
+    outdoorTemperature = property(lambda self: self.snapshot.outdoor_temp)
+    outdoorPressure = property(lambda self: self.snapshot.outdoor_pressure)
+    lightIntensity = property(lambda self: self.snapshot.light_intensity)
 
     # --- GETTER METHODS (UML Requirement) ---
+    def getSnapshot(self) -> CurtainSnapshot: return self.snapshot
     def getOutdoorTemp(self) -> float: return self.outdoorTemperature
     def getOutdoorPress(self) -> float: return self.outdoorPressure
     def getLightIntensity(self) -> float: return self.lightIntensity
\ No newline at end of file
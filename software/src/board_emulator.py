@@ -0,0 +1,788 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KART EMÜLATÖRLERİ (PTY)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Board #1 (board1.asm) ve Board #2 (board2.asm) firmware'lerinin UART
+#           komut işleyişini birebir taklit eden ve Linux sözde terminalleri (pty)
+#           üzerinden gerçek seri port gibi sunan, saf Python emülatörleridir.
+# ==============================================================================
+
+"""
+Board Emulators
+---------------
+Modeller (AcBoardModel, CurtainBoardModel) firmware'deki komut çözümünü byte
+seviyesinde aynen uygular:
+
+* Board #1 - UART_Check: 11xxxxxx -> UART_SET_INT, 10xxxxxx -> UART_SET_FRAC,
+  0x01..0x05 -> UART_GET_*. Bilinmeyen komutlara cevap verilmez.
+* Board #2 - MAIN_LOOP: her byte'tan önce CHECK_LDR_AUTOMATION çalışır,
+  HANDLE_SET_INT gece modunda komutu yok sayar, CALCULATE_STEPS hedefi
+  (yüzde x 20) adım olarak hesaplar, HANDLE_SET_FRAC hiçbir şey yapmaz.
+  HANDLE_GET'teki ADC dönüşümleri (RRF/carry davranışı dahil) korunur.
+
+Zamanlama (EmulatorHub):
+* Her byte hattı 10 / baud saniyede geçer (start + 8 veri + stop biti).
+* Kart gelen byte'ı ana döngüsünün bir turunda işler (model.loop_period()).
+  PIC'teki 2 byte'lık RX FIFO dolarken yeni byte gelirse taşma (OERR) oluşur:
+  Board #2 OERR'yi temizleyip 0 okur, Board #1 ise OERR'yi hiç temizlemediği
+  için alıcısı kilitlenir (gerçek kartla aynı).
+* Cevaplara latency + [0, jitter) gecikme eklenir.
+
+Protokol v2 (protocol=2, varsayılan): İki kart da CMD_PROTO_HELLO'ya FRAME_HELLO_ACK
+ile cevap verir. FRAME_SOF gelince firmware ana döngüden çıkıp çerçevenin kalanını
+bloklayarak okur (HANDLE_FRAME); bu sürede byte'lar gelir gelmez alınır, LDR
+otomasyonu / motor adımı çalışmaz. protocol=1 eski firmware'i taklit eder.
+FRAME_BAUD ile hız canlı değişir (BaudSwitch); max_baud verilirse kart bu hızın
+üstünü örnekleyemez ve yankı testi bozuk byte döner. FRAME_SUBSCRIBE sonrası hub
+kartın PUSH_TASK'ını periyodik çalıştırır (PushState): değişimde ve heartbeat'te
+FRAME_EVENT gönderilir, çerçeve okunurken olay çıkmaz.
+
+Yüzlerce kart tek bir EmulatorHub iş parçacığında (selectors + zamanlayıcı
+kuyruğu) çalışır; kart başına thread açılmaz.
+
+Kullanım:
+    with EmulatorHub() as hub:
+        board = hub.add(AcBoardModel(), latency=0.002, jitter=0.001)
+        ac = AirConditionerSystemConnection(board.port)   # "/dev/pts/N"
+
+Komut satırı (geliştirme için, Ctrl+C ile durur):
+    python board_emulator.py ac curtain
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import selectors
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import config as cfg
+import constants as const
+from automation_api import crc8, encode_frame
+
+logger = logging.getLogger(__name__)
+
+RX_FIFO_DEPTH = 2  # PIC16F877A RCREG FIFO derinliği
+PUSH_POLL_PERIOD = 0.01  # Abone kartların PUSH_TASK'ının hub'da çalıştırılma aralığı
+
+
+class FrameReceiver:
+    """
+    Firmware HANDLE_FRAME okuyucusu: SOF'tan sonraki LEN, TYPE, PAYLOAD ve CRC byte'larını toplar.
+
+    UART_RecvByte_Timeout her byte için ~25 ms bekler; süre dolarsa çerçeve cevapsız
+    bırakılır ve gelen byte yeniden ana döngüde işlenir.
+    """
+
+    BYTE_TIMEOUT = 0.025
+
+    def __init__(self):
+        self._buf: Optional[bytearray] = None
+        self._last = 0.0
+
+    @property
+    def active(self) -> bool:
+        if self._buf is not None and time.monotonic() - self._last > self.BYTE_TIMEOUT:
+            self._buf = None  # Çerçeve zaman aşımına uğradı
+        return self._buf is not None
+
+    def start(self) -> None:
+        self._buf = bytearray()
+        self._last = time.monotonic()
+
+    def feed(self, byte: int) -> Optional[Tuple[int, int, bytes]]:
+        """
+        Çerçevenin bir sonraki byte'ını ekler.
+
+        :return: Çerçeve bitmediyse None; bittiyse (nak_kodu, tip, yük). nak_kodu 0 -> geçerli.
+        """
+        buf = self._buf
+        buf.append(byte)
+        self._last = time.monotonic()
+        if buf[0] > const.FRAME_MAX_PAYLOAD:
+            self._buf = None
+            return const.NAK_LEN, 0, b""
+        if len(buf) < buf[0] + 3:
+            return None
+
+        self._buf = None
+        if crc8(buf[:-1]) != buf[-1]:
+            return const.NAK_CRC, 0, b""
+        return 0, buf[1], bytes(buf[2:-1])
+
+
+class BaudSwitch:
+    """
+    Firmware UART_FRAME_BAUD: ACK'ten sonra SPBRG değişir, desen byte'ları okunup
+    yankılanır ve BAUD_COMMIT beklenir. Byte ~100 ms içinde gelmezse, desen yanlışsa
+    veya onay gelmezse eski SPBRG'ye dönülür.
+    """
+
+    WAIT = 0.1  # UART_RecvByte_Wait (.100)
+
+    def __init__(self, max_baud: Optional[float] = None):
+        self.spbrg: Optional[int] = None  # None -> açılış hızı (VirtualBoard.baud)
+        self.max_baud = max_baud
+        self._old: Optional[int] = None
+        self._got = -1      # Alınan desen byte'ı sayısı (-1 -> test yok)
+        self._bad = False
+        self._deadline = 0.0
+
+    @property
+    def baud(self) -> Optional[float]:
+        return None if self.spbrg is None else cfg.BOARD_OSC_HZ / (16 * (self.spbrg + 1))
+
+    @property
+    def active(self) -> bool:
+        if self._got >= 0 and time.monotonic() > self._deadline:
+            self._finish(commit=False)
+        return self._got >= 0
+
+    def request(self, payload: bytes) -> bytes:
+        """FRAME_BAUD isteği: ACK (eski hızda) gönderilir ve yeni SPBRG yüklenir."""
+        if len(payload) != 1:
+            return encode_frame(const.FRAME_NAK, bytes([const.NAK_LEN]))
+        self._old, self.spbrg = self.spbrg, payload[0]
+        self._got, self._bad = 0, False
+        self._deadline = time.monotonic() + self.WAIT
+        return encode_frame(const.FRAME_SET_ACK, b"\x00")
+
+    def feed(self, byte: int) -> bytes:
+        """Yankı testi sırasında gelen byte; desen byte'ları aynen geri gönderilir."""
+        if self.max_baud is not None and self.baud > self.max_baud:
+            byte = 0xFF  # Kart bu hızı örnekleyemiyor: bozuk byte
+        self._deadline = time.monotonic() + self.WAIT
+        pattern = const.BAUD_TEST_PATTERN
+        if self._got < len(pattern):
+            self._bad |= byte != pattern[self._got]
+            self._got += 1
+            if self._got == len(pattern) and self._bad:
+                self._finish(commit=False)  # PC onay göndermeyecek
+            return bytes([byte])
+        self._finish(commit=byte == const.BAUD_COMMIT)
+        return b""
+
+    def _finish(self, commit: bool) -> None:
+        if not commit:
+            self.spbrg = self._old
+        self._got = -1
+
+
+class PushState:
+    """
+    Firmware PUSH_TASK: FRAME_SUBSCRIBE ile açılır; izlenen değerler son gönderilenden
+    farklıysa veya heartbeat (PUSH_TICK x periyot) dolduysa FRAME_EVENT üretir.
+    """
+
+    def __init__(self):
+        self.on = False
+        self.period = 0.0  # Saniye, 0 -> sadece değişimde
+        self._pending = False
+        self._last: Optional[tuple] = None
+        self._next = 0.0
+
+    def subscribe(self, payload: bytes) -> bytes:
+        """FRAME_SUBSCRIBE isteği: [açık, heartbeat tick] -> ACK; açılışta ilk olay hemen gider."""
+        if len(payload) != 2:
+            return encode_frame(const.FRAME_NAK, bytes([const.NAK_LEN]))
+        self.on = bool(payload[0] & 1)
+        self.period = payload[1] * const.PUSH_TICK
+        self._pending = True
+        self._next = time.monotonic() + self.period
+        return encode_frame(const.FRAME_SET_ACK, b"\x00")
+
+    def poll(self, watched: tuple, values: Callable[[], bytes]) -> bytes:
+        """
+        Ana döngünün bir turu.
+
+        :param watched: Değişimi izlenen firmware değişkenleri.
+        :param values: FRAME_VALUES yükünü üreten fonksiyon.
+        :return: Gönderilecek FRAME_EVENT (yoksa boş).
+        """
+        if not self.on:
+            return b""
+        now = time.monotonic()
+        if watched != self._last:
+            self._pending = True
+        if self.period and now >= self._next:
+            self._pending = True
+            self._next = now + self.period
+        if not self._pending:
+            return b""
+        self._pending = False
+        self._last = watched
+        return encode_frame(const.FRAME_EVENT, values())
+
+
+class AcBoardModel:
+    """Board #1 (Klima) firmware modeli - board1.asm / UART_Check."""
+
+    # UART_Check çağrıları arası süre @ 1 MIPS: SHOW_DISPLAY (4 x WAIT_1MS = 4 x 600 döngü)
+    # + SCAN_KEYPAD (4 x KEY_WAIT = 4 x 150 döngü) + dallanmalar
+    LOOP_PERIOD = 0.0032
+    # FRAME_VALUES yük sırası (UART_FRAME_VALUES)
+    VALUES_ORDER = (const.CMD_AC_GET_DESIRED_TEMP_INT, const.CMD_AC_GET_DESIRED_TEMP_FRAC,
+                    const.CMD_AC_GET_AMBIENT_TEMP_INT, const.CMD_AC_GET_AMBIENT_TEMP_FRAC,
+                    const.CMD_AC_GET_FAN_SPEED)
+    BOARD_ID = const.BOARD_ID_AC
+
+    def __init__(self, desired_temp: float = 25.0, ambient_temp: float = 22.0, fan_speed: int = 0,
+                 protocol: int = const.PROTOCOL_V2, max_baud: Optional[float] = None):
+        self.desired_int = int(desired_temp) & const.MASK_DATA_6BIT
+        self.desired_frac = int(round((desired_temp - int(desired_temp)) * 10)) & const.MASK_DATA_6BIT
+        self.set_ambient_temp(ambient_temp)
+        self.fan_speed = fan_speed & 0xFF
+        self.rx_locked = False  # OERR temizlenmediği için alıcı kilitli
+        self.protocol = protocol
+        self._frame = FrameReceiver()
+        self._rx_frame = FrameReceiver()  # Alış zamanlaması için ayrı takip (bkz. rx_period)
+        self._rx_raw = 0                  # Alış tarafında beklenen yankı testi byte'ları
+        self._rx_raw_at = 0.0
+        self.baud_switch = BaudSwitch(max_baud)
+        self.push_state = PushState()
+
+    def set_ambient_temp(self, temp: float) -> None:
+        """READ_TEMP_SAFE: ADC sonucu tam kısma yazılır, ondalık kısım daima 0'dır."""
+        self.ambient_int = int(temp) & 0xFF
+        self.ambient_frac = 0
+
+    def loop_period(self) -> float:
+        return self.LOOP_PERIOD
+
+    @property
+    def baud(self) -> Optional[float]:
+        return self.baud_switch.baud
+
+    def rx_period(self, cmd: int) -> float:
+        return _frame_rx_period(self, cmd)
+
+    def overrun(self) -> None:
+        # UART_Check RCSTA.OERR'ye hiç bakmaz -> CREN sıfırlanmadıkça yeni byte alınmaz
+        self.rx_locked = True
+
+    def push(self) -> bytes:
+        """PUSH_TASK (UART_Check'te byte yokken): hedef/ortam sıcaklığı, fan hızı izlenir."""
+        if self._frame.active or self.baud_switch.active:
+            return b""
+        watched = (self.desired_int, self.desired_frac, self.ambient_int, self.fan_speed)
+        return self.push_state.poll(watched, self._values)
+
+    def _values(self) -> bytes:
+        return b"".join(self.handle(c) for c in self.VALUES_ORDER)
+
+    def handle(self, cmd: int) -> bytes:
+        """
+        Tek bir komut byte'ını işler.
+
+        :return: Karttan gönderilen cevap (boş olabilir).
+        """
+        if self.protocol >= const.PROTOCOL_V2:
+            if self.baud_switch.active:
+                return self.baud_switch.feed(cmd)
+            if self._frame.active:
+                return _frame_reply(self, self._frame.feed(cmd))
+            if cmd == const.FRAME_SOF:
+                self._frame.start()
+                return b""
+            if cmd == const.CMD_PROTO_HELLO:
+                return encode_frame(const.FRAME_HELLO_ACK, bytes([const.PROTOCOL_V2, self.BOARD_ID]))
+
+        header = cmd & 0xC0
+        if header == const.MASK_SET_INT_HEADER:
+            self.desired_int = cmd & const.MASK_DATA_6BIT
+            return b""
+        if header == const.MASK_SET_FRAC_HEADER:
+            self.desired_frac = cmd & const.MASK_DATA_6BIT
+            return b""
+
+        if cmd == const.CMD_AC_GET_DESIRED_TEMP_FRAC:
+            return bytes([self.desired_frac])
+        if cmd == const.CMD_AC_GET_DESIRED_TEMP_INT:
+            return bytes([self.desired_int])
+        if cmd == const.CMD_AC_GET_AMBIENT_TEMP_FRAC:
+            return bytes([self.ambient_frac])
+        if cmd == const.CMD_AC_GET_AMBIENT_TEMP_INT:
+            return bytes([self.ambient_int])
+        if cmd == const.CMD_AC_GET_FAN_SPEED:
+            return bytes([self.fan_speed])
+        return b""
+
+    def handle_frame(self, frame_type: int, payload: bytes) -> bytes:
+        """UART_HANDLE_FRAME: READ_ALL -> VALUES, SET -> hedef sıcaklık + ACK."""
+        if frame_type == const.FRAME_READ_ALL:
+            return encode_frame(const.FRAME_VALUES, self._values())
+        if frame_type == const.FRAME_SET:
+            if len(payload) != 2:
+                return encode_frame(const.FRAME_NAK, bytes([const.NAK_LEN]))
+            self.desired_int = payload[0] & const.MASK_DATA_6BIT
+            self.desired_frac = payload[1] & const.MASK_DATA_6BIT
+            return encode_frame(const.FRAME_SET_ACK, b"\x00")
+        return encode_frame(const.FRAME_NAK, bytes([const.NAK_TYPE]))
+
+
+class CurtainBoardModel:
+    """Board #2 (Perde) firmware modeli - board2.asm / MAIN_LOOP."""
+
+    NIGHT_ADC = 30          # CHECK_LDR_AUTOMATION gece eşiği (adc < 30)
+    DAY_ADC = 60            # Gündüz eşiği (adc >= 60)
+    NIGHT_POSITION = 50     # Gece perdesi tam kapalı (%100 -> 50)
+    STEPS_PER_UNIT = 20     # CALCULATE_STEPS: hedef = yüzde x 20
+    STEP_PERIOD = 0.0015    # DELAY_MOTOR (10 x 50 x 3 komut döngüsü @ 1 MIPS)
+    IDLE_LOOP_PERIOD = 0.0001
+    # FRAME_VALUES yük sırası (SEND_FRAME_VALUES)
+    VALUES_ORDER = (const.CMD_CUR_GET_DESIRED_INT, const.CMD_CUR_GET_DESIRED_FRAC,
+                    const.CMD_CUR_GET_OUTDOOR_TEMP_INT, const.CMD_CUR_GET_OUTDOOR_TEMP_FRAC,
+                    const.CMD_CUR_GET_PRESSURE_INT, const.CMD_CUR_GET_PRESSURE_FRAC,
+                    const.CMD_CUR_GET_LIGHT_INT, const.CMD_CUR_GET_LIGHT_FRAC)
+    BOARD_ID = const.BOARD_ID_CURTAIN
+
+    def __init__(self, light_adc: int = 150, temp_adc: int = 100, pressure_adc: int = 200,
+                 protocol: int = const.PROTOCOL_V2, max_baud: Optional[float] = None):
+        self.light_adc = light_adc & 0xFF
+        self.temp_adc = temp_adc & 0xFF
+        self.pressure_adc = pressure_adc & 0xFF
+        self.protocol = protocol
+        self._frame = FrameReceiver()
+        self._rx_frame = FrameReceiver()
+        self._rx_raw = 0
+        self._rx_raw_at = 0.0
+        self.baud_switch = BaudSwitch(max_baud)
+        self.push_state = PushState()
+
+        self.cur_percentage = 0
+        self.is_night_mode = False
+        self.saved_usr_pos = 0
+        self.target_steps = 0
+        self._position = 0
+        self._last_tick = time.monotonic()
+
+    # --- Fiziksel dünya ---
+
+    @property
+    def position(self) -> int:
+        """Step motorun mevcut konumu (adım)."""
+        self._advance_motor()
+        return self._position
+
+    def set_light_adc(self, value: int) -> None:
+        """LDR (AN0) ADC değerini değiştirir ve otomasyonu hemen çalıştırır."""
+        self.light_adc = value & 0xFF
+        self._check_ldr_automation()
+
+    def loop_period(self) -> float:
+        # Motor dönerken her turda DELAY_MOTOR beklenir
+        self._advance_motor()
+        return self.STEP_PERIOD if self._position != self.target_steps else self.IDLE_LOOP_PERIOD
+
+    @property
+    def baud(self) -> Optional[float]:
+        return self.baud_switch.baud
+
+    def rx_period(self, cmd: int) -> float:
+        return _frame_rx_period(self, cmd)
+
+    def overrun(self) -> None:
+        # UART_Read_Byte_Safe OERR'yi temizler ve W=0 döner (HANDLE_GET'te eşleşmez)
+        self.handle(0)
+
+    def push(self) -> bytes:
+        """
+        MAIN_LOOP'un byte gelmeyen turu: otomasyon, motor, ardından PUSH_TASK
+        (perde hedefi ve gece modu izlenir; sensörler heartbeat ile taşınır).
+        """
+        if self._frame.active or self.baud_switch.active:
+            return b""
+        self._check_ldr_automation()
+        self._advance_motor()
+        return self.push_state.poll((self.cur_percentage, self.is_night_mode), self._values)
+
+    def _values(self) -> bytes:
+        return b"".join(self._get(c) for c in self.VALUES_ORDER)
+
+    # --- Firmware mantığı ---
+
+    def handle(self, cmd: int) -> bytes:
+        """
+        Tek bir komut byte'ını işler (ana döngünün bir turu).
+
+        :return: Karttan gönderilen cevap (boş olabilir).
+        """
+        if self.protocol >= const.PROTOCOL_V2:
+            # HANDLE_FRAME / yankı testi bloklayarak okur: otomasyon ve motor bu sürede çalışmaz
+            if self.baud_switch.active:
+                return self.baud_switch.feed(cmd)
+            if self._frame.active:
+                return _frame_reply(self, self._frame.feed(cmd))
+
+        self._check_ldr_automation()
+        self._advance_motor()
+
+        if self.protocol >= const.PROTOCOL_V2:
+            if cmd == const.FRAME_SOF:
+                self._frame.start()
+                return b""
+            if cmd == const.CMD_PROTO_HELLO:
+                return encode_frame(const.FRAME_HELLO_ACK, bytes([const.PROTOCOL_V2, self.BOARD_ID]))
+
+        header = cmd & 0xC0
+        if header == const.MASK_SET_FRAC_HEADER:
+            return b""  # HANDLE_SET_FRAC: yok sayılır
+        if header == const.MASK_SET_INT_HEADER:
+            if not self.is_night_mode:  # Gece modunda PC komutu kilitli
+                self.cur_percentage = cmd & const.MASK_DATA_6BIT
+                self._calculate_steps(self.cur_percentage)
+            return b""
+        return self._get(cmd)
+
+    def handle_frame(self, frame_type: int, payload: bytes) -> bytes:
+        """HANDLE_FRAME: READ_ALL -> VALUES, SET -> gece kilidi yoksa hedef + ACK."""
+        if frame_type == const.FRAME_READ_ALL:
+            return encode_frame(const.FRAME_VALUES, self._values())
+        if frame_type == const.FRAME_SET:
+            if len(payload) != 2:
+                return encode_frame(const.FRAME_NAK, bytes([const.NAK_LEN]))
+            if self.is_night_mode:
+                return encode_frame(const.FRAME_SET_ACK, b"\x01")  # Gece kilidi
+            self.cur_percentage = min(payload[0], self.NIGHT_POSITION)
+            self._calculate_steps(self.cur_percentage)
+            return encode_frame(const.FRAME_SET_ACK, b"\x00")
+        return encode_frame(const.FRAME_NAK, bytes([const.NAK_TYPE]))
+
+    def _get(self, cmd: int) -> bytes:
+        """HANDLE_GET cevapları (v1 tek komut ve v2 VALUES yükü ortak)."""
+        if cmd == const.CMD_CUR_GET_DESIRED_INT:
+            return bytes([self.cur_percentage])
+        if cmd == const.CMD_CUR_GET_DESIRED_FRAC:
+            return b"\x00"
+        if cmd == const.CMD_CUR_GET_OUTDOOR_TEMP_INT:
+            # BCF C; RRF; RRF -> ikinci RRF ilk kaydırmanın carry'sini 7. bite taşır
+            return bytes([(self.temp_adc >> 2) | ((self.temp_adc & 1) << 7)])
+        if cmd == const.CMD_CUR_GET_OUTDOOR_TEMP_FRAC:
+            return b"\x05"
+        if cmd == const.CMD_CUR_GET_PRESSURE_INT:
+            return bytes([self.pressure_adc >> 1])
+        if cmd == const.CMD_CUR_GET_PRESSURE_FRAC:
+            return b"\x00"
+        if cmd == const.CMD_CUR_GET_LIGHT_INT:
+            return bytes([self.light_adc // 3])  # DIV3_L döngüsü
+        if cmd == const.CMD_CUR_GET_LIGHT_FRAC:
+            return b"\x00"
+        return b""
+
+    def _check_ldr_automation(self) -> None:
+        if self.light_adc < self.NIGHT_ADC:
+            if not self.is_night_mode:
+                self.is_night_mode = True
+                self.saved_usr_pos = self.cur_percentage
+                self._force_move(self.NIGHT_POSITION)
+        elif self.light_adc >= self.DAY_ADC and self.is_night_mode:
+            self.is_night_mode = False
+            self._force_move(self.saved_usr_pos)
+
+    def _force_move(self, percentage: int) -> None:
+        self.cur_percentage = percentage
+        self._calculate_steps(percentage)
+
+    def _calculate_steps(self, value: int) -> None:
+        self._advance_motor()
+        self.target_steps = (value * self.STEPS_PER_UNIT) & 0xFFFF
+
+    def _advance_motor(self) -> None:
+        now = time.monotonic()
+        steps = int((now - self._last_tick) / self.STEP_PERIOD)
+        if steps <= 0:
+            return
+        self._last_tick += steps * self.STEP_PERIOD
+        delta = self.target_steps - self._position
+        move = min(abs(delta), steps)
+        self._position += move if delta > 0 else -move
+        if self._position == self.target_steps:
+            self._last_tick = now
+
+
+def _frame_reply(model, result: Optional[Tuple[int, int, bytes]]) -> bytes:
+    """Tamamlanan çerçeveyi modele işletir; bozuksa NAK döner."""
+    if result is None:
+        return b""
+    nak, frame_type, payload = result
+    if nak:
+        return encode_frame(const.FRAME_NAK, bytes([nak]))
+    if frame_type == const.FRAME_BAUD:
+        return model.baud_switch.request(payload)
+    if frame_type == const.FRAME_SUBSCRIBE:
+        return model.push_state.subscribe(payload)
+    return model.handle_frame(frame_type, payload)
+
+
+def _frame_rx_period(model, cmd: int) -> float:
+    """
+    Byte alındığı anda kartın bir sonraki byte'ı ne kadar sonra okuyacağı.
+
+    SOF'tan çerçeve sonuna kadar firmware UART'ı sürekli dinler (~0); çerçeve bitince
+    cevap gönderilip ana döngüye dönülür. handle() servis anında çalıştığı için
+    bu karar alış sırasına göre ayrı bir FrameReceiver ile verilir.
+    """
+    if model.protocol < const.PROTOCOL_V2:
+        return model.loop_period()
+    now = time.monotonic()
+    if model._rx_raw and now - model._rx_raw_at <= BaudSwitch.WAIT:
+        model._rx_raw -= 1  # Yankı testi byte'ları da bloklayarak okunur
+        model._rx_raw_at = now
+        return 0.0 if model._rx_raw else model.loop_period()
+    model._rx_raw = 0
+    if model._rx_frame.active:
+        result = model._rx_frame.feed(cmd)
+        if result is None:
+            return 0.0
+        if result[:2] == (0, const.FRAME_BAUD):
+            model._rx_raw, model._rx_raw_at = len(const.BAUD_TEST_PATTERN) + 1, now
+        return model.loop_period()
+    if cmd == const.FRAME_SOF:
+        model._rx_frame.start()
+        return 0.0
+    return model.loop_period()
+
+
+BOARD_MODELS: Dict[str, Callable[[], object]] = {
+    "ac": AcBoardModel,
+    "curtain": CurtainBoardModel,
+}
+
+
+class VirtualBoard:
+    """
+    Bir pty'ye bağlı emüle kart. EmulatorHub.add() ile oluşturulur.
+
+    :ivar port: Uygulamanın açacağı cihaz yolu (örn: "/dev/pts/7").
+    """
+
+    def __init__(self, model, master_fd: int, slave_fd: int, baud: int, latency: float, jitter: float):
+        self.model = model
+        self.master_fd = master_fd
+        self.slave_fd = slave_fd
+        self.port = os.ttyname(slave_fd)
+        self.baud = baud
+        self.latency = latency
+        self.jitter = jitter
+
+        self.rx_bytes = 0
+        self.tx_bytes = 0
+        self.overruns = 0
+
+        self._rx_line_free = 0.0   # Host -> kart hattının boşalacağı an
+        self._tx_line_free = 0.0   # Kart -> host hattının boşalacağı an
+        self._board_free = 0.0     # Kartın bir sonraki UART kontrolü
+        self._pending: Deque[float] = deque()  # FIFO'daki byte'ların işlenme anları
+        self._pushing = False      # PUSH_TASK zamanlayıcıda mı
+
+    @property
+    def byte_time(self) -> float:
+        # Kart FRAME_BAUD ile hızını değiştirdiyse o hız geçerlidir
+        return 10.0 / (getattr(self.model, "baud", None) or self.baud)
+
+    def __repr__(self) -> str:
+        return f"VirtualBoard({type(self.model).__name__}, {self.port} @ {self.baud})"
+
+
+class EmulatorHub:
+    """
+    Tüm emüle kartları tek bir arka plan iş parçacığında çalıştırır.
+
+    :param seed: Jitter için rastgele sayı üreteci tohumu (tekrarlanabilir testler).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        if os.name != "posix":
+            raise OSError("Kart emülatörleri pty gerektirir (Linux/macOS).")
+        self.boards: List[VirtualBoard] = []
+        self._rng = random.Random(seed)
+        self._selector = selectors.DefaultSelector()
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def __enter__(self) -> "EmulatorHub":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="EmulatorHub", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """İş parçacığını durdurur ve tüm pty'leri kapatır."""
+        self._running = False
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for board in list(self.boards):
+            self.remove(board)
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def add(self, model, baud: int = cfg.DEFAULT_BAUDRATE, latency: float = 0.0,
+            jitter: float = 0.0) -> VirtualBoard:
+        """
+        Yeni bir pty açar ve modeli ona bağlar.
+
+        :param model: AcBoardModel / CurtainBoardModel (veya handle() sağlayan herhangi bir nesne).
+        :param latency: Her cevaba eklenen sabit gecikme (saniye).
+        :param jitter: Cevaplara eklenen [0, jitter) rastgele gecikme (saniye).
+        """
+        import tty
+
+        master_fd, slave_fd = os.openpty()
+        tty.setraw(slave_fd)
+        os.set_blocking(master_fd, False)
+        board = VirtualBoard(model, master_fd, slave_fd, baud, latency, jitter)
+        with self._lock:
+            self.boards.append(board)
+            self._selector.register(master_fd, selectors.EVENT_READ, board)
+        self._wake()
+        logger.info(f"Emülatör: {board}")
+        return board
+
+    def remove(self, board: VirtualBoard) -> None:
+        with self._lock:
+            if board not in self.boards:
+                return
+            self.boards.remove(board)
+            try:
+                self._selector.unregister(board.master_fd)
+            except (KeyError, ValueError):
+                pass
+        os.close(board.master_fd)
+        os.close(board.slave_fd)
+
+    # --- Olay döngüsü ---
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def _schedule(self, when: float, action: Callable[[], None]) -> None:
+        heapq.heappush(self._events, (when, next(self._counter), action))
+
+    def _run(self) -> None:
+        while self._running:
+            timeout = None
+            if self._events:
+                timeout = max(self._events[0][0] - time.monotonic(), 0.0)
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, 1024)
+                    except BlockingIOError:
+                        pass
+                    continue
+                self._receive(key.data)
+
+            now = time.monotonic()
+            while self._events and self._events[0][0] <= now:
+                _, _, action = heapq.heappop(self._events)
+                action()
+
+    def _receive(self, board: VirtualBoard) -> None:
+        try:
+            data = os.read(board.master_fd, 4096)
+        except (BlockingIOError, OSError):
+            return
+
+        now = time.monotonic()
+        for cmd in data:
+            board.rx_bytes += 1
+            if getattr(board.model, "rx_locked", False):
+                continue  # Alıcı kilitli (Board #1 OERR), byte kaybolur
+            # Byte, hat boşaldıktan sonra bir karakter süresinde tamamen alınır
+            arrived = max(now, board._rx_line_free) + board.byte_time
+            board._rx_line_free = arrived
+
+            while board._pending and board._pending[0] <= arrived:
+                board._pending.popleft()
+            if len(board._pending) >= RX_FIFO_DEPTH:
+                board.overruns += 1
+                board.model.overrun()
+                continue
+
+            service = max(arrived, board._board_free)
+            rx_period = getattr(board.model, "rx_period", None)
+            board._board_free = service + (rx_period(cmd) if rx_period else board.model.loop_period())
+            board._pending.append(service)
+            self._schedule(service, lambda b=board, c=cmd: self._service(b, c))
+
+    def _service(self, board: VirtualBoard, cmd: int) -> None:
+        self._reply(board, board.model.handle(cmd))
+        push_state = getattr(board.model, "push_state", None)
+        if push_state is not None and push_state.on and not board._pushing:
+            board._pushing = True
+            self._schedule(time.monotonic(), lambda b=board: self._push(b))
+
+    def _push(self, board: VirtualBoard) -> None:
+        """Abone kartın PUSH_TASK'ı; abonelik kapanana kadar kendini yeniden zamanlar."""
+        if not board.model.push_state.on or board not in self.boards:
+            board._pushing = False
+            return
+        self._reply(board, board.model.push())
+        self._schedule(time.monotonic() + PUSH_POLL_PERIOD, lambda b=board: self._push(b))
+
+    def _reply(self, board: VirtualBoard, reply: bytes) -> None:
+        if not reply:
+            return
+
+        ready = time.monotonic() + board.latency
+        if board.jitter:
+            ready += self._rng.uniform(0.0, board.jitter)
+        for byte in reply:
+            done = max(ready, board._tx_line_free) + board.byte_time
+            board._tx_line_free = done
+            self._schedule(done, lambda b=board, v=byte: self._transmit(b, v))
+
+    def _transmit(self, board: VirtualBoard, byte: int) -> None:
+        board.tx_bytes += 1  # Yazmadan önce: host cevabı okuduğunda sayaç güncel olmalı
+        try:
+            os.write(board.master_fd, bytes([byte]))
+        except (BlockingIOError, OSError):
+            board.tx_bytes -= 1  # Host portu okumuyor, byte kaybolur
+
+
+def main(argv: List[str]) -> int:
+    types = argv or ["ac", "curtain"]
+    unknown = [t for t in types if t not in BOARD_MODELS]
+    if unknown:
+        print(f"Bilinmeyen kart tipi: {', '.join(unknown)} (seçenekler: {', '.join(BOARD_MODELS)})")
+        return 1
+
+    with EmulatorHub() as hub:
+        for board_type in types:
+            board = hub.add(BOARD_MODELS[board_type]())
+            print(f"{board_type:<8} -> {board.port}")
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
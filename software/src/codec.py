@@ -0,0 +1,148 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - 6-BIT TAM/ONDALIK KODEĞİ
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kartların Tam + Ondalık (6 bit) değer formatı için önceden
+#           hesaplanmış kodlama/çözme tablolarını ve bytes / memoryview
+#           tamponları üzerinde toplu kodlama/çözme fonksiyonlarını sunar.
+# ==============================================================================
+
+"""
+Codec
+-----
+Geçerli kodlar: tam kısım 0..63 (6 bit), ondalık kısım 0..9 -> 640 kod.
+Kod indeksi: tam * 10 + ondalık.
+
+    DECODE[k]        tam + ondalık / 10.0            (GET cevapları)
+    DECODE_X2[k]     (tam + ondalık / 10.0) * 2.0    (perde: 0-50 -> %0-%100)
+    SET_COMMANDS[k]  bytes([0x80 | ondalık, 0xC0 | tam])  (v1 SET: önce ondalık)
+
+Tablolar mevcut formüllerle (aynı float işlemleri, aynı sırayla) üretilir; bu
+yüzden sonuçlar tablo öncesi hesapla bit düzeyinde aynıdır. Tablo dışındaki
+byte'lar (örn. 6 bit'i aşan ADC değeri) ve tam onluk olmayan float'lar eski
+hesapla işlenir.
+
+Toplu çözme (decode_pairs) tamponu 16 bit'lik kelimeler olarak görür ve her çifti
+tek bir indeksle 65536 girişlik tablodan okur. Bu tablo ilk toplu çağrıda kurulur
+(~10 ms, ölçek başına); tek değer çözen sorgu yolu sadece 640'lık tabloları kullanır.
+"""
+
+import functools
+import sys
+from typing import Dict, Iterable, List, Tuple, Union
+
+import constants as const
+
+MAX_INT = const.MASK_DATA_6BIT  # 63
+FRAC_STEPS = 10
+CODES = (MAX_INT + 1) * FRAC_STEPS  # 640
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def float_to_parts(value: float) -> Tuple[int, int]:
+    """
+    Float değeri protokol formatına uygun olarak Tam ve Ondalık kısımlara ayırır.
+
+    Örnek: 25.6 -> (25, 6)
+
+    :param value: İşlenecek ondalıklı sayı.
+    :return: (tam_kısım, ondalık_kısım) tuple'ı.
+    """
+    int_part = int(value)
+    # Ondalık kısmı al, 10 ile çarp ve yuvarla (Örn: 0.56 -> 5.6 -> 6)
+    frac_part = int(round((value - int_part) * 10))
+
+    # Yuvarlama taşması kontrolü (Örn: 25.95 -> 26.0)
+    if frac_part == 10:
+        int_part += 1
+        frac_part = 0
+
+    return int_part, frac_part
+
+
+def _set_command(int_part: int, frac_part: int) -> bytes:
+    return bytes([const.MASK_SET_FRAC_HEADER | (frac_part & const.MASK_DATA_6BIT),
+                  const.MASK_SET_INT_HEADER | (int_part & const.MASK_DATA_6BIT)])
+
+
+DECODE: Tuple[float, ...] = tuple(i + (f / 10.0) for i in range(MAX_INT + 1) for f in range(FRAC_STEPS))
+DECODE_X2: Tuple[float, ...] = tuple(v * 2.0 for v in DECODE)
+SET_COMMANDS: Tuple[bytes, ...] = tuple(_set_command(i, f) for i in range(MAX_INT + 1) for f in range(FRAC_STEPS))
+
+# Tam onluk float'lar (k / 10.0) -> parçalar. Anahtarın kendisi float_to_parts'tan
+# geçirildiği için sonuç birebir aynıdır; 0.1 + 0.2 gibi değerler eski yoldan hesaplanır.
+_TENTHS: Dict[float, Tuple[int, int]] = {k / 10.0: float_to_parts(k / 10.0) for k in range(CODES)}
+
+
+def decode_pair(int_byte: int, frac_byte: int, scale: int = 1) -> float:
+    """
+    İki cevap byte'ını değere çevirir.
+
+    :param scale: 1 veya 2 (perde konumu 2 ile çarpılır).
+    """
+    if int_byte <= MAX_INT and frac_byte < FRAC_STEPS:
+        return (DECODE_X2 if scale == 2 else DECODE)[int_byte * FRAC_STEPS + frac_byte]
+    value = int_byte + (frac_byte / 10.0)
+    return value * 2.0 if scale == 2 else value
+
+
+@functools.lru_cache(maxsize=None)
+def _pair_table(scale: int) -> List[float]:
+    """Makinenin byte sırasındaki 16 bit kelime (tam, ondalık) -> değer tablosu."""
+    little = sys.byteorder == "little"
+    table = []
+    for word in range(1 << 16):
+        lo, hi = word & 0xFF, word >> 8
+        table.append(decode_pair(lo, hi, scale) if little else decode_pair(hi, lo, scale))
+    return table
+
+
+def decode_pairs(buf: Buffer, scale: int = 1) -> List[float]:
+    """
+    Ardışık (tam, ondalık) byte çiftlerini toplu çözer.
+
+    :param buf: bytes / bytearray / memoryview (bitişik); kopyalanmadan okunur.
+    :param scale: 1 veya 2 (perde konumu).
+    :return: Çift başına bir değer (tek kalan son byte yok sayılır).
+    """
+    view = memoryview(buf).cast("B")
+    words = view[:len(view) & ~1].cast("H")
+    return list(map(_pair_table(scale).__getitem__, words))
+
+
+def quantize(value: float, limit: int = MAX_INT) -> Tuple[int, int, bool]:
+    """
+    Hedef değeri gönderilecek (tam, ondalık) parçalara çevirir.
+
+    :param limit: Tam kısmın üst sınırı (klima 63, perde 50).
+    :return: (tam, ondalık, sınırlandı_mı). Ondalık kısım en fazla 9'dur.
+    """
+    parts = _TENTHS.get(value)
+    int_part, frac_part = parts if parts is not None else float_to_parts(value)
+    clamped = int_part > limit
+    if clamped:
+        int_part = limit
+    if frac_part > 9:
+        frac_part = 9
+    return int_part, frac_part, clamped
+
+
+def set_command(int_part: int, frac_part: int) -> bytes:
+    """v1 SET komut çifti (önce ondalık, sonra tam)."""
+    if 0 <= int_part <= MAX_INT and 0 <= frac_part < FRAC_STEPS:
+        return SET_COMMANDS[int_part * FRAC_STEPS + frac_part]
+    return _set_command(int_part, frac_part)
+
+
+def encode_setpoints(values: Iterable[float], limit: int = MAX_INT) -> bytes:
+    """
+    Hedef değerleri ardışık v1 SET komut çiftleri olarak toplu kodlar (replay / emülasyon).
+
+    :param limit: Tam kısmın üst sınırı; perde için değerler önceden 2'ye bölünmelidir.
+    """
+    out = bytearray()
+    for value in values:
+        int_part, frac_part, _ = quantize(value, limit)
+        out += set_command(int_part, frac_part)
+    return bytes(out)
@@ -0,0 +1,95 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KOMUT KUYRUĞU
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Arayüz (Tk) thread'inden gelen SET komutlarını portun sahibi olan
+#           event loop'a taşıyan, aynı hedefe ait art arda komutları en son
+#           değere indiren ve sorgulardan önce gönderilmesini sağlayan kuyruktur.
+# ==============================================================================
+
+"""
+Command Queue
+-------------
+Bir porttaki TÜM trafik tek bir asyncio görevinden geçer; böylece SET byte'ları
+GET istek/cevap çiftlerinin arasına giremez. Diğer thread'ler porta doğrudan
+yazmaz, sadece submit() ile kuyruğa ekler (bloklamaz).
+
+    Tk thread:   queue.submit("curtain_status", 40.0)        # anında döner
+    Event loop:  await queue.wait(delay)                      # komut gelince uyanır
+                 for key, value in queue.take(): ...          # sorgudan ÖNCE kodlanıp gönderilir
+
+Kuyrukta byte değil hedef DEĞER tutulur: kuyruk yeniden bağlantıdan sağ çıkar ve
+yeni bağlantıda protokol (v1/v2) değişmiş olabilir. Değer gönderim anındaki
+protokolle kodlanır (bkz. AsyncHomeAutomationSystemConnection.flush_commands).
+
+Birleştirme (coalescing): Henüz gönderilmemiş bir anahtara yeni komut gelirse eskisi
+atılır. Slider'ı hızla sürüklemek onlarca ara hedef yerine sadece son hedefi gönderir.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+
+class CommandQueue:
+    """Thread-safe, anahtar bazında birleştiren SET komut kuyruğu."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, Any]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+        self.submitted = 0  # submit() çağrı sayısı
+        self.coalesced = 0  # Gönderilmeden yerine yenisi gelen komutlar
+
+    def submit(self, key: str, value: Any) -> None:
+        """
+        Komutu kuyruğa ekler (herhangi bir thread'den çağrılabilir).
+
+        :param key: Hedef (örn. "curtain_status"); aynı anahtardaki bekleyen komut atılır.
+        :param value: Hedef değer (gönderilirken kodlanır) veya hazır komut byte'ları.
+        """
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+            self._pending[key] = value
+            self.submitted += 1
+            loop, event = self._loop, self._event
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    def take(self) -> List[Tuple[str, Any]]:
+        """Bekleyen tüm komutları (eklenme sırasıyla) alır ve kuyruğu boşaltır."""
+        with self._lock:
+            items = list(self._pending.items())
+            self._pending.clear()
+        return items
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Komut gelene veya süre dolana kadar bekler (event loop thread'inde çağrılır).
+
+        :return: Bekleyen komut varsa True.
+        """
+        if self._event is None or self._loop is not asyncio.get_running_loop():
+            with self._lock:
+                self._loop = asyncio.get_running_loop()
+                self._event = asyncio.Event()
+        # Önce temizle sonra kontrol et: arada gelen submit() uyandırmayı kaçırmaz
+        self._event.clear()
+        if self:
+            return True
+        try:
+            await asyncio.wait_for(self._event.wait(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        return bool(self)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
@@ -19,7 +19,118 @@ CURTAIN_BOARD_PORT = 12 # Varsayılan Board 2 Portu
 # Bağlantı Ayarları
 TIMEOUT_READ = 1.0 # Saniye
 TIMEOUT_WRITE = 1.0 # Saniye
+RX_BUFFER_SIZE = 256 # Byte - Bağlantı başına önceden ayrılan alım tamponu (gerekirse büyür)
+
+# Toplu Sorgu (Batch Polling) Ayarları
+# Komut byte'ları arasındaki bekleme. PIC UART'ı polling ile okuduğu için (2 byte FIFO)
+# art arda gelen byte'lar taşmasın diye kullanılır. calibratePacing() ile ölçülerek güncellenir.
+INTER_BYTE_PACING = 0.002 # Saniye (0 -> tüm komutlar tek write() ile gider)
+
+# Kart Sağlığı (Health) Ayarları
+HEALTH_OFFLINE_AFTER = 3 # Üst üste bu kadar başarısız sorguda kart çevrimdışı sayılır
+HEALTH_MIN_TIMEOUT = 0.05 # Saniye - Uyarlamalı okuma zaman aşımının alt sınırı
+HEALTH_PROBE_INTERVAL = 2.0 # Saniye - Çevrimdışı kartın ilk yoklama aralığı
+HEALTH_PROBE_INTERVAL_MAX = 30.0 # Saniye - Yoklama aralığının üst sınırı
+
+# Protokol Ayarları
+# "auto": Bağlantıda HELLO gönderilir; kart cevap verirse çerçeveli v2 (CRC'li, tek istekte
+# tüm değerler), vermezse eski tek byte'lık v1 kullanılır. "v1": Pazarlık yapılmaz.
+PROTOCOL_MODE = "auto"
+PROTOCOL_HELLO_TIMEOUT = 0.1 # Saniye - v1 firmware HELLO'ya cevap vermez, bu kadar beklenir
+
+# Baud Rate Pazarlığı (sadece protokol v2)
+# Kartlar 4 MHz kristal ve BRGH=1 ile çalışır: baud = OSC / (16 x (SPBRG + 1)).
+# Bu kristalde 38400/57600/115200 %7-8.5 hata verir; hatasız hızlar 250000/125000/62500'dür.
+BAUD_NEGOTIATE = True # Bağlantıda en hızlı çalışan hıza geçilir
+BOARD_OSC_HZ = 4000000
+BAUD_CANDIDATES = (250000, 125000, 62500, 19200) # Büyükten küçüğe denenir
+BAUD_MAX_ERROR = 0.025 # Kabul edilen en büyük baud hatası (oran)
+BAUD_SWITCH_DELAY = 0.005 # Saniye - ACK'ten sonra yeni hızda desen göndermeden önce
+BAUD_REVERT_DELAY = 0.25 # Saniye - Başarısız denemede kartın eski hıza dönmesi beklenir
+
+# Push (Abonelik) Modu (sadece protokol v2, isteğe bağlı)
+# Açıksa havuz v2 kartlara abone olur; kart değişimde ve heartbeat periyodunda değerleri
+# kendisi gönderir, host sorgu yapmaz. Portu paylaşan kartlar sorgu ile okunmaya devam eder.
+PUSH_MODE = False
+PUSH_HEARTBEAT = 1.0 # Saniye - Değişim olmasa da gelen periyodik olay (0 -> sadece değişimde, max 25.5)
+PUSH_SILENCE_TIMEOUT = 3.5 # Saniye - Bu süre olay gelmezse abonelik yenilenir (heartbeat > 0 iken)
+
+# Çoklu Kart (Device Pool) Ayarları
+BOARDS_CONFIG_FILE = "boards.json" # Göreli ise src klasörüne göre
+POLL_INTERVAL = 0.5 # Saniye - Her kartın sorgu periyodu
+RECONNECT_BACKOFF_MIN = 1.0 # Saniye - İlk yeniden bağlanma beklemesi
+RECONNECT_BACKOFF_MAX = 30.0 # Saniye - En uzun yeniden bağlanma beklemesi
+
+# Uyarlamalı Sorgu (Kanal Zamanlayıcısı) Ayarları
+ADAPTIVE_POLLING = True # False -> tüm kanallar her POLL_INTERVAL'da sorgulanır
+POLL_BACKOFF_FACTOR = 1.5 # Değişmeyen kanalın sorgu aralığı her okumada bu katsayı ile uzar
+POLL_COALESCE_WINDOW = 0.1 # Saniye - Bu süre içinde zamanı gelecek kanallar aynı sorguya eklenir
+# Kart tipi -> kanal -> (min aralık sn, max aralık sn, ölü bant). Değer ölü banttan
+# fazla değişirse kanal min aralığa iner, değişmezse max aralığa kadar yavaşlar.
+CHANNEL_POLL_RATES = {
+    "ac": {
+        "desired_temp": (0.5, 5.0, 0.0),      # Tuş takımından değişebilir
+        "ambient_temp": (1.0, 10.0, 0.1),     # Yavaş değişen sensör (ADC gürültüsü yutulur)
+        "fan_speed": (0.5, 5.0, 0.0),
+    },
+    "curtain": {
+        "curtain_status": (0.25, 5.0, 0.0),   # Motor dönerken hızlı izlenir
+        "outdoor_temp": (2.0, 20.0, 0.1),
+        "outdoor_pressure": (5.0, 60.0, 0.5), # Barometrik basınç nadiren değişir
+        "light_intensity": (0.5, 5.0, 0.5),   # Gece kilidi perdeyi hareket ettirebilir
+    },
+}
+
+# Telemetri (Zaman Serisi) Ayarları
+TELEMETRY_DIR = "telemetry" # Dakikalık/saatlik özet dosyalarının klasörü
+TELEMETRY_RING_SIZE = 3600 # Seri başına RAM'de tutulan örnek (0.5 sn periyotta 30 dk)
+TELEMETRY_FLUSH_INTERVAL = 60.0 # Saniye - Kapanan özetlerin diske yazılma periyodu
+TELEMETRY_MINUTE_RETENTION_DAYS = 14 # Dakikalık özetlerin saklama süresi (saatlikler kalıcı)
+TELEMETRY_COMPACT_INTERVAL = 86400.0 # Saniye - Eski dakikalık kayıtların silinme periyodu (arayüz ve servis)
+
+# Analitik Ayarları
+ANALYTICS_EWMA_ALPHA = 0.3 # EWMA yumuşatma katsayısı (0-1, küçük = daha yumuşak)
+ANALYTICS_WINDOW = 20 # Hareketli istatistik / trend penceresi (örnek sayısı)
+ANALYTICS_ZSCORE_THRESHOLD = 3.0 # Bu z-skorun üstü anomali sayılır
+TREND_DEADBAND_PER_MIN = 0.1 # Birim/dakika - Trend okunun "sabit" sayıldığı eğim
+NIGHT_LUX_THRESHOLD = 12.0 # Yumuşatılmış ışık bu değerin altındaysa gece modu
+
+# Grafik Ayarları
+CHART_WINDOW_SECONDS = 1800 # Grafiklerde gösterilen geçmiş (saniye)
+CHART_Y_SHRINK_RATIO = 0.5 # Veri aralığı (pay dahil) Y ekseninin bu oranının altına inerse eksen daraltılır
+
+# Metrik Ayarları
+METRICS_HTTP_PORT = 0 # Prometheus metin ucu (http://127.0.0.1:<port>/metrics), 0 -> kapalı
+
+# Kontrol API'si (REST + WebSocket, daemon.py)
+API_PORT = 0 # HTTP/JSON + WebSocket ucu (http://<host>:<port>/api/boards), 0 -> kapalı
+API_HOST = "127.0.0.1" # Yerel ağdaki panellerin erişimi için "0.0.0.0"
+API_TOKEN = "" # Boş değilse her istek "Authorization: Bearer <token>" (WebSocket'te ?token=) ister
+API_MAX_BODY = 4096 # Byte - İstek gövdesi / WebSocket mesajı sınırı
+API_WS_QUEUE = 64 # İstemci başına bekleyen mesaj; yavaş istemcinin en eski mesajı atılır
+
+# Host Tarafı Termostat (Kapalı Çevrim Kontrol, daemon.py --thermostat)
+# Firmware fanı/ısıtıcıyı hedef sıcaklık etrafında kendisi açıp kapatır. Termostat ortam
+# sıcaklığını izleyip programdaki hedefe göre PI(D) düzeltmesi yapar ve karta sadece
+# anlamlı değişimde yeni hedef gönderir.
+THERMOSTAT_ENABLED = False
+THERMOSTAT_BOARD = "" # Boş -> ilk klima kartı
+# Gün içi program: ("SS:DD", °C), yerel saat. Son giriş ertesi günün ilk girişine kadar geçerlidir.
+THERMOSTAT_SCHEDULE = (("06:30", 22.0), ("08:30", 20.0), ("17:30", 22.0), ("23:00", 19.0))
+THERMOSTAT_KP = 0.8 # °C düzeltme / °C hata
+THERMOSTAT_KI = 0.002 # °C düzeltme / (°C hata x sn)
+THERMOSTAT_KD = 0.0 # °C düzeltme / (°C/sn) - ADC tam sayı okuduğu için varsayılan kapalı
+THERMOSTAT_MAX_OFFSET = 3.0 # °C - Gönderilen hedef programdan en fazla bu kadar sapar
+THERMOSTAT_SETPOINT_LIMITS = (10.0, 35.0) # °C - Gönderilebilecek hedef aralığı
+THERMOSTAT_MIN_CHANGE = 0.3 # °C - Son gönderilenden daha az farklı hedef gönderilmez
+THERMOSTAT_MIN_INTERVAL = 60.0 # Saniye - İki gönderim arası en az süre (program geçişi hariç)
 
 # Log Ayarları
 LOG_FILE_NAME = "system.log"
-LOG_DIR = "logs"
\ No newline at end of file
+LOG_DIR = "logs"
+LOG_MAX_BYTES = 5 * 1024 * 1024 # Log dosyası bu boyuta ulaşınca döndürülür (system.log.1 ...)
+LOG_BACKUP_COUNT = 3 # Saklanan eski log dosyası sayısı
+LOG_JSON = False # True -> log dosyasına satır başına JSON kayıt yazılır
+LOG_RATE_WINDOW = 10.0 # Saniye - Aynı mesaj bu süre içinde bir kez yazılır (0 -> sınırsız)
+GUI_LOG_LINES = 500 # Arayüz terminalinde tutulan en fazla satır
+GUI_CLOSE_TIMEOUT = 5.0 # Saniye - Kapanışta arka plan döngüsünün portları kapatması için beklenen süre
\ No newline at end of file
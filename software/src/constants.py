@@ -31,4 +31,46 @@ CMD_CUR_GET_LIGHT_INT = 0b00001000
 # --- GENEL MASKELEME ---
 MASK_SET_FRAC_HEADER = 0b10000000
 MASK_SET_INT_HEADER = 0b11000000
-MASK_DATA_6BIT = 0x3F
\ No newline at end of file
+MASK_DATA_6BIT = 0x3F
+
+# --- PROTOKOL v2 (ÇERÇEVELİ) ---
+# Çerçeve: SOF | LEN | TYPE | PAYLOAD (LEN byte) | CRC-8 (LEN..PAYLOAD, polinom 0x07, başlangıç 0)
+# HELLO ve SOF byte'larının v1 firmware'de karşılığı yoktur (yok sayılır), bu sayede
+# eski kartlarda pazarlık sessizce v1'e düşer.
+PROTOCOL_V1 = 1
+PROTOCOL_V2 = 2
+CMD_PROTO_HELLO = 0x7F   # Tek byte pazarlık isteği -> FRAME_HELLO_ACK
+FRAME_SOF = 0x7E
+FRAME_OVERHEAD = 4       # SOF + LEN + TYPE + CRC
+FRAME_MAX_PAYLOAD = 2    # Kartların kabul ettiği en uzun istek yükü
+
+# İstek tipleri (PC -> PIC)
+FRAME_READ_ALL = 0x01    # Yük yok; cevap FRAME_VALUES
+FRAME_SET = 0x02         # Yük: [tam, ondalık]; cevap FRAME_SET_ACK
+FRAME_BAUD = 0x03        # Yük: [SPBRG]; cevap FRAME_SET_ACK, ardından yeni hızda yankı testi
+FRAME_SUBSCRIBE = 0x04   # Yük: [açık (0/1), heartbeat (PUSH_TICK birimi, 0 = sadece değişimde)]; cevap FRAME_SET_ACK
+
+# Cevap tipleri (PIC -> PC)
+FRAME_HELLO_ACK = 0x80   # Yük: [protokol sürümü, kart kimliği]
+FRAME_VALUES = 0x81      # Yük: tüm değerler, update() komut sırasıyla
+FRAME_SET_ACK = 0x82     # Yük: [durum] 0 = uygulandı, 1 = kilitli (perde gece modu)
+FRAME_EVENT = 0x83       # İstenmeden gelen (push) değerler; yük FRAME_VALUES ile aynı
+FRAME_NAK = 0xC0         # Yük: [hata kodu]
+
+NAK_CRC = 0x01
+NAK_TYPE = 0x02
+NAK_LEN = 0x03
+
+BOARD_ID_AC = 0x01
+BOARD_ID_CURTAIN = 0x02
+
+# Baud pazarlığı (FRAME_BAUD): ACK eski hızda gelir, sonra iki taraf da yeni hıza geçer.
+# PC deseni gönderir, kart her byte'ı geri yollar; desen doğruysa PC BAUD_COMMIT gönderir.
+# Kart desen veya onay byte'ını alamazsa eski SPBRG'ye döner.
+BAUD_TEST_PATTERN = bytes([0x55, 0xAA, 0x0F, 0xF0])  # Bit geçişleri yoğun desen
+BAUD_COMMIT = 0xA5
+
+# Push modu (FRAME_SUBSCRIBE): kart değer değişince veya heartbeat dolunca kendiliğinden
+# FRAME_EVENT gönderir; olaylar sadece komutlar arasında çıkar, bir cevabın ortasına girmez.
+PUSH_TICK = 0.1          # Saniye - Kartın heartbeat sayacı (TMR1 taşması)
+PUSH_MAX_TICKS = 255
@@ -0,0 +1,419 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KONTROL API'Sİ (REST + WEBSOCKET)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kart havuzunun son değerlerini, telemetri geçmişini ve SET
+#           komutlarını yerel ağdaki panellere HTTP/JSON üzerinden açan, canlı
+#           değişimleri WebSocket ile ileten ve ek kütüphane gerektirmeyen
+#           asyncio sunucusudur.
+# ==============================================================================
+
+"""
+Control API
+-----------
+Uçlar (JSON):
+    GET  /api/boards                     Tüm kartlar: tip, port, sağlık, son değerler
+    GET  /api/boards/<ad>                Tek kartın son değerleri
+    GET  /api/boards/<ad>/history?channel=<kanal>[&since=<unix sn>][&resolution=raw|1m|1h]
+    POST /api/boards/<ad>/commands       {"desired_temp": 21.5} veya {"curtain_status": 40}
+    GET  /api/ws                         WebSocket: önce tüm kartlar, sonra her değişim
+
+Okumalar SnapshotCache'ten gelir: kartlar sadece DevicePool'un kendi takvimiyle
+sorgulanır, istemci sayısı seri trafiği artırmaz. Her snapshot bir kez JSON'a
+çevrilir; aynı byte'lar tüm HTTP ve WebSocket istemcilerine gider.
+
+Komutlar kartın CommandQueue'suna eklenir (202 Accepted): birleştirilir ve bir
+sonraki sorgudan önce gönderilir. Sunucu havuzla aynı event loop'ta çalışır
+(bkz. daemon.py --api-port).
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import math
+import struct
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import config as cfg
+from device_pool import DevicePool, PooledBoard
+from telemetry import RESOLUTIONS, TelemetryStore
+
+logger = logging.getLogger(__name__)
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455
+WS_CONTINUATION, WS_TEXT, WS_BINARY = 0x0, 0x1, 0x2
+WS_CLOSE, WS_PING, WS_PONG = 0x8, 0x9, 0xA
+WS_PROTOCOL_ERROR, WS_TOO_BIG = 1002, 1009  # Kapanış kodları
+
+# Kart tipi -> komut alanı -> (asenkron bağlantıdaki kuyruk metodu, min, max)
+COMMANDS = {
+    "ac": {"desired_temp": ("queueDesiredTemp", 0.0, 63.9)},
+    "curtain": {"curtain_status": ("queueCurtainStatus", 0.0, 100.0)},
+}
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized",
+                404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class ApiError(Exception):
+    """İstemciye JSON hata gövdesiyle dönen HTTP hatası."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def ws_frame(opcode: int, payload: bytes) -> bytes:
+    """Sunucudan istemciye tek parça (FIN), maskesiz WebSocket çerçevesi oluşturur."""
+    size = len(payload)
+    if size < 126:
+        head = struct.pack("!BB", 0x80 | opcode, size)
+    elif size < 0x10000:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, size)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, size)
+    return head + payload
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class SnapshotCache:
+    """
+    Kartların son durumunu JSON olarak tutan ve değişimleri WebSocket abonelerine
+    dağıtan önbellek. DevicePool dinleyicisi olarak kaydolur.
+
+    Anahtar (seq, sağlık, bağlantı) değişmedikçe kart yeniden serileştirilmez;
+    abonelere ise sadece değerler, sağlık veya bağlantı değiştiğinde gönderilir
+    (değeri aynı kalan sorgu turları yayılmaz).
+    """
+
+    def __init__(self, pool: DevicePool):
+        self.pool = pool
+        self._entries: Dict[str, Tuple[tuple, bytes]] = {}
+        self._sent: Dict[str, tuple] = {}  # Abonelere son gönderilen durum
+        self._subscribers: List[asyncio.Queue] = []
+        pool.listeners.append(self.publish)
+
+    def get(self, name: str) -> bytes:
+        """
+        Kartın son durumunu döner.
+
+        :raises KeyError: Kart havuzda yoksa.
+        """
+        board = self.pool.boards[name]
+        key = self._key(board)
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, self._encode(board))
+            self._entries[name] = entry
+        return entry[1]
+
+    def all(self) -> List[bytes]:
+        return [self.get(name) for name in self.pool.boards]
+
+    def publish(self, board: PooledBoard) -> None:
+        """Havuz dinleyicisi: değer veya sağlık durumu değiştiyse abonelere gönderir."""
+        state = (tuple(board.device.snapshot.as_dict().values()),) + self._key(board)[1:]
+        if self._sent.get(board.name) == state:
+            return
+        self._sent[board.name] = state
+        data = self.get(board.name)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()  # Yavaş istemci: en eski mesaj atılır, havuz beklemez
+            queue.put_nowait(data)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(cfg.API_WS_QUEUE)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    @staticmethod
+    def _key(board: PooledBoard) -> tuple:
+        return board.device.snapshot.seq, board.device.health.state, board.conn.is_open
+
+    @staticmethod
+    def _encode(board: PooledBoard) -> bytes:
+        snapshot = board.device.snapshot
+        return _json({
+            "board": board.name,
+            "type": board.spec.board_type,
+            "port": board.conn.port_name,
+            "connected": board.conn.is_open,
+            "health": board.device.health.state,
+            "seq": snapshot.seq,
+            "timestamp": snapshot.timestamp or None,
+            "values": snapshot.as_dict(),
+        })
+
+
+class ControlApiServer:
+    """
+    REST + WebSocket sunucusu.
+
+    Kullanım (havuzla aynı event loop'ta):
+        api = ControlApiServer(pool, telemetry, port=8080)
+        await api.start()
+        ...
+        await api.close()
+    """
+
+    def __init__(self, pool: DevicePool, telemetry: Optional[TelemetryStore] = None,
+                 host: str = cfg.API_HOST, port: int = cfg.API_PORT, token: str = cfg.API_TOKEN):
+        self.pool = pool
+        self.telemetry = telemetry
+        self.cache = SnapshotCache(pool)
+        self.host = host
+        self.port = port
+        self.token = token
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> int:
+        """
+        Dinlemeye başlar.
+
+        :return: Dinlenen port (port=0 verildiyse seçilen boş port).
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Kontrol API'si: http://{self.host}:{self.port}/api/boards")
+        return self.port
+
+    async def close(self) -> None:
+        """Sunucuyu ve açık bağlantıları (WebSocket'ler dahil) kapatır."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    # --- HTTP ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            await self._serve(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # İstemci bağlantıyı kapattı
+        except Exception as e:
+            logger.error(f"API İstek Hatası: {e}")
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, query, headers = await self._read_head(reader)
+            self._authorize(headers, query)
+            if path == "/api/ws":
+                if headers.get("upgrade", "").lower() != "websocket" or "sec-websocket-key" not in headers:
+                    raise ApiError(400, "WebSocket bağlantısı bekleniyor")
+                await self._websocket(reader, writer, headers["sec-websocket-key"])
+                return
+            body = await self._read_body(reader, headers)
+            status, payload = await self._route(method, path, query, body)
+        except ApiError as e:
+            status, payload = e.status, _json({"error": str(e)})
+
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                      "Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(payload)}\r\n"
+                      "Cache-Control: no-store\r\n"
+                      "Connection: close\r\n\r\n").encode("ascii") + payload)
+        await writer.drain()
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, List[str]], Dict[str, str]]:
+        try:
+            line = await reader.readline()
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                if len(headers) >= 64:
+                    raise ApiError(400, "Çok fazla başlık")
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:  # Bozuk istek satırı veya satır sınırı aşıldı
+            raise ApiError(400, "Geçersiz HTTP isteği")
+        url = urlsplit(target)
+        return method.upper(), unquote(url.path), parse_qs(url.query), headers
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+        length = headers.get("content-length", "0")
+        if not length.isdigit():
+            raise ApiError(400, "Geçersiz Content-Length")
+        if int(length) > cfg.API_MAX_BODY:
+            raise ApiError(413, f"Gövde en fazla {cfg.API_MAX_BODY} byte olabilir")
+        return await reader.readexactly(int(length))
+
+    def _authorize(self, headers: Dict[str, str], query: Dict[str, List[str]]) -> None:
+        if not self.token:
+            return
+        auth = headers.get("authorization", "")
+        given = auth[7:] if auth.startswith("Bearer ") else query.get("token", [""])[0]
+        if not hmac.compare_digest(given.encode("utf-8"), self.token.encode("utf-8")):
+            raise ApiError(401, "Geçersiz veya eksik token")
+
+    async def _route(self, method: str, path: str, query: Dict[str, List[str]],
+                     body: bytes) -> Tuple[int, bytes]:
+        parts = [p for p in path.split("/") if p]
+        if parts[:2] != ["api", "boards"] or len(parts) > 4:
+            raise ApiError(404, f"Bilinmeyen uç: {path}")
+
+        if len(parts) == 2:
+            self._require(method, "GET")
+            return 200, b"[" + b",".join(self.cache.all()) + b"]"
+
+        board = self.pool.boards.get(parts[2])
+        if board is None:
+            raise ApiError(404, f"Bilinmeyen kart: {parts[2]}")
+        if len(parts) == 3:
+            self._require(method, "GET")
+            return 200, self.cache.get(board.name)
+        if parts[3] == "history":
+            self._require(method, "GET")
+            return 200, await self._history(board, query)
+        if parts[3] == "commands":
+            self._require(method, "POST")
+            return 202, self._command(board, body)
+        raise ApiError(404, f"Bilinmeyen uç: {path}")
+
+    @staticmethod
+    def _require(method: str, expected: str) -> None:
+        if method != expected:
+            raise ApiError(405, f"Bu uç sadece {expected} kabul eder")
+
+    async def _history(self, board: PooledBoard, query: Dict[str, List[str]]) -> bytes:
+        """Ham örnekler RAM'deki halka tampondan, özetler diskten (executor'da) okunur."""
+        if self.telemetry is None:
+            raise ApiError(404, "Telemetri kapalı")
+        channel = query.get("channel", [""])[0]
+        if channel not in board.device.CHANNELS:
+            raise ApiError(400, f"Geçerli kanallar: {', '.join(board.device.CHANNELS)}")
+        resolution = query.get("resolution", ["raw"])[0]
+        try:
+            since = float(query["since"][0]) if "since" in query else None
+        except ValueError:
+            raise ApiError(400, "since bir unix zamanı olmalı")
+
+        result = {"board": board.name, "channel": channel, "resolution": resolution}
+        if resolution == "raw":
+            times, values = self.telemetry.history(board.name, channel, since)
+            result.update(t=times.tolist(), v=values.tolist())
+        elif resolution in RESOLUTIONS:
+            rows = await asyncio.get_running_loop().run_in_executor(
+                None, self.telemetry.read_aggregates, board.name, channel, resolution, since)
+            result["rows"] = [{"start": r[0], "min": r[1], "max": r[2], "avg": r[3], "count": r[4]} for r in rows]
+        else:
+            raise ApiError(400, f"Geçerli çözünürlükler: raw, {', '.join(RESOLUTIONS)}")
+        return _json(result)
+
+    def _command(self, board: PooledBoard, body: bytes) -> bytes:
+        """Gövdedeki hedefleri doğrular ve kartın komut kuyruğuna ekler."""
+        allowed = COMMANDS[board.spec.board_type]
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Gövde geçerli JSON olmalı")
+        if not isinstance(data, dict) or not data or set(data) - set(allowed):
+            raise ApiError(400, f"Geçerli alanlar: {', '.join(allowed)}")
+
+        for key, value in data.items():
+            _, low, high = allowed[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                    or not math.isfinite(value) or not low <= value <= high:
+                raise ApiError(400, f"{key} {low} ile {high} arasında bir sayı olmalı")
+        for key, value in data.items():
+            getattr(board.conn, allowed[key][0])(float(value))
+        logger.info(f"API komutu -> {board.name}: {data}")
+        return _json({"board": board.name, "queued": data})
+
+    # --- WEBSOCKET ---
+
+    async def _websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: str) -> None:
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("ascii"))
+
+        queue = self.cache.subscribe()
+        for data in self.cache.all():
+            writer.write(ws_frame(WS_TEXT, data))
+        sender = asyncio.ensure_future(self._ws_send(writer, queue))
+        try:
+            await writer.drain()
+            await self._ws_receive(reader, writer)
+        finally:
+            self.cache.unsubscribe(queue)
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+
+    @staticmethod
+    async def _ws_send(writer: asyncio.StreamWriter, queue: asyncio.Queue) -> None:
+        while True:
+            writer.write(ws_frame(WS_TEXT, await queue.get()))
+            await writer.drain()
+
+    @staticmethod
+    async def _ws_receive(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        İstemci çerçevelerini okur: ping'e pong, close'a close; veri mesajları yok sayılır.
+        Parçalı (FIN=0 + devam çerçeveleri) mesajlar birleştirilmeden izlenir; arada kontrol
+        çerçevesi gelebilir. RFC 6455'e aykırı çerçevede (maskesiz, RSV biti, bilinmeyen
+        opcode, sırasız devam, parçalı / uzun kontrol çerçevesi) 1002 ile kapatılır.
+        """
+        message = None  # Parçaları gelmekte olan veri mesajının toplam boyu
+        while True:
+            head = await reader.readexactly(2)
+            fin, opcode, size = head[0] & 0x80, head[0] & 0x0F, head[1] & 0x7F
+            control = opcode & 0x8
+            if (head[0] & 0x70 or not head[1] & 0x80                       # RSV / maskesiz istemci
+                    or opcode not in (WS_CONTINUATION, WS_TEXT, WS_BINARY, WS_CLOSE, WS_PING, WS_PONG)
+                    or (control and (not fin or size > 125))
+                    or (opcode == WS_CONTINUATION) != (message is not None and not control)):  # Devam sırası
+                writer.write(ws_frame(WS_CLOSE, struct.pack("!H", WS_PROTOCOL_ERROR)))
+                await writer.drain()
+                return
+            if size == 126:
+                size = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif size == 127:
+                size = struct.unpack("!Q", await reader.readexactly(8))[0]
+            if not control:
+                message = (message or 0) + size
+            if size > cfg.API_MAX_BODY or (message or 0) > cfg.API_MAX_BODY:
+                writer.write(ws_frame(WS_CLOSE, struct.pack("!H", WS_TOO_BIG)))
+                await writer.drain()
+                return
+            mask = await reader.readexactly(4)
+            payload = await reader.readexactly(size)
+            if not control:
+                if fin:
+                    message = None  # Mesaj tamamlandı (içeriği kullanılmaz)
+                continue
+            payload = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+
+            if opcode == WS_CLOSE:
+                writer.write(ws_frame(WS_CLOSE, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == WS_PING:
+                writer.write(ws_frame(WS_PONG, payload))
+                await writer.drain()
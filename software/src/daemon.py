@@ -0,0 +1,234 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ARKA PLAN SERVİSİ (HEADLESS DAEMON)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Arayüz (GUI) modüllerini hiç yüklemeden kart havuzunu, telemetri
+#           deposunu, metrik ucunu, kontrol API'sini ve termostatı çalıştıran, systemd
+#           altında servis olarak koşabilen ikinci giriş noktasıdır.
+# ==============================================================================
+
+"""
+Headless Daemon
+---------------
+Ekransız sunucularda (Raspberry Pi, NAS vb.) main.py yerine kullanılır. customtkinter,
+Tk ve matplotlib yüklenmez; sadece DevicePool + TelemetryStore (+ isteğe bağlı
+metrik ucu, REST/WebSocket kontrol API'si ve host tarafı termostat) çalışır.
+
+    python daemon.py                          # boards.json'daki kartlar
+    python daemon.py --boards /etc/nexus/boards.json --push --metrics-port 9108
+    python daemon.py --api-port 8080 --api-host 0.0.0.0   # Token: config.API_TOKEN
+    python daemon.py --thermostat             # Program: config.THERMOSTAT_SCHEDULE
+
+systemd (Type=notify: servis, kart havuzu kurulunca READY=1 bildirir; WatchdogSec
+verilirse yarı periyotta WATCHDOG=1 gönderilir):
+
+    [Unit]
+    Description=Nexus Control Hub
+    After=network.target
+
+    [Service]
+    Type=notify
+    WorkingDirectory=/opt/nexus/software/src
+    ExecStart=/usr/bin/python3 daemon.py --boards /etc/nexus/boards.json
+    WatchdogSec=30
+    Restart=on-failure
+
+    [Install]
+    WantedBy=multi-user.target
+
+SIGTERM / SIGINT ile durur: abonelikler kapatılır, hızı değiştirilen kartlar taban
+hıza alınır, açık telemetri kovaları diske yazılır.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import List, Optional
+
+import config as cfg
+import metrics
+from device_pool import BoardSpec, DevicePool, load_board_specs
+from telemetry import TelemetryStore
+from thermostat import ThermostatEngine
+from utils.logger import setup_logging, stop_logging
+
+logger = logging.getLogger(__name__)
+
+
+def sd_notify(state: str) -> bool:
+    """
+    systemd'ye durum bildirir (NOTIFY_SOCKET yoksa hiçbir şey yapmaz).
+
+    :param state: Örn. "READY=1", "STOPPING=1", "WATCHDOG=1".
+    :return: Bildirim gönderildiyse True.
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address or not hasattr(socket, "AF_UNIX"):
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]  # Soyut (abstract) soket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode("utf-8"))
+        return True
+    except OSError as e:
+        logger.warning(f"systemd bildirimi gönderilemedi ({state}): {e}")
+        return False
+
+
+def watchdog_interval() -> Optional[float]:
+    """systemd WatchdogSec ayarlıysa WATCHDOG=1 gönderme periyodu (saniye), değilse None."""
+    usec = os.environ.get("WATCHDOG_USEC", "")
+    if not usec.isdigit() or int(usec) == 0:
+        return None
+    pid = os.environ.get("WATCHDOG_PID", "")
+    if pid.isdigit() and int(pid) != os.getpid():
+        return None
+    return int(usec) / 2_000_000
+
+
+class AutomationDaemon:
+    """
+    GUI'siz servis: kart havuzu, telemetri bakımı, metrik ucu, kontrol API'si ve termostat.
+
+    Kullanım:
+        daemon = AutomationDaemon(load_board_specs())
+        asyncio.run(daemon.run())        # stop() veya SIGTERM ile biter
+    """
+
+    def __init__(self, specs: List[BoardSpec], telemetry: Optional[TelemetryStore] = None,
+                 push: bool = cfg.PUSH_MODE, metrics_port: int = cfg.METRICS_HTTP_PORT,
+                 api_port: int = cfg.API_PORT, api_host: str = cfg.API_HOST,
+                 thermostat: bool = cfg.THERMOSTAT_ENABLED):
+        self.telemetry = telemetry if telemetry is not None else TelemetryStore()
+        self.pool = DevicePool(specs, telemetry=self.telemetry, push=push)
+        self.metrics_port = metrics_port
+        self._metrics_server = None
+        # Kontrol API'si havuzla aynı loop'ta çalışır (port=0 -> kapalı, modül de yüklenmez)
+        self.api = None
+        if api_port:
+            from control_api import ControlApiServer
+            self.api = ControlApiServer(self.pool, self.telemetry, api_host, api_port)
+        # Termostat havuz dinleyicisidir; her sorgu / olay turunda klima kartına hedef hesaplar
+        self.thermostat: Optional[ThermostatEngine] = None
+        if thermostat:
+            try:
+                self.thermostat = ThermostatEngine.attach(self.pool)
+            except ValueError as e:
+                logger.error(f"Termostat başlatılamadı: {e}")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def run(self) -> None:
+        """Havuzu ve bakım görevini başlatır; stop() çağrılana kadar bekler."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._install_signal_handlers()
+
+        if self.metrics_port:
+            self._metrics_server = metrics.start_http_server(self.metrics_port)
+        if self.api is not None:
+            await self.api.start()
+
+        pool_task = asyncio.create_task(self.pool.run(), name="DevicePool")
+        housekeeping = asyncio.create_task(self._housekeeping(), name="Housekeeping")
+        logger.info(f"Servis başladı: {len(self.pool.boards)} kart ({', '.join(self.pool.boards)}).")
+        sd_notify("READY=1")
+
+        try:
+            await self._stopping.wait()
+        finally:
+            sd_notify("STOPPING=1")
+            housekeeping.cancel()
+            if self.api is not None:
+                await self.api.close()
+            self.pool.stop()
+            await asyncio.gather(pool_task, housekeeping, return_exceptions=True)
+            await self._loop.run_in_executor(None, lambda: self.telemetry.flush(close_buckets=True))
+            if self._metrics_server is not None:
+                self._metrics_server.shutdown()
+            logger.info("Servis durdu.")
+
+    def stop(self) -> None:
+        """Servisi durdurur (herhangi bir thread'den veya sinyal işleyiciden çağrılabilir)."""
+        if self._loop is None or self._stopping is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+
+    def _install_signal_handlers(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Windows / ana thread dışı: Ctrl+C KeyboardInterrupt olarak gelir
+
+    async def _housekeeping(self) -> None:
+        """Periyodik telemetri flush'ı, günlük compact ve systemd watchdog bildirimi."""
+        watchdog = watchdog_interval()
+        period = min(cfg.TELEMETRY_FLUSH_INTERVAL, watchdog or cfg.TELEMETRY_FLUSH_INTERVAL)
+        next_flush = next_compact = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            if now >= next_flush:
+                # Telemetri dosyalarına sadece buradan yazılır (havuz kaydı RAM'e yapar);
+                # disk G/Ç'si event loop'u bloklamasın. flush ve compact farklı executor
+                # thread'lerinde çakışsa da deponun dosya kilidiyle sıralanır.
+                await self._loop.run_in_executor(None, self.telemetry.flush)
+                next_flush = now + cfg.TELEMETRY_FLUSH_INTERVAL
+            if now >= next_compact:
+                await self._loop.run_in_executor(None, self.telemetry.compact)
+                next_compact = now + cfg.TELEMETRY_COMPACT_INTERVAL
+            if watchdog:
+                sd_notify("WATCHDOG=1")
+            await asyncio.sleep(period)
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Nexus Control Hub - GUI'siz servis")
+    parser.add_argument("--boards", help="Kart listesi JSON dosyası (varsayılan: config.BOARDS_CONFIG_FILE)")
+    parser.add_argument("--push", action="store_true", default=cfg.PUSH_MODE,
+                        help="v2 kartlara abone ol (sorgu yerine push modu)")
+    parser.add_argument("--metrics-port", type=int, default=cfg.METRICS_HTTP_PORT,
+                        help="Prometheus metrik ucu portu (0 -> kapalı)")
+    parser.add_argument("--api-port", type=int, default=cfg.API_PORT,
+                        help="REST/WebSocket kontrol API'si portu (0 -> kapalı)")
+    parser.add_argument("--api-host", default=cfg.API_HOST,
+                        help="Kontrol API'sinin dinleyeceği adres (yerel ağ için 0.0.0.0)")
+    parser.add_argument("--thermostat", action="store_true", default=cfg.THERMOSTAT_ENABLED,
+                        help="Klima kartının hedefini program + PID ile host tarafında yönet")
+    parser.add_argument("--telemetry-dir", default=cfg.TELEMETRY_DIR,
+                        help="Telemetri özet klasörü ('' -> diske yazılmaz)")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--log-file", help="Log dosyası (varsayılan: sadece stdout)")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_level, args.log_file)  # Disk/konsol yazımı ayrı thread'de
+    try:
+        specs = load_board_specs(args.boards)
+    except (OSError, ValueError, KeyError) as e:
+        logger.critical(f"Kart listesi okunamadı: {e}")
+        return 1
+
+    daemon = AutomationDaemon(specs, TelemetryStore(args.telemetry_dir or None),
+                              push=args.push, metrics_port=args.metrics_port,
+                              api_port=args.api_port, api_host=args.api_host,
+                              thermostat=args.thermostat)
+    try:
+        asyncio.run(daemon.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,385 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - ÇOKLU KART HAVUZU (DEVICE POOL)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Dosyadan okunan kart listesine göre N adet Klima/Perde kartını
+#           açık tutan, kopan bağlantıları geri çekilmeli (backoff) olarak yeniden
+#           kuran ve sorguları portları aşırı yüklemeden zamanlayan modüldür.
+# ==============================================================================
+
+"""
+Device Registry & Pool
+----------------------
+Kart listesi JSON dosyasından okunur (config.BOARDS_CONFIG_FILE):
+
+    {
+      "boards": [
+        {"name": "salon_ac", "type": "ac", "port": 10},
+        {"name": "salon_perde", "type": "curtain", "port": 12, "baud": 9600}
+      ]
+    }
+
+Dosya yoksa config.py'deki AC_BOARD_PORT / CURTAIN_BOARD_PORT ile iki kartlık
+varsayılan liste kullanılır.
+
+Her kart kendi asyncio görevinde sorgulanır ve her port tek bir karta aittir:
+v1 protokolünde adresleme yoktur, aynı hattaki iki kartın cevapları ayırt
+edilemez; bu yüzden aynı portu kullanan iki tanım reddedilir. Portun tüm
+trafiği (açma, protokol / hız pazarlığı, SET, sorgu) port kilidi altında yapılır
+ve aynı anda uçuşta olan toplam sorgu sayısı sınırlıdır (max_concurrent). Seri
+G/Ç beklemeye dayalı olduğu için tek thread (tek event loop) onlarca portu
+doldurmaya yeter.
+
+Uyarlamalı sorguda (config.ADAPTIVE_POLLING) her kartın ChannelScheduler'ı hangi
+kanalların ne zaman okunacağını belirler; sabit kanallar seyrek okunduğu için
+aynı porta daha fazla kart sığar.
+
+Push modunda (config.PUSH_MODE) v2 kartlara abone olunur:
+kart değerleri kendisi gönderir, görev sorgu yapmadan olay veya SET komutu gelene
+kadar bekler. Heartbeat süresince sessiz kalan kartın aboneliği yenilenir; aboneliği
+desteklemeyen kartlar sorgu ile okunmaya devam eder.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+import config as cfg
+import constants as const
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection, port_name_for
+from async_api import (
+    AsyncAirConditionerSystemConnection,
+    AsyncCurtainControlSystemConnection,
+    AsyncHomeAutomationSystemConnection,
+)
+from scheduler import ChannelScheduler
+from telemetry import TelemetryStore
+
+logger = logging.getLogger(__name__)
+
+# Konfigürasyon dosyasındaki "type" alanının karşılığı olan sınıflar
+BOARD_TYPES = {
+    "ac": (AirConditionerSystemConnection, AsyncAirConditionerSystemConnection),
+    "curtain": (CurtainControlSystemConnection, AsyncCurtainControlSystemConnection),
+}
+
+
+class BoardSpec:
+    """Konfigürasyon dosyasındaki tek bir kart tanımı."""
+
+    def __init__(self, name: str, board_type: str, port: Union[int, str], baud: int = cfg.DEFAULT_BAUDRATE):
+        if board_type not in BOARD_TYPES:
+            raise ValueError(f"Bilinmeyen kart tipi: {board_type} ({name})")
+        self.name = name
+        self.board_type = board_type
+        # COM numarası (int) veya cihaz yolu (örn: emülatör pty'si "/dev/pts/4")
+        self.port = int(port) if isinstance(port, int) or str(port).isdigit() else port
+        self.baud = int(baud)
+
+    def __repr__(self) -> str:
+        return f"BoardSpec({self.name!r}, {self.board_type!r}, {port_name_for(self.port)} @ {self.baud})"
+
+
+def default_config_path() -> str:
+    """config.BOARDS_CONFIG_FILE göreli ise src klasörüne göre çözümler."""
+    path = cfg.BOARDS_CONFIG_FILE
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    return path
+
+
+def load_board_specs(path: Optional[str] = None) -> List[BoardSpec]:
+    """
+    Kart listesini JSON dosyasından okur.
+
+    :param path: Dosya yolu (varsayılan: config.BOARDS_CONFIG_FILE).
+    :return: BoardSpec listesi. Dosya yoksa config.py'deki iki kart döner.
+    """
+    path = path or default_config_path()
+    if not os.path.exists(path):
+        logger.warning(f"Kart listesi bulunamadı ({path}), config.py portları kullanılıyor.")
+        return [
+            BoardSpec("ac", "ac", cfg.AC_BOARD_PORT),
+            BoardSpec("curtain", "curtain", cfg.CURTAIN_BOARD_PORT),
+        ]
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    specs = []
+    names = set()
+    for entry in data.get("boards", []):
+        spec = BoardSpec(entry["name"], entry["type"], entry["port"], entry.get("baud", cfg.DEFAULT_BAUDRATE))
+        if spec.name in names:
+            raise ValueError(f"Kart ismi tekrar ediyor: {spec.name}")
+        names.add(spec.name)
+        specs.append(spec)
+    check_unique_ports(specs)
+    return specs
+
+
+def check_unique_ports(specs: List[BoardSpec]) -> None:
+    """
+    Aynı seri portu kullanan iki kart tanımı varsa hata verir.
+
+    :raises ValueError: Port tekrar ediyorsa (3 ile "COM3" aynı porttur).
+    """
+    owners: Dict[str, str] = {}
+    for spec in specs:
+        port = port_name_for(spec.port)
+        if port in owners:
+            raise ValueError(f"{port} portu iki kartta tanımlı: {owners[port]}, {spec.name} "
+                             "(v1 protokolünde adresleme yok, bir port tek karta ait olmalı)")
+        owners[port] = spec.name
+
+
+def first_of_type(specs: List[BoardSpec], board_type: str) -> Optional[BoardSpec]:
+    """Listede verilen tipteki ilk kartı döner (tek kartlı arayüz için)."""
+    return next((s for s in specs if s.board_type == board_type), None)
+
+
+class PooledBoard:
+    """Havuzdaki bir kart: bağlantı nesnesi + yeniden bağlanma durumu."""
+
+    def __init__(self, spec: BoardSpec):
+        self.spec = spec
+        sync_cls, async_cls = BOARD_TYPES[spec.board_type]
+        device = sync_cls(spec.port)
+        device.setBaudRate(spec.baud)
+        self.conn: AsyncHomeAutomationSystemConnection = async_cls(device=device)
+        self.scheduler = ChannelScheduler.for_device(device)
+
+        self.backoff = cfg.RECONNECT_BACKOFF_MIN
+        self.next_attempt = 0.0
+        self.polls = 0
+        self.events = 0     # Push modunda işlenen olay turları
+        self.failures = 0
+        self.push = True    # False -> firmware aboneliği reddetti, sorgu ile okunur
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def device(self):
+        return self.conn.device
+
+
+class DevicePool:
+    """
+    N adet kartı sahiplenen ve sorgulayan havuz.
+
+    Kullanım:
+        pool = DevicePool.from_file()
+        await pool.run()          # stop() çağrılana kadar sorgular
+    """
+
+    def __init__(self, specs: List[BoardSpec], poll_interval: float = cfg.POLL_INTERVAL,
+                 max_concurrent: Optional[int] = None, telemetry: Optional[TelemetryStore] = None,
+                 adaptive: bool = cfg.ADAPTIVE_POLLING, push: bool = cfg.PUSH_MODE,
+                 heartbeat: float = cfg.PUSH_HEARTBEAT):
+        check_unique_ports(specs)
+        self.boards: Dict[str, PooledBoard] = {s.name: PooledBoard(s) for s in specs}
+        self.poll_interval = poll_interval
+        self.adaptive = adaptive  # True -> kanal başına hız (ChannelScheduler), False -> sabit periyot
+        self.push = push  # True -> uygun kartlar abonelikle (FRAME_EVENT) okunur
+        self.heartbeat = heartbeat
+        self.telemetry = telemetry  # Verilirse her sorgu sonrası değerler kaydedilir
+        # Her sorgu / olay turundan sonra çağrılır (örn. kontrol API'sinin SnapshotCache'i)
+        self.listeners: List[Callable[[PooledBoard], None]] = []
+
+        # Port başına tek bir işlem: açma / pazarlık, SET ve sorgu birbirine karışmaz
+        self._port_locks: Dict[Union[int, str], asyncio.Lock] = {}
+        self.max_concurrent = max_concurrent or max(len(specs), 1)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None, **kwargs) -> "DevicePool":
+        return cls(load_board_specs(path), **kwargs)
+
+    def get(self, name: str) -> AsyncHomeAutomationSystemConnection:
+        return self.boards[name].conn
+
+    def by_type(self, board_type: str) -> List[AsyncHomeAutomationSystemConnection]:
+        return [b.conn for b in self.boards.values() if b.spec.board_type == board_type]
+
+    async def run(self) -> None:
+        """Tüm kartlar için sorgu görevlerini başlatır ve stop() çağrılana kadar bekler."""
+        self._running = True
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._port_locks = {b.spec.port: asyncio.Lock() for b in self.boards.values()}
+
+        count = len(self.boards)
+        for i, board in enumerate(self.boards.values()):
+            # Başlangıçları periyoda yay, tüm kartlar aynı anda patlamasın
+            offset = self.poll_interval * i / count
+            self._tasks.append(asyncio.create_task(self._board_worker(board, offset), name=board.name))
+
+        try:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            for board in self.boards.values():
+                await board.conn.close()
+
+    def stop(self) -> None:
+        """Sorgu görevlerini durdurur."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def poll_once(self, board: PooledBoard) -> bool:
+        """
+        Kartı (gerekirse bağlanarak) bir kez sorgular.
+        Uyarlamalı modda sadece zamanı gelen kanallar okunur (hiçbiri gelmediyse sorgu yapılmaz).
+
+        :return: Kart bağlıysa True.
+        """
+        if not await self._ensure_connected(board):
+            return False
+
+        channels = None
+        if self.adaptive:
+            channels = board.scheduler.due()
+            if not channels:
+                # Sorgu zamanı gelmedi ama bekleyen SET komutları hemen gönderilir
+                if board.conn.commands:
+                    async with self._port_locks.setdefault(board.spec.port, asyncio.Lock()):
+                        await board.conn.flush_commands()
+                return True
+
+        async with self._port_locks.setdefault(board.spec.port, asyncio.Lock()):
+            if self._slots is None:
+                ok = await board.conn.update(channels)
+            else:
+                async with self._slots:
+                    ok = await board.conn.update(channels)
+        board.polls += 1
+
+        snapshot = board.device.snapshot
+        if channels is not None:
+            if ok:
+                board.scheduler.observe(snapshot, channels)
+            else:
+                board.scheduler.defer(channels)
+        if self.telemetry is not None and ok:
+            # Sadece bu sorguda okunan kanallar kaydedilir (taşınan eski değerler tekrar yazılmaz)
+            values = snapshot.as_dict()
+            if channels is not None:
+                values = {name: values[name] for name in channels}
+            self.telemetry.record_many(board.name, values, ts=snapshot.timestamp)
+        self._notify(board)
+        return True
+
+    async def stream_once(self, board: PooledBoard) -> bool:
+        """
+        Push modundaki kartın akışını bir kez dinler (abone değilse abone olur).
+        Olay veya SET komutu gelene kadar bekler; heartbeat açıkken
+        config.PUSH_SILENCE_TIMEOUT boyunca sessiz kalan kartın aboneliği yenilenir.
+
+        :return: Kart bağlıysa True.
+        """
+        conn = board.conn
+        if not conn.streaming:
+            if not await conn.subscribe(self.heartbeat):
+                board.push = False
+                logger.warning(f"Havuz: {board.name} aboneliği reddetti, sorgu ile okunacak.")
+            return conn.is_open
+
+        await conn.flush_commands()
+        # Olay (listen) ve SET komutu (commands.wait) hangisi önce gelirse
+        tasks = [asyncio.ensure_future(conn.listen(cfg.PUSH_SILENCE_TIMEOUT)),
+                 asyncio.ensure_future(conn.commands.wait(cfg.PUSH_SILENCE_TIMEOUT))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        published = 0 if tasks[0].cancelled() else tasks[0].result()
+
+        if published:
+            board.events += 1
+            snapshot = board.device.snapshot
+            if self.telemetry is not None:
+                self.telemetry.record_many(board.name, snapshot.as_dict(), ts=snapshot.timestamp)
+        elif self.heartbeat > 0 and time.monotonic() - conn.last_frame > cfg.PUSH_SILENCE_TIMEOUT:
+            # Kart resetlenmiş veya olaylar kayboluyor: bir sonraki turda yeniden abone olunur
+            board.device.health.record_failure()
+            conn.streaming = False
+            logger.warning(f"Havuz: {board.name} {cfg.PUSH_SILENCE_TIMEOUT:.1f} sn sessiz, abonelik yenileniyor.")
+        self._notify(board)
+        return conn.is_open
+
+    def _notify(self, board: PooledBoard) -> None:
+        """Dinleyicilere kartın yeni durumunu bildirir (değişim kontrolü dinleyicidedir)."""
+        for listener in self.listeners:
+            try:
+                listener(board)
+            except Exception as e:
+                logger.error(f"Havuz Dinleyici Hatası ({board.name}): {e}")
+
+    def _can_stream(self, board: PooledBoard) -> bool:
+        """Push modu açık, kart bağlı ve v2 ise True."""
+        return (self.push and board.push and board.conn.is_open
+                and board.device.protocol == const.PROTOCOL_V2)
+
+    async def _board_worker(self, board: PooledBoard, offset: float) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(offset)
+
+        while self._running:
+            started = loop.time()
+            connected = False
+            try:
+                if self._can_stream(board):
+                    await self.stream_once(board)
+                    continue  # stream_once olay/komut gelene kadar bekledi
+                connected = await self.poll_once(board)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                board.failures += 1
+                logger.error(f"Havuz Sorgu Hatası ({board.name}): {e}")
+
+            if connected and self.adaptive:
+                # Zamanı en erken gelecek kanala kadar uyu
+                delay = board.scheduler.delay()
+            else:
+                # Bir sonraki sorguya kadar kalan süre (sorgu süresi periyottan düşülür)
+                delay = self.poll_interval - (loop.time() - started)
+            # SET komutu gelirse beklemeden uyanılır (komutlar sorgulardan önceliklidir)
+            await board.conn.commands.wait(delay)
+
+    async def _ensure_connected(self, board: PooledBoard) -> bool:
+        """Kart kapalıysa backoff süresi dolmuşsa yeniden bağlanmayı dener."""
+        if board.conn.is_open:
+            return True
+
+        loop = asyncio.get_running_loop()
+        if loop.time() < board.next_attempt:
+            return False
+
+        # HELLO ve hız pazarlığı portun diğer trafiğiyle karışmasın
+        async with self._port_locks.setdefault(board.spec.port, asyncio.Lock()):
+            opened = await board.conn.open()
+        if opened:
+            logger.info(f"Havuz: {board.name} bağlandı ({board.conn.port_name}).")
+            board.backoff = cfg.RECONNECT_BACKOFF_MIN
+            board.push = True  # Firmware değişmiş olabilir, abonelik yeniden denenir
+            return True
+
+        # Üstel geri çekilme (+%20 jitter ki tüm kartlar aynı anda denemesin)
+        delay = board.backoff * (1 + random.uniform(0, 0.2))
+        board.next_attempt = loop.time() + delay
+        board.backoff = min(board.backoff * 2, cfg.RECONNECT_BACKOFF_MAX)
+        board.failures += 1
+        logger.warning(f"Havuz: {board.name} bağlanamadı, {delay:.1f} sn sonra tekrar denenecek.")
+        return False
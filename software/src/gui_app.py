@@ -4,6 +4,9 @@ import sys
 import os
 import threading
 import time
+import asyncio
+import logging
+import queue
 from datetime import datetime
 
 # ==============================================================================
@@ -21,8 +24,15 @@ sys.path.append(current_dir)
 
 # Kendi yazdığımız modüllerin içe aktarılması
 from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from async_api import AsyncAirConditionerSystemConnection, AsyncCurtainControlSystemConnection
+from device_pool import load_board_specs, first_of_type
+from scheduler import ChannelScheduler
+from telemetry import TelemetryStore
+from utils.logger import new_ring
 import config as cfg
 
+logger = logging.getLogger(__name__)
+
 # --- TEMA VE RENK PALETİ AYARLARI ---
 # Arayüzün genel renk şeması burada tanımlanır. Değişiklikler buradan tüm uygulamaya yansır.
 THEME = {
@@ -44,6 +54,9 @@ THEME = {
     "border": "#374151"  # İnce kenarlık çizgilerinin rengi
 }
 
+# Henüz yayınlanmamış alanları ayırt etmek için işaretçi (None da geçerli bir değer olabilir)
+_UNSET = object()
+
 # CustomTkinter genel ayarları
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -55,7 +68,7 @@ class ModernHomeAutomationGUI:
     Tüm pencereleri, butonları ve seri haberleşme işlemlerini yönetir.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, log_ring=None):
         self.root = root
         self.root.title("NEXUS CONTROL HUB v6.0")
         self.root.geometry("1280x820")
@@ -63,14 +76,50 @@ class ModernHomeAutomationGUI:
 
         # --- API BAĞLANTILARI (NESNE OLUŞTURMA) ---
         # Henüz portlar açılmadı, sadece nesneler tanımlandı.
-        self.ac_api = AirConditionerSystemConnection(com_port=cfg.AC_BOARD_PORT)
-        self.curtain_api = CurtainControlSystemConnection(com_port=cfg.CURTAIN_BOARD_PORT)
+        # Portlar kart listesinden (boards.json) alınır; panel başına ilk kart gösterilir.
+        specs = load_board_specs()
+        ac_spec = first_of_type(specs, "ac")
+        cur_spec = first_of_type(specs, "curtain")
+        self.ac_port = ac_spec.port if ac_spec else cfg.AC_BOARD_PORT
+        self.curtain_port = cur_spec.port if cur_spec else cfg.CURTAIN_BOARD_PORT
+
+        self.ac_api = AirConditionerSystemConnection(com_port=self.ac_port)
+        self.curtain_api = CurtainControlSystemConnection(com_port=self.curtain_port)
+
+        # Asenkron sarmalayıcılar aynı nesneleri (ve portlarını) paylaşır. Porta sadece
+        # arka plan event loop'u yazar; arayüz SET komutlarını bunların kuyruğuna ekler.
+        self.ac_async = AsyncAirConditionerSystemConnection(device=self.ac_api)
+        self.curtain_async = AsyncCurtainControlSystemConnection(device=self.curtain_api)
+
+        # Kanal başına uyarlamalı sorgu hızları (değişen kanal sık, sabit kanal seyrek okunur)
+        self.ac_sched = ChannelScheduler.for_device(self.ac_api)
+        self.curtain_sched = ChannelScheduler.for_device(self.curtain_api)
 
         # Durum değişkenleri
         self.ac_connected = False  # Klima kartı bağlı mı?
         self.curtain_connected = False  # Perde kartı bağlı mı?
         self.running = True  # Uygulama çalışıyor mu?
-        self.last_ambient = 0.0  # Trend okları için son sıcaklık hafızası
+
+        # Sensör geçmişi (RAM'de halka tampon + diske dakikalık/saatlik özet)
+        self.telemetry = TelemetryStore()
+
+        # Arka plan -> Arayüz değişiklik kuyruğu (sadece değişen alanlar taşınır)
+        self.ui_queue = queue.Queue()
+        self._published = {}  # Arka plan thread'inin son yayınladığı değerler
+        self._night_mode = None  # Son uygulanan gece/gündüz modu
+        self._clock_text = ""
+
+        # Terminal satırları (zaman, mesaj, etiket) önce bu sınırlı tampona yazılır;
+        # herhangi bir thread ekleyebilir, Tk widget'ına sadece update_gui_loop yazar.
+        # main.py aynı tampona WARNING ve üstü log kayıtlarını da ekler.
+        self.log_ring = log_ring if log_ring is not None else new_ring()
+
+        # Kart panelleri ilk bağlantıda, grafikler (matplotlib + numpy) ilk veri geldiğinde kurulur;
+        # bağlantısız açılış sadece iskeleti (menü, başlık, günlük) çizer
+        self.dashboard_built = False
+        self.chart_ac = None
+        self.chart_curtain = None
+        self.charts_enabled = True  # Kurulum başarısız olursa (örn. matplotlib yok) tekrar denenmez
 
         # --- GRID DÜZENİ (LAYOUT) ---
         # Ekranı ikiye bölüyoruz: Sol (Sidebar - Sabit), Sağ (Main Area - Esnek)
@@ -86,9 +135,20 @@ class ModernHomeAutomationGUI:
 
         # --- ARKA PLAN İŞLEMLERİ (THREADING) ---
         # Seri porttan veri okurken arayüz donmasın diye ayrı bir iş parçacığı başlatıyoruz.
+        # Portlara sadece bu thread'in event loop'u dokunur: bağlantı el sıkışması ve
+        # kapanış da loop içinde yapılır (bkz. async_connect, async_poll_loop).
+        self.loop = asyncio.new_event_loop()
+        self.wake = None  # Loop'u beklemesinden uyandıran olay (loop içinde oluşturulur)
+        self.connect_requested = False
         self.thread = threading.Thread(target=self.background_data_loop, daemon=True)
         self.thread.start()
 
+        # Telemetri diske yazımı / eski kayıt temizliği ayrı thread'de periyodik yapılır
+        # (sorgu döngüsü ve Tk ana thread'i disk G/Ç'si beklemez)
+        self.stop_event = threading.Event()
+        self.telemetry_thread = threading.Thread(target=self.telemetry_loop, daemon=True)
+        self.telemetry_thread.start()
+
         # Arayüzü periyodik olarak güncelleme döngüsünü başlat
         self.update_gui_loop()
 
@@ -113,8 +173,8 @@ class ModernHomeAutomationGUI:
 
         # Alt bileşenleri oluştur
         self.create_header()  # Üst Başlık ve Saat
-        self.create_dashboard()  # Paneller (Klima, Perde)
-        self.create_terminal()  # Alt Log Ekranı
+        self.create_placeholder()  # Paneller (Klima, Perde) ilk bağlantıda: ensure_dashboard
+        self.create_terminal()  # Alt Log Ekranı (Canlı grafikler ilk veriyle: create_charts)
 
         # Pencere kapatılınca çalışacak fonksiyon
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -187,11 +247,11 @@ class ModernHomeAutomationGUI:
         info_grid = ctk.CTkFrame(conn_box, fg_color="transparent")
         info_grid.pack(fill="x", padx=10, pady=(0, 10))
 
-        self.lbl_port_ac = ctk.CTkLabel(info_grid, text=f"AC: COM{cfg.AC_BOARD_PORT}",
+        self.lbl_port_ac = ctk.CTkLabel(info_grid, text=f"AC: COM{self.ac_port}",
                                         font=ctk.CTkFont(size=10, weight="bold"), text_color=THEME["text_sub"])
         self.lbl_port_ac.pack(side="left", padx=5)
 
-        self.lbl_port_cur = ctk.CTkLabel(info_grid, text=f"CUR: COM{cfg.CURTAIN_BOARD_PORT}",
+        self.lbl_port_cur = ctk.CTkLabel(info_grid, text=f"CUR: COM{self.curtain_port}",
                                          font=ctk.CTkFont(size=10, weight="bold"), text_color=THEME["text_sub"])
         self.lbl_port_cur.pack(side="right", padx=5)
 
@@ -237,6 +297,21 @@ class ModernHomeAutomationGUI:
                                      text_color=THEME["primary"])
         self.lbl_time.pack(side="right")
 
+    def create_placeholder(self):
+        """Paneller kurulana kadar dashboard alanında gösterilen hafif yer tutucu."""
+        self.placeholder = ctk.CTkFrame(self.main_area, fg_color=THEME["bg_panel"], corner_radius=16,
+                                        border_width=1, border_color=THEME["border"])
+        self.placeholder.grid(row=1, column=0, sticky="nsew")
+        ctk.CTkLabel(self.placeholder, text="Kart panelleri bağlantı kurulunca yüklenecek.",
+                     font=ctk.CTkFont(size=14, weight="bold"), text_color=THEME["text_sub"]).pack(expand=True)
+
+    def ensure_dashboard(self):
+        """Klima ve perde panellerini ilk ihtiyaç anında (bir kez) kurar."""
+        if self.dashboard_built: return
+        self.placeholder.destroy()
+        self.create_dashboard()
+        self.dashboard_built = True
+
     def create_dashboard(self):
         """Dashboard grid yapısını oluşturur (Klima ve Perde panelleri için yer açar)."""
         self.dash_frame = ctk.CTkFrame(self.main_area, fg_color="transparent")
@@ -378,11 +453,32 @@ class ModernHomeAutomationGUI:
                                              text_color="white", font=ctk.CTkFont(weight="bold"))
         self.btn_set_curtain.pack(fill="x", padx=20, pady=(0, 20))
 
+    def create_charts(self):
+        """Panellerin altındaki canlı sensör grafiklerini oluşturur (blitting ile güncellenir)."""
+        from live_plot import LiveChart  # matplotlib sadece burada yüklenir
+
+        charts = ctk.CTkFrame(self.main_area, fg_color="transparent")
+        charts.grid(row=2, column=0, sticky="ew", pady=(20, 0))
+        charts.grid_columnconfigure(0, weight=1)
+        charts.grid_columnconfigure(1, weight=1)
+
+        self.chart_ac = LiveChart(charts, self.telemetry, [
+            ("ac", "ambient_temp", "Ortam °C", THEME["primary"]),
+            ("ac", "desired_temp", "Hedef °C", THEME["text_sub"]),
+        ], THEME)
+        self.chart_ac.widget.grid(row=0, column=0, sticky="nsew", padx=(0, 12))
+
+        self.chart_curtain = LiveChart(charts, self.telemetry, [
+            ("curtain", "curtain_status", "Perde %", THEME["secondary"]),
+            ("curtain", "light_intensity", "Işık Lux", THEME["danger"]),
+        ], THEME)
+        self.chart_curtain.widget.grid(row=0, column=1, sticky="nsew")
+
     def create_terminal(self):
         """Alt kısımdaki Log/Terminal ekranını oluşturur."""
         term_frame = ctk.CTkFrame(self.main_area, fg_color=THEME["bg_panel"], height=130, corner_radius=12,
                                   border_width=1, border_color=THEME["border"])
-        term_frame.grid(row=2, column=0, sticky="ew", pady=(20, 0))
+        term_frame.grid(row=3, column=0, sticky="ew", pady=(20, 0))
         term_frame.pack_propagate(False)
 
         top = ctk.CTkFrame(term_frame, fg_color="transparent", height=24)
@@ -433,10 +529,11 @@ class ModernHomeAutomationGUI:
         Bağlantı yoksa kullanıcı komut gönderemez.
         """
         state = "normal" if enable else "disabled"
-        self.entry_temp.configure(state=state)
-        self.btn_set_temp.configure(state=state)
-        self.slider_curtain.configure(state=state)
-        self.btn_set_curtain.configure(state=state)
+        if self.dashboard_built:
+            self.entry_temp.configure(state=state)
+            self.btn_set_temp.configure(state=state)
+            self.slider_curtain.configure(state=state)
+            self.btn_set_curtain.configure(state=state)
 
         if enable:
             self.btn_connect.configure(text="SİSTEM BAĞLI", state="disabled", fg_color=THEME["bg_card"],
@@ -446,10 +543,24 @@ class ModernHomeAutomationGUI:
                                        text_color="white")
 
     def log_message(self, msg, tag="info"):
-        """Ekrana log basar. Otomatik timestamp ve renk ekler."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        """Terminale log satırı ekler (bloklamaz; ekrana bir sonraki arayüz turunda yazılır)."""
+        self.log_ring.append((datetime.now().timestamp(), msg, tag))
+
+    def flush_log(self):
+        """
+        ANA THREAD: Tampondaki satırları tek seferde terminale yazar.
+        Terminal GUI_LOG_LINES satırı geçerse en eski satırlar silinir.
+        """
+        if not self.log_ring: return
         self.log_box.configure(state="normal")  # Yazmak için kilidi aç
-        self.log_box.insert("end", f"[{timestamp}] {msg}\n", tag)
+        while self.log_ring:
+            created, msg, tag = self.log_ring.popleft()
+            timestamp = datetime.fromtimestamp(created).strftime("%H:%M:%S")
+            self.log_box.insert("end", f"[{timestamp}] {msg}\n", tag)
+
+        lines = int(self.log_box.index("end-1c").split(".")[0]) - 1
+        if lines > cfg.GUI_LOG_LINES:
+            self.log_box.delete("1.0", f"{lines - cfg.GUI_LOG_LINES + 1}.0")
         self.log_box.see("end")  # En sona kaydır
         self.log_box.configure(state="disabled")  # Tekrar kilitle
 
@@ -458,125 +569,331 @@ class ModernHomeAutomationGUI:
         ARKA PLAN THREAD:
         Seri porttan veri okuma işlemlerini burada yaparız ki arayüz donmasın.
         """
-        while self.running:
-            try:
-                if self.ac_connected: self.ac_api.update()
-                if self.curtain_connected: self.curtain_api.update()
-                time.sleep(0.5)  # İşlemciyi yormamak için kısa bekleme
-            except:
-                pass
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.async_poll_loop())
+        finally:
+            self.loop.close()
 
-    def update_gui_loop(self):
+    def wake_background(self):
+        """ANA THREAD: Arka plan döngüsünü beklemesinden hemen uyandırır (bağlan / kapat)."""
+        try:
+            self.loop.call_soon_threadsafe(lambda: self.wake and self.wake.set())
+        except RuntimeError:
+            pass  # Loop zaten kapandı
+
+    async def async_poll_loop(self):
         """
-        ANA THREAD DÖNGÜSÜ:
-        Arka planda (API'de) güncellenen verileri ekrana (Label'lara) yazar.
-        Tkinter'da GUI güncellemeleri SADECE ana thread'de yapılmalıdır.
+        Bağlı kartları tek bir event loop içinde AYNI ANDA sorgular.
+        Bir kartın zaman aşımı diğerinin güncellenmesini geciktirmez.
+        Her turda sadece zamanı gelen kanallar okunur (bkz. ChannelScheduler).
         """
-        if not self.running: return
-        self.lbl_time.configure(text=datetime.now().strftime("%H:%M:%S"))
+        boards = (
+            ("ac", self.ac_async, self.ac_sched),
+            ("curtain", self.curtain_async, self.curtain_sched),
+        )
+        self.wake = asyncio.Event()
 
+        while self.running:
+            if self.connect_requested:
+                self.connect_requested = False
+                await self.async_connect()
+
+            connected = {"ac": self.ac_connected, "curtain": self.curtain_connected}
+            try:
+                polls = []
+                for name, conn, sched in boards:
+                    if not connected[name]: continue
+                    channels = sched.due() if cfg.ADAPTIVE_POLLING else list(conn.device.CHANNELS)
+                    if channels: polls.append((name, conn, sched, channels))
+                    # Sorgu zamanı gelmese de bekleyen SET komutları hemen gönderilir
+                    elif conn.commands: await conn.flush_commands()
+
+                results = await asyncio.gather(*(conn.update(channels) for _, conn, _, channels in polls))
+
+                for (name, conn, sched, channels), ok in zip(polls, results):
+                    if not ok:
+                        sched.defer(channels)
+                        continue
+                    snap = conn.getSnapshot()
+                    sched.observe(snap, channels)
+                    # Sadece okunan kanallar kaydedilir
+                    self.telemetry.record_many(name, {ch: getattr(snap, ch) for ch in channels}, ts=snap.timestamp)
+                if polls: self.publish_changes()
+            except Exception as e:
+                # Tek bir turun hatası döngüyü durdurmaz; ama sessizce yutulmaz
+                logger.error(f"Sorgu Döngüsü Hatası: {e}", exc_info=True)
+
+            # Zamanı en erken gelecek kanala kadar bekle (en fazla POLL_INTERVAL).
+            # Arayüzden SET komutu, bağlanma veya kapanma isteği gelirse beklemeden uyanılır.
+            active = [(conn, sched) for name, conn, sched in boards if connected[name]]
+            delay = cfg.POLL_INTERVAL
+            if cfg.ADAPTIVE_POLLING:
+                delay = min([sched.delay() for _, sched in active] + [delay])
+            waits = [asyncio.ensure_future(conn.commands.wait(delay)) for conn, _ in active]
+            waits.append(asyncio.ensure_future(self.wait_wake(delay)))
+            _, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending: task.cancel()
+
+        # Kapanış: portlar da burada, asenkron close() ile kapatılır (push aboneliği ve
+        # canlı değiştirilen hız geri alınır); başka thread porta bu sırada dokunmaz
+        await asyncio.gather(*(conn.close() for _, conn, _ in boards if conn.is_open), return_exceptions=True)
+
+    async def wait_wake(self, timeout):
+        """ARKA PLAN THREAD: wake_background() çağrılana veya süre dolana kadar bekler."""
         try:
-            # --- KLIMA VERİLERİNİ GÜNCELLE ---
-            if self.ac_connected:
-                temp = self.ac_api.getAmbientTemp()
-                self.lbl_ac_ambient.configure(text=f"{temp:.2f}")
+            await asyncio.wait_for(self.wake.wait(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        self.wake.clear()
 
-                # Trend oku mantığı
-                if temp > self.last_ambient:
-                    self.lbl_trend_ac.configure(text="▲", text_color=THEME["danger"])
-                elif temp < self.last_ambient:
-                    self.lbl_trend_ac.configure(text="▼", text_color=THEME["secondary"])
-                else:
-                    self.lbl_trend_ac.configure(text="", text_color=THEME["text_sub"])
-                self.last_ambient = temp
+    async def async_connect(self):
+        """
+        ARKA PLAN THREAD:
+        Portları açar; kart destekliyorsa protokol v2'ye ve en yüksek hıza geçer, ardından
+        komutlar arası beklemeyi kullanılan hızda ölçer. İki kart aynı anda el sıkışır.
+        Sonuç arayüze değişiklik kuyruğuyla ("connect") bildirilir.
+        """
+        async def open_board(conn):
+            # open(): port + protokol v2 pazarlığı + (v2 ise) hız pazarlığı
+            if not await conn.open(): return False
+            await conn.calibratePacing()
+            return True
 
-                fan = self.ac_api.getFanSpeed()
-                self.bar_fan["label"].configure(text=f"{fan} RPS")
-                self.bar_fan["prog"].set(fan / 255)  # Progress bar 0-1 arası çalışır
+        try:
+            ok_ac, ok_cur = await asyncio.gather(open_board(self.ac_async), open_board(self.curtain_async))
+        except Exception as e:
+            logger.error(f"Bağlantı Hatası: {e}", exc_info=True)
+            self.log_message(f"Kritik Hata: {e}", "error")
+            ok_ac, ok_cur = self.ac_async.is_open, self.curtain_async.is_open
 
-                targ = self.ac_api.getDesiredTemp()
-                self.bar_target["label"].configure(text=f"{targ:.1f} °C")
-                self.bar_target["prog"].set(targ / 50)
+        self.ac_connected = ok_ac
+        self.curtain_connected = ok_cur
+        self.ui_queue.put({"connect": (ok_ac, ok_cur)})
 
-                # --- PERDE VERİLERİNİ GÜNCELLE ---
-                if self.curtain_connected:
-                    self.lbl_cur_temp["label"].configure(
-                        text=f"{self.curtain_api.getOutdoorTemp():.1f} {self.lbl_cur_temp['unit']}")
-                    self.lbl_cur_press["label"].configure(
-                        text=f"{self.curtain_api.getOutdoorPress():.1f} {self.lbl_cur_press['unit']}")
-                    self.lbl_cur_light["label"].configure(
-                        text=f"{self.curtain_api.getLightIntensity():.1f} {self.lbl_cur_light['unit']}")
+    def collect_fields(self):
+        """
+        ARKA PLAN THREAD:
+        Ekranda gösterilen tüm alanların güncel değerlerini (ve türetilmiş trend /
+        gece modu bilgisini) toplar. Analitik hesabı da burada yapılır, Tk thread'i yorulmaz.
+        """
+        import analytics  # numpy ilk bağlantıda, arka plan thread'inde yüklenir
+
+        fields = {}
+        if self.ac_connected:
+            # Tek bir tutarlı kare: tüm alanlar aynı snapshot'tan okunur
+            ac = self.ac_api.getSnapshot()
+            fields["ac.ambient"] = ac.ambient_temp
+            fields["ac.fan"] = ac.fan_speed
+            fields["ac.desired"] = ac.desired_temp
+
+            # Trend oku mantığı (son pencerenin EWMA ile yumuşatılmış eğimi)
+            times, values = self.telemetry.history("ac", "ambient_temp")
+            fields["ac.trend"] = analytics.trend(times[-cfg.ANALYTICS_WINDOW:], values[-cfg.ANALYTICS_WINDOW:])
+
+        if self.curtain_connected:
+            cur = self.curtain_api.getSnapshot()
+            lux = cur.light_intensity
+            fields["cur.temp"] = cur.outdoor_temp
+            fields["cur.press"] = cur.outdoor_pressure
+            fields["cur.light"] = lux
+            fields["cur.status"] = cur.curtain_status
+
+            # Gece/Gündüz kararı tek bir gürültülü byte yerine yumuşatılmış ışık ile verilir
+            _, lux_history = self.telemetry.history("curtain", "light_intensity")
+            smooth_lux = analytics.smoothed_latest(lux_history[-cfg.ANALYTICS_WINDOW:]) if lux_history else lux
+            fields["cur.night"] = smooth_lux < cfg.NIGHT_LUX_THRESHOLD
+        return fields
+
+    def publish_changes(self):
+        """
+        ARKA PLAN THREAD:
+        Sadece bir önceki yayından bu yana DEĞİŞEN alanları kuyruğa koyar.
+        Değer değişmediyse arayüz hiç uyandırılmaz.
+        """
+        fields = self.collect_fields()
+        changes = {k: v for k, v in fields.items() if self._published.get(k, _UNSET) != v}
+        if changes:
+            self._published.update(changes)
+            self.ui_queue.put(changes)
 
-                    cur_val = self.curtain_api.curtainStatus
-                    self.lbl_cur_stat["label"].configure(text=f"%{cur_val:.0f}")
+    def drain_changes(self):
+        """
+        ANA THREAD:
+        Kuyrukta biriken tüm değişiklikleri tek bir sözlükte birleştirir (son değer kazanır).
+        Böylece art arda gelen güncellemeler tek bir ekran güncellemesine iner.
+        """
+        merged = {}
+        while True:
+            try:
+                merged.update(self.ui_queue.get_nowait())
+            except queue.Empty:
+                return merged
 
-                    lux = self.curtain_api.getLightIntensity()
+    def telemetry_loop(self):
+        """
+        BAKIM THREAD'İ:
+        Kapanan özet kovalarını TELEMETRY_FLUSH_INTERVAL'da bir diske yazar, eski dakikalık
+        kayıtları açılışta ve TELEMETRY_COMPACT_INTERVAL'da bir siler.
+        """
+        next_compact = time.monotonic()
+        while True:
+            try:
+                self.telemetry.flush()
+                now = time.monotonic()
+                if now >= next_compact:
+                    self.telemetry.compact()
+                    next_compact = now + cfg.TELEMETRY_COMPACT_INTERVAL
+            except OSError as e:
+                logger.error(f"Telemetri Yazma Hatası: {e}")
+            if self.stop_event.wait(cfg.TELEMETRY_FLUSH_INTERVAL):
+                return  # Son flush'ı on_closing yapar
 
-                    is_night = lux < 12.0
+    def update_gui_loop(self):
+        """
+        ANA THREAD DÖNGÜSÜ:
+        Arka plandan gelen DEĞİŞİKLİKLERİ ekrana (Label'lara) yazar.
+        Sadece değeri değişen bileşenler yeniden yapılandırılır.
+        Tkinter'da GUI güncellemeleri SADECE ana thread'de yapılmalıdır.
+        """
+        if not self.running: return
 
-                    if not hasattr(self, "_last_lux"):
-                        self._last_lux = lux
+        now_text = datetime.now().strftime("%H:%M:%S")
+        if now_text != self._clock_text:
+            self._clock_text = now_text
+            self.lbl_time.configure(text=now_text)
 
-                    if abs(lux - self._last_lux) >= 0.1:
-                        self.log_message(f"LDR Lux güncellendi: {lux:.1f} Lux", "info")
-                        self._last_lux = lux
+        changes = {}
+        try:
+            changes = self.drain_changes()
+            connect = changes.pop("connect", None)  # Arka planda biten bağlantının sonucu
+            if connect is not None:
+                self.finish_connect(*connect)
+            if changes:
+                self.ensure_dashboard()
+                self.apply_changes(changes)
+        except Exception as e:
+            logger.error(f"GUI Update Hatası: {e}")
 
-                    # Gece ise KİLİTLE (Disabled), Gündüz ise AÇ (Normal)
+        # Grafikler ayrı korunur: matplotlib hatası etiketleri ve günlüğü durdurmaz
+        if changes and self.charts_enabled:
+            try:
+                # İlk veriyle kurulur, yeni örnek yoksa çizim yapılmaz
+                if self.chart_ac is None: self.create_charts()
+                if any(k.startswith("ac.") for k in changes): self.chart_ac.refresh()
+                if any(k.startswith("cur.") for k in changes): self.chart_curtain.refresh()
+            except ImportError as e:
+                self.charts_enabled = False
+                logger.error(f"Grafikler devre dışı (eksik bağımlılık): {e}")
+            except Exception as e:
+                logger.error(f"Grafik Hatası: {e}")
 
-                    if is_night:
-                        # GECE MODU -> KULLANICI KİLİTLİ
-                        self.slider_curtain.configure(state="disabled")
-                        self.btn_set_curtain.configure(state="disabled")
+        try:
+            self.flush_log()
+        except Exception as e:
+            logger.error(f"Günlük Yazma Hatası: {e}")
 
-                        # Kullanıcıya neden kilitli olduğunu söyleyen yazıyı göster
-                        self.curtain_lock_overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
-                        self.lbl_curtain_lock.configure(text="GECE MODU AKTİF\nOtomatik Kapatıldı\nKontrol Kilitli")
+        # 200 ms sonra bu fonksiyonu tekrar çağır (Sonsuz Döngü)
+        self.root.after(200, self.update_gui_loop)
 
-                    else:
-                        # GÜNDÜZ MODU -> KULLANICI SERBEST
-                        self.slider_curtain.configure(state="normal")
-                        self.btn_set_curtain.configure(state="normal")
+    def apply_changes(self, changes):
+        """ANA THREAD: Değişen alanları ilgili bileşenlere uygular."""
+        # --- KLIMA VERİLERİ ---
+        if "ac.ambient" in changes:
+            self.lbl_ac_ambient.configure(text=f"{changes['ac.ambient']:.2f}")
+
+        if "ac.trend" in changes:
+            direction = changes["ac.trend"]
+            if direction > 0:
+                self.lbl_trend_ac.configure(text="▲", text_color=THEME["danger"])
+            elif direction < 0:
+                self.lbl_trend_ac.configure(text="▼", text_color=THEME["secondary"])
+            else:
+                self.lbl_trend_ac.configure(text="", text_color=THEME["text_sub"])
+
+        if "ac.fan" in changes:
+            fan = changes["ac.fan"]
+            self.bar_fan["label"].configure(text=f"{fan} RPS")
+            self.bar_fan["prog"].set(fan / 255)  # Progress bar 0-1 arası çalışır
+
+        if "ac.desired" in changes:
+            targ = changes["ac.desired"]
+            self.bar_target["label"].configure(text=f"{targ:.1f} °C")
+            self.bar_target["prog"].set(targ / 50)
+
+        # --- PERDE VERİLERİ ---
+        if "cur.temp" in changes:
+            self.lbl_cur_temp["label"].configure(text=f"{changes['cur.temp']:.1f} {self.lbl_cur_temp['unit']}")
+        if "cur.press" in changes:
+            self.lbl_cur_press["label"].configure(text=f"{changes['cur.press']:.1f} {self.lbl_cur_press['unit']}")
+        if "cur.light" in changes:
+            lux = changes["cur.light"]
+            self.lbl_cur_light["label"].configure(text=f"{lux:.1f} {self.lbl_cur_light['unit']}")
+            self.log_message(f"LDR Lux güncellendi: {lux:.1f} Lux", "info")
+        if "cur.status" in changes:
+            self.lbl_cur_stat["label"].configure(text=f"%{changes['cur.status']:.0f}")
+
+        if "cur.night" in changes:
+            self.apply_night_mode(changes["cur.night"])
+
+    def apply_night_mode(self, is_night):
+        """
+        ANA THREAD: Gece ise perde kontrolünü KİLİTLE (Disabled), Gündüz ise AÇ (Normal).
+        Sadece mod değiştiğinde çağrılır.
+        """
+        self._night_mode = is_night
 
-                        # Kilitleme yazısını kaldır
-                        self.curtain_lock_overlay.place_forget()
+        if is_night:
+            # GECE MODU -> KULLANICI KİLİTLİ
+            self.slider_curtain.configure(state="disabled")
+            self.btn_set_curtain.configure(state="disabled")
 
+            # Kullanıcıya neden kilitli olduğunu söyleyen yazıyı göster
+            self.curtain_lock_overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self.lbl_curtain_lock.configure(text="GECE MODU AKTİF\nOtomatik Kapatıldı\nKontrol Kilitli")
 
-        except Exception as e:
-            print(f"GUI Update Hatası: {e}")
+        else:
+            # GÜNDÜZ MODU -> KULLANICI SERBEST
+            self.slider_curtain.configure(state="normal")
+            self.btn_set_curtain.configure(state="normal")
 
-        # 200 ms sonra bu fonksiyonu tekrar çağır (Sonsuz Döngü)
-        self.root.after(200, self.update_gui_loop)
+            # Kilitleme yazısını kaldır
+            self.curtain_lock_overlay.place_forget()
 
     def connect_system(self):
-        """Bağlantıyı Başlat butonuna basılınca çalışır."""
+        """
+        Bağlantıyı Başlat butonuna basılınca çalışır. Port açma ve kartlarla el sıkışma
+        arka plan loop'unda yapılır (arayüz donmaz); sonucu finish_connect uygular.
+        """
         self.log_message("Bağlantı başlatılıyor...", "cmd")
-        self.root.update()
-        try:
-            # Seri portları açmayı dene
-            ok_ac = self.ac_api.open()
-            ok_cur = self.curtain_api.open()
-
-            self.ac_connected = ok_ac
-            self.curtain_connected = ok_cur
-
-            # Sidebar'daki renkleri güncelle
-            self.update_sidebar_status(ok_ac, ok_cur)
-
-            if ok_ac or ok_cur:
-                self.toggle_controls(enable=True)
-                self.log_message(f"Bağlantı Başarılı (AC:{ok_ac}, CUR:{ok_cur})", "info")
-            else:
-                self.log_message("HATA: Portlara erişilemedi.", "error")
-                messagebox.showerror("Bağlantı Hatası", "Portlar açılamadı.")
-        except Exception as e:
-            self.log_message(f"Kritik Hata: {e}", "error")
+        self.btn_connect.configure(text="BAĞLANILIYOR...", state="disabled")
+        self.connect_requested = True
+        self.wake_background()
+
+    def finish_connect(self, ok_ac, ok_cur):
+        """ANA THREAD: Arka planda yapılan bağlantının sonucunu arayüze uygular."""
+        # Sidebar'daki renkleri güncelle
+        self.update_sidebar_status(ok_ac, ok_cur)
+
+        if ok_ac or ok_cur:
+            self.ensure_dashboard()
+            self.toggle_controls(enable=True)
+            # Gece modu değişmediği sürece tekrar yayınlanmaz; kilidi yeniden uygula
+            if self._night_mode is not None: self.apply_night_mode(self._night_mode)
+            self.log_message(f"Bağlantı Başarılı (AC:{ok_ac}, CUR:{ok_cur})", "info")
+        else:
+            self.toggle_controls(enable=False)  # Buton tekrar denenebilsin
+            self.log_message("HATA: Portlara erişilemedi.", "error")
+            messagebox.showerror("Bağlantı Hatası", "Portlar açılamadı.")
 
     def cmd_set_temp(self):
         """Klima 'Ayarla Gönder' butonu işlevi."""
         try:
             val = float(self.entry_temp.get())
             if 10 <= val <= 50:
-                self.ac_api.setDesiredTemp(val)
+                # Porta doğrudan yazılmaz: arka plan döngüsü sorgudan önce gönderir
+                self.ac_async.queueDesiredTemp(val)
+                self.ac_sched.kick(["desired_temp"])
                 self.log_message(f"AC Komut: {val}°C", "cmd")
             else:
                 messagebox.showwarning("Limit", "10-50 arası giriniz.")
@@ -586,14 +903,22 @@ class ModernHomeAutomationGUI:
     def cmd_set_curtain(self):
         """Perde 'Pozisyonu Uygula' butonu işlevi."""
         val = self.slider_curtain.get()
-        self.curtain_api.setCurtainStatus(val)
+        self.curtain_async.queueCurtainStatus(val)  # Son slider konumu kazanır
+        self.curtain_sched.kick(["curtain_status"])  # Motor dönmeye başlayacak: konumu sık izle
         self.log_message(f"Perde Komut: %{val:.0f}", "cmd")
 
     def on_closing(self):
-        """Pencere kapatılırken portları temizler ve thread'i durdurur."""
+        """
+        Pencere kapatılırken arka plan döngüsünü durdurur ve bitmesini bekler. Portlar
+        döngünün içinde kapatılır; kapatma el sıkışması sorgularla çakışmaz.
+        """
         self.running = False
-        if self.ac_connected: self.ac_api.close()
-        if self.curtain_connected: self.curtain_api.close()
+        self.stop_event.set()
+        self.wake_background()
+        self.thread.join(cfg.GUI_CLOSE_TIMEOUT)
+        if self.thread.is_alive():
+            logger.warning("Arka plan döngüsü zamanında durmadı; portlar kapatılmadan çıkılıyor.")
+        self.telemetry.flush(close_buckets=True)  # Döngünün son kayıtları da yazılır
         self.root.destroy()
         sys.exit()
 
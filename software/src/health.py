@@ -0,0 +1,136 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - KART SAĞLIK DURUMU
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Her kart için sağlıklı / bozulmuş / çevrimdışı durum makinesini,
+#           gözlenen gecikmeden hesaplanan uyarlamalı okuma zaman aşımını ve
+#           çevrimdışı kartların seyrek ve ucuz yoklanmasını yöneten modüldür.
+# ==============================================================================
+
+"""
+Board Health
+------------
+Durumlar:
+    HEALTHY   Son sorgu eksiksiz cevaplandı.
+    DEGRADED  Son sorgu(lar) eksik / cevapsız kaldı ama kart henüz düşmüş sayılmadı.
+              Normal sorgulanır; zaman aşımı her hatada iki katına çıkar.
+    OFFLINE   HEALTH_OFFLINE_AFTER kez üst üste başarısız. Tam sorgu GÖNDERİLMEZ;
+              sadece artan aralıklarla tek byte'lık PROBE_COMMAND ile yoklanır.
+              Yoklama cevaplanırsa kart DEGRADED'e döner ve sorgulanır.
+
+Uyarlamalı zaman aşımı (TCP RTO benzeri):
+    srtt   = 7/8 srtt + 1/8 ölçüm
+    rttvar = 3/4 rttvar + 1/4 |srtt - ölçüm|
+    timeout = srtt + 4 * rttvar   (HEALTH_MIN_TIMEOUT ile TIMEOUT_READ arasında)
+Ölçüm, son komut yazıldıktan sonra tüm cevapların okunmasına kadar geçen süredir;
+yani read() çağrısının gerçekten beklemesi gereken süre. Ölçüm yokken TIMEOUT_READ kullanılır.
+"""
+
+import logging
+import time
+from typing import Optional
+
+import config as cfg
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+OFFLINE = "offline"
+
+
+class BoardHealth:
+    """
+    Tek bir kartın sağlık durum makinesi.
+
+    :param name: Log mesajlarında kullanılan isim (örn: port adı).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = HEALTHY
+        self.failures = 0          # Üst üste başarısız sorgu sayısı
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.backoff_factor = 1.0  # Başarısızlık sonrası zaman aşımı çarpanı
+        self.probe_interval = cfg.HEALTH_PROBE_INTERVAL
+        self.next_probe = 0.0
+
+    # --- Karar ---
+
+    def should_poll(self, now: Optional[float] = None) -> bool:
+        """Kart şimdi sorgulanmalı mı? Çevrimdışı kartlar sadece yoklama zamanı gelince True döner."""
+        if self.state != OFFLINE:
+            return True
+        return (time.monotonic() if now is None else now) >= self.next_probe
+
+    def needs_probe(self) -> bool:
+        """Tam sorgudan önce tek byte'lık yoklama gerekiyor mu?"""
+        return self.state == OFFLINE
+
+    def read_timeout(self) -> float:
+        """Bir sorgunun cevaplarını beklemek için kullanılacak süre (saniye)."""
+        if self.srtt is None:
+            return cfg.TIMEOUT_READ
+        rto = (self.srtt + 4 * self.rttvar) * self.backoff_factor
+        return min(max(rto, cfg.HEALTH_MIN_TIMEOUT), cfg.TIMEOUT_READ)
+
+    def probe_timeout(self) -> float:
+        """Yoklama zaman aşımı: kart canlıyken ölçülen gecikmeye göre (geri çekilme uygulanmaz)."""
+        if self.srtt is None:
+            return cfg.TIMEOUT_READ
+        return min(max(self.srtt + 4 * self.rttvar, cfg.HEALTH_MIN_TIMEOUT), cfg.TIMEOUT_READ)
+
+    # --- Sonuçlar ---
+
+    def record_success(self, rtt: Optional[float] = None) -> None:
+        """Eksiksiz cevaplanan sorgu (rtt: son yazmadan okumanın bitişine kadar geçen süre)."""
+        if rtt is not None:
+            if self.srtt is None:
+                self.srtt, self.rttvar = rtt, rtt / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+                self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.failures = 0
+        self.backoff_factor = 1.0
+        self.probe_interval = cfg.HEALTH_PROBE_INTERVAL
+        self._set_state(HEALTHY)
+
+    def record_failure(self) -> None:
+        """Cevapsız veya eksik cevaplanan sorgu."""
+        self.failures += 1
+        self.backoff_factor = min(self.backoff_factor * 2, 64.0)
+        if self.failures >= cfg.HEALTH_OFFLINE_AFTER:
+            self._go_offline()
+        else:
+            self._set_state(DEGRADED)
+
+    def record_probe(self, answered: bool) -> None:
+        """
+        Çevrimdışı kart yoklamasının sonucu. Cevap gelirse kart DEGRADED'e döner ve sayaçlar
+        sıfırlanır: tekrar çevrimdışı sayılması için yine HEALTH_OFFLINE_AFTER hata gerekir,
+        yoklama aralığı da taban değerden başlar (ara sıra takılan kart tek hatayla düşmez).
+        """
+        if answered:
+            self.failures = 0
+            self.backoff_factor = 1.0
+            self.probe_interval = cfg.HEALTH_PROBE_INTERVAL
+            self._set_state(DEGRADED)
+            return
+        self.probe_interval = min(self.probe_interval * 2, cfg.HEALTH_PROBE_INTERVAL_MAX)
+        self.next_probe = time.monotonic() + self.probe_interval
+
+    def _go_offline(self) -> None:
+        self.next_probe = time.monotonic() + self.probe_interval
+        self._set_state(OFFLINE)
+
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        log = logger.warning if state == OFFLINE else logger.info
+        log(f"{self.name}: {self.state} -> {state}")
+        self.state = state
+
+    def __repr__(self) -> str:
+        srtt = f"{self.srtt * 1000:.1f} ms" if self.srtt is not None else "?"
+        return f"BoardHealth({self.name!r}, {self.state}, srtt={srtt}, timeout={self.read_timeout() * 1000:.0f} ms)"
@@ -0,0 +1,150 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - CANLI GRAFİKLER (MATPLOTLIB + BLITTING)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Telemetri deposundaki sensör geçmişini Tk arayüzüne gömülü
+#           grafiklerde gösterir. Sadece çizgiler yeniden çizilir (blitting);
+#           uzun geçmiş piksel başına min/max ile seyreltilir.
+# ==============================================================================
+
+"""
+Live Charts
+-----------
+Her güncellemede tüm figürü yeniden çizmek (canvas.draw) Tk ana döngüsünü
+yüzlerce ms kilitleyebilir. Bunun yerine:
+
+1. Eksenler, ızgara ve yazılar bir kez çizilir ve arka plan (copy_from_bbox) saklanır.
+2. Her güncellemede arka plan geri yüklenir, sadece 'animated' çizgiler
+   draw_artist ile çizilir ve canvas.blit ile ekrana basılır.
+3. Çizilen nokta sayısı grafik genişliğinin (piksel) iki katını geçmez
+   (analytics.decimate_minmax).
+
+Tam yeniden çizim sadece pencere boyutu değiştiğinde veya Y ekseni değiştiğinde
+yapılır. Y sınırları görünen veriden hesaplanır: değer dışarı taşarsa eksen hemen
+genişler, veri aralığı eksenin CHART_Y_SHRINK_RATIO oranının altına inerse daralır
+(tek bir sıçrama / bağlantı kopmasında okunan 0 pencereden çıkınca grafik eski
+ölçeğine döner; aradaki küçük oynamalar tam çizim tetiklemez).
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+import analytics
+import config as cfg
+
+
+def fit_ylim(current: Tuple[float, float], lo: float, hi: float,
+             shrink_ratio: float = cfg.CHART_Y_SHRINK_RATIO) -> Optional[Tuple[float, float]]:
+    """
+    Görünen verinin [lo, hi] aralığına göre yeni Y sınırları (histerezisli).
+
+    :param current: Mevcut (alt, üst) sınırlar.
+    :return: Yeni sınırlar veya mevcutlar uygunsa None (tam çizim gerekmez).
+    """
+    pad = max((hi - lo) * 0.1, 1.0)
+    target = (lo - pad, hi + pad)
+    y_lo, y_hi = current
+    if lo < y_lo or hi > y_hi:
+        return target  # Taşma: genişlet
+    if (target[1] - target[0]) < (y_hi - y_lo) * shrink_ratio:
+        return target  # Eksen verinin çok üstünde: daralt
+    return None
+
+
+class LiveChart:
+    """
+    Tek bir eksen üzerinde birden fazla telemetri kanalını gösteren canlı grafik.
+
+    :param parent: Grafiğin yerleşeceği Tk/CTk bileşeni.
+    :param telemetry: TelemetryStore nesnesi.
+    :param series: [(kart, kanal, etiket, renk), ...] listesi.
+    """
+
+    def __init__(self, parent, telemetry, series: List[Tuple[str, str, str, str]],
+                 theme: Dict[str, str], window_seconds: float = cfg.CHART_WINDOW_SECONDS):
+        self.telemetry = telemetry
+        self.series = series
+        self.window_seconds = window_seconds
+
+        self.figure = Figure(figsize=(5, 1.8), dpi=100, facecolor=theme["bg_panel"])
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_facecolor(theme["bg_card"])
+        self.ax.set_xlim(-window_seconds / 60.0, 0)  # X ekseni: dakika (0 = şimdi)
+        self.ax.tick_params(colors=theme["text_sub"], labelsize=7)
+        for spine in self.ax.spines.values():
+            spine.set_color(theme["border"])
+        self.ax.grid(True, color=theme["border"], linewidth=0.5)
+
+        self.lines = []
+        for _, _, label, color in series:
+            line, = self.ax.plot([], [], color=color, linewidth=1.2, label=label, animated=True)
+            self.lines.append(line)
+        legend = self.ax.legend(loc="upper left", fontsize=7, frameon=False)
+        for text in legend.get_texts():
+            text.set_color(theme["text_sub"])
+        self.figure.tight_layout(pad=0.4)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.widget = self.canvas.get_tk_widget()
+        self.widget.configure(bg=theme["bg_panel"], highlightthickness=0)
+
+        self._background = None
+        self._last_sample_ts: Optional[float] = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, _event) -> None:
+        """Tam çizimden sonra statik arka planı sakla ve çizgileri üzerine bas."""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Yeni örnek geldiyse çizgileri günceller (blit). Yeni veri yoksa hiçbir şey yapmaz.
+
+        :param force: True ise yeni veri olmasa da yeniden çizer.
+        """
+        stamps = [ts for ts in (self._latest_ts(b, c) for b, c, _, _ in self.series) if ts is not None]
+        newest = max(stamps, default=None)
+        if newest is None or (not force and newest == self._last_sample_ts):
+            return
+        self._last_sample_ts = newest
+
+        now = time.time()
+        width_px = max(int(self.figure.bbox.width), 1)
+        need_full_draw = self._background is None
+        lo = hi = None
+
+        for (board, channel, _, _), line in zip(self.series, self.lines):
+            times, values = self.telemetry.history(board, channel, since=now - self.window_seconds)
+            if not len(values):
+                line.set_data([], [])
+                continue
+            t, x = analytics.decimate_minmax(times, values, width_px)
+            line.set_data((t - now) / 60.0, x)
+
+            # Y sınırları sadece görünen pencereden hesaplanır (eski sıçramalar taşınmaz)
+            x_lo, x_hi = float(x.min()), float(x.max())
+            lo = x_lo if lo is None else min(lo, x_lo)
+            hi = x_hi if hi is None else max(hi, x_hi)
+
+        limits = fit_ylim(self.ax.get_ylim(), lo, hi) if lo is not None else None
+        if limits is not None:
+            self.ax.set_ylim(*limits)
+            need_full_draw = True
+
+        if need_full_draw:
+            self.canvas.draw()  # _on_draw arka planı yeniler
+            return
+
+        self.canvas.restore_region(self._background)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.figure.bbox)
+
+    def _latest_ts(self, board: str, channel: str) -> Optional[float]:
+        latest = self.telemetry.latest(board, channel)
+        return latest[0] if latest else None
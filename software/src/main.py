@@ -13,7 +13,6 @@ Bu dosya projenin TEK giriş noktasıdır.
 Gerekli kütüphaneleri yükler ve GUI uygulamasını başlatır.
 """
 
-import customtkinter as ctk
 import logging
 import sys
 import os
@@ -21,31 +20,32 @@ import os
 # --- PATH AYARLARI ---
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from gui_app import ModernHomeAutomationGUI
-    import config as cfg
-except ImportError as e:
-    print(f"KRİTİK HATA: Modüller yüklenemedi! {e}")
-    sys.exit(1)
+import config as cfg
+from utils.logger import RingLogHandler, new_ring, setup_logging, stop_logging
 
-# --- LOGGING KURULUMU ---
-if not os.path.exists(cfg.LOG_DIR):
-    os.makedirs(cfg.LOG_DIR)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(cfg.LOG_DIR, cfg.LOG_FILE_NAME), encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger("MainStarter")
 
 def main():
-    logger.info("==========================================")
-    logger.info("   EV OTOMASYON SİSTEMİ BAŞLATILIYOR...   ")
-    logger.info("==========================================")
+    # --- LOGGING KURULUMU ---
+    # Dosya/konsol yazımı arka plan thread'inde; uyarı ve hatalar arayüz terminaline de düşer
+    log_ring = new_ring()
+    setup_logging(log_file=os.path.join(cfg.LOG_DIR, cfg.LOG_FILE_NAME),
+                  extra_handlers=[RingLogHandler(log_ring)])
+
+    logger.info("==========================================", extra={"audit": True})
+    logger.info("   EV OTOMASYON SİSTEMİ BAŞLATILIYOR...   ", extra={"audit": True})
+    logger.info("==========================================", extra={"audit": True})
+
+    # Ağır modüller (customtkinter, matplotlib, numpy) import anında değil, arayüz
+    # açılırken yüklenir; cihaz katmanı script / servis kullanımında bunları ödemez.
+    try:
+        import customtkinter as ctk
+        from gui_app import ModernHomeAutomationGUI
+        import metrics
+    except ImportError as e:
+        logger.critical(f"KRİTİK HATA: Modüller yüklenemedi! {e}")
+        stop_logging()
+        sys.exit(1)
 
     try:
         # 1. Ana Pencereyi (Root) Oluştur
@@ -53,10 +53,14 @@ def main():
 
         # 2. GUI Sınıfını Başlat (gui_app.py içindeki sınıf)
         # Root penceresini parametre olarak gönder
-        gui = ModernHomeAutomationGUI(app_root)
+        gui = ModernHomeAutomationGUI(app_root, log_ring)
 
         logger.info("Arayüz başarıyla yüklendi.")
-        logger.info(f"Ayarlı Portlar -> Klima: COM{cfg.AC_BOARD_PORT}, Perde: COM{cfg.CURTAIN_BOARD_PORT}")
+
+        # İsteğe bağlı Prometheus metrik ucu (sadece yerel erişim)
+        if cfg.METRICS_HTTP_PORT:
+            metrics.start_http_server(cfg.METRICS_HTTP_PORT)
+        logger.info(f"Ayarlı Portlar -> Klima: COM{gui.ac_port}, Perde: COM{gui.curtain_port}")
 
         # 3. Ana Döngüyü (Main Loop) Başlat
         app_root.mainloop()
@@ -66,6 +70,7 @@ def main():
         sys.exit(1)
     finally:
         logger.info("Program sonlandırıldı.")
+        stop_logging()  # Kuyrukta kalan kayıtlar yazılır
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
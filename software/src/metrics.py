@@ -0,0 +1,298 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - PERFORMANS METRİKLERİ
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Seri haberleşmenin sıcak yolunda (hot path) komut başına gecikme
+#           histogramları ve hata sayaçları tutan, bunları sözlük olarak veya
+#           isteğe bağlı yerel bir HTTP ucundan Prometheus metin formatında
+#           sunan modüldür.
+# ==============================================================================
+
+"""
+Metrics
+-------
+Her bağlantı nesnesi (HomeAutomationSystemConnection) bir ConnectionMetrics
+taşır. Kayıt işlemi sadece tamsayı artırma ve bir dizi elemanı güncellemedir;
+kilit, ayırma (allocation) veya log yoktur.
+
+Gecikme: komutun porta yazılmasından cevabının çağırana ulaşmasına kadar geçen
+süre. Toplu sorguda (tek read) tüm cevaplar aynı anda ulaşır; asenkron yolda
+her byte geldiği an kaydedilir.
+
+Sayaçlar:
+    requests        Gönderilen GET komutu sayısı
+    timeouts        Cevabı HİÇ gelmeyen komutlar (0 ile doldurulan değerler)
+    short_reads     Cevabın bir kısmı gelmiş ama eksik kalmış sorgular
+    overruns        Sorgudan önce tamponda bulunan beklenmeyen byte'lar
+                    (geç gelen / kayan cevaplar, kartın FIFO taşması sonrası senkron kaybı)
+    write_timeouts  Yazma zaman aşımları
+    errors          Diğer seri port hataları
+    push_events     Push modunda karttan kendiliğinden gelen değer çerçeveleri
+
+HTTP ucu:
+    metrics.start_http_server(9108)   ->  http://127.0.0.1:9108/metrics
+
+http.server (ve zinciri: email, ssl, http.client) sadece uç başlatılınca yüklenir;
+cihaz katmanı bu modülü her zaman içe aktardığı için açılış süresine eklenmez.
+"""
+
+import logging
+import threading
+import weakref
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+import constants as const
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# --- HDR benzeri log-lineer kovalar (mikrosaniye) ---
+# 32'den küçük değerler birebir, üstü her ikinin kuvvetinde 16 alt kovaya bölünür
+# (bağıl hata < %6.25). 2^31 us (~35 dk) üstü son kovaya yazılır.
+_SUB_BITS = 5
+_SUB_HALF = 1 << (_SUB_BITS - 1)
+_MAX_SHIFT = 31 - _SUB_BITS
+_BUCKETS = (_MAX_SHIFT + 2) * _SUB_HALF
+
+COUNTER_NAMES = ("requests", "timeouts", "short_reads", "overruns", "write_timeouts", "errors",
+                 "bytes_sent", "bytes_received", "frame_errors", "push_events")
+
+# Prometheus çıktısında kullanılan sabit sınırlar (saniye)
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+
+def _bucket_index(us: int) -> int:
+    if us < 2 * _SUB_HALF:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    if shift > _MAX_SHIFT:
+        return _BUCKETS - 1
+    return shift * _SUB_HALF + (us >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Kovanın içerdiği en büyük değer (us)."""
+    if index < 2 * _SUB_HALF:
+        return index
+    shift = (index - _SUB_HALF) // _SUB_HALF
+    mantissa = index - shift * _SUB_HALF
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Sabit boyutlu, log-lineer kovalı gecikme histogramı (mikrosaniye çözünürlük)."""
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * _BUCKETS))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1_000_000)
+        if us < 0:
+            us = 0
+        self.counts[_bucket_index(us)] += 1
+        if self.count == 0 or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+        self.count += 1
+        self.total_us += us
+
+    def percentile(self, p: float) -> float:
+        """p. yüzdelik (0-100), saniye cinsinden. Boş histogramda 0."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(p / 100.0 * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """Her sınır (saniye) için o değere eşit/küçük örnek sayısı (Prometheus 'le')."""
+        result = []
+        index, seen = 0, 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while index < _BUCKETS and _bucket_upper(index) <= limit:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": (self.total_us / self.count / 1_000_000) if self.count else 0.0,
+            "min": self.min_us / 1_000_000,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max_us / 1_000_000,
+        }
+
+
+def command_names(prefix: str) -> Dict[int, str]:
+    """constants.py'deki komut isimlerini byte değerine eşler (örn: 0x06 -> CMD_CUR_GET_PRESSURE_INT)."""
+    return {value: name for name, value in vars(const).items()
+            if name.startswith(prefix) and isinstance(value, int)}
+
+
+class ConnectionMetrics:
+    """
+    Tek bir kart bağlantısının sayaçları ve komut başına gecikme histogramları.
+
+    :param board: Kart tipi etiketi ("ac", "curtain").
+    :param port: Port adı etiketi.
+    :param names: Komut byte'ı -> komut ismi eşlemesi.
+    """
+
+    def __init__(self, board: str, port: str, names: Optional[Dict[int, str]] = None):
+        self.board = board
+        self.port = port
+        self.names = names or {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTER_NAMES, 0)
+        self.latency: Dict[int, LatencyHistogram] = {}
+        _registry.add(self)
+
+    def command_name(self, cmd: int) -> str:
+        name = self.names.get(cmd)
+        if name:
+            return name
+        if cmd & 0xC0 == const.MASK_SET_INT_HEADER:
+            return "SET_INT"
+        if cmd & 0xC0 == const.MASK_SET_FRAC_HEADER:
+            return "SET_FRAC"
+        return f"0x{cmd:02X}"
+
+    def incr(self, counter: str, n: int = 1) -> None:
+        self.counters[counter] += n
+
+    def record_query(self, commands: Sequence[int], sent: Sequence[float],
+                     arrivals: Sequence[float], received: int,
+                     bytes_sent: Optional[int] = None, bytes_received: Optional[int] = None) -> None:
+        """
+        Toplu sorgunun sonucunu işler.
+
+        :param commands: Gönderilen komutlar.
+        :param sent: Her komutun yazıldığı an (perf_counter).
+        :param arrivals: Gelen her cevap byte'ının çağırana ulaştığı an.
+        :param received: Gelen cevap byte sayısı.
+        :param bytes_sent: Hatta giden byte (v2 çerçevesinde komut sayısından farklı).
+        :param bytes_received: Hattan gelen byte (v2 çerçevesinde değer sayısından farklı).
+        """
+        count = len(commands)
+        self.counters["requests"] += count
+        self.counters["bytes_sent"] += count if bytes_sent is None else bytes_sent
+        self.counters["bytes_received"] += received if bytes_received is None else bytes_received
+
+        for i in range(min(received, len(arrivals), len(sent))):
+            hist = self.latency.get(commands[i])
+            if hist is None:
+                hist = self.latency[commands[i]] = LatencyHistogram()
+            hist.record(arrivals[i] - sent[i])
+
+        if received == 0:
+            self.counters["timeouts"] += count
+        elif received < count:
+            self.counters["short_reads"] += 1
+            self.counters["timeouts"] += count - received
+
+    def snapshot(self) -> Dict:
+        """Anlık metrik görüntüsü (JSON'a yazılabilir)."""
+        return {
+            "board": self.board,
+            "port": self.port,
+            "counters": dict(self.counters),
+            "latency": {self.command_name(cmd): hist.summary() for cmd, hist in self.latency.items()},
+        }
+
+
+# Canlı tüm bağlantıların metrikleri (bağlantı silinince kendiliğinden düşer)
+_registry: "weakref.WeakSet[ConnectionMetrics]" = weakref.WeakSet()
+
+
+def all_metrics() -> List[ConnectionMetrics]:
+    return sorted(_registry, key=lambda m: (m.board, m.port))
+
+
+def snapshot_all() -> List[Dict]:
+    """Tüm canlı bağlantıların metrik görüntüleri."""
+    return [m.snapshot() for m in all_metrics()]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(items: Optional[Iterable[ConnectionMetrics]] = None) -> str:
+    """Metrikleri Prometheus metin formatına (v0.0.4) çevirir."""
+    items = list(all_metrics() if items is None else items)
+    lines = []
+
+    for counter in COUNTER_NAMES:
+        metric = f"nexus_serial_{counter}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for m in items:
+            lines.append(f'{metric}{{board="{_escape(m.board)}",port="{_escape(m.port)}"}} {m.counters[counter]}')
+
+    metric = "nexus_command_latency_seconds"
+    lines.append(f"# TYPE {metric} histogram")
+    for m in items:
+        for cmd, hist in sorted(m.latency.items()):
+            labels = f'board="{_escape(m.board)}",port="{_escape(m.port)}",command="{m.command_name(cmd)}"'
+            for bound, n in zip(PROMETHEUS_BUCKETS, hist.cumulative(PROMETHEUS_BUCKETS)):
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {hist.total_us / 1_000_000}")
+            lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _handler_class():
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format, *args)
+
+    return _MetricsHandler
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """
+    Prometheus metin ucunu arka planda başlatır.
+
+    :param port: Dinlenecek TCP portu (0 -> boş bir port seçilir).
+    :param host: Varsayılan olarak sadece yerel erişim.
+    :return: Sunucu nesnesi (server.shutdown() ile durdurulur).
+    """
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _handler_class())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MetricsHTTP", daemon=True).start()
+    logger.info(f"Metrik ucu: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,138 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - UYARLAMALI SORGU ZAMANLAYICISI
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Her kanalı (perde konumu, basınç, ışık...) kendi hızında sorgulayan;
+#           değer değişirken sorgu aralığını kısaltıp, sabitken uzatan
+#           zamanlayıcıdır. Seri hat bant genişliği gerçekten gerekene iner.
+# ==============================================================================
+
+"""
+Channel Scheduler
+-----------------
+Kanal: Snapshot'taki tek bir alan ve onu okuyan GET komutları
+(örn. "outdoor_pressure" -> CMD_CUR_GET_PRESSURE_INT + _FRAC).
+
+Her kanalın config.CHANNEL_POLL_RATES'te (min_aralık, max_aralık, ölü_bant) ayarı vardır:
+    - Değer son okumaya göre ölü banttan fazla değiştiyse aralık min_aralık'a iner
+      (örn. motor dönerken perde konumu hızlı izlenir).
+    - Değişmediyse aralık POLL_BACKOFF_FACTOR ile çarpılarak max_aralık'a kadar uzar.
+
+Zamanı gelen kanallar tek bir toplu sorguda birleştirilir. POLL_COALESCE_WINDOW
+içinde zamanı gelecek kanallar da aynı sorguya eklenir; böylece kanallar ayrı ayrı
+uyanıp hattı parça parça kullanmaz.
+
+Kullanım:
+    sched = ChannelScheduler.for_device(device)
+    names = sched.due()
+    if names and await conn.update(names):
+        sched.observe(device.snapshot, names)
+    await asyncio.sleep(sched.delay())
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config as cfg
+
+
+class _ChannelState:
+    """Tek bir kanalın zamanlama durumu."""
+
+    __slots__ = ("min_interval", "max_interval", "deadband", "interval", "next_due", "last_value")
+
+    def __init__(self, min_interval: float, max_interval: float, deadband: float):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.deadband = deadband
+        self.interval = min_interval
+        self.next_due = 0.0  # İlk çağrıda tüm kanallar okunur
+        self.last_value: Optional[float] = None
+
+
+class ChannelScheduler:
+    """
+    Kanal başına uyarlamalı sorgu zamanlayıcısı.
+
+    :param rates: Kanal adı -> (min_aralık, max_aralık, ölü_bant). Sıra sorgu sırasıdır.
+    :param backoff: Değişmeyen kanalın aralığının çarpanı.
+    :param coalesce: Bu süre içinde zamanı gelecek kanallar da şimdi sorgulanır (saniye).
+    """
+
+    def __init__(self, rates: Dict[str, Tuple[float, float, float]],
+                 backoff: float = cfg.POLL_BACKOFF_FACTOR, coalesce: float = cfg.POLL_COALESCE_WINDOW):
+        self.channels: Dict[str, _ChannelState] = {
+            name: _ChannelState(*rate) for name, rate in rates.items()
+        }
+        self.backoff = backoff
+        self.coalesce = coalesce
+
+    @classmethod
+    def for_device(cls, device, **kwargs) -> "ChannelScheduler":
+        """
+        Cihazın CHANNELS listesi için config.CHANNEL_POLL_RATES'teki hızlarla zamanlayıcı kurar.
+        Ayarı olmayan kanallar sabit POLL_INTERVAL ile sorgulanır.
+        """
+        configured = cfg.CHANNEL_POLL_RATES.get(device.BOARD_KIND, {})
+        default = (cfg.POLL_INTERVAL, cfg.POLL_INTERVAL, 0.0)
+        return cls({name: configured.get(name, default) for name in device.CHANNELS}, **kwargs)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Şimdi sorgulanması gereken kanallar (zamanı yakında gelecekler dahil)."""
+        now = time.monotonic() if now is None else now
+        if not any(st.next_due <= now for st in self.channels.values()):
+            return []
+        horizon = now + self.coalesce
+        return [name for name, st in self.channels.items() if st.next_due <= horizon]
+
+    def next_due(self) -> float:
+        """En erken sorgu zamanı (time.monotonic() ölçeğinde)."""
+        return min((st.next_due for st in self.channels.values()), default=float("inf"))
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Bir sonraki sorguya kadar beklenecek süre (saniye)."""
+        now = time.monotonic() if now is None else now
+        return max(self.next_due() - now, 0.0)
+
+    def observe(self, snapshot, names: Iterable[str], now: Optional[float] = None) -> None:
+        """
+        Başarılı sorgu sonrası okunan değerlere göre kanalların yeni aralıklarını belirler.
+
+        :param snapshot: Sorgudan sonra yayınlanan snapshot.
+        :param names: Bu sorguda okunan kanallar.
+        """
+        now = time.monotonic() if now is None else now
+        for name in names:
+            st = self.channels[name]
+            value = getattr(snapshot, name)
+            if st.last_value is not None and abs(value - st.last_value) > st.deadband:
+                st.interval = st.min_interval
+            elif st.last_value is not None:
+                st.interval = min(st.interval * self.backoff, st.max_interval)
+            st.last_value = value
+            st.next_due = now + st.interval
+
+    def defer(self, names: Iterable[str], now: Optional[float] = None) -> None:
+        """
+        Cevapsız sorgu: kanallar mevcut aralıkla ertelenir (hızlanma/yavaşlama olmaz).
+        Ölü kartın ayrıca yoklanmasını BoardHealth yönetir.
+        """
+        now = time.monotonic() if now is None else now
+        for name in names:
+            st = self.channels[name]
+            st.next_due = now + st.interval
+
+    def kick(self, names: Sequence[str], now: Optional[float] = None) -> None:
+        """
+        Kanalları hemen ve en hızlı aralıkla sorgulanacak hale getirir.
+        Örn. perdeye yeni konum gönderildiğinde motor dönmeye başlayacağı bilinir.
+        """
+        now = time.monotonic() if now is None else now
+        for name in names:
+            st = self.channels[name]
+            st.interval = st.min_interval
+            st.next_due = now
+
+    def intervals(self) -> Dict[str, float]:
+        """Kanalların güncel sorgu aralıkları (izleme / log için)."""
+        return {name: st.interval for name, st in self.channels.items()}
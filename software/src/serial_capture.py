@@ -0,0 +1,269 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SERİ TRAFİK KAYDI VE TEKRAR OYNATMA
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kartlarla yapılan tüm TX/RX byte alışverişini zaman damgalı olarak
+#           ikili bir dosyaya kaydeden ve bu kaydı bağlantı sınıflarına gerçek
+#           zamandan hızlı olarak geri besleyen taşıma (transport) katmanı.
+# ==============================================================================
+
+"""
+Serial Capture & Replay
+-----------------------
+Kayıt:
+    ac = AirConditionerSystemConnection(10)
+    ac.serial_factory = recording_factory("ac.cap")
+    ac.open(); ac.update(); ac.close()
+
+Tekrar oynatma (PICSimLab / com0com gerekmez):
+    ac = AirConditionerSystemConnection(10)
+    ac.serial_factory = replay_factory("ac.cap")          # Beklemesiz (en hızlı)
+    ac.serial_factory = replay_factory("ac.cap", speed=10) # Gerçek zamanın 10 katı
+
+Dosya formatı (little-endian):
+    Başlık : b"NXCAP1\\0\\0" + port adı uzunluğu (uint16) + port adı (utf-8)
+    Olay   : yön (uint8, 0=TX / 1=RX) + monotonik zaman (uint64, ns, kayıt başına göre)
+             + uzunluk (uint16) + veri
+
+Komut satırı:
+    python serial_capture.py ac.cap      # Kaydı okunabilir biçimde döker
+"""
+
+import logging
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"NXCAP1\0\0"
+EVENT_HEADER = struct.Struct("<BQH")
+TX = 0
+RX = 1
+
+
+def read_capture(path: str) -> Tuple[str, List[Tuple[int, int, bytes]]]:
+    """
+    Kayıt dosyasını okur.
+
+    :return: (port adı, [(yön, zaman_ns, veri), ...])
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(CAPTURE_MAGIC):
+        raise ValueError(f"Geçersiz kayıt dosyası: {path}")
+    offset = len(CAPTURE_MAGIC)
+    (name_len,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    port_name = data[offset:offset + name_len].decode("utf-8")
+    offset += name_len
+
+    events = []
+    view = memoryview(data)
+    while offset + EVENT_HEADER.size <= len(data):
+        direction, t_ns, length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        if offset + length > len(data):
+            break  # Yarım kalmış son olay (kayıt sırasında kesilmiş)
+        events.append((direction, t_ns, bytes(view[offset:offset + length])))
+        offset += length
+    return port_name, events
+
+
+class RecordingSerial:
+    """
+    Gerçek bir seri port nesnesini sarmalayarak her TX/RX byte'ını kaydeder.
+    Okuma/yazma davranışı değişmez; sadece dosyaya ek kayıt yapılır.
+    """
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic_ns()
+        self._file = open(path, "wb")
+        name = str(getattr(inner, "port", "") or "").encode("utf-8")
+        self._file.write(CAPTURE_MAGIC + struct.pack("<H", len(name)) + name)
+
+    def _log(self, direction: int, data: bytes) -> None:
+        if not data:
+            return
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(EVENT_HEADER.pack(direction, time.monotonic_ns() - self._t0, len(data)))
+                self._file.write(data)
+
+    # --- pyserial arayüzü ---
+
+    @property
+    def is_open(self) -> bool:
+        return self.inner.is_open
+
+    @property
+    def in_waiting(self) -> int:
+        return self.inner.in_waiting
+
+    @property
+    def port(self):
+        return getattr(self.inner, "port", None)
+
+    @property
+    def timeout(self):
+        return self.inner.timeout
+
+    @timeout.setter
+    def timeout(self, value) -> None:
+        # Uyarlamalı okuma zaman aşımı gerçek porta uygulanmalı
+        self.inner.timeout = value
+
+    def write(self, data: bytes) -> Optional[int]:
+        self._log(TX, bytes(data))
+        return self.inner.write(data)
+
+    def read(self, size: int = 1) -> bytes:
+        data = self.inner.read(size)
+        self._log(RX, data)
+        return data
+
+    def reset_input_buffer(self) -> None:
+        self.inner.reset_input_buffer()
+
+    def fileno(self) -> int:
+        return self.inner.fileno()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.inner.close()
+
+    def __getattr__(self, name):
+        # baudrate, timeout gibi diğer öznitelikler doğrudan gerçek porta yönlendirilir
+        return getattr(self.inner, name)
+
+
+class ReplaySerial:
+    """
+    Kayıt dosyasını seri port gibi davranarak geri oynatır.
+
+    Yazılan byte'lar kayıttaki TX akışıyla eşleştirilir; bir TX tüketildikten sonra
+    bir sonraki TX'e kadar olan RX olayları giriş tamponuna konur. speed=None ise
+    hiç beklenmez (gerçek zamandan çok daha hızlı), aksi halde kayıttaki zaman
+    aralıkları speed katsayısına bölünerek beklenir.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None, **_serial_kwargs):
+        self.port, self.events = read_capture(path)
+        self.speed = speed
+        self.is_open = True
+        self.timeout = _serial_kwargs.get("timeout")  # Geri oynatmada beklenmez, sadece saklanır
+        self.mismatches = 0
+
+        self._index = 0          # Sıradaki olay
+        self._tx_offset = 0      # Mevcut TX olayının tüketilen byte sayısı
+        self._rx = bytearray()
+        self._clock_ns = 0       # Oynatılan son olayın kayıt zamanı
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._rx)
+
+    @property
+    def finished(self) -> bool:
+        return self._index >= len(self.events) and not self._rx
+
+    def write(self, data: bytes) -> int:
+        for byte in bytes(data):
+            self._consume_tx_byte(byte)
+        self._release_rx()
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        self._release_rx()
+        chunk = bytes(self._rx[:size])
+        del self._rx[:size]
+        return chunk
+
+    def reset_input_buffer(self) -> None:
+        self._rx.clear()
+
+    def close(self) -> None:
+        self.is_open = False
+
+    def _consume_tx_byte(self, byte: int) -> None:
+        # Bu TX'ten önce kaydedilmiş RX'ler (istenmeden gelen veri) tampona alınır
+        while self._index < len(self.events) and self.events[self._index][0] == RX:
+            self._push_rx(self._index)
+            self._index += 1
+
+        if self._index >= len(self.events):
+            self.mismatches += 1
+            return
+
+        _, t_ns, data = self.events[self._index]
+        if self._tx_offset == 0:
+            self._wait_until(t_ns)
+        if data[self._tx_offset] != byte:
+            self.mismatches += 1
+            if self.mismatches == 1:
+                logger.warning(f"Replay: beklenen TX 0x{data[self._tx_offset]:02X}, yazılan 0x{byte:02X}")
+
+        self._tx_offset += 1
+        if self._tx_offset >= len(data):
+            self._index += 1
+            self._tx_offset = 0
+
+    def _release_rx(self) -> None:
+        """Mevcut TX'e cevap olarak kaydedilen (bir sonraki TX'e kadarki) RX olaylarını tampona alır."""
+        if self._tx_offset:
+            return  # TX olayının ortasındayız, cevap henüz gelmemiş olmalı
+        while self._index < len(self.events) and self.events[self._index][0] == RX:
+            self._push_rx(self._index)
+            self._index += 1
+
+    def _push_rx(self, index: int) -> None:
+        _, t_ns, data = self.events[index]
+        self._wait_until(t_ns)
+        self._rx += data
+
+    def _wait_until(self, t_ns: int) -> None:
+        if self.speed and t_ns > self._clock_ns:
+            time.sleep((t_ns - self._clock_ns) / 1e9 / self.speed)
+        self._clock_ns = max(self._clock_ns, t_ns)
+
+
+def recording_factory(path: str, inner_factory=None):
+    """
+    HomeAutomationSystemConnection.serial_factory için kayıt yapan fabrika.
+
+    :param inner_factory: Gerçek portu açan fonksiyon (varsayılan: serial.Serial).
+    """
+    def factory(**kwargs):
+        import serial
+        return RecordingSerial((inner_factory or serial.Serial)(**kwargs), path)
+    return factory
+
+
+def replay_factory(path: str, speed: Optional[float] = None):
+    """HomeAutomationSystemConnection.serial_factory için tekrar oynatan fabrika."""
+    def factory(**kwargs):
+        return ReplaySerial(path, speed=speed)
+    return factory
+
+
+def iter_dump(path: str) -> Iterator[str]:
+    """Kaydı satır satır okunabilir metne çevirir."""
+    port_name, events = read_capture(path)
+    yield f"# {path} ({port_name or '?'}) - {len(events)} olay"
+    for direction, t_ns, data in events:
+        arrow = "TX ->" if direction == TX else "RX <-"
+        yield f"{t_ns / 1e6:12.3f} ms  {arrow}  {data.hex(' ')}"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Kullanım: python serial_capture.py <kayıt.cap>")
+        sys.exit(1)
+    for line in iter_dump(sys.argv[1]):
+        print(line)
@@ -0,0 +1,319 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - TELEMETRİ (ZAMAN SERİSİ) DEPOSU
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kartlardan okunan sensör değerlerinin geçmişini RAM'de sabit boyutlu
+#           halka tamponlarda tutan ve dakikalık/saatlik özetlerini (min/max/ort)
+#           diske sıkıştırılmış ikili (binary) formatta ekleyen modüldür.
+# ==============================================================================
+
+"""
+Telemetry Store
+---------------
+- Son örnekler her (kart, kanal) için array('d') tabanlı halka tamponda tutulur;
+  örnek başına Python nesnesi oluşturulmaz, RAM kullanımı sabittir.
+- Her örnek dakikalık ve saatlik kovalara (min/max/toplam/adet) katlanır. Kova
+  kapandığında 24 byte'lık bir kayıt diske eklenecek şekilde sıraya alınır.
+- flush() sıradaki kayıtları 'TELEMETRY_DIR/<kart>/<kanal>.<1m|1h>.bin'
+  dosyalarına sadece ekleme (append-only) yaparak yazar.
+- compact() eski dakikalık kayıtları siler; saatlik kayıtlar kalıcıdır.
+- Kapanışta yazılan yarım kova, aynı dakika / saat içinde yeniden açılınca ikinci bir
+  kayıtla devam eder; read_aggregates() aynı başlangıçlı kayıtları birleştirerek döner.
+- flush() ve compact() depoyu kullanan uygulama tarafından periyodik çağrılır
+  (arayüzde ayrı bakım thread'i, serviste _housekeeping); record() hiçbir zaman
+  diske dokunmaz, sorgu yapan thread / event loop G/Ç beklemez. İkisi aynı dosya
+  kilidini tutar; compact dosyayı yeniden yazarken araya ekleme giremez.
+
+Kayıt formatı (little-endian): <d f f f I
+    kova_başlangıcı (unix sn, float64), min, max, ortalama (float32), örnek sayısı (uint32)
+"""
+
+import bisect
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import config as cfg
+
+# Disk kayıt formatı: başlangıç, min, max, ortalama, adet
+AGGREGATE_RECORD = struct.Struct("<dfffI")
+
+# Çözünürlük adı -> kova genişliği (saniye)
+RESOLUTIONS = {"1m": 60, "1h": 3600}
+
+
+class RingBuffer:
+    """
+    Sabit kapasiteli (zaman, değer) halka tamponu.
+    Veriler iki adet array('d') içinde tutulur; dolunca en eski örneğin üzerine yazılır.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0  # Bir sonraki yazılacak indeks
+        self.count = 0
+
+    def append(self, ts: float, value: float) -> None:
+        self.times[self.head] = ts
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def snapshot(self) -> Tuple[array, array]:
+        """Örnekleri eskiden yeniye sıralı olarak (kopya) döner."""
+        start = (self.head - self.count) % self.capacity
+        if start + self.count <= self.capacity:
+            end = start + self.count
+            return self.times[start:end], self.values[start:end]
+        return (self.times[start:] + self.times[:self.head],
+                self.values[start:] + self.values[:self.head])
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.count:
+            return None
+        i = (self.head - 1) % self.capacity
+        return self.times[i], self.values[i]
+
+
+def _merge_rows(rows) -> List[Tuple[float, float, float, float, int]]:
+    """
+    Aynı başlangıçlı ardışık kayıtları tek kayıtta birleştirir. Program kapanırken
+    yarım kova yazılır (flush(close_buckets=True)); aynı dakika / saat içinde yeniden
+    açılınca o kovanın geri kalanı ikinci bir kayıt olarak eklenir.
+    """
+    merged: List[Tuple[float, float, float, float, int]] = []
+    for row in rows:
+        if merged and merged[-1][0] == row[0]:
+            start, low, high, mean, count = merged[-1]
+            total = count + row[4]
+            merged[-1] = (start, min(low, row[1]), max(high, row[2]),
+                          (mean * count + row[3] * row[4]) / total if total else mean, total)
+        else:
+            merged.append(row)
+    return merged
+
+
+class _Bucket:
+    """Açık olan tek bir özet kovası (min/max/toplam/adet)."""
+
+    __slots__ = ("start", "min", "max", "sum", "count")
+
+    def __init__(self, start: float, value: float):
+        self.start = start
+        self.min = value
+        self.max = value
+        self.sum = value
+        self.count = 1
+
+    def add(self, value: float) -> None:
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+        self.sum += value
+        self.count += 1
+
+    def pack(self) -> bytes:
+        return AGGREGATE_RECORD.pack(self.start, self.min, self.max, self.sum / self.count, self.count)
+
+
+class _Series:
+    """Tek bir (kart, kanal) serisi: halka tampon + açık kovalar + diske yazılmayı bekleyen kayıtlar."""
+
+    def __init__(self, capacity: int):
+        self.ring = RingBuffer(capacity)
+        self.buckets: Dict[str, Optional[_Bucket]] = {name: None for name in RESOLUTIONS}
+        self.pending: Dict[str, bytearray] = {name: bytearray() for name in RESOLUTIONS}
+
+    def add(self, ts: float, value: float) -> None:
+        self.ring.append(ts, value)
+        for name, width in RESOLUTIONS.items():
+            start = ts - (ts % width)
+            bucket = self.buckets[name]
+            if bucket is not None and bucket.start == start:
+                bucket.add(value)
+                continue
+            if bucket is not None:
+                self.pending[name] += bucket.pack()
+            self.buckets[name] = _Bucket(start, value)
+
+
+class TelemetryStore:
+    """
+    Tüm kartların sensör geçmişini tutan depo.
+
+    Kullanım:
+        store = TelemetryStore()
+        store.record_many("ac", ac_api.readings())
+        times, values = store.history("ac", "ambient_temp")
+        store.flush()      # Periyodik (TELEMETRY_FLUSH_INTERVAL), sahibi çağırır
+        store.compact()    # Periyodik (TELEMETRY_COMPACT_INTERVAL), sahibi çağırır
+    """
+
+    def __init__(self, directory: Optional[str] = cfg.TELEMETRY_DIR,
+                 capacity: int = cfg.TELEMETRY_RING_SIZE):
+        """
+        :param directory: Özet dosyalarının klasörü. None ise diske yazılmaz.
+        :param capacity: Seri başına RAM'de tutulan örnek sayısı.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()       # RAM'deki seriler
+        self._file_lock = threading.Lock()  # Diskteki dosyalar (flush <-> compact)
+
+    # --- YAZMA ---
+
+    def record(self, board: str, channel: str, value: float, ts: Optional[float] = None) -> None:
+        """Tek bir örnek ekler."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._get_series(board, channel).add(ts, float(value))
+
+    def record_many(self, board: str, readings: Dict[str, float], ts: Optional[float] = None) -> None:
+        """Aynı anda okunan birden fazla kanalı tek zaman damgası ile ekler."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            for channel, value in readings.items():
+                self._get_series(board, channel).add(ts, float(value))
+
+    # --- OKUMA ---
+
+    def channels(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._series)
+
+    def history(self, board: str, channel: str, since: Optional[float] = None) -> Tuple[array, array]:
+        """
+        RAM'deki son örnekleri döner.
+
+        :param since: Verilirse sadece bu zamandan sonraki örnekler.
+        :return: (zamanlar, değerler) array('d') çifti.
+        """
+        with self._lock:
+            series = self._series.get((board, channel))
+            if series is None:
+                return array("d"), array("d")
+            times, values = series.ring.snapshot()
+
+        if since is not None:
+            i = bisect.bisect_right(times, since)
+            return times[i:], values[i:]
+        return times, values
+
+    def latest(self, board: str, channel: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            series = self._series.get((board, channel))
+            return series.ring.latest() if series else None
+
+    def read_aggregates(self, board: str, channel: str, resolution: str = "1m",
+                        since: Optional[float] = None) -> List[Tuple[float, float, float, float, int]]:
+        """
+        Diske yazılmış özet kayıtlarını okur.
+
+        :param resolution: "1m" (dakikalık) veya "1h" (saatlik).
+        :return: (başlangıç, min, max, ortalama, adet) listesi.
+        """
+        path = self._path(board, channel, resolution)
+        if path is None or not os.path.exists(path):
+            return []
+
+        with open(path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % AGGREGATE_RECORD.size  # Yarım kalmış son kaydı atla
+        rows = _merge_rows(AGGREGATE_RECORD.iter_unpack(memoryview(data)[:usable]))
+        if since is None:
+            return rows
+        return [r for r in rows if r[0] >= since]
+
+    # --- DİSK ---
+
+    def flush(self, close_buckets: bool = False) -> None:
+        """
+        Kapanmış kovaları diske ekler.
+
+        :param close_buckets: True ise açık kovalar da kapatılıp yazılır (program kapanırken).
+        """
+        if not self.directory:
+            return
+
+        # Dosya kilidi önce alınır: eşzamanlı iki flush'ın eklemeleri sıra değiştiremez
+        with self._file_lock:
+            self._flush_locked(close_buckets)
+
+    def _flush_locked(self, close_buckets: bool) -> None:
+        with self._lock:
+            batches = []
+            for (board, channel), series in self._series.items():
+                for name in RESOLUTIONS:
+                    if close_buckets and series.buckets[name] is not None:
+                        series.pending[name] += series.buckets[name].pack()
+                        series.buckets[name] = None
+                    if series.pending[name]:
+                        batches.append((self._path(board, channel, name), bytes(series.pending[name])))
+                        series.pending[name].clear()
+
+        # Disk G/Ç'si seri kilidi dışında yapılır (record() beklemez)
+        for path, payload in batches:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(payload)
+
+    def compact(self, retention_days: float = cfg.TELEMETRY_MINUTE_RETENTION_DAYS) -> None:
+        """
+        Dakikalık dosyalardan saklama süresini aşan kayıtları siler.
+        Saatlik dosyalar dokunulmadan kalır. Dosya geçici dosya + rename ile değiştirilir;
+        bu sırada flush() dosya kilidinde bekler, okuma ile rename arasında kayıt kaybolmaz.
+        """
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+
+        with self._file_lock:
+            self._compact_locked(retention_days)
+
+    def _compact_locked(self, retention_days: float) -> None:
+        cutoff = time.time() - retention_days * 86400
+        for board in os.listdir(self.directory):
+            board_dir = os.path.join(self.directory, board)
+            if not os.path.isdir(board_dir):
+                continue
+            for file_name in os.listdir(board_dir):
+                if not file_name.endswith(".1m.bin"):
+                    continue
+                path = os.path.join(board_dir, file_name)
+                with open(path, "rb") as f:
+                    data = f.read()
+                usable = len(data) - len(data) % AGGREGATE_RECORD.size
+                size = AGGREGATE_RECORD.size
+                # Kayıtlar zamana göre sıralı: ilk saklanacak kaydı bul
+                keep_from = usable
+                for offset in range(0, usable, size):
+                    if AGGREGATE_RECORD.unpack_from(data, offset)[0] >= cutoff:
+                        keep_from = offset
+                        break
+                if keep_from == 0:
+                    continue
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data[keep_from:usable])
+                os.replace(tmp, path)
+
+    def _get_series(self, board: str, channel: str) -> _Series:
+        key = (board, channel)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(self.capacity)
+        return series
+
+    def _path(self, board: str, channel: str, resolution: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, board, f"{channel}.{resolution}.bin")
+
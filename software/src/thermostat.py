@@ -0,0 +1,229 @@
+﻿# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - HOST TARAFI TERMOSTAT (KAPALI ÇEVRİM KONTROL)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Klima kartının ortam sıcaklığını havuzun sorgu/olay akışından izleyen,
+#           gün içi hedef programı ve PID düzeltmesi ile karta gönderilecek hedef
+#           sıcaklığı hesaplayan ve sadece anlamlı değişimde gönderen modüldür.
+# ==============================================================================
+
+"""
+Thermostat Engine
+-----------------
+Firmware (board1.asm) fanı ve ısıtıcıyı hedef sıcaklığın etrafında açıp kapatır; ancak
+odanın ısı kaybı yüzünden ortam sıcaklığı hedefin biraz altında / üstünde oturur.
+Termostat bu iç döngünün üstünde dış döngü olarak çalışır:
+
+    hedef    = program[yerel saat]                      (örn. 22.0 °C)
+    düzeltme = PID(hedef - ortam), ±THERMOSTAT_MAX_OFFSET ile sınırlı
+    karta    = hedef + düzeltme (0.1 °C'ye yuvarlanır)
+
+Karta yazım sayısı düşük tutulur: yeni değer son gönderilenden THERMOSTAT_MIN_CHANGE
+kadar farklı değilse veya son gönderimden bu yana THERMOSTAT_MIN_INTERVAL geçmediyse
+gönderilmez. Program geçişi (örn. 23:00'te gece hedefi) beklemeden gönderilir.
+Kart resetlenir ya da tuş takımından değiştirilirse, okunan hedef gönderilenden
+farklı kaldığı sürece en geç MIN_INTERVAL sonra tekrar gönderilir (termostat açıkken
+hedefin sahibi host'tur).
+
+Kullanım:
+    pool = DevicePool(specs)
+    engine = ThermostatEngine.attach(pool)   # Havuz dinleyicisi olarak eklenir
+    await pool.run()
+"""
+
+import bisect
+import logging
+import time
+from typing import Optional, Sequence, Tuple
+
+import config as cfg
+
+logger = logging.getLogger(__name__)
+
+
+class SetpointSchedule:
+    """
+    Gün içi hedef sıcaklık programı.
+
+    :param entries: ("SS:DD", °C) çiftleri; sıra önemli değildir.
+    :raises ValueError: Program boşsa veya saat biçimi hatalıysa.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, float]] = cfg.THERMOSTAT_SCHEDULE):
+        parsed = sorted((self._minutes(at), float(temp)) for at, temp in entries)
+        if not parsed:
+            raise ValueError("Termostat programı boş.")
+        self.minutes = [m for m, _ in parsed]
+        self.temps = [t for _, t in parsed]
+
+    @staticmethod
+    def _minutes(at: str) -> int:
+        try:
+            hour, minute = (int(part) for part in at.split(":"))
+        except ValueError:
+            raise ValueError(f"Geçersiz program saati: {at!r} (beklenen 'SS:DD')") from None
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Geçersiz program saati: {at!r}")
+        return hour * 60 + minute
+
+    def target(self, ts: Optional[float] = None) -> float:
+        """
+        Verilen andaki hedef sıcaklık.
+
+        :param ts: Unix zamanı (varsayılan: şimdi); yerel saate çevrilir.
+        :return: Hedef (°C). İlk girişten önceki saatler önceki günün son girişini kullanır.
+        """
+        local = time.localtime(time.time() if ts is None else ts)
+        index = bisect.bisect_right(self.minutes, local.tm_hour * 60 + local.tm_min) - 1
+        return self.temps[index]  # -1 -> son giriş (gece yarısından sonra)
+
+
+class PidController:
+    """
+    Çıkışı sınırlı, integral sarmasına (windup) karşı korumalı PID.
+
+    Türev ölçüm üzerinden alınır; program geçişinde hedef sıçradığında çıkış tekmelenmez.
+    İntegral çıkış biriminde tutulur; çıkış doymuşken hatayı büyüten integral birikmez.
+    """
+
+    def __init__(self, kp: float = cfg.THERMOSTAT_KP, ki: float = cfg.THERMOSTAT_KI,
+                 kd: float = cfg.THERMOSTAT_KD, limit: float = cfg.THERMOSTAT_MAX_OFFSET):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.out_min = -limit
+        self.out_max = limit
+        self.reset()
+
+    def reset(self) -> None:
+        self.integral = 0.0
+        self._last_measurement: Optional[float] = None
+
+    def step(self, setpoint: float, measurement: float, dt: float) -> float:
+        """
+        Bir kontrol adımı.
+
+        :param setpoint: Hedef değer.
+        :param measurement: Ölçülen değer.
+        :param dt: Önceki adımdan bu yana geçen süre (saniye); <= 0 ise I ve D uygulanmaz.
+        :return: Sınırlanmış çıkış.
+        """
+        error = setpoint - measurement
+        derivative = 0.0
+        integral = self.integral
+        if dt > 0:
+            integral += self.ki * error * dt
+            if self._last_measurement is not None:
+                derivative = -(measurement - self._last_measurement) / dt
+        self._last_measurement = measurement
+
+        output = self.kp * error + integral + self.kd * derivative
+        if output > self.out_max:
+            if error < 0:
+                self.integral = integral  # Doygunluktan çıkaran yönde biriktirmeye izin ver
+            return self.out_max
+        if output < self.out_min:
+            if error > 0:
+                self.integral = integral
+            return self.out_min
+        self.integral = integral
+        return output
+
+
+class ThermostatEngine:
+    """
+    Tek bir klima kartı için dış döngü termostatı.
+
+    :param conn: AsyncAirConditionerSystemConnection (queueDesiredTemp ile yazılır).
+    :param schedule: Hedef programı (varsayılan: config.THERMOSTAT_SCHEDULE).
+    :param pid: Denetleyici (varsayılan: config.THERMOSTAT_KP/KI/KD).
+    :param min_change: Bundan küçük hedef değişimleri gönderilmez (°C).
+    :param min_interval: İki gönderim arası en az süre (saniye).
+    :param limits: Gönderilebilecek (en düşük, en yüksek) hedef.
+    """
+
+    def __init__(self, conn, schedule: Optional[SetpointSchedule] = None, pid: Optional[PidController] = None,
+                 min_change: float = cfg.THERMOSTAT_MIN_CHANGE, min_interval: float = cfg.THERMOSTAT_MIN_INTERVAL,
+                 limits: Tuple[float, float] = cfg.THERMOSTAT_SETPOINT_LIMITS):
+        self.conn = conn
+        self.schedule = schedule or SetpointSchedule()
+        self.pid = pid or PidController()
+        self.min_change = min_change
+        self.min_interval = min_interval
+        self.limits = limits
+
+        self.target: Optional[float] = None     # Programdaki güncel hedef
+        self.last_sent: Optional[float] = None  # Karta en son gönderilen hedef
+        self.writes = 0
+        self.suppressed = 0  # Eşik / aralık yüzünden gönderilmeyen hesaplamalar
+        self._last_sent_at = 0.0
+        self._last_seq = 0
+        self._last_ts = 0.0
+
+    @classmethod
+    def attach(cls, pool, board_name: str = cfg.THERMOSTAT_BOARD, **kwargs) -> "ThermostatEngine":
+        """
+        Termostatı havuzdaki klima kartına bağlar; her sorgu / olay turunda çalışır.
+
+        :param board_name: Kart adı (boş -> ilk "ac" kartı).
+        :raises ValueError: Uygun klima kartı yoksa.
+        """
+        if board_name:
+            board = pool.boards.get(board_name)
+            if board is None or board.spec.board_type != "ac":
+                raise ValueError(f"Termostat için klima kartı bulunamadı: {board_name!r}")
+        else:
+            board = next((b for b in pool.boards.values() if b.spec.board_type == "ac"), None)
+            if board is None:
+                raise ValueError("Termostat için havuzda klima kartı yok.")
+
+        engine = cls(board.conn, **kwargs)
+        pool.listeners.append(engine.on_board)
+        logger.info(f"Termostat {board.name} kartına bağlandı (program: {len(engine.schedule.temps)} giriş).")
+        return engine
+
+    def on_board(self, board) -> None:
+        """Havuz dinleyicisi: sadece bağlı olduğu kartın yeni okumalarında çalışır."""
+        if board.conn is self.conn:
+            self.step(board.device.snapshot)
+
+    def step(self, snapshot, now: Optional[float] = None) -> Optional[float]:
+        """
+        Yeni bir okumayı işler; gerekiyorsa karta yeni hedef kuyruklar.
+
+        :param snapshot: AcSnapshot (aynı seq ikinci kez işlenmez).
+        :param now: Gönderim aralığı için monotonic zaman (test için).
+        :return: Gönderilen hedef veya gönderilmediyse None.
+        """
+        if snapshot.seq == 0 or snapshot.seq == self._last_seq:
+            return None
+        dt = snapshot.timestamp - self._last_ts if self._last_seq else 0.0
+        self._last_seq = snapshot.seq
+        self._last_ts = snapshot.timestamp
+        now = time.monotonic() if now is None else now
+
+        target = self.schedule.target(snapshot.timestamp)
+        transition = target != self.target
+        if transition and self.target is not None:
+            logger.info(f"Termostat: program hedefi {self.target:.1f} -> {target:.1f} °C")
+        self.target = target
+
+        correction = self.pid.step(target, snapshot.ambient_temp, dt)
+        low, high = self.limits
+        setpoint = round(min(max(target + correction, low), high), 1)
+
+        if not transition and self.last_sent is not None:
+            drifted = abs(snapshot.desired_temp - self.last_sent) >= self.min_change
+            if abs(setpoint - self.last_sent) < self.min_change and not drifted:
+                self.suppressed += 1
+                return None
+            if now - self._last_sent_at < self.min_interval:
+                self.suppressed += 1
+                return None
+
+        self.conn.queueDesiredTemp(setpoint)
+        self.writes += 1
+        self.last_sent = setpoint
+        self._last_sent_at = now
+        logger.debug(f"Termostat: hedef {target:.1f}, ortam {snapshot.ambient_temp:.1f} -> karta {setpoint:.1f} °C")
+        return setpoint
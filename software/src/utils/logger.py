@@ -6,53 +6,181 @@
 #           çıktılarını yöneten özelleştirilmiş loglama modülüdür.
 # ==============================================================================
 
+"""
+Kuyruklu Loglama
+----------------
+Seri port ve Tk thread'leri log kaydını sadece bir kuyruğa bırakır (QueueHandler);
+dosyaya / konsola yazma işini tek bir arka plan thread'i (QueueListener) yapar.
+Böylece yavaş disk veya dolu bir terminal sorgu döngüsünü ya da arayüzü bekletmez.
+
+    listener = setup_logging(log_file="logs/system.log")   # Uygulama başında bir kez
+    ...
+    stop_logging()                                         # Kuyruktaki kayıtlar yazılır
+
+Aynı mesaj (örn. kopuk kartın her turdaki zaman aşımı hatası) LOG_RATE_WINDOW
+içinde bir kez yazılır; bastırılan tekrarların sayısı bir sonraki kayda eklenir.
+"""
+
+import collections
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Deque, Dict, Optional, Sequence, Tuple
 
-# Logların kaydedileceği klasör
-LOG_DIR = "logs"
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+import config as cfg
 
+TEXT_FORMAT = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
-def get_logger(name="HomeAutomation"):
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Aynı (logger, seviye, mesaj) üçlüsünü pencere süresi içinde sadece bir kez geçirir.
+    Pencere dolduktan sonraki ilk kayda bastırılan tekrar sayısı eklenir (record.repeated).
+
+    Mesaj argümanlarıyla birleştirilmiş haliyle karşılaştırılır; "%s portu koptu" gibi
+    %-biçimli kayıtlarda farklı portlar ayrı olaylardır. exempt_level ve üstü ile
+    extra={"audit": True} verilen kayıtlar (SET komutları, açılış başlığı) hiç bastırılmaz.
+    """
+
+    def __init__(self, window: float = cfg.LOG_RATE_WINDOW, max_keys: int = 1024,
+                 exempt_level: int = logging.CRITICAL):
+        super().__init__()
+        self.window = window
+        self.exempt_level = exempt_level
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple[str, int, str], list] = {}  # anahtar -> [son geçiş zamanı, bastırılan]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.window <= 0 or record.levelno >= self.exempt_level or getattr(record, "audit", False):
+            return True
+        try:
+            message = record.getMessage()
+        except (TypeError, ValueError):
+            message = str(record.msg)  # Argümanları tutmayan kayıt; handler hatayı kendisi raporlar
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                return False
+            if entry is None and len(self._seen) >= self.max_keys:
+                self._seen.clear()  # Sınırsız büyümesin
+            record.repeated = entry[1] if entry else 0
+            self._seen[key] = [now, 0]
+        if record.repeated:
+            record.msg = f"{record.msg} (son {self.window:.0f} sn'de {record.repeated} tekrar bastırıldı)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak yazar (log toplayıcılar için)."""
+
+    FIELDS = ("board", "port", "repeated", "audit")  # extra={...} ile verilebilen alanlar
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for name in self.FIELDS:
+            value = getattr(record, name, None)
+            if value:
+                data[name] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class RingLogHandler(logging.Handler):
     """
-    Rotating File Handler kullanan yapılandırılmış logger.
+    Kayıtları sabit boyutlu bir halka tampona ekler (arayüz terminali için).
+    Tk widget'ına dokunmaz; ana thread tamponu kendi döngüsünde boşaltır.
     """
-    logger = logging.getLogger(name)
 
-    # Eğer logger daha önce yapılandırıldıysa tekrar ekleme yapma
-    if logger.handlers:
-        return logger
+    TAGS = {logging.ERROR: "error", logging.CRITICAL: "error"}
+
+    def __init__(self, ring: Deque[Tuple[float, str, str]], level: int = logging.WARNING):
+        super().__init__(level)
+        self.ring = ring
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.ring.append((record.created, record.getMessage(), self.TAGS.get(record.levelno, "info")))
 
-    logger.setLevel(logging.DEBUG)
 
-    # Format Belirleme (Zaman | Seviye | Dosya:Satır | Mesaj)
-    log_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)-8s | %(filename)s:%(lineno)d | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+def new_ring(size: int = cfg.GUI_LOG_LINES) -> Deque[Tuple[float, str, str]]:
+    """(zaman, mesaj, etiket) tutan, dolunca en eski satırı atan halka tampon."""
+    return collections.deque(maxlen=size)
 
-    # Dosyaya Yazma (Rotating File Handler)
-    # 5 MB'a ulaşınca dosyayı yedekle (app.log.1), en fazla 3 yedek tut.
-    file_handler = RotatingFileHandler(
-        os.path.join(LOG_DIR, "system.log"),
-        maxBytes=5 * 1024 * 1024,  # 5 MB
-        backupCount=3,
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(log_formatter)
-    file_handler.setLevel(logging.DEBUG)
 
-    # Konsola Yazma
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(log_formatter)
-    console_handler.setLevel(logging.INFO)  # Konsolda sadece INFO ve üstünü göster
+def setup_logging(level: str = "INFO", log_file: Optional[str] = None, console: bool = True,
+                  json_file: bool = cfg.LOG_JSON, extra_handlers: Sequence[logging.Handler] = ()) -> QueueListener:
+    """
+    Kök logger'a QueueHandler bağlar ve yazıcı handler'ları arka plan thread'inde başlatır.
+    Tekrar çağrılırsa önceki kurulum kapatılıp yenisi kurulur.
+
+    :param log_file: Verilirse döner (rotating) log dosyası; klasörü yoksa oluşturulur.
+    :param json_file: True ise dosyaya düz metin yerine satır başına JSON yazılır.
+    :param extra_handlers: Dinleyiciye eklenecek diğer handler'lar (örn. RingLogHandler).
+    :return: Çalışan QueueListener.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    text = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    handlers = list(extra_handlers)
+    if console:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(text)
+        handlers.append(stream)
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        file_handler = RotatingFileHandler(log_file, maxBytes=cfg.LOG_MAX_BYTES,
+                                           backupCount=cfg.LOG_BACKUP_COUNT, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter() if json_file else text)
+        handlers.append(file_handler)
 
-    # Handler'ları ekle
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    _queue_handler = QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    return logger
\ No newline at end of file
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Kuyruktaki kayıtları yazar, dinleyici thread'ini durdurur ve handler'ları kapatır."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def get_logger(name="HomeAutomation"):
+    """
+    İsimli logger döner; kuyruklu loglama henüz kurulmadıysa varsayılan dosya ile kurar.
+    """
+    if _listener is None:
+        setup_logging(log_file=os.path.join(cfg.LOG_DIR, cfg.LOG_FILE_NAME))
+    return logging.getLogger(name)
@@ -81,6 +81,56 @@ class TestAirConditionerSystem(unittest.TestCase):
         self.mock_conn.write.assert_has_calls(expected_requests)
         print("   -> SONUÇ: BAŞARILI [✓]")
 
+    def test_update_batched_single_write(self):
+        """Toplu Sorgu (Batch) Testi"""
+        print(f"[TEST SENARYOSU] Klima Toplu Sorgu (Tek write / Tek read)")
+
+        self.ac.open()
+        self.ac.inter_byte_pacing = 0
+        # Desired: 24.5, Ambient: 22.3, Fan: 7
+        self.mock_conn.read.return_value = bytes([24, 5, 22, 3, 7])
+
+        self.ac.update()
+
+        self.mock_conn.write.assert_called_once_with(bytes([
+            const.CMD_AC_GET_DESIRED_TEMP_INT,
+            const.CMD_AC_GET_DESIRED_TEMP_FRAC,
+            const.CMD_AC_GET_AMBIENT_TEMP_INT,
+            const.CMD_AC_GET_AMBIENT_TEMP_FRAC,
+            const.CMD_AC_GET_FAN_SPEED
+        ]))
+        self.mock_conn.read.assert_called_once_with(5)
+
+        print(f"   -> Okunan: Hedef={self.ac.getDesiredTemp()}, Ortam={self.ac.getAmbientTemp()}, Fan={self.ac.getFanSpeed()}")
+        self.assertEqual(self.ac.getDesiredTemp(), 24.5)
+        self.assertEqual(self.ac.getAmbientTemp(), 22.3)
+        self.assertEqual(self.ac.getFanSpeed(), 7)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_update_publishes_immutable_snapshot(self):
+        """Snapshot (Tutarlı Kare) Testi"""
+        print(f"[TEST SENARYOSU] update() sonunda tek bir değiştirilemez snapshot yayınlanır")
+
+        self.ac.open()
+        self.ac.inter_byte_pacing = 0
+        first = self.ac.getSnapshot()
+        self.assertEqual(first.seq, 0)
+
+        self.mock_conn.read.return_value = bytes([24, 5, 22, 3, 7])
+        self.ac.update()
+        snap = self.ac.getSnapshot()
+
+        print(f"   -> Snapshot: {snap}")
+        self.assertIsNot(snap, first)
+        self.assertEqual(snap.seq, 1)
+        self.assertGreater(snap.timestamp, 0)
+        self.assertEqual((snap.desired_temp, snap.ambient_temp, snap.fan_speed), (24.5, 22.3, 7))
+        with self.assertRaises(AttributeError):
+            snap.ambient_temp = 0.0
+        with self.assertRaises(AttributeError):
+            snap.extra = 1  # __slots__: yeni alan eklenemez
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
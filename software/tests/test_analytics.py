@@ -0,0 +1,101 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (SENSÖR ANALİTİĞİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: NumPy tabanlı vektörel analitik fonksiyonlarının sonuçlarını
+#           basit döngüsel (referans) hesaplarla karşılaştırır.
+# ==============================================================================
+
+import unittest
+from array import array
+import sys
+import os
+
+import numpy as np
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import analytics
+
+
+class TestAnalytics(unittest.TestCase):
+    """
+    Sensör Analitiği Testleri
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.values = 22.0 + rng.normal(0, 0.3, 500)
+        print("\n" + "-" * 60)
+
+    def test_rolling_stats_match_reference(self):
+        """Hareketli Ortalama / Std Testi"""
+        print(f"[TEST SENARYOSU] Vektörel hareketli istatistikler döngüsel hesapla aynı mı?")
+
+        window = 10
+        mean = analytics.rolling_mean(self.values, window)
+        std = analytics.rolling_std(self.values, window)
+
+        self.assertTrue(np.isnan(mean[:window - 1]).all())
+        for i in (window - 1, 100, 499):
+            chunk = self.values[i - window + 1:i + 1]
+            self.assertAlmostEqual(mean[i], chunk.mean(), places=9)
+            self.assertAlmostEqual(std[i], chunk.std(), places=9)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_ewma_matches_recursive_definition(self):
+        """EWMA Testi"""
+        print(f"[TEST SENARYOSU] Blok kapalı form EWMA, özyinelemeli tanımla aynı mı?")
+
+        alpha = 0.05  # Küçük alpha -> birden fazla blok kullanılır
+        values = np.concatenate([self.values] * 40)
+        expected = np.empty_like(values)
+        expected[0] = values[0]
+        for i in range(1, len(values)):
+            expected[i] = alpha * values[i] + (1 - alpha) * expected[i - 1]
+
+        np.testing.assert_allclose(analytics.ewma(values, alpha), expected, rtol=1e-9)
+        # array('d') girdisi de kabul edilir
+        np.testing.assert_allclose(analytics.ewma(array('d', values[:50]), alpha), expected[:50], rtol=1e-9)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_anomaly_and_trend(self):
+        """Anomali ve Trend Testi"""
+        print(f"[TEST SENARYOSU] Tek byte sıçraması anomali, yavaş artış trend olarak algılanır")
+
+        values = self.values.copy()
+        values[300] = 60.0  # Hatalı okuma
+        flags = analytics.anomaly_flags(values, window=20, threshold=4.0)
+        self.assertEqual(list(np.flatnonzero(flags)), [300])
+
+        times = np.arange(20) * 0.5
+        self.assertEqual(analytics.trend(times, 20.0 + times * 0.1), 1)
+        self.assertEqual(analytics.trend(times, 20.0 - times * 0.1), -1)
+        self.assertEqual(analytics.trend(times, np.full(20, 20.0)), 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_decimate_minmax_keeps_spikes(self):
+        """Min/Max Seyreltme Testi"""
+        print(f"[TEST SENARYOSU] Seyreltilmiş seride tek örneklik sıçrama korunur")
+
+        times = np.arange(10_000, dtype=float)
+        values = np.sin(times / 500.0)
+        values[4321] = 5.0
+        values[8765] = -5.0
+
+        t, x = analytics.decimate_minmax(times, values, 200)
+
+        self.assertEqual(len(x), 400)
+        self.assertEqual(x.max(), 5.0)
+        self.assertEqual(x.min(), -5.0)
+        self.assertTrue((np.diff(t) >= 0).all())
+        self.assertGreaterEqual(t[-1], times[-50])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (ASENKRON API)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Asenkron taşıma katmanının ve kartların eşzamanlı sorgulanmasının
+#           birim testlerini (mocking ile) içerir.
+# ==============================================================================
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch, call
+import sys
+import os
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from async_api import AsyncAirConditionerSystemConnection, AsyncCurtainControlSystemConnection, poll_all
+
+
+def make_mock_serial(reply: bytes):
+    """Cevabı tek parça halinde tamponda hazır bekleyen sahte seri port."""
+    conn = MagicMock()
+    conn.is_open = True
+    conn.fileno.side_effect = AttributeError  # Yoklama (polling) moduna zorla
+    conn.in_waiting = len(reply)
+    conn.read.side_effect = lambda n: reply[:n]
+    return conn
+
+
+class TestAsyncApi(unittest.TestCase):
+    """
+    Asenkron API Testleri
+    """
+
+    def setUp(self):
+        self.patcher = patch('serial.Serial')
+        self.MockSerial = self.patcher.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_poll_all_updates_both_boards(self):
+        """Eşzamanlı Sorgu Testi"""
+        print(f"[TEST SENARYOSU] İki kartın aynı event loop içinde sorgulanması")
+
+        ac_conn = make_mock_serial(bytes([24, 5, 22, 3, 7]))
+        cur_conn = make_mock_serial(bytes([10, 0, 24, 5, 13, 2, 50, 5]))
+        self.MockSerial.side_effect = [ac_conn, cur_conn]
+
+        ac = AsyncAirConditionerSystemConnection(3)
+        cur = AsyncCurtainControlSystemConnection(5)
+
+        async def scenario():
+            await ac.open()
+            await cur.open()
+            await poll_all([ac, cur])
+
+        asyncio.run(scenario())
+
+        self.assertEqual(ac.getDesiredTemp(), 24.5)
+        self.assertEqual(ac.getAmbientTemp(), 22.3)
+        self.assertEqual(ac.getFanSpeed(), 7)
+        self.assertEqual(cur.getCurtainStatus(), 20.0)
+        self.assertEqual(cur.getOutdoorTemp(), 24.5)
+        self.assertEqual(cur.getOutdoorPress(), 13.2)
+        self.assertEqual(cur.getLightIntensity(), 50.5)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_async_set_commands_protocol(self):
+        """Asenkron SET Komut Testi"""
+        print(f"[TEST SENARYOSU] Asenkron SET komutları senkron API ile aynı byte'ları gönderir mi?")
+
+        ac_conn = make_mock_serial(b"")
+        cur_conn = make_mock_serial(b"")
+        self.MockSerial.side_effect = [ac_conn, cur_conn]
+
+        ac = AsyncAirConditionerSystemConnection(3)
+        cur = AsyncCurtainControlSystemConnection(5)
+
+        async def scenario():
+            await ac.open()
+            await cur.open()
+            await ac.setDesiredTemp(25.5)
+            await cur.setCurtainStatus(55.5)
+
+        asyncio.run(scenario())
+
+        ac_conn.write.assert_has_calls([call(bytes([0x85])), call(bytes([0xD9]))])
+        cur_conn.write.assert_has_calls([call(bytes([0x88])), call(bytes([0xDB]))])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
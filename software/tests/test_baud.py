@@ -0,0 +1,114 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (BAUD RATE PAZARLIĞI)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: SPBRG hesabını, emüle kartlarla canlı hız değişimini, kartın
+#           desteklemediği hızda eski hıza geri dönüşü ve asenkron pazarlığı
+#           test eder.
+# ==============================================================================
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import config as cfg
+from automation_api import AirConditionerSystemConnection, baud_divisor
+from async_api import AsyncCurtainControlSystemConnection
+from board_emulator import AcBoardModel, CurtainBoardModel, EmulatorHub
+
+
+class TestBaudDivisor(unittest.TestCase):
+    """
+    SPBRG Hesabı Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_divisor_matches_firmware(self):
+        """SPBRG Testi"""
+        print(f"[TEST SENARYOSU] 4 MHz kristalde SPBRG değerleri ve baud hataları")
+
+        self.assertEqual(baud_divisor(9600)[0], 25)  # UART_Init ile aynı
+        self.assertEqual(baud_divisor(250000), (0, 0.0))
+        self.assertEqual(baud_divisor(19200)[0], 12)
+        self.assertGreater(baud_divisor(115200)[1], cfg.BAUD_MAX_ERROR)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü sadece POSIX sistemlerde çalışır")
+class TestBaudNegotiation(unittest.TestCase):
+    """
+    Canlı Hız Değişimi Testleri (pty emülatörü üzerinden)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_live_switch_and_fallback(self):
+        """Canlı Değişim / Geri Dönüş Testi"""
+        print(f"[TEST SENARYOSU] Kartın örnekleyemediği hız reddedilir, desteklenen hıza canlı geçilir")
+
+        model = AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=3, max_baud=130000)
+        board = self.hub.add(model)
+
+        ac = AirConditionerSystemConnection(board.port)
+        ac.inter_byte_pacing = model.LOOP_PERIOD
+        self.assertTrue(ac.open())
+        try:
+            ac.negotiateProtocol()
+            self.assertFalse(ac.setBaudRate(250000))  # Yankı bozuk -> iki taraf da 9600'e döner
+            self.assertEqual((ac.baud_rate, model.baud), (9600, None))
+            ac.update()
+            self.assertEqual(ac.getAmbientTemp(), 21.0)
+
+            self.assertEqual(ac.negotiateBaudRate([250000, 125000]), 125000)
+            self.assertEqual(ac.serial_conn.baudrate, 125000)
+            self.assertEqual(model.baud, 125000)
+            self.assertTrue(ac.setDesiredTemp(19.5))
+            ac.update()
+            self.assertEqual(ac.getDesiredTemp(), 19.5)
+        finally:
+            ac.close()
+        self.assertEqual(model.baud_switch.spbrg, 25)  # close() kartı taban hıza geri aldı
+        self.assertEqual(ac.baud_rate, 9600)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_async_open_negotiates_fastest_rate(self):
+        """Asenkron Pazarlık Testi"""
+        print(f"[TEST SENARYOSU] Asenkron open() v2 kartta en hızlı çalışan hıza geçer")
+
+        model = CurtainBoardModel(light_adc=90)
+        board = self.hub.add(model)
+        cur = AsyncCurtainControlSystemConnection(board.port)
+
+        async def scenario():
+            await cur.open()
+            ok = await cur.update()
+            rate = cur.device.baud_rate
+            await cur.close()
+            return ok, rate
+
+        ok, rate = asyncio.run(scenario())
+
+        self.assertTrue(ok)
+        self.assertEqual(rate, max(cfg.BAUD_CANDIDATES))
+        self.assertEqual(cur.getLightIntensity(), 30.0)
+        self.assertEqual(model.baud_switch.spbrg, 25)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (BENCHMARK ARAÇLARI)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Benchmark sonuç özetinin ve iki koşu arasındaki regresyon
+#           karşılaştırmasının doğruluğunu test eder.
+# ==============================================================================
+
+import os
+import sys
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(software_dir, 'src'))
+sys.path.insert(0, os.path.join(software_dir, 'benchmarks'))
+
+from run_benchmarks import summarize, compare_results, bench_float_to_parts
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Benchmark Araçları Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_summary_fields(self):
+        """Özet İstatistik Testi"""
+        print(f"[TEST SENARYOSU] Örneklerden medyan / p95 / min / max hesaplanır")
+
+        r = summarize("rtt.test", [float(i) for i in range(1, 101)], "ms", timeouts=0)
+
+        self.assertEqual((r["samples"], r["min"], r["max"]), (100, 1.0, 100.0))
+        self.assertEqual(r["median"], 50.5)
+        self.assertEqual(r["p95"], 95.0)
+        self.assertEqual(r["timeouts"], 0)
+
+        rates = bench_float_to_parts(3)[0]
+        self.assertTrue(rates["higher_is_better"])
+        self.assertGreater(rates["median"], 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_compare_flags_regressions(self):
+        """Regresyon Karşılaştırma Testi"""
+        print(f"[TEST SENARYOSU] Gecikme artışı ve hız düşüşü regresyon sayılır")
+
+        old = {"results": [
+            summarize("update.ac", [10.0], "ms"),
+            summarize("set_rate.x", [200.0], "cmd/s", higher_is_better=True),
+            summarize("rtt.ok", [5.0], "ms"),
+            {"name": "gui.frame", "skipped": "DISPLAY yok"},
+        ]}
+        new = {"results": [
+            summarize("update.ac", [13.0], "ms"),                                # %30 yavaş
+            summarize("set_rate.x", [120.0], "cmd/s", higher_is_better=True),    # %40 düşük
+            summarize("rtt.ok", [5.2], "ms"),                                    # %4 (eşik altı)
+            summarize("gui.frame", [3.0], "ms"),                                 # Eskide yok
+        ]}
+
+        rows = {r["name"]: r for r in compare_results(old, new, threshold=0.2)}
+
+        self.assertEqual(set(rows), {"update.ac", "set_rate.x", "rtt.ok"})
+        self.assertTrue(rows["update.ac"]["regression"])
+        self.assertTrue(rows["set_rate.x"]["regression"])
+        self.assertAlmostEqual(rows["set_rate.x"]["change"], 0.4)
+        self.assertFalse(rows["rtt.ok"]["regression"])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (KART EMÜLATÖRLERİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Firmware davranışını taklit eden pty emülatörlerine gerçek seri
+#           port (pyserial) üzerinden bağlanarak API sınıflarını test eder.
+# ==============================================================================
+
+import os
+import sys
+import time
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from board_emulator import AcBoardModel, CurtainBoardModel, EmulatorHub
+import constants as const
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü sadece POSIX sistemlerde çalışır")
+class TestBoardEmulator(unittest.TestCase):
+    """
+    Emüle Kart Testleri (pty üzerinden uçtan uca)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_ac_round_trip_over_pty(self):
+        """Klima Emülatörü Testi"""
+        print(f"[TEST SENARYOSU] Board #1 emülatörü okunur, hedef sıcaklık yazılıp geri okunur")
+
+        model = AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=120)
+        board = self.hub.add(model, latency=0.001, jitter=0.001)
+
+        ac = AirConditionerSystemConnection(board.port)
+        ac.inter_byte_pacing = model.LOOP_PERIOD  # Byte'lar en az bir ana döngü turu arayla gider
+        self.assertTrue(ac.open())
+        try:
+            ac.update()
+            self.assertEqual((ac.getDesiredTemp(), ac.getAmbientTemp(), ac.getFanSpeed()), (24.5, 21.0, 120))
+
+            ac.setDesiredTemp(18.3)
+            ac.update()
+            self.assertEqual(ac.getDesiredTemp(), 18.3)
+            self.assertEqual((model.desired_int, model.desired_frac), (18, 3))
+            self.assertEqual(board.overruns, 0)
+        finally:
+            ac.close()
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_curtain_night_lock_over_pty(self):
+        """Perde Emülatörü Testi"""
+        print(f"[TEST SENARYOSU] Board #2 gece modunda perdeyi kapatır ve PC komutunu yok sayar")
+
+        model = CurtainBoardModel(light_adc=150, temp_adc=101, pressure_adc=200)
+        board = self.hub.add(model)
+
+        curtain = CurtainControlSystemConnection(board.port)
+        self.assertTrue(curtain.open())
+        try:
+            curtain.setCurtainStatus(40)
+            curtain.update()
+            self.assertEqual(curtain.curtainStatus, 40.0)
+            # Firmware dönüşümleri: temp RRF carry'si, basınç /2, ışık /3
+            self.assertEqual(curtain.getOutdoorTemp(), ((101 >> 2) | 0x80) + 0.5)
+            self.assertEqual(curtain.getOutdoorPress(), 100.0)
+            self.assertEqual(curtain.getLightIntensity(), 50.0)
+
+            model.set_light_adc(10)  # Gece
+            curtain.setCurtainStatus(20)
+            curtain.update()
+            self.assertEqual(curtain.curtainStatus, 100.0)
+            self.assertEqual(model.target_steps, 50 * 20)
+
+            model.set_light_adc(200)  # Gün doğumu -> kullanıcı konumu geri gelir
+            curtain.update()
+            self.assertEqual(curtain.curtainStatus, 40.0)
+        finally:
+            curtain.close()
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_burst_overruns_board1_fifo(self):
+        """RX FIFO Taşma Testi"""
+        print(f"[TEST SENARYOSU] Aralıksız gönderilen komutlar Board #1 FIFO'sunu taşırır")
+
+        board = self.hub.add(AcBoardModel())
+        fd = os.open(board.port, os.O_RDWR | os.O_NOCTTY)
+        try:
+            import tty
+            tty.setraw(fd)
+            os.write(fd, bytes([const.CMD_AC_GET_FAN_SPEED] * 6))
+            deadline = time.monotonic() + 1.0
+            while board.overruns == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            os.close(fd)
+
+        self.assertGreater(board.overruns, 0)
+        self.assertTrue(board.model.rx_locked)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
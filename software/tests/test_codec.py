@@ -0,0 +1,106 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (TAM/ONDALIK KODEĞİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Önceden hesaplanmış kodek tablolarının eski float hesabıyla bit
+#           düzeyinde aynı sonucu verdiğini (perde x2 ölçeği dahil) ve toplu
+#           çözme / kodlama fonksiyonlarını test eder.
+# ==============================================================================
+
+import os
+import random
+import struct
+import sys
+import unittest
+from array import array
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import codec
+import constants as const
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+
+
+def reference_parts(value):
+    """Tablolardan önceki _float_to_parts."""
+    int_part = int(value)
+    frac_part = int(round((value - int_part) * 10))
+    if frac_part == 10:
+        int_part += 1
+        frac_part = 0
+    return int_part, frac_part
+
+
+def reference_set(value, limit):
+    """Tablolardan önceki v1 SET paketlemesi (klima: limit 63, perde: limit 50 ve value/2)."""
+    int_part, frac_part = reference_parts(value)
+    if int_part > limit:
+        int_part = limit
+    if frac_part > 9:
+        frac_part = 9
+    return bytes([const.MASK_SET_FRAC_HEADER | (frac_part & const.MASK_DATA_6BIT),
+                  const.MASK_SET_INT_HEADER | (int_part & const.MASK_DATA_6BIT)])
+
+
+def bits(value):
+    return struct.pack("<d", value)
+
+
+class TestCodecTables(unittest.TestCase):
+    """
+    Bit Düzeyinde Eşitlik Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_tables_match_previous_arithmetic(self):
+        """Bit Eşitliği Testi"""
+        print(f"[TEST SENARYOSU] 256x256 cevap çifti ve binlerce hedef değer eski hesapla aynı byte'ları verir")
+
+        ac = AirConditionerSystemConnection(0)
+        cur = CurtainControlSystemConnection(0)
+        for i in range(256):
+            for f in range(256):
+                raw = bytes([i, f])
+                self.assertEqual(bits(ac._decode_channel("ambient_temp", raw)), bits(i + (f / 10.0)))
+                self.assertEqual(bits(cur._decode_channel("curtain_status", raw)), bits((i + (f / 10.0)) * 2.0))
+
+        rng = random.Random(7)
+        values = [k / 10.0 for k in range(-100, 1100)] + [k / 100.0 for k in range(-500, 7000)]
+        values += [rng.uniform(-5, 120) for _ in range(5000)] + [0.1 + 0.2, 25.95, 63.95, -0.0, 25, True]
+        with self.assertLogs("automation_api", "WARNING"):  # Sınır aşımı uyarıları
+            self.check_encodings(ac, cur, values)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def check_encodings(self, ac, cur, values):
+        for v in values:
+            self.assertEqual(codec.float_to_parts(v), reference_parts(v), v)
+            self.assertEqual(ac._encode_desired_temp(v), reference_set(v, 63), v)
+            self.assertEqual(cur._encode_curtain_status(v), reference_set(v / 2.0, 50), v)
+            self.assertEqual(codec.encode_setpoints([v]), reference_set(v, 63), v)
+
+    def test_batch_decode_over_buffers(self):
+        """Toplu Çözme Testi"""
+        print(f"[TEST SENARYOSU] bytes / bytearray / memoryview tamponları kopyasız çözülür, tablo dışı byte eski hesapla")
+
+        data = bytearray([25, 5, 0, 0, 63, 9, 70, 12, 50, 0, 7])  # Son tek byte yok sayılır
+        expected = [25.5, 0.0, 63.9, 70 + 12 / 10.0, 50.0]
+
+        self.assertEqual(codec.decode_pairs(bytes(data)), expected)
+        self.assertEqual(codec.decode_pairs(memoryview(data)[:10]), expected)
+        self.assertEqual(codec.decode_pairs(data, scale=2), [v * 2.0 for v in expected])
+        word = array("H", [int.from_bytes(b"\x19\x05", sys.byteorder)])
+        self.assertEqual(codec.decode_pairs(memoryview(word)), [25.5])  # 'H' biçimli görünüm byte'a çevrilir
+
+        payload = codec.encode_setpoints([21.5, 100 / 2.0, 80.0], limit=50)
+        self.assertEqual(payload, bytes([0x85, 0xD5, 0x80, 0xF2, 0x80, 0xF2]))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
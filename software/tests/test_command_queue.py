@@ -0,0 +1,140 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (KOMUT KUYRUĞU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: SET komutlarının birleştirilmesini, sorgulardan önce gönderilmesini
+#           ve başka thread'den eklenen komutun bekleyen döngüyü uyandırmasını
+#           test eder.
+# ==============================================================================
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import codec
+import constants as const
+from automation_api import encode_frame
+from command_queue import CommandQueue
+from async_api import AsyncAirConditionerSystemConnection, AsyncCurtainControlSystemConnection
+
+
+class TestCommandQueue(unittest.TestCase):
+    """
+    Komut Kuyruğu Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_rapid_submits_collapse_to_latest(self):
+        """Birleştirme Testi"""
+        print(f"[TEST SENARYOSU] Hızlı slider hareketleri sadece son hedefe iner")
+
+        queue = CommandQueue()
+        worker = threading.Thread(target=lambda: [queue.submit("curtain_status", bytes([i])) for i in range(50)])
+        worker.start()
+        worker.join()
+        queue.submit("desired_temp", b"\x85\xd8")
+
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.take(), [("curtain_status", bytes([49])), ("desired_temp", b"\x85\xd8")])
+        self.assertEqual((queue.submitted, queue.coalesced), (51, 49))
+        self.assertEqual(queue.take(), [])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    @patch('config.PROTOCOL_MODE', 'v1')  # v1 byte akışı test ediliyor
+    @patch('serial.Serial')
+    def test_set_commands_go_before_reads(self, MockSerial):
+        """SET Önceliği Testi"""
+        print(f"[TEST SENARYOSU] Bekleyen SET byte'ları GET istekleriyle karışmadan önce gönderilir")
+
+        conn = MockSerial.return_value
+        conn.is_open = True
+        conn.fileno.side_effect = AttributeError
+        conn.in_waiting = 8
+        conn.read.side_effect = lambda n: bytes(n)
+
+        cur = AsyncCurtainControlSystemConnection(5)
+        cur.device.inter_byte_pacing = 0
+
+        async def scenario():
+            await cur.open()
+            for pct in (10, 40, 80):
+                cur.queueCurtainStatus(pct)
+            await cur.update()
+
+        asyncio.run(scenario())
+
+        written = b"".join(c.args[0] for c in conn.write.call_args_list)
+        set_bytes = cur.device._encode_curtain_status(80)
+        self.assertEqual(written, set_bytes + bytes(cur.device.UPDATE_COMMANDS))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    @patch('config.PROTOCOL_MODE', 'v1')  # Yeniden bağlantıda HELLO kaçırıldı: v1'e düşülür
+    @patch('serial.Serial')
+    def test_queued_value_encoded_with_protocol_at_send(self, MockSerial):
+        """Gönderim Anında Kodlama Testi"""
+        print(f"[TEST SENARYOSU] v2 iken kuyruğa giren hedef, v1'e düşen bağlantıda v1 SET olarak gider")
+
+        conn = MockSerial.return_value
+        conn.is_open = True
+        conn.fileno.side_effect = AttributeError
+        conn.in_waiting = 8
+        conn.read.side_effect = lambda n: bytes(n)
+
+        ac = AsyncAirConditionerSystemConnection(5)
+        ac.device.inter_byte_pacing = 0
+        ac.device.protocol = const.PROTOCOL_V2
+        ac.queueDesiredTemp(22.5)  # Eskiden burada 7e 02 02 16 05 c8 çerçevesi kuyruğa girerdi
+
+        async def scenario():
+            await ac.open()
+            await ac.update()
+
+        asyncio.run(scenario())
+
+        written = b"".join(c.args[0] for c in conn.write.call_args_list)
+        self.assertEqual(ac.device.protocol, const.PROTOCOL_V1)
+        self.assertTrue(written.startswith(codec.set_command(22, 5)))
+        self.assertNotIn(const.FRAME_SOF, written)
+
+        # v2 çerçevesinde aralık dışı parçalar sınırlanır (bytes() ValueError vermez)
+        ac.device.protocol = const.PROTOCOL_V2
+        cur = AsyncCurtainControlSystemConnection(6)
+        cur.device.protocol = const.PROTOCOL_V2
+        self.assertEqual(ac.device._encode_desired_temp(-0.5), encode_frame(const.FRAME_SET, bytes([0, 0])))
+        self.assertEqual(cur.device._encode_curtain_status(-10), encode_frame(const.FRAME_SET, bytes([0, 0])))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_submit_wakes_waiting_loop(self):
+        """Uyandırma Testi"""
+        print(f"[TEST SENARYOSU] Başka thread'den gelen komut, uyuyan döngüyü hemen uyandırır")
+
+        queue = CommandQueue()
+
+        async def scenario():
+            timer = threading.Timer(0.05, queue.submit, args=("desired_temp", b"\x80"))
+            started = time.perf_counter()
+            timer.start()
+            woke = await queue.wait(5.0)
+            return woke, time.perf_counter() - started
+
+        woke, elapsed = asyncio.run(scenario())
+
+        self.assertTrue(woke)
+        self.assertLess(elapsed, 1.0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
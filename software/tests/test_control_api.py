@@ -0,0 +1,228 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (KONTROL API'Sİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Snapshot önbelleğinin sadece değişimleri yaymasını, token / bilinmeyen
+#           kart / geçersiz komut hatalarını ve emüle kart üzerinden REST okuma,
+#           komut gönderme ve WebSocket canlı akışını test eder.
+# ==============================================================================
+
+import asyncio
+import base64
+import json
+import os
+import struct
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import config as cfg
+from board_emulator import AcBoardModel, EmulatorHub
+from control_api import ControlApiServer, SnapshotCache, WS_CLOSE, WS_CONTINUATION, WS_PING, WS_PONG, WS_TEXT
+from device_pool import BoardSpec, DevicePool
+
+
+async def http(port, method, path, body=None, token=None):
+    """Tek istekli HTTP istemcisi: (durum kodu, JSON gövde) döner."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\n{auth}"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def client_frame(opcode, payload=b"", fin=True, masked=True):
+    """İstemci çerçevesi (RFC 6455: istemci maskelemek zorundadır)."""
+    mask = b"\x11\x22\x33\x44" if masked else b""
+    body = bytes(b ^ mask[i & 3] for i, b in enumerate(payload)) if masked else payload
+    return bytes([(0x80 if fin else 0) | opcode, (0x80 if masked else 0) | len(payload)]) + mask + body
+
+
+class FrameSink:
+    """_ws_receive'in yazdığı sunucu çerçevelerini toplayan sahte StreamWriter."""
+
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+async def ws_recv(reader):
+    """Sunucudan gelen tek (maskesiz) WebSocket metin çerçevesini JSON olarak okur."""
+    head = await reader.readexactly(2)
+    size = head[1] & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", await reader.readexactly(2))[0]
+    return json.loads(await reader.readexactly(size))
+
+
+class TestSnapshotCache(unittest.TestCase):
+    """
+    Önbellek ve Doğrulama Testleri (seri port açılmadan)
+    """
+
+    def setUp(self):
+        self.pool = DevicePool([BoardSpec("klima", "ac", "/dev/null"), BoardSpec("perde", "curtain", "/dev/zero")])
+        print("\n" + "-" * 60)
+
+    def test_publishes_only_changes_and_drops_for_slow_client(self):
+        """Değişim Algılama / Yavaş İstemci Testi"""
+        print(f"[TEST SENARYOSU] Aynı snapshot tekrar yayılmaz; dolu kuyrukta en eski mesaj atılır")
+
+        cache = SnapshotCache(self.pool)
+        board = self.pool.boards["klima"]
+        with patch.object(cfg, "API_WS_QUEUE", 2):
+            queue = cache.subscribe()
+
+        for temp in (20.0, 21.0, 22.0):
+            device = board.device
+            device.snapshot = device.snapshot.evolve(device.snapshot.seq + 1, time.time(), desired_temp=temp)
+            self.pool._notify(board)
+            device.snapshot = device.snapshot.evolve(device.snapshot.seq + 1, time.time())
+            self.pool._notify(board)  # Değeri aynı kalan tur yayılmaz
+
+        messages = [json.loads(queue.get_nowait()) for _ in range(queue.qsize())]
+        self.assertEqual([m["values"]["desired_temp"] for m in messages], [21.0, 22.0])
+        self.assertIs(cache.get("klima"), cache.get("klima"))  # Tekrar serileştirilmez
+        self.assertEqual(messages[-1]["health"], "healthy")
+        self.assertFalse(messages[-1]["connected"])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_rejects_bad_token_unknown_board_and_command(self):
+        """Hatalı İstek Testi"""
+        print(f"[TEST SENARYOSU] Token yoksa 401, bilinmeyen kart 404, aralık dışı / yanlış komut 400")
+
+        api = ControlApiServer(self.pool, host="127.0.0.1", port=0, token="gizli")
+
+        async def scenario():
+            port = await api.start()
+            results = [
+                await http(port, "GET", "/api/boards"),
+                await http(port, "GET", "/api/boards/yok", token="gizli"),
+                await http(port, "POST", "/api/boards/klima/commands", {"desired_temp": 99}, token="gizli"),
+                await http(port, "POST", "/api/boards/klima/commands", {"curtain_status": 10}, token="gizli"),
+                await http(port, "GET", "/api/boards/klima/commands", token="gizli"),
+                await http(port, "GET", "/api/boards", token="gizli"),
+            ]
+            await api.close()
+            return results
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual([status for status, _ in results], [401, 404, 400, 400, 405, 200])
+        self.assertEqual([b["board"] for b in results[-1][1]], ["klima", "perde"])
+        self.assertEqual(self.pool.boards["klima"].conn.commands.submitted, 0)  # Hiçbir komut kuyruğa girmedi
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+    def test_websocket_fragments_and_protocol_errors(self):
+        """WebSocket Çerçeve Kuralları Testi"""
+        print(f"[TEST SENARYOSU] Parçalı mesaj arasına ping girebilir; maskesiz / sırasız çerçeve 1002 ile kapatılır")
+
+        def receive(*frames):
+            async def scenario():
+                reader = asyncio.StreamReader()
+                reader.feed_data(b"".join(frames))
+                reader.feed_eof()
+                sink = FrameSink()
+                try:
+                    await ControlApiServer._ws_receive(reader, sink)
+                except asyncio.IncompleteReadError:
+                    pass  # İstemci bağlantıyı kapattı
+                return sink.data
+            return asyncio.run(scenario())
+
+        close_1002 = bytes([0x80 | WS_CLOSE, 2]) + struct.pack("!H", 1002)
+
+        # Parçalı metin + arada ping + devam; sonra normal kapanış
+        replies = receive(client_frame(WS_TEXT, b"mer", fin=False), client_frame(WS_PING, b"p"),
+                          client_frame(WS_CONTINUATION, b"haba"), client_frame(WS_CLOSE, struct.pack("!H", 1000)))
+        self.assertEqual(replies, bytes([0x80 | WS_PONG, 1]) + b"p" + bytes([0x80 | WS_CLOSE, 2]) + struct.pack("!H", 1000))
+
+        self.assertEqual(receive(client_frame(WS_TEXT, b"selam", masked=False)), close_1002)
+        self.assertEqual(receive(client_frame(WS_CONTINUATION, b"x")), close_1002)               # Başlangıçsız devam
+        self.assertEqual(receive(client_frame(WS_TEXT, b"a", fin=False), client_frame(WS_TEXT, b"b")), close_1002)
+        self.assertEqual(receive(client_frame(WS_PING, b"p", fin=False)), close_1002)            # Parçalı kontrol
+        self.assertEqual(receive(client_frame(0x3, b"")), close_1002)                            # Tanımsız opcode
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü sadece POSIX sistemlerde çalışır")
+class TestControlApiLive(unittest.TestCase):
+    """
+    Canlı API Testleri (pty emülatörü üzerinden)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_rest_command_and_websocket_stream(self):
+        """REST / WebSocket Testi"""
+        print(f"[TEST SENARYOSU] API snapshot'ı okur, komutu kuyruğa ekler, değişim WebSocket'e düşer")
+
+        model = AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=3)
+        board = self.hub.add(model)
+        pool = DevicePool([BoardSpec("klima", "ac", board.port)], poll_interval=0.1, adaptive=False)
+        pool.boards["klima"].device.inter_byte_pacing = model.LOOP_PERIOD
+        api = ControlApiServer(pool, host="127.0.0.1", port=0)
+
+        async def scenario():
+            runner = asyncio.create_task(pool.run())
+            port = await api.start()
+            await asyncio.sleep(0.5)
+            status, snapshot = await http(port, "GET", "/api/boards/klima")
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            key = base64.b64encode(os.urandom(16)).decode()
+            writer.write(f"GET /api/ws HTTP/1.1\r\nHost: test\r\nUpgrade: websocket\r\n"
+                         f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                         f"Sec-WebSocket-Version: 13\r\n\r\n".encode())
+            handshake = await reader.readuntil(b"\r\n\r\n")
+            first = await ws_recv(reader)
+
+            accepted = await http(port, "POST", "/api/boards/klima/commands", {"desired_temp": 19.5})
+            update = await asyncio.wait_for(ws_recv(reader), 3.0)
+            while update["values"]["desired_temp"] != 19.5:  # Araya ortam sıcaklığı değişimi girebilir
+                update = await asyncio.wait_for(ws_recv(reader), 3.0)
+            writer.close()
+
+            await api.close()
+            pool.stop()
+            await runner
+            return status, snapshot, handshake, first, accepted, update
+
+        status, snapshot, handshake, first, accepted, update = asyncio.run(scenario())
+
+        self.assertEqual(status, 200)
+        self.assertEqual(snapshot["values"], {"desired_temp": 24.5, "ambient_temp": 21.0, "fan_speed": 3.0})
+        self.assertTrue(snapshot["connected"])
+        self.assertIn(b"101 Switching Protocols", handshake)
+        self.assertEqual((first["board"], first["values"]["desired_temp"]), ("klima", 24.5))
+        self.assertEqual(accepted, (202, {"board": "klima", "queued": {"desired_temp": 19.5}}))
+        self.assertEqual(update["values"]["desired_temp"], 19.5)
+        self.assertEqual((model.desired_int, model.desired_frac), (19, 5))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (ARKA PLAN SERVİSİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Servis giriş noktasının arayüz modüllerini yüklemediğini, emüle
+#           kartları sorgulayıp telemetriyi diske yazdığını ve systemd'ye
+#           hazır/durma bildirimi gönderdiğini test eder.
+# ==============================================================================
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from board_emulator import AcBoardModel, EmulatorHub
+from daemon import AutomationDaemon
+from device_pool import BoardSpec
+from telemetry import TelemetryStore
+
+
+class TestDaemonImports(unittest.TestCase):
+    """
+    Bağımlılık Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_does_not_load_gui_modules(self):
+        """GUI'siz Başlangıç Testi"""
+        print(f"[TEST SENARYOSU] Servis modülü customtkinter / tkinter / matplotlib yüklemez")
+
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import daemon; "
+                "print(sorted(m for m in ('gui_app', 'live_plot', 'customtkinter', 'tkinter', 'matplotlib') "
+                "if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code, src_dir], capture_output=True, text=True, timeout=30)
+
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertEqual(out.stdout.strip(), "[]")
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü ve systemd soketi sadece POSIX sistemlerde çalışır")
+class TestDaemonRun(unittest.TestCase):
+    """
+    Servis Çalışma Testleri (pty emülatörü üzerinden)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        self.tmp = tempfile.TemporaryDirectory()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+        self.tmp.cleanup()
+
+    def test_polls_records_and_notifies_systemd(self):
+        """Sorgu / Telemetri / systemd Testi"""
+        print(f"[TEST SENARYOSU] Servis kartı okur, kapanışta telemetriyi yazar, READY/STOPPING bildirir")
+
+        board = self.hub.add(AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=3))
+        notify_path = os.path.join(self.tmp.name, "notify.sock")
+        notify = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        notify.bind(notify_path)
+        notify.settimeout(2.0)
+
+        telemetry = TelemetryStore(os.path.join(self.tmp.name, "telemetry"))
+        daemon = AutomationDaemon([BoardSpec("klima", "ac", board.port)], telemetry, metrics_port=0)
+        threading.Timer(1.0, daemon.stop).start()
+
+        with patch.dict(os.environ, {"NOTIFY_SOCKET": notify_path}):
+            asyncio.run(daemon.run())
+        states = [notify.recv(64), notify.recv(64)]
+        notify.close()
+
+        self.assertEqual(states, [b"READY=1", b"STOPPING=1"])
+        self.assertEqual(telemetry.latest("klima", "desired_temp")[1], 24.5)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "telemetry", "klima", "ambient_temp.1m.bin")))
+        self.assertFalse(daemon.pool.get("klima").is_open)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (ÇOKLU KART HAVUZU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kart listesinin dosyadan okunmasını, havuzun sorgulamasını ve
+#           yeniden bağlanma geri çekilmesini (backoff) test eder.
+# ==============================================================================
+
+import asyncio
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+import serial
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from device_pool import DevicePool, BoardSpec, load_board_specs
+import config as cfg
+
+
+class TestDevicePool(unittest.TestCase):
+    """
+    Çoklu Kart Havuzu Testleri
+    """
+
+    def setUp(self):
+        self.patcher = patch('serial.Serial')
+        self.MockSerial = self.patcher.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_load_specs_from_file(self):
+        """Kart Listesi Okuma Testi"""
+        print(f"[TEST SENARYOSU] boards.json formatındaki dosyadan kart listesi okunması")
+
+        boards = {"boards": [
+            {"name": "salon_ac", "type": "ac", "port": 3},
+            {"name": "salon_perde", "type": "curtain", "port": 5, "baud": 19200},
+            {"name": "yatak_ac", "type": "ac", "port": 7},
+        ]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "boards.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(boards, f)
+            specs = load_board_specs(path)
+
+        self.assertEqual([s.name for s in specs], ["salon_ac", "salon_perde", "yatak_ac"])
+        self.assertEqual(specs[1].baud, 19200)
+        self.assertEqual(specs[2].baud, cfg.DEFAULT_BAUDRATE)
+
+        pool = DevicePool(specs)
+        self.assertEqual(len(pool.by_type("ac")), 2)
+        self.assertEqual(pool.get("salon_perde").device.baud_rate, 19200)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_duplicate_port_rejected(self):
+        """Tekrarlanan Port Testi"""
+        print(f"[TEST SENARYOSU] Aynı portu kullanan iki kart (3 ve \"3\" dahil) dosyada ve havuzda reddedilir")
+
+        boards = {"boards": [
+            {"name": "salon_ac", "type": "ac", "port": 3},
+            {"name": "salon_perde", "type": "curtain", "port": "3"},
+        ]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "boards.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(boards, f)
+            with self.assertRaises(ValueError):
+                load_board_specs(path)
+
+        with self.assertRaises(ValueError):
+            DevicePool([BoardSpec("a", "ac", "/dev/pts/4"), BoardSpec("b", "curtain", "/dev/pts/4")])
+        self.MockSerial.assert_not_called()
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_poll_once_and_reconnect_backoff(self):
+        """Sorgu ve Yeniden Bağlanma Testi"""
+        print(f"[TEST SENARYOSU] Açılamayan kart geri çekilir, açılan kart sorgulanır")
+
+        good = MagicMock()
+        good.is_open = True
+        good.fileno.side_effect = AttributeError
+        reply = bytes([24, 5, 22, 3, 7])
+        good.in_waiting = len(reply)
+        good.read.side_effect = lambda n: reply[:n]
+
+        self.MockSerial.side_effect = [serial.SerialException("yok"), good]
+
+        pool = DevicePool([BoardSpec("ac", "ac", 3)])
+        board = pool.boards["ac"]
+
+        async def scenario():
+            first = await pool.poll_once(board)
+            # Backoff süresi dolmadan tekrar denenmez
+            second = await pool.poll_once(board)
+            board.next_attempt = 0.0
+            third = await pool.poll_once(board)
+            return first, second, third
+
+        first, second, third = asyncio.run(scenario())
+
+        self.assertEqual((first, second, third), (False, False, True))
+        self.assertEqual(self.MockSerial.call_count, 2)
+        self.assertEqual(board.backoff, cfg.RECONNECT_BACKOFF_MIN)
+        self.assertEqual(board.device.getAmbientTemp(), 22.3)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (KART SAĞLIK DURUMU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Zaman aşımının gerçek 0 okumasından ayrılmasını, sağlıklı /
+#           bozulmuş / çevrimdışı geçişlerini ve uyarlamalı okuma zaman
+#           aşımını test eder.
+# ==============================================================================
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import config as cfg
+from health import BoardHealth, HEALTHY, DEGRADED, OFFLINE
+from automation_api import AirConditionerSystemConnection, ReadStatus
+
+
+class TestBoardHealth(unittest.TestCase):
+    """
+    Kart Sağlık Durumu Testleri
+    """
+
+    def setUp(self):
+        self.patcher = patch('serial.Serial')
+        self.mock_conn = self.patcher.start().return_value
+        self.mock_conn.is_open = True
+        self.mock_conn.in_waiting = 0
+
+        self.ac = AirConditionerSystemConnection(com_port=3)
+        self.ac.inter_byte_pacing = 0
+        self.ac.open()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_state_transitions_and_adaptive_timeout(self):
+        """Durum Makinesi ve Uyarlamalı Zaman Aşımı Testi"""
+        print(f"[TEST SENARYOSU] Hızlı cevaplar zaman aşımını kısaltır, hatalar kartı düşürür")
+
+        health = BoardHealth("COM9")
+        self.assertEqual(health.read_timeout(), cfg.TIMEOUT_READ)  # Ölçüm yok
+
+        for _ in range(10):
+            health.record_success(0.030)
+        self.assertEqual(health.state, HEALTHY)
+        self.assertLess(health.read_timeout(), 0.1)
+        self.assertGreaterEqual(health.read_timeout(), cfg.HEALTH_MIN_TIMEOUT)
+
+        fast = health.read_timeout()
+        health.record_failure()
+        self.assertEqual(health.state, DEGRADED)
+        self.assertGreater(health.read_timeout(), fast)  # Geri çekilme
+
+        for _ in range(cfg.HEALTH_OFFLINE_AFTER - 1):
+            health.record_failure()
+        self.assertEqual(health.state, OFFLINE)
+        self.assertFalse(health.should_poll(now=health.next_probe - 0.001))
+        self.assertTrue(health.should_poll(now=health.next_probe))
+
+        health.record_probe(False)
+        health.record_probe(False)  # Cevapsız yoklamalar aralığı uzatır
+        self.assertGreater(health.probe_interval, cfg.HEALTH_PROBE_INTERVAL)
+
+        health.record_probe(True)
+        self.assertEqual(health.state, DEGRADED)
+        self.assertEqual((health.failures, health.probe_interval), (0, cfg.HEALTH_PROBE_INTERVAL))
+        health.record_failure()  # Tek hata kartı yeniden düşürmez
+        self.assertEqual(health.state, DEGRADED)
+        health.record_success(0.010)
+        self.assertEqual(health.state, HEALTHY)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_timeout_keeps_previous_reading(self):
+        """Zaman Aşımı / Gerçek Sıfır Ayrımı Testi"""
+        print(f"[TEST SENARYOSU] Cevapsız veya eksik sorgu son geçerli değerleri ezmez")
+
+        self.mock_conn.read.return_value = bytes([24, 5, 23, 0, 2])
+        self.ac.update()
+        self.assertEqual(self.ac.getAmbientTemp(), 23.0)
+        seq = self.ac.snapshot.seq
+
+        self.mock_conn.read.return_value = b""
+        self.assertEqual(self.ac._read_byte().status, ReadStatus.TIMEOUT)
+        self.ac.update()
+        self.mock_conn.read.return_value = bytes([24, 5])
+        self.ac.update()
+
+        self.assertEqual(self.ac.snapshot.seq, seq)
+        self.assertEqual(self.ac.getAmbientTemp(), 23.0)
+        self.assertEqual(self.ac.getHealth(), DEGRADED)
+
+        # Gerçek 0 değeri ise geçerli bir okumadır
+        self.mock_conn.read.return_value = bytes(5)
+        self.ac.update()
+        self.assertEqual(self.ac.getAmbientTemp(), 0.0)
+        self.assertEqual(self.ac.getHealth(), HEALTHY)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_offline_board_is_only_probed(self):
+        """Çevrimdışı Kart Yoklama Testi"""
+        print(f"[TEST SENARYOSU] Ölü kart tam sorgu yerine seyrek tek byte ile yoklanır")
+
+        self.mock_conn.read.return_value = b""
+        for _ in range(cfg.HEALTH_OFFLINE_AFTER):
+            self.ac.update()
+        self.assertEqual(self.ac.getHealth(), OFFLINE)
+
+        # Yoklama zamanı gelmeden yapılan update'ler porta hiç dokunmaz
+        self.mock_conn.write.reset_mock()
+        for _ in range(20):
+            self.ac.update()
+        self.mock_conn.write.assert_not_called()
+
+        # Yoklama zamanı geldi: tek byte gider, cevap yoksa tam sorgu atlanır
+        self.ac.health.next_probe = 0.0
+        self.ac.update()
+        self.mock_conn.write.assert_called_once_with(bytes([self.ac.PROBE_COMMAND]))
+        self.assertEqual(self.ac.getHealth(), OFFLINE)
+
+        # Kart geri geldi: yoklama cevaplanır, ardından tam sorgu yapılır
+        self.ac.health.next_probe = 0.0
+        self.mock_conn.read.side_effect = [b"\x00", bytes([24, 5, 23, 0, 2])]
+        self.ac.update()
+        self.assertEqual(self.ac.getHealth(), HEALTHY)
+        self.assertEqual(self.ac.getAmbientTemp(), 23.0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
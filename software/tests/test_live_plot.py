@@ -0,0 +1,122 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (CANLI GRAFİKLER)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Y ekseni sınırlarının görünen veriden histerezisli hesaplanmasını ve
+#           küçük oynamalarda tam çizim yerine blit yapılmasını ekransız (Agg)
+#           test eder. matplotlib kurulu değilse testler atlanır.
+# ==============================================================================
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+except ImportError:
+    matplotlib = None
+
+from telemetry import TelemetryStore
+
+THEME = {"bg_panel": "#22252a", "bg_card": "#2b2f36", "text_sub": "#94a3b8", "border": "#374151"}
+
+
+@unittest.skipIf(matplotlib is None, "matplotlib kurulu değil")
+class TestLiveChart(unittest.TestCase):
+    """
+    Canlı Grafik Testleri
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fit_ylim_grows_at_once_and_shrinks_with_hysteresis(self):
+        """Histerezisli Y Sınırı Testi"""
+        print(f"[TEST SENARYOSU] Taşan veri ekseni hemen genişletir, küçük daralma tam çizim tetiklemez")
+
+        from live_plot import fit_ylim
+
+        self.assertEqual(fit_ylim((19.0, 23.0), 18.0, 22.0), (17.0, 23.0))      # Alttan taşma
+        self.assertIsNone(fit_ylim((17.0, 23.0), 19.5, 21.5))                    # 4.0 >= 6.0 x 0.5
+        self.assertEqual(fit_ylim((-10.0, 30.0), 20.0, 22.0), (19.0, 23.0))     # 4.0 < 40.0 x 0.5
+        self.assertIsNone(fit_ylim((-10.0, 30.0), 20.0, 22.0, shrink_ratio=0.05))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_refresh_recomputes_limits_from_visible_window(self):
+        """Görünen Pencere / Blit Testi"""
+        print(f"[TEST SENARYOSU] Pencereden çıkan sıçrama ölçeği bırakır, pencere içi oynama sadece blit edilir")
+
+        import live_plot
+
+        class HeadlessCanvas(FigureCanvasAgg):
+            """Tk yerine Agg: ekran olmadan çizer."""
+
+            def __init__(self, figure, master=None):
+                super().__init__(figure)
+                self.full_draws = 0
+                self.blits = 0
+
+            def get_tk_widget(self):
+                return MagicMock()
+
+            def draw(self):
+                self.full_draws += 1
+                super().draw()
+
+            def blit(self, bbox=None):
+                self.blits += 1
+
+        store = TelemetryStore(directory=self.tmp.name, capacity=64)
+        now = time.time()
+        store.record("ac", "ambient_temp", 0.0, ts=now - 30)  # Bağlantı kopmasında okunan 0
+        for i, temp in enumerate((21.0, 21.4, 20.8)):
+            store.record("ac", "ambient_temp", temp, ts=now - 20 + i)
+
+        with patch.object(live_plot, "FigureCanvasTkAgg", HeadlessCanvas):
+            chart = live_plot.LiveChart(None, store, [("ac", "ambient_temp", "Ortam", "#c084fc")], THEME,
+                                        window_seconds=60)
+        canvas = chart.canvas
+
+        with patch.object(live_plot.time, "time", return_value=now):
+            chart.refresh()
+        low, high = chart.ax.get_ylim()
+        self.assertLess(low, 0.0)
+        self.assertGreater(high, 21.4)
+        self.assertEqual((canvas.full_draws, canvas.blits), (1, 0))
+
+        # 40 sn sonra 0 pencereden çıkar: eksen görünen veriye daralır
+        store.record("ac", "ambient_temp", 21.2, ts=now + 40)
+        with patch.object(live_plot.time, "time", return_value=now + 40):
+            chart.refresh()
+        low, high = chart.ax.get_ylim()
+        self.assertGreater(low, 15.0)
+        self.assertLess(high, 25.0)
+        self.assertEqual(canvas.full_draws, 2)
+
+        # Sınırlar içinde küçük oynama: tam çizim yok, sadece çizgiler
+        store.record("ac", "ambient_temp", 21.1, ts=now + 41)
+        with patch.object(live_plot.time, "time", return_value=now + 41):
+            chart.refresh()
+            chart.refresh()  # Yeni örnek yok: hiçbir şey çizilmez
+        self.assertEqual((canvas.full_draws, canvas.blits), (2, 1))
+        self.assertEqual(chart.ax.get_ylim(), (low, high))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
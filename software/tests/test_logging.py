@@ -0,0 +1,130 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (KUYRUKLU LOGLAMA)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Tekrarlanan mesajların bastırılmasını, dosya yazımının çağıran
+#           thread yerine arka plan dinleyicisinde yapılmasını, JSON kayıt
+#           biçimini ve arayüz terminal tamponunun sınırlı kalmasını test eder.
+# ==============================================================================
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from utils.logger import RateLimitFilter, RingLogHandler, new_ring, setup_logging, stop_logging
+
+
+class ThreadRecorder(logging.Handler):
+    """Kaydı hangi thread'in yazdığını not eden handler."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+
+
+class TestRateLimit(unittest.TestCase):
+    """
+    Tekrar Bastırma Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_repeats_suppressed_and_counted(self):
+        """Tekrar Bastırma Testi"""
+        print(f"[TEST SENARYOSU] Pencere içinde aynı hata bir kez geçer, sonra tekrar sayısıyla yazılır")
+
+        limiter = RateLimitFilter(window=10.0)
+        make = lambda msg, level=logging.ERROR: logging.LogRecord("pool", level, __file__, 1, msg, None, None)
+
+        with patch("utils.logger.time.monotonic", side_effect=[0.0, 1.0, 2.0, 3.0, 4.0, 12.0]):
+            passed = [limiter.filter(make("COM3 zaman aşımı")) for _ in range(4)]
+            other = limiter.filter(make("COM3 zaman aşımı", logging.WARNING))
+            summary = make("COM3 zaman aşımı")
+            again = limiter.filter(summary)
+
+        self.assertEqual(passed, [True, False, False, False])
+        self.assertTrue(other)  # Farklı seviye ayrı anahtardır
+        self.assertTrue(again)
+        self.assertEqual(summary.repeated, 3)
+        self.assertIn("3 tekrar bastırıldı", summary.getMessage())
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_formatted_args_and_audit_lines_not_merged(self):
+        """Argümanlı Mesaj / Denetim Kaydı Testi"""
+        print(f"[TEST SENARYOSU] %-biçimli farklı olaylar ve tekrarlanan başlık / SET satırları bastırılmaz")
+
+        limiter = RateLimitFilter(window=10.0)
+        make = lambda msg, args=None, level=logging.WARNING: logging.LogRecord(
+            "asyncio", level, __file__, 1, msg, args, None)
+
+        self.assertEqual([limiter.filter(make("port %s lost", (p,))) for p in ("COM5", "COM6", "COM5")],
+                         [True, True, False])
+
+        banner = make("=" * 42, level=logging.INFO)
+        banner.audit = True
+        self.assertTrue(limiter.filter(banner))
+        self.assertTrue(limiter.filter(banner))
+        self.assertTrue(all(limiter.filter(make("Kart yanıt vermiyor", level=logging.CRITICAL)) for _ in range(3)))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """
+    Kuyruk / Dinleyici Testleri
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root_level = logging.getLogger().level
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        stop_logging()
+        logging.getLogger().setLevel(self.root_level)
+        self.tmp.cleanup()
+
+    def test_writes_in_listener_thread_as_json(self):
+        """Arka Plan Yazımı / JSON Testi"""
+        print(f"[TEST SENARYOSU] Kayıtlar dinleyici thread'inde JSON satırı olarak dosyaya yazılır")
+
+        path = os.path.join(self.tmp.name, "logs", "system.log")
+        recorder = ThreadRecorder()
+        ring = new_ring(3)
+        setup_logging("DEBUG", path, console=False, json_file=True,
+                      extra_handlers=[recorder, RingLogHandler(ring)])
+
+        log = logging.getLogger("test_logging")
+        log.info("Havuz başladı", extra={"board": "klima"})
+        for i in range(5):
+            log.warning(f"Kart {i} yanıt vermiyor")
+        stop_logging()  # Kuyruk boşaltılır, dosya kapatılır
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual(len(records), 6)
+        self.assertEqual((records[0]["level"], records[0]["msg"], records[0]["board"]),
+                         ("INFO", "Havuz başladı", "klima"))
+        self.assertEqual(records[0]["thread"], threading.current_thread().name)  # Kaydı üreten thread
+        self.assertNotIn(threading.current_thread().name, recorder.threads)   # Yazan thread ayrı
+        self.assertEqual([msg for _, msg, _ in ring], [f"Kart {i} yanıt vermiyor" for i in (2, 3, 4)])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (PERFORMANS METRİKLERİ)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Komut başına gecikme histogramlarını, zaman aşımı / eksik okuma
+#           sayaçlarını ve Prometheus metin çıktısını test eder.
+# ==============================================================================
+
+import os
+import sys
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import metrics
+from metrics import LatencyHistogram
+from automation_api import CurtainControlSystemConnection
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Metrik Testleri
+    """
+
+    def setUp(self):
+        self.patcher = patch('serial.Serial')
+        self.mock_conn = self.patcher.start().return_value
+        self.mock_conn.is_open = True
+        self.mock_conn.in_waiting = 0
+
+        self.curtain = CurtainControlSystemConnection(com_port=5)
+        self.curtain.inter_byte_pacing = 0
+        self.curtain.open()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_histogram_percentiles(self):
+        """Histogram Yüzdelik Testi"""
+        print(f"[TEST SENARYOSU] Log-lineer kovalar yüzdelikleri %6 hata içinde verir")
+
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.record(ms / 1000.0)
+
+        self.assertEqual(hist.count, 1000)
+        self.assertAlmostEqual(hist.percentile(50), 0.5, delta=0.5 * 0.0625)
+        self.assertAlmostEqual(hist.percentile(99), 0.99, delta=0.99 * 0.0625)
+        self.assertEqual(hist.summary()["max"], 1.0)
+        below_100ms, below_2s = hist.cumulative([0.1, 2.0])
+        self.assertAlmostEqual(below_100ms, 100, delta=100 * 0.0625)  # Sınırı aşan kova dahil edilmez
+        self.assertEqual(below_2s, 1000)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_timeouts_and_short_reads_are_counted(self):
+        """Zaman Aşımı / Eksik Okuma Sayaç Testi"""
+        print(f"[TEST SENARYOSU] Cevapsız sorgu 0 °C gibi görünse de sayaçlara yansır")
+
+        self.mock_conn.read.side_effect = [bytes(range(8)), bytes([10, 0, 5]), b""]
+        for _ in range(3):
+            self.curtain.update()
+
+        snap = self.curtain.getMetrics()
+        counters = snap["counters"]
+        self.assertEqual(counters["requests"], 24)
+        self.assertEqual(counters["short_reads"], 1)
+        self.assertEqual(counters["timeouts"], 5 + 8)
+        self.assertEqual(counters["bytes_received"], 11)
+        # Histogram isimleri constants.py'den gelir; cevabı gelen komut sayısı kadar örnek
+        self.assertEqual(snap["latency"]["CMD_CUR_GET_DESIRED_INT"]["count"], 2)
+        self.assertEqual(snap["latency"]["CMD_CUR_GET_PRESSURE_INT"]["count"], 1)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_prometheus_endpoint(self):
+        """Prometheus Ucu Testi"""
+        print(f"[TEST SENARYOSU] /metrics ucu sayaçları ve histogramları metin olarak sunar")
+
+        self.mock_conn.in_waiting = 3  # Önceki sorgudan kalan byte'lar
+        self.mock_conn.read.return_value = bytes(8)
+        self.curtain.update()
+
+        server = metrics.start_http_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIn('nexus_serial_overruns_total{board="curtain",port="COM5"} 3', body)
+        self.assertIn('nexus_command_latency_seconds_count{board="curtain",port="COM5",'
+                      'command="CMD_CUR_GET_LIGHT_FRAC"} 1', body)
+        self.assertIn('le="+Inf"', body)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (ÇERÇEVELİ PROTOKOL v2)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: v2 çerçeve kodeğini (CRC-8), HELLO ile protokol pazarlığını ve eski
+#           firmware'e v1 geri dönüşünü, tek istekte toplu okumayı test eder.
+# ==============================================================================
+
+import os
+import io
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import constants as const
+from automation_api import (
+    AirConditionerSystemConnection,
+    CurtainControlSystemConnection,
+    FrameError,
+    ReadStatus,
+    crc8,
+    decode_frame,
+    encode_frame,
+)
+from board_emulator import AcBoardModel, CurtainBoardModel, EmulatorHub
+
+
+class TestFrameCodec(unittest.TestCase):
+    """
+    Çerçeve Kodeği Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_round_trip_and_corruption(self):
+        """Kodlama / Çözme ve CRC Testi"""
+        print(f"[TEST SENARYOSU] Çerçeve geri çözülür, tek bit hatası CRC ile yakalanır")
+
+        self.assertEqual(crc8(b"123456789"), 0xF4)  # CRC-8/SMBUS kontrol değeri
+
+        frame = encode_frame(const.FRAME_SET, bytes([25, 5]))
+        self.assertEqual(frame[:3], bytes([const.FRAME_SOF, 2, const.FRAME_SET]))
+        self.assertEqual(decode_frame(frame), (const.FRAME_SET, bytes([25, 5])))
+
+        for i in range(1, len(frame)):
+            corrupted = bytearray(frame)
+            corrupted[i] ^= 0x04
+            with self.assertRaises(FrameError):
+                decode_frame(bytes(corrupted))
+        with self.assertRaises(FrameError):
+            decode_frame(frame[:-1])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_nak_reply_sized_from_header(self):
+        """NAK Cevabı Boyutlandırma Testi"""
+        print(f"[TEST SENARYOSU] Toplu sorguya gelen 5 byte'lık NAK LEN'e göre okunur, hata olarak sayılır")
+
+        nak = encode_frame(const.FRAME_NAK, b"\x02")
+        ac = AirConditionerSystemConnection(0)
+        ac.protocol = const.PROTOCOL_V2
+        ac.inter_byte_pacing = 0
+        ac.serial_conn = MagicMock()
+        ac.serial_conn.in_waiting = 0
+        ac.serial_conn.read.side_effect = io.BytesIO(nak).read
+
+        result = ac._query_frame(ac.UPDATE_COMMANDS)
+
+        self.assertEqual([c.args[0] for c in ac.serial_conn.read.call_args_list], [2, len(nak) - 2])
+        self.assertEqual(result.status, ReadStatus.ERROR)
+        self.assertEqual((ac.metrics.counters["frame_errors"], ac.metrics.counters["timeouts"]), (1, 0))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü sadece POSIX sistemlerde çalışır")
+class TestProtocolNegotiation(unittest.TestCase):
+    """
+    Protokol Pazarlığı Testleri (pty emülatörü üzerinden)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_v2_bulk_read_matches_v1(self):
+        """Toplu Okuma Testi"""
+        print(f"[TEST SENARYOSU] v2 kart tek istek / tek cevapla v1 ile aynı değerleri verir")
+
+        model = CurtainBoardModel(light_adc=90, temp_adc=101, pressure_adc=203)
+        board = self.hub.add(model, latency=0.001)
+
+        cur = CurtainControlSystemConnection(board.port)
+        self.assertTrue(cur.open())
+        try:
+            cur.update()
+            v1 = cur.getSnapshot()
+
+            self.assertEqual(cur.negotiateProtocol(), const.PROTOCOL_V2)
+            tx_before = board.tx_bytes
+            cur.update()
+            v2 = cur.getSnapshot()
+            self.assertEqual(board.tx_bytes - tx_before, const.FRAME_OVERHEAD + len(cur.UPDATE_COMMANDS))
+            for name in cur.CHANNELS:
+                self.assertEqual(getattr(v2, name), getattr(v1, name))
+
+            self.assertTrue(cur.setCurtainStatus(40))
+            cur.update()
+            self.assertEqual(cur.curtainStatus, 40.0)
+            self.assertEqual(cur.metrics.counters["frame_errors"], 0)
+        finally:
+            cur.close()
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_legacy_firmware_falls_back_to_v1(self):
+        """Geri Dönüş Testi"""
+        print(f"[TEST SENARYOSU] HELLO'ya cevap vermeyen eski kartla v1 protokolü kullanılır")
+
+        model = AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=3, protocol=const.PROTOCOL_V1)
+        board = self.hub.add(model)
+
+        ac = AirConditionerSystemConnection(board.port)
+        ac.inter_byte_pacing = model.LOOP_PERIOD
+        self.assertTrue(ac.open())
+        try:
+            self.assertEqual(ac.negotiateProtocol(), const.PROTOCOL_V1)
+            ac.update()
+            self.assertEqual((ac.getDesiredTemp(), ac.getAmbientTemp(), ac.getFanSpeed()), (24.5, 21.0, 3))
+            self.assertTrue(ac.setDesiredTemp(19.5))
+            self.assertEqual(ac.protocol, const.PROTOCOL_V1)
+        finally:
+            ac.close()
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (PUSH / ABONELİK MODU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Akış ayrıştırıcısının parçalı veri ve bozuk çerçevelerden sonra
+#           yeniden senkron olmasını, abone kartın değişimi sorgusuz bildirmesini
+#           ve havuzun push modunda SET komutlarını akışla birlikte göndermesini
+#           test eder.
+# ==============================================================================
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import constants as const
+from automation_api import FrameParser, encode_frame
+from async_api import AsyncCurtainControlSystemConnection
+from board_emulator import AcBoardModel, CurtainBoardModel, EmulatorHub
+from device_pool import BoardSpec, DevicePool
+
+
+class TestFrameParser(unittest.TestCase):
+    """
+    Akış Ayrıştırıcı Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_partial_feeds_and_resync(self):
+        """Parçalı Veri / Yeniden Senkron Testi"""
+        print(f"[TEST SENARYOSU] Byte byte gelen akış çözülür, çöp ve bozuk çerçeve atlanır")
+
+        event = encode_frame(const.FRAME_EVENT, bytes([25, 0, 21, 0, 3]))
+        ack = encode_frame(const.FRAME_SET_ACK, b"\x00")
+        corrupted = bytearray(event)
+        corrupted[4] ^= 0x10
+        # Yükünde 0x7E (sahte SOF) olan çerçeve
+        tricky = encode_frame(const.FRAME_EVENT, bytes([const.FRAME_SOF, 1, 2, 3, 4]))
+        stream = b"\x00\x13" + event + bytes(corrupted) + ack + tricky
+
+        parser = FrameParser()
+        frames = []
+        for i in range(len(stream)):
+            frames += parser.feed(stream[i:i + 1])
+
+        self.assertEqual(frames, [
+            (const.FRAME_EVENT, bytes([25, 0, 21, 0, 3])),
+            (const.FRAME_SET_ACK, b"\x00"),
+            (const.FRAME_EVENT, bytes([const.FRAME_SOF, 1, 2, 3, 4])),
+        ])
+        self.assertEqual(parser.crc_errors, 1)
+        self.assertEqual(len(parser), 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty emülatörü sadece POSIX sistemlerde çalışır")
+class TestPushMode(unittest.TestCase):
+    """
+    Abonelik Testleri (pty emülatörü üzerinden)
+    """
+
+    def setUp(self):
+        self.hub = EmulatorHub(seed=1)
+        self.hub.start()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_curtain_pushes_night_mode_without_polling(self):
+        """Sorgusuz Değişim Bildirimi Testi"""
+        print(f"[TEST SENARYOSU] Gece olunca perde konumu karttan kendiliğinden gelir")
+
+        model = CurtainBoardModel(light_adc=90)
+        board = self.hub.add(model)
+        cur = AsyncCurtainControlSystemConnection(board.port)
+
+        async def scenario():
+            await cur.open()
+            self.assertTrue(await cur.subscribe(heartbeat=0))
+            self.assertEqual(await cur.listen(0.5), 1)  # Abonelikte ilk tam görüntü
+            rx_before = board.rx_bytes
+
+            model.set_light_adc(10)
+            published = await cur.listen(0.5)
+            rx_during = board.rx_bytes - rx_before
+            unsubscribed = await cur.unsubscribe()
+            await cur.close()
+            return published, rx_during, unsubscribed
+
+        published, rx_during, unsubscribed = asyncio.run(scenario())
+
+        self.assertEqual(published, 1)
+        self.assertEqual(rx_during, 0)  # Host hiç byte göndermedi
+        self.assertTrue(unsubscribed)
+        self.assertEqual(cur.getCurtainStatus(), 100.0)
+        self.assertEqual(cur.getLightIntensity(), 3.0)
+        self.assertFalse(model.push_state.on)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_pool_streams_and_sends_sets(self):
+        """Havuz Push Modu Testi"""
+        print(f"[TEST SENARYOSU] Havuz abone kartı sorgulamaz; SET komutu akış sırasında iletilir")
+
+        model = AcBoardModel(desired_temp=24.5, ambient_temp=21, fan_speed=3)
+        board = self.hub.add(model)
+        pool = DevicePool([BoardSpec("klima", "ac", board.port)], push=True, heartbeat=0.2)
+        pooled = pool.boards["klima"]
+        pooled.device.inter_byte_pacing = model.LOOP_PERIOD
+
+        async def scenario():
+            runner = asyncio.create_task(pool.run())
+            await asyncio.sleep(0.5)
+            pool.get("klima").queueDesiredTemp(19.5)
+            model.set_ambient_temp(23)
+            await asyncio.sleep(0.5)
+            snapshot = pooled.device.getSnapshot()
+            pool.stop()
+            await runner
+            return snapshot
+
+        started = time.monotonic()
+        snapshot = asyncio.run(scenario())
+
+        self.assertLess(time.monotonic() - started, 3.0)
+        self.assertEqual((snapshot.desired_temp, snapshot.ambient_temp), (19.5, 23.0))
+        self.assertEqual((model.desired_int, model.desired_frac), (19, 5))
+        self.assertEqual(pooled.polls, 1)         # Sadece bağlantı turu sorguladı
+        self.assertGreaterEqual(pooled.events, 3)  # İlk görüntü + heartbeat'ler + değişim
+        self.assertFalse(model.push_state.on)      # Kapanışta abonelik kapatıldı
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (ALIM TAMPONU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Önceden ayrılmış alım tamponunun yarım çerçeveyi başa taşımasını ve
+#           gerektiğinde büyümesini, ayrıştırıcının yükleri kopyasız döndürmesini
+#           ve gerçek portun read() çağrılmadan doğrudan tampona okunmasını (senkron
+#           sorgular dahil) test eder.
+# ==============================================================================
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import serial
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import constants as const
+from automation_api import AirConditionerSystemConnection, FrameParser, ReadStatus, RxBuffer, encode_frame
+
+
+class TestRxBuffer(unittest.TestCase):
+    """
+    Tampon Yönetimi Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_compacts_grows_and_parses_in_place(self):
+        """Taşıma / Büyüme / Kopyasız Ayrıştırma Testi"""
+        print(f"[TEST SENARYOSU] Yarım çerçeve başa taşınır, sığmayan veri tamponu büyütür, yükler memoryview döner")
+
+        event = encode_frame(const.FRAME_EVENT, bytes([25, 0, 21, 0, 3]))  # 9 byte
+        parser = FrameParser(capacity=16)
+        buf = parser.rx._buf
+
+        parser.rx.write(event + event[:4])
+        frames = list(parser.parse())
+        self.assertEqual(len(frames), 1)
+        self.assertIsInstance(frames[0][1], memoryview)
+        self.assertEqual(bytes(frames[0][1]), bytes([25, 0, 21, 0, 3]))
+
+        parser.rx.write(event[4:] + event[:3])  # Sona sığmaz: 4 byte'lık yarım çerçeve başa taşınır
+        self.assertIs(parser.rx._buf, buf)
+        self.assertEqual(parser.rx.capacity, 16)
+        self.assertEqual([bytes(p) for _, p in parser.parse()], [bytes([25, 0, 21, 0, 3])])
+
+        parser.rx.write(event[3:] + event * 3)  # 33 byte: tampon büyür
+        self.assertGreaterEqual(parser.rx.capacity, 33)
+        self.assertEqual(len(list(parser.parse())), 4)
+        self.assertEqual((len(parser), parser.crc_errors, parser.frames), (0, 0, 6))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_fill_mock_port_uses_read_fallback(self):
+        """read() Yedek Yolu Testi"""
+        print(f"[TEST SENARYOSU] Gerçek olmayan port nesnesi read() ile okunur, limit aşılmaz")
+
+        port = MagicMock()
+        port.in_waiting = 6
+        port.read.side_effect = lambda n: b"\x01\x02\x03\x04\x05\x06"[:n]
+
+        rx = RxBuffer(4)
+        self.assertEqual(rx.fill(port, limit=4), 4)
+        port.read.assert_called_once_with(4)
+        self.assertEqual(bytes(rx.view()), b"\x01\x02\x03\x04")
+
+        port.in_waiting = 0
+        self.assertEqual(rx.fill(port), 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+@unittest.skipUnless(os.name == "posix", "pty sadece POSIX sistemlerde bulunur")
+class TestDirectFill(unittest.TestCase):
+    """
+    Doğrudan Okuma Testi (pty üzerinden)
+    """
+
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.port = serial.Serial(os.ttyname(slave), timeout=0)
+        os.close(slave)
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.port.close()
+        os.close(self.master)
+
+    def test_real_port_reads_without_read_call(self):
+        """os.readv ile Doğrudan Okuma Testi"""
+        print(f"[TEST SENARYOSU] pyserial portu read() çağrılmadan tamponun boş alanına okunur")
+
+        frame = encode_frame(const.FRAME_VALUES, bytes([24, 5, 22, 0, 2]))
+        os.write(self.master, frame * 2)
+        deadline = time.monotonic() + 2.0
+        while self.port.in_waiting < len(frame) * 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        parser = FrameParser()
+        with patch.object(serial.Serial, "read", side_effect=AssertionError("read() çağrılmamalı")):
+            self.assertEqual(parser.rx.fill(self.port), len(frame) * 2)
+        self.assertEqual([bytes(p) for _, p in parser.parse()], [bytes([24, 5, 22, 0, 2])] * 2)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+    def test_sync_query_reads_into_buffer(self):
+        """Senkron Sorgunun Tampona Okuması Testi"""
+        print(f"[TEST SENARYOSU] Senkron toplu sorgu read() çağırmadan ve port zaman aşımını değiştirmeden okur")
+
+        ac = AirConditionerSystemConnection(self.port.port)
+        ac.serial_conn = self.port  # Açık pty portu
+        ac.inter_byte_pacing = 0.0
+        commands = [const.CMD_AC_GET_AMBIENT_TEMP_FRAC, const.CMD_AC_GET_AMBIENT_TEMP_INT]
+
+        def board():
+            os.read(self.master, len(commands))  # Komutlar geldikten sonra cevap ver
+            os.write(self.master, bytes([5, 22]))
+
+        responder = threading.Thread(target=board, daemon=True)
+        responder.start()
+        with patch.object(serial.Serial, "read", side_effect=AssertionError("read() çağrılmamalı")):
+            result = ac._query(commands, timeout=2.0)
+            responder.join(2.0)
+            self.assertEqual((result.status, result.data), (ReadStatus.OK, bytes([5, 22])))
+            self.assertIsNotNone(result.rtt)
+
+            # Cevap yok: süre dolunca TIMEOUT, portun kendi zaman aşımı (0) değişmez
+            started = time.monotonic()
+            result = ac._query(commands, timeout=0.1)
+        self.assertEqual(result.status, ReadStatus.TIMEOUT)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.port.timeout, 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+if __name__ == '__main__':
+    unittest.main()
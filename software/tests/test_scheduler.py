@@ -0,0 +1,121 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (UYARLAMALI SORGU ZAMANLAYICISI)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Kanal başına sorgu hızlarının değişen kanalda hızlanmasını, sabit
+#           kanalda yavaşlamasını ve havuzun sadece zamanı gelen kanalları
+#           sorgulamasını test eder.
+# ==============================================================================
+
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import constants as const
+from scheduler import ChannelScheduler
+from device_pool import DevicePool, BoardSpec
+
+
+class TestChannelScheduler(unittest.TestCase):
+    """
+    Uyarlamalı Sorgu Zamanlayıcısı Testleri
+    """
+
+    def setUp(self):
+        self.sched = ChannelScheduler({
+            "curtain_status": (0.25, 5.0, 0.0),
+            "outdoor_pressure": (5.0, 60.0, 0.5),
+        }, backoff=2.0, coalesce=0.1)
+        print("\n" + "-" * 60)
+
+    def test_changing_channel_speeds_up_stable_channel_backs_off(self):
+        """Hızlanma / Yavaşlama Testi"""
+        print(f"[TEST SENARYOSU] Hareket eden perde sık, sabit basınç seyrek okunur")
+
+        now = 0.0
+        position = 0.0
+        while now < 12.0:
+            names = self.sched.due(now)
+            position += 10.0  # Motor dönüyor
+            snap = SimpleNamespace(curtain_status=position, outdoor_pressure=101.2)
+            self.sched.observe(snap, names, now)
+            now = self.sched.next_due()
+
+        intervals = self.sched.intervals()
+        self.assertEqual(intervals["curtain_status"], 0.25)
+        self.assertEqual(intervals["outdoor_pressure"], 10.0)  # t=0 ve t=5 okundu, değişmedi: 5 -> 10
+
+        # Motor durdu: perde aralığı max'a kadar uzar; ölü bant içindeki basınç oynaması sayılmaz
+        for i in range(200):
+            names = self.sched.due(now)
+            snap = SimpleNamespace(curtain_status=position, outdoor_pressure=101.2 + (i % 2) * 0.3)
+            self.sched.observe(snap, names, now)
+            now = self.sched.next_due()
+        self.assertEqual(self.sched.intervals(), {"curtain_status": 5.0, "outdoor_pressure": 60.0})
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_due_coalescing_and_kick(self):
+        """Birleştirme ve Hemen Sorgu Testi"""
+        print(f"[TEST SENARYOSU] Yakında zamanı gelecek kanal aynı sorguya eklenir, kick hemen sorgulatır")
+
+        self.assertEqual(self.sched.due(0.0), ["curtain_status", "outdoor_pressure"])
+        self.sched.channels["curtain_status"].next_due = 1.0
+        self.sched.channels["outdoor_pressure"].next_due = 1.05
+
+        self.assertEqual(self.sched.due(0.9), [])
+        self.assertEqual(self.sched.due(1.0), ["curtain_status", "outdoor_pressure"])
+        self.assertAlmostEqual(self.sched.delay(0.5), 0.5)
+
+        self.sched.channels["curtain_status"].interval = 5.0
+        self.sched.kick(["curtain_status"], now=0.2)
+        self.assertEqual(self.sched.due(0.2), ["curtain_status"])
+        self.assertEqual(self.sched.intervals()["curtain_status"], 0.25)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    @patch('config.PROTOCOL_MODE', 'v1')  # v1 byte akışı test ediliyor
+    @patch('serial.Serial')
+    def test_pool_polls_only_due_channels(self, MockSerial):
+        """Havuz Kanal Sorgusu Testi"""
+        print(f"[TEST SENARYOSU] Havuz sadece zamanı gelen kanalların komutlarını gönderir")
+
+        conn = MockSerial.return_value
+        conn.is_open = True
+        conn.fileno.side_effect = AttributeError
+        replies = [bytes([25, 0, 20, 5, 101, 2, 30, 0]), bytes([30, 0])]
+        conn.in_waiting = 8
+        conn.read.side_effect = lambda n: replies.pop(0)[:n]
+
+        pool = DevicePool([BoardSpec("perde", "curtain", 5)], adaptive=True)
+        board = pool.boards["perde"]
+        board.device.inter_byte_pacing = 0
+
+        async def scenario():
+            await pool.poll_once(board)              # İlk tur: tüm kanallar
+            for st in board.scheduler.channels.values():
+                st.next_due = float("inf")
+            board.scheduler.kick(["curtain_status"])
+            conn.write.reset_mock()
+            await pool.poll_once(board)              # Sadece perde konumu
+
+        asyncio.run(scenario())
+
+        written = b"".join(c.args[0] for c in conn.write.call_args_list)
+        self.assertEqual(written, bytes([const.CMD_CUR_GET_DESIRED_INT, const.CMD_CUR_GET_DESIRED_FRAC]))
+        snap = board.device.snapshot
+        self.assertEqual(snap.curtain_status, 60.0)
+        self.assertEqual(snap.outdoor_pressure, 101.2)  # Önceki değer korunur
+        self.assertEqual(snap.seq, 2)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
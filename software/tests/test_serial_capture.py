@@ -0,0 +1,100 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (TRAFİK KAYDI / TEKRAR OYNATMA)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Seri trafiğin kaydedilip bağlantı sınıflarına aynen geri
+#           oynatılabildiğini test eder.
+# ==============================================================================
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from automation_api import AirConditionerSystemConnection, CurtainControlSystemConnection
+from serial_capture import recording_factory, replay_factory, read_capture, TX, RX
+
+
+class TestSerialCapture(unittest.TestCase):
+    """
+    Trafik Kaydı ve Tekrar Oynatma Testleri
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "board.cap")
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record_ac_session(self):
+        """Sahte bir porta karşı iki update() döngüsünü kaydeder."""
+        inner = MagicMock()
+        inner.is_open = True
+        inner.port = "COM3"
+        inner.read.side_effect = [bytes([24, 5, 22, 3, 7]), bytes([24, 5, 22, 8, 9])]
+
+        ac = AirConditionerSystemConnection(3)
+        ac.serial_factory = recording_factory(self.path, inner_factory=lambda **kw: inner)
+        ac.open()
+        ac.update()
+        ac.update()
+        ac.close()
+
+    def test_capture_file_contents(self):
+        """Kayıt Dosyası Testi"""
+        print(f"[TEST SENARYOSU] TX/RX olayları sırası ve zaman damgalarıyla kaydedilir")
+
+        self.record_ac_session()
+        port_name, events = read_capture(self.path)
+
+        self.assertEqual(port_name, "COM3")
+        tx = b"".join(d for direction, _, d in events if direction == TX)
+        rx = b"".join(d for direction, _, d in events if direction == RX)
+        self.assertEqual(tx, bytes(AirConditionerSystemConnection.UPDATE_COMMANDS) * 2)
+        self.assertEqual(rx, bytes([24, 5, 22, 3, 7, 24, 5, 22, 8, 9]))
+        times = [t for _, t, _ in events]
+        self.assertEqual(times, sorted(times))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_replay_reproduces_readings(self):
+        """Tekrar Oynatma Testi"""
+        print(f"[TEST SENARYOSU] Kayıt, gerçek port olmadan aynı sonuçları üretir")
+
+        self.record_ac_session()
+
+        ac = AirConditionerSystemConnection(3)
+        ac.serial_factory = replay_factory(self.path)
+        ac.open()
+        ac.update()
+        self.assertEqual((ac.getDesiredTemp(), ac.getAmbientTemp(), ac.getFanSpeed()), (24.5, 22.3, 7))
+        ac.update()
+        self.assertEqual((ac.getAmbientTemp(), ac.getFanSpeed()), (22.8, 9))
+        self.assertEqual(ac.serial_conn.mismatches, 0)
+        self.assertTrue(ac.serial_conn.finished)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_replay_flags_unexpected_traffic(self):
+        """Farklı Trafik Testi"""
+        print(f"[TEST SENARYOSU] Kayıtla eşleşmeyen komutlar sayılır")
+
+        self.record_ac_session()
+
+        curtain = CurtainControlSystemConnection(3)
+        curtain.serial_factory = replay_factory(self.path)
+        curtain.open()
+        curtain.update()
+        self.assertGreater(curtain.serial_conn.mismatches, 0)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
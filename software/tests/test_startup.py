@@ -0,0 +1,64 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (AÇILIŞ / TEMBEL YÜKLEME)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Cihaz katmanının ağır modülleri (http.server, numpy, matplotlib,
+#           customtkinter) yüklemeden içe aktarılabildiğini ve giriş
+#           noktalarının import anında diske klasör açmadığını test eder.
+# ==============================================================================
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+HEAVY = ('http.server', 'statistics', 'numpy', 'matplotlib', 'customtkinter', 'tkinter',
+         'control_api', 'argparse', 'analytics', 'live_plot', 'gui_app')
+
+
+def loaded_after(statement, cwd=None):
+    """Temiz bir yorumlayıcıda statement çalıştırılır; yüklenen ağır modüller döner."""
+    code = (f"import sys; sys.path.insert(0, sys.argv[1]); {statement}; "
+            f"print(sorted(m for m in {HEAVY!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code, src_dir], capture_output=True, text=True,
+                         timeout=30, cwd=cwd)
+    if out.returncode != 0:
+        raise AssertionError(out.stderr)
+    return out.stdout.strip()
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Açılış Maliyeti Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_device_layer_stays_light(self):
+        """Hafif Cihaz Katmanı Testi"""
+        print(f"[TEST SENARYOSU] Senkron/asenkron API, havuz ve servis ağır modül yüklemez")
+
+        self.assertEqual(loaded_after("import automation_api, async_api, device_pool, telemetry"), "[]")
+        self.assertEqual(loaded_after("import daemon"), "[]")
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_entry_points_do_not_touch_disk_on_import(self):
+        """Import Anında Disk Yazmama Testi"""
+        print(f"[TEST SENARYOSU] main / utils.logger import edilince 'logs' klasörü açılmaz, GUI yüklenmez")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(loaded_after("import main, utils.logger, metrics", cwd=tmp), "[]")
+            self.assertEqual(os.listdir(tmp), [])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
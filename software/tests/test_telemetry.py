@@ -0,0 +1,154 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (TELEMETRİ DEPOSU)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Halka tamponların, dakikalık/saatlik özetlerin ve disk
+#           sıkıştırmasının (compaction) birim testlerini içerir.
+# ==============================================================================
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+import config as cfg
+from telemetry import RingBuffer, TelemetryStore
+
+
+class TestTelemetryStore(unittest.TestCase):
+    """
+    Telemetri Deposu Testleri
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        print("\n" + "-" * 60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ring_buffer_wraps_in_order(self):
+        """Halka Tampon Sıralama Testi"""
+        print(f"[TEST SENARYOSU] Kapasite aşıldığında en eski örnekler düşer, sıra korunur")
+
+        ring = RingBuffer(4)
+        for i in range(6):
+            ring.append(float(i), i * 10.0)
+
+        times, values = ring.snapshot()
+        self.assertEqual(list(times), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(list(values), [20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(ring.latest(), (5.0, 50.0))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_minute_aggregates_flushed_to_disk(self):
+        """Dakikalık Özet Testi"""
+        print(f"[TEST SENARYOSU] Kapanan dakika kovası min/max/ortalama olarak diske eklenir")
+
+        store = TelemetryStore(directory=self.tmp.name, capacity=8)
+        base = 1_700_000_040.0  # Dakika başı
+        for i, temp in enumerate([20.0, 22.0, 24.0]):
+            store.record_many("ac", {"ambient_temp": temp}, ts=base + i)
+        store.record("ac", "ambient_temp", 30.0, ts=base + 60)  # Yeni dakika -> ilk kova kapanır
+        store.flush()
+
+        rows = store.read_aggregates("ac", "ambient_temp", "1m")
+        self.assertEqual(len(rows), 1)
+        start, lo, hi, mean, count = rows[0]
+        self.assertEqual((start, lo, hi, count), (base, 20.0, 24.0, 3))
+        self.assertAlmostEqual(mean, 22.0, places=4)
+
+        times, values = store.history("ac", "ambient_temp", since=base + 1)
+        self.assertEqual(list(values), [24.0, 30.0])
+
+        # Kayıt hiçbir zaman diske yazmaz (flush periyodik olarak sahibi tarafından çağrılır)
+        idle = TelemetryStore(directory=os.path.join(self.tmp.name, "idle"), capacity=8)
+        for minute in range(5):
+            idle.record_many("ac", {"ambient_temp": 21.0}, ts=time.time() + minute * cfg.TELEMETRY_FLUSH_INTERVAL)
+        self.assertFalse(os.path.exists(idle.directory))
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_restart_within_bucket_merges_records(self):
+        """Yeniden Başlatma / Yarım Kova Testi"""
+        print(f"[TEST SENARYOSU] Kapanışta yazılan yarım kova ile açılıştaki devamı tek satır olarak okunur")
+
+        base = 1_700_002_800.0  # Saat başı
+        before = TelemetryStore(directory=self.tmp.name, capacity=8)
+        before.record("ac", "ambient_temp", 20.0, ts=base + 10)
+        before.record("ac", "ambient_temp", 22.0, ts=base + 20)
+        before.flush(close_buckets=True)  # Program kapanıyor
+
+        after = TelemetryStore(directory=self.tmp.name, capacity=8)
+        after.record("ac", "ambient_temp", 26.0, ts=base + 40)  # Aynı dakika, aynı saat
+        after.record("ac", "ambient_temp", 30.0, ts=base + 70)
+        after.flush(close_buckets=True)
+
+        minutes = after.read_aggregates("ac", "ambient_temp", "1m")
+        self.assertEqual([(r[0], r[1], r[2], r[4]) for r in minutes], [(base, 20.0, 26.0, 3), (base + 60, 30.0, 30.0, 1)])
+        self.assertAlmostEqual(minutes[0][3], 68.0 / 3, places=4)
+
+        hours = after.read_aggregates("ac", "ambient_temp", "1h", since=base)
+        self.assertEqual([(r[0], r[1], r[2], r[4]) for r in hours], [(base, 20.0, 30.0, 4)])
+        self.assertAlmostEqual(hours[0][3], 24.5, places=4)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_compact_drops_old_minute_records(self):
+        """Sıkıştırma (Compaction) Testi"""
+        print(f"[TEST SENARYOSU] Saklama süresini aşan dakikalık kayıtlar silinir")
+
+        store = TelemetryStore(directory=self.tmp.name, capacity=8)
+        now = time.time()
+        old = now - 30 * 86400
+        store.record("curtain", "light_intensity", 5.0, ts=old)
+        store.record("curtain", "light_intensity", 9.0, ts=now)
+        store.flush(close_buckets=True)
+        self.assertEqual(len(store.read_aggregates("curtain", "light_intensity", "1m")), 2)
+
+        store.compact(retention_days=14)
+
+        rows = store.read_aggregates("curtain", "light_intensity", "1m")
+        self.assertEqual([r[4] for r in rows], [1])
+        self.assertEqual(rows[0][1], 9.0)
+        self.assertEqual(len(store.read_aggregates("curtain", "light_intensity", "1h")), 2)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_flush_during_compact_loses_nothing(self):
+        """Flush / Compact Kilidi Testi"""
+        print(f"[TEST SENARYOSU] compact dosyayı yeniden yazarken gelen flush bekler, kayıt kaybolmaz")
+
+        store = TelemetryStore(directory=self.tmp.name, capacity=8)
+        now = time.time()
+        store.record("ac", "ambient_temp", 18.0, ts=now - 30 * 86400)
+        store.record("ac", "ambient_temp", 20.0, ts=now - 120)
+        store.flush(close_buckets=True)
+        store.record("ac", "ambient_temp", 22.0, ts=now - 60)  # Kapanmış kova, sonraki flush'ı bekliyor
+        store.record("ac", "ambient_temp", 23.0, ts=now)
+
+        replace = os.replace
+        racer = threading.Thread(target=store.flush)
+
+        def replace_after_flush(src, dst):
+            racer.start()
+            racer.join(0.3)  # Kilitsiz olsaydı flush eski dosyaya ekleyip biterdi
+            replace(src, dst)
+
+        with patch("telemetry.os.replace", side_effect=replace_after_flush):
+            store.compact(retention_days=14)
+        racer.join()
+
+        rows = store.read_aggregates("ac", "ambient_temp", "1m")
+        self.assertEqual([r[1] for r in rows], [20.0, 22.0])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# ==============================================================================
+# PROJE: NEXUS CONTROL HUB - SİSTEM TESTLERİ (HOST TARAFI TERMOSTAT)
+# YAZAR: Kenan Kandilli - 152120211045
+# TARİH: 2025
+# AÇIKLAMA: Gün içi hedef programının gece yarısında doğru devrilmesini, PID dış
+#           döngüsünün firmware'in kalıcı sapmasını az sayıda yazımla gidermesini
+#           ve küçük değişimlerin karta gönderilmemesini test eder.
+# ==============================================================================
+
+import os
+import sys
+import time
+import unittest
+
+# Path ayarı
+current_dir = os.path.dirname(os.path.abspath(__file__))
+software_dir = os.path.dirname(current_dir)
+src_dir = os.path.join(software_dir, 'src')
+sys.path.insert(0, src_dir)
+
+from automation_api import AcSnapshot
+from device_pool import BoardSpec, DevicePool
+from thermostat import PidController, SetpointSchedule, ThermostatEngine
+
+
+def local_ts(hour, minute):
+    """Bugünün verilen yerel saatine ait unix zamanı."""
+    now = time.localtime()
+    return time.mktime((now.tm_year, now.tm_mon, now.tm_mday, hour, minute, 0, 0, 0, -1))
+
+
+class RecordingConn:
+    """queueDesiredTemp çağrılarını kaydeden sahte bağlantı."""
+
+    def __init__(self):
+        self.sent = []
+
+    def queueDesiredTemp(self, temp):
+        self.sent.append(temp)
+
+
+class TestSetpointSchedule(unittest.TestCase):
+    """
+    Hedef Programı Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_schedule_wraps_midnight_and_rejects_bad_times(self):
+        """Gece Yarısı Devri Testi"""
+        print(f"[TEST SENARYOSU] 06:30 öncesi önceki günün son girişi geçerli, hatalı saat reddedilir")
+
+        schedule = SetpointSchedule([("23:00", 19.0), ("06:30", 22.0), ("17:30", 21.0)])
+        self.assertEqual(schedule.target(local_ts(2, 15)), 19.0)
+        self.assertEqual(schedule.target(local_ts(6, 30)), 22.0)
+        self.assertEqual(schedule.target(local_ts(17, 29)), 22.0)
+        self.assertEqual(schedule.target(local_ts(23, 59)), 19.0)
+
+        for bad in ([], [("25:00", 20.0)], [("7.30", 20.0)]):
+            with self.assertRaises(ValueError):
+                SetpointSchedule(bad)
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+class TestThermostatEngine(unittest.TestCase):
+    """
+    Kapalı Çevrim Testleri
+    """
+
+    def setUp(self):
+        print("\n" + "-" * 60)
+
+    def test_closed_loop_removes_offset_with_few_writes(self):
+        """Kalıcı Sapma / Yazım Sayısı Testi"""
+        print(f"[TEST SENARYOSU] Isı kaybı olan odada 3 saatlik simülasyon: hedef ±0.2 °C tutulur, yazım < %2")
+
+        def simulate(engine, conn, steps=2160, dt=5.0):
+            # Firmware'in iç döngüsü: oda hedefin 1.5 °C altına, 10 dk zaman sabitiyle oturur
+            desired, ambient, ts = 22.0, 18.0, 1.0e9
+            for seq in range(1, steps + 1):
+                ts += dt
+                ambient += (desired - 1.5 - ambient) * dt / 600.0
+                if engine is not None:
+                    engine.step(AcSnapshot(seq, ts, desired_temp=desired, ambient_temp=ambient), now=ts)
+                    desired = conn.sent[-1] if conn.sent else desired
+            return ambient
+
+        self.assertAlmostEqual(simulate(None, None), 20.5, delta=0.05)  # Sadece sabit hedef
+
+        conn = RecordingConn()
+        engine = ThermostatEngine(conn, SetpointSchedule([("00:00", 22.0)]), PidController(0.8, 0.002, 0.0, 3.0))
+        self.assertAlmostEqual(simulate(engine, conn), 22.0, delta=0.2)
+        self.assertLess(engine.writes, 2160 * 0.02)
+        self.assertEqual(engine.writes + engine.suppressed, 2160)
+        self.assertTrue(all(round(t, 1) == t for t in conn.sent))  # Kodek çözünürlüğü
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+    def test_small_changes_suppressed_transitions_and_resets_pushed(self):
+        """Yazım Bastırma / Program Geçişi / Yeniden Gönderim Testi"""
+        print(f"[TEST SENARYOSU] Eşik altı değişim gönderilmez, program geçişi beklemez, resetlenen kart düzeltilir")
+
+        pool = DevicePool([BoardSpec("perde", "curtain", 12), BoardSpec("salon", "ac", 10)])
+        schedule = SetpointSchedule([("06:00", 22.0), ("23:00", 19.0)])
+        engine = ThermostatEngine.attach(pool, schedule=schedule, pid=PidController(1.0, 0.0, 0.0, 3.0),
+                                         min_change=0.3, min_interval=60.0)
+        recorder = RecordingConn()
+        pool.get("salon").queueDesiredTemp = recorder.queueDesiredTemp
+        self.assertEqual(pool.listeners, [engine.on_board])
+
+        ts = local_ts(22, 50)
+        snap = lambda seq, t, ambient, desired: AcSnapshot(seq, ts + t, desired_temp=desired, ambient_temp=ambient)
+
+        self.assertEqual(engine.step(snap(1, 0, 21.0, 25.0), now=0.0), 23.0)
+        self.assertIsNone(engine.step(snap(1, 0, 21.0, 25.0), now=1.0))       # Aynı okuma
+        self.assertIsNone(engine.step(snap(2, 5, 21.2, 23.0), now=5.0))       # 22.8: eşik altı
+        self.assertIsNone(engine.step(snap(3, 10, 21.5, 23.0), now=10.0))     # 22.5: aralık dolmadı
+        self.assertEqual(engine.step(snap(4, 70, 21.5, 23.0), now=70.0), 22.5)
+        self.assertEqual(engine.step(snap(5, 600, 22.4, 22.5), now=80.0), 16.0)  # 23:00 geçişi
+        self.assertIsNone(engine.step(snap(6, 610, 19.0, 25.0), now=90.0))    # Kart resetlendi
+        self.assertEqual(engine.step(snap(7, 700, 19.0, 25.0), now=150.0), 19.0)
+
+        pool.boards["perde"].conn.device.snapshot = AcSnapshot(99, ts)
+        pool._notify(pool.boards["perde"])  # Başka kartın turu termostatı çalıştırmaz
+        self.assertEqual(recorder.sent, [23.0, 22.5, 16.0, 19.0])
+        print("   -> SONUÇ: BAŞARILI [✓]")
+
+
+if __name__ == '__main__':
+    unittest.main()